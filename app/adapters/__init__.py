@@ -4,7 +4,7 @@ Adapter factory and registry - now uses dynamic miner loader
 from typing import Dict, Optional
 from adapters.base import MinerAdapter
 
-# Global reference to scheduler service for accessing shared NMMiner adapters
+# Global reference to scheduler service for adapter access
 _scheduler_service = None
 
 def set_scheduler_service(service):
@@ -72,6 +72,21 @@ def get_adapter(miner) -> Optional[MinerAdapter]:
     )
 
 
+def invalidate_adapter(miner_id: int):
+    """
+    Drop the cached adapter for a miner so the next lookup builds a fresh one.
+    
+    Call after a miner is updated or deleted.
+    """
+    from core.miner_loader import get_miner_loader
+    
+    try:
+        get_miner_loader().invalidate_adapter(miner_id)
+    except RuntimeError:
+        # Miner loader not initialized yet - nothing cached
+        pass
+
+
 def get_supported_types() -> list:
     """Get list of supported miner types from dynamic loader"""
     from core.miner_loader import get_miner_loader
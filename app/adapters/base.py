@@ -65,6 +65,25 @@ class MinerAdapter(ABC):
         self.port = port
         self.config = config or {}
     
+    def http_session(self):
+        """
+        Shared keep-alive HTTP session for REST-based drivers.
+        
+        Usage: `async with self.http_session() as session:` - the session is
+        pooled process-wide and is not closed when the block exits.
+        """
+        from core.http_client import get_http_client
+        return get_http_client().session()
+    
+    async def ping(self, timeout: float = 1.0) -> bool:
+        """
+        Network-level reachability via the shared liveness service (ICMP,
+        falling back to a TCP connect on self.port). Results are cached for a
+        few seconds, so drivers can use this for a cheap is_online().
+        """
+        from core.liveness import get_liveness_service
+        return await get_liveness_service().check(self.ip_address, timeout=timeout, port=self.port)
+    
     @abstractmethod
     async def get_telemetry(self) -> Optional[MinerTelemetry]:
         """Get current telemetry data from miner"""
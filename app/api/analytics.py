@@ -4,7 +4,7 @@ Analytics API endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Row, delete, select, func
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Tuple, Union
 from pydantic import BaseModel
@@ -14,7 +14,7 @@ import statistics
 
 from core.database import get_db, Miner, Telemetry, HealthScore
 from core.health import HealthScoringService
-from core.utils import format_hashrate
+from core.utils import format_hashrate, get_telemetry_columns, stream_telemetry_columns
 
 
 router = APIRouter()
@@ -136,14 +136,8 @@ async def get_telemetry_stats(
     
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
-    # Get telemetry data
-    result = await db.execute(
-        select(Telemetry)
-        .where(Telemetry.miner_id == miner_id)
-        .where(Telemetry.timestamp >= cutoff_time)
-        .order_by(Telemetry.timestamp.asc())
-    )
-    telemetry_data = result.scalars().all()
+    # Get telemetry data (numeric columns only)
+    telemetry_data = await get_telemetry_columns(db, miner_id, start=cutoff_time)
     
     if not telemetry_data:
         raise HTTPException(status_code=404, detail="No telemetry data found")
@@ -218,14 +212,6 @@ async def get_telemetry_timeseries(
     
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
-    result = await db.execute(
-        select(Telemetry)
-        .where(Telemetry.miner_id == miner_id)
-        .where(Telemetry.timestamp >= cutoff_time)
-        .order_by(Telemetry.timestamp.asc())
-    )
-    telemetry_data = result.scalars().all()
-    
     # Map metric to field
     metric_map = {
         "hashrate": "hashrate",
@@ -238,6 +224,8 @@ async def get_telemetry_timeseries(
     
     field = metric_map[metric]
     
+    telemetry_data = await get_telemetry_columns(db, miner_id, ("timestamp", field), start=cutoff_time)
+    
     data_points = [
         {
             "timestamp": t.timestamp.isoformat(),
@@ -273,14 +261,12 @@ async def repair_telemetry_outliers(
         raise HTTPException(status_code=404, detail="Miner not found")
 
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-    result = await db.execute(
-        select(Telemetry)
-        .where(Telemetry.miner_id == miner_id)
-        .where(Telemetry.timestamp >= cutoff_time)
-        .where(Telemetry.hashrate.is_not(None))
-        .order_by(Telemetry.timestamp.asc())
-    )
-    rows = result.scalars().all()
+    rows = [
+        t for t in await get_telemetry_columns(
+            db, miner_id, ("id", "timestamp", "hashrate", "hashrate_unit"), start=cutoff_time
+        )
+        if t.hashrate is not None
+    ]
     if not rows:
         return {
             "miner_id": miner_id,
@@ -291,7 +277,7 @@ async def repair_telemetry_outliers(
             "reason": "no telemetry rows in window",
         }
 
-    normalized: List[Tuple[Telemetry, float]] = []
+    normalized: List[Tuple[Row, float]] = []
     for t in rows:
         unit = t.hashrate_unit or "GH/s"
         v = format_hashrate(t.hashrate or 0.0, unit)["value"]
@@ -314,7 +300,7 @@ async def repair_telemetry_outliers(
     deviations = [abs(v - median) for v in values]
     mad = statistics.median(deviations)
 
-    outliers: List[Telemetry] = []
+    outliers: List[Row] = []
     if mad == 0:
         if median > 0:
             outliers = [t for t, v in normalized if v > (median * 10)]
@@ -338,9 +324,11 @@ async def repair_telemetry_outliers(
         }
 
     deleted = 0
-    for t in outliers:
-        await db.delete(t)
-        deleted += 1
+    if outliers:
+        result = await db.execute(
+            delete(Telemetry).where(Telemetry.id.in_([t.id for t in outliers]))
+        )
+        deleted = result.rowcount or 0
 
     await db.commit()
     return {
@@ -369,14 +357,6 @@ async def export_telemetry_csv(
     
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
-    result = await db.execute(
-        select(Telemetry)
-        .where(Telemetry.miner_id == miner_id)
-        .where(Telemetry.timestamp >= cutoff_time)
-        .order_by(Telemetry.timestamp.asc())
-    )
-    telemetry_data = result.scalars().all()
-    
     # Create CSV in memory
     output = io.StringIO()
     writer = csv.writer(output)
@@ -392,8 +372,13 @@ async def export_telemetry_csv(
         "Pool"
     ])
     
-    # Write data
-    for t in telemetry_data:
+    # Write data, streaming rows from the database in batches
+    async for t in stream_telemetry_columns(
+        db,
+        miner_id,
+        ("timestamp", "hashrate", "temperature", "power_watts", "shares_accepted", "shares_rejected", "pool_in_use"),
+        start=cutoff_time,
+    ):
         hashrate_formatted = format_hashrate(t.hashrate or 0, "GH/s") if t.hashrate else {"display": ""}
         writer.writerow([
             t.timestamp.isoformat(),
@@ -10,9 +10,11 @@ from typing import List, Dict, Any
 from decimal import Decimal
 
 from core.database import (
-    get_db, Miner, Telemetry, EnergyPrice, 
+    get_db, Miner,
     DailyMinerStats, MonthlyMinerStats
 )
+from core.cost_engine import compute_costs, load_power_series
+from core.price_timeline import get_price_timeline
 
 router = APIRouter()
 
@@ -47,127 +49,49 @@ async def get_hourly_costs(
             }
         }
     
-    # Get pricing data for the period (past data only, no future)
+    # Shared price index for the period (binary search per reading)
     now = datetime.utcnow()
-    pricing_result = await db.execute(
-        select(EnergyPrice)
-        .where(
-            and_(
-                EnergyPrice.valid_from >= cutoff,
-                EnergyPrice.valid_from <= now
-            )
-        )
-        .order_by(EnergyPrice.valid_from)
-    )
-    energy_prices = pricing_result.scalars().all()
-    
-    # Create price lookup function (same as dashboard)
-    def get_price_for_timestamp(ts):
-        for price in energy_prices:
-            if price.valid_from <= ts < price.valid_to:
-                return price.price_pence
-        return None
+    price_timeline = await get_price_timeline(db, cutoff)
     
-    # Get all telemetry for the period
-    telemetry_result = await db.execute(
-        select(Telemetry)
-        .where(
-            and_(
-                Telemetry.miner_id.in_(miner_ids),
-                Telemetry.timestamp >= cutoff
-            )
-        )
-        .order_by(Telemetry.miner_id, Telemetry.timestamp.asc())
+    # Per-reading costs (same method as dashboard), bucketed by hour
+    series = await load_power_series(db, miner_ids, cutoff)
+    costs = compute_costs(
+        series,
+        price_timeline,
+        manual_power={m.id: m.manual_power_watts for m in miners},
+        bucket="hour",
     )
-    all_telemetry = telemetry_result.scalars().all()
     
-    # Group telemetry by miner
-    telemetry_by_miner = {}
-    for tel in all_telemetry:
-        if tel.miner_id not in telemetry_by_miner:
-            telemetry_by_miner[tel.miner_id] = []
-        telemetry_by_miner[tel.miner_id].append(tel)
-    
-    # Calculate per-reading costs (same method as dashboard)
     hourly_costs = {}
-    miner_avg_power = {}
+    for hour_dt, bucket in costs.buckets.items():
+        hourly_costs[hour_dt] = {
+            "hour": hour_dt.strftime('%Y-%m-%d %H:00:00'),
+            "actual_cost": bucket.cost_pence / 100.0,  # Convert to GBP
+            "baseline_cost": 0,
+            "miners": {}
+        }
     
-    for miner in miners:
-        telemetry_records = telemetry_by_miner.get(miner.id, [])
-        if not telemetry_records:
-            continue
-        
-        miner_power_readings = []
-        
-        # Process each telemetry reading
-        for i, tel in enumerate(telemetry_records):
-            power = tel.power_watts
-            
-            # Fallback to manual power if no auto-detected power
-            if not power or power <= 0:
-                if miner.manual_power_watts:
-                    power = miner.manual_power_watts
-                else:
-                    continue
-            
-            miner_power_readings.append(power)
-            
-            # Get price for this timestamp
-            price_pence = get_price_for_timestamp(tel.timestamp)
-            if price_pence is None:
-                continue
-            
-            # Calculate duration until next reading (capped at 10 minutes)
-            if i < len(telemetry_records) - 1:
-                next_timestamp = telemetry_records[i + 1].timestamp
-                duration_seconds = (next_timestamp - tel.timestamp).total_seconds()
-                duration_hours = duration_seconds / 3600.0
-                
-                # Cap at 10 minutes to prevent counting offline gaps
-                max_duration_hours = 10.0 / 60.0
-                if duration_hours > max_duration_hours:
-                    duration_hours = max_duration_hours
-            else:
-                duration_hours = 30.0 / 3600.0  # Last reading assumes 30 seconds
-            
-            # Calculate cost for this period
-            kwh = (power / 1000.0) * duration_hours
-            cost_pence = kwh * price_pence
-            
-            # Group by hour
-            hour_dt = tel.timestamp.replace(minute=0, second=0, microsecond=0)
-            if hour_dt not in hourly_costs:
-                hourly_costs[hour_dt] = {
-                    "hour": hour_dt.strftime('%Y-%m-%d %H:00:00'),
-                    "actual_cost": 0,
-                    "baseline_cost": 0,
-                    "miners": {}
-                }
-            
-            hourly_costs[hour_dt]["actual_cost"] += cost_pence / 100.0  # Convert to GBP
-        
-        # Track average power for baseline calculation
-        if miner_power_readings:
-            avg_power = sum(miner_power_readings) / len(miner_power_readings)
-            miner_avg_power[miner.id] = avg_power
+    # Track average power for baseline calculation
+    miner_avg_power = {
+        miner_id: miner_cost.avg_power_watts
+        for miner_id, miner_cost in costs.miners.items()
+        if miner_cost.avg_power_watts is not None
+    }
     
     # Calculate baseline costs (if all miners ran 24/7 at their average power)
     # Use exact 30-minute price slots, not hourly averages
     current_hour = now.replace(minute=0, second=0, microsecond=0)
     
     for miner_id, avg_power in miner_avg_power.items():
-        # Iterate through each 30-minute price slot
-        for price in energy_prices:
-            if price.valid_from > now:
-                continue
-            
+        # Iterate through each 30-minute price slot (past slots only)
+        for valid_from, _valid_to, price_pence in price_timeline.slots_between(cutoff, now):
             # Calculate cost for this 30-minute slot
             slot_duration_hours = 0.5  # 30 minutes
             baseline_kwh = (avg_power / 1000.0) * slot_duration_hours
-            baseline_cost_pence = baseline_kwh * float(price.price_pence)
+            baseline_cost_pence = baseline_kwh * float(price_pence)
             
             # Add to the hour bucket for display
-            hour_dt = price.valid_from.replace(minute=0, second=0, microsecond=0)
+            hour_dt = valid_from.replace(minute=0, second=0, microsecond=0)
             if hour_dt not in hourly_costs:
                 hourly_costs[hour_dt] = {
                     "hour": hour_dt.strftime('%Y-%m-%d %H:00:00'),
@@ -10,10 +10,13 @@ import time
 import logging
 
 from core.database import get_db, Miner, Telemetry, EnergyPrice, Event, HighDiffShare, PriceBandStrategyConfig, PoolBlockEffort
+from core.cost_engine import compute_costs, load_power_series
+from core.price_timeline import get_price_timeline
 from core.dashboard_pool_service import DashboardPoolService
 from core.pool_loader import get_pool_loader
+from core.pool_resolver import coin_from_pool_url
 from core.pool_warnings import derive_pool_warnings
-from core.utils import format_hashrate
+from core.utils import format_hashrate, get_latest_telemetry_batch
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -95,33 +98,7 @@ def format_stats_summary(stats: dict) -> dict:
 
 def parse_coin_from_pool(pool_url: str) -> str:
     """Extract coin symbol from pool URL"""
-    if not pool_url:
-        return None
-    
-    pool_url = pool_url.lower()
-    
-    # Braiins Pool patterns
-    if "braiins" in pool_url or "slushpool" in pool_url:
-        return "BTC"
-    
-    # NerdMiners Pool patterns
-    if "nerdminers" in pool_url:
-        return "BTC"
-    
-    # Solopool.org patterns
-    if "dgb" in pool_url:
-        return "DGB"
-    elif "bch" in pool_url or "eu2.solopool.org" in pool_url:
-        return "BCH"
-    elif "bc2" in pool_url:
-        return "BC2"
-    elif "btc" in pool_url:
-        return "BTC"
-    elif "eu1.solopool.org" in pool_url or "us1.solopool.org" in pool_url:
-        # Default to DGB for shared pools
-        return "DGB"
-    
-    return None
+    return coin_from_pool_url(pool_url)
 
 
 async def get_best_share_24h(db: AsyncSession) -> dict:
@@ -298,105 +275,14 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     )
     recent_events = result.scalar()
     
-    # Pre-fetch all energy prices for the last 24 hours (avoid N queries per telemetry record)
-    result = await db.execute(
-        select(EnergyPrice)
-        .where(EnergyPrice.valid_from >= cutoff_24h)
-        .order_by(EnergyPrice.valid_from)
-    )
-    energy_prices = result.scalars().all()
+    # Shared price index for the last 24 hours (binary search per telemetry record)
+    price_timeline = await get_price_timeline(db, cutoff_24h)
 
-    miner_ids = [miner.id for miner in miners]
-    telemetry_by_miner = {miner_id: [] for miner_id in miner_ids}
-    if miner_ids:
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.miner_id.in_(miner_ids))
-            .where(Telemetry.timestamp > cutoff_24h)
-            .order_by(Telemetry.miner_id, Telemetry.timestamp.asc())
-        )
-        for telemetry in result.scalars().all():
-            telemetry_by_miner[telemetry.miner_id].append(telemetry)
-    
-    # Create a lookup function for energy prices
-    def get_price_for_timestamp(ts):
-        for price in energy_prices:
-            if price.valid_from <= ts < price.valid_to:
-                return price.price_pence
-        return None
-
-    miner_ids = [miner.id for miner in miners]
-    telemetry_by_miner = {miner_id: [] for miner_id in miner_ids}
-    if miner_ids:
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.miner_id.in_(miner_ids))
-            .where(Telemetry.timestamp > cutoff_24h)
-            .order_by(Telemetry.miner_id, Telemetry.timestamp.asc())
-        )
-        for telemetry in result.scalars().all():
-            telemetry_by_miner[telemetry.miner_id].append(telemetry)
-
-    miner_ids = [miner.id for miner in miners]
-    telemetry_by_miner = {miner_id: [] for miner_id in miner_ids}
-    if miner_ids:
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.miner_id.in_(miner_ids))
-            .where(Telemetry.timestamp > cutoff_24h)
-            .order_by(Telemetry.miner_id, Telemetry.timestamp.asc())
-        )
-        for telemetry in result.scalars().all():
-            telemetry_by_miner[telemetry.miner_id].append(telemetry)
-    
     # Calculate total 24h cost across all miners using actual telemetry + energy prices
-    total_cost_pence = 0.0
-    total_kwh_consumed_24h = 0.0
-    for miner in miners:
-        # Get telemetry for last 24 hours
-        result = await db.execute(
-            select(Telemetry.power_watts, Telemetry.timestamp)
-            .where(Telemetry.miner_id == miner.id)
-            .where(Telemetry.timestamp > cutoff_24h)
-            .order_by(Telemetry.timestamp)
-        )
-        telemetry_records = result.all()
-        
-        if not telemetry_records:
-            continue
-        
-        # Calculate cost by matching each telemetry reading with the energy price that was active at that time
-        for i, (power, timestamp) in enumerate(telemetry_records):
-            if power is None or power <= 0:
-                continue
-            
-            # Find the energy price that was active when this telemetry was recorded
-            price_pence = get_price_for_timestamp(timestamp)
-            
-            if price_pence is None:
-                # No price data for this timestamp, skip
-                continue
-            
-            # Calculate duration until next telemetry reading (or assume 30s if it's the last one)
-            if i < len(telemetry_records) - 1:
-                next_timestamp = telemetry_records[i + 1][1]
-                duration_seconds = (next_timestamp - timestamp).total_seconds()
-                duration_hours = duration_seconds / 3600.0
-                
-                # Cap duration at 10 minutes to prevent counting offline gaps
-                # Telemetry is recorded every 30s, so >10min gap = miner was offline
-                max_duration_hours = 10.0 / 60.0  # 10 minutes in hours
-                if duration_hours > max_duration_hours:
-                    duration_hours = max_duration_hours
-            else:
-                # Last reading, assume 30 second interval
-                duration_hours = 30.0 / 3600.0
-            
-            # Calculate cost: (power_watts / 1000) * duration_hours * price_pence_per_kwh
-            kwh = (power / 1000.0) * duration_hours
-            cost = kwh * price_pence
-            total_cost_pence += cost
-            total_kwh_consumed_24h += kwh
+    series = await load_power_series(db, [miner.id for miner in miners], cutoff_24h)
+    costs = compute_costs(series, price_timeline)
+    total_cost_pence = costs.total_cost_pence
+    total_kwh_consumed_24h = costs.total_priced_kwh
     
     # Calculate average price per kWh (weighted by consumption)
     avg_price_per_kwh = None
@@ -546,7 +432,6 @@ async def get_pool_tiles(pool_id: str = None, db: AsyncSession = Depends(get_db)
     """
     try:
         from core.database import Pool
-        from core.pool_loader import get_pool_loader
         
         pool_data = await DashboardPoolService.get_pool_dashboard_data(db, pool_id)
         
@@ -986,6 +871,7 @@ async def _build_dashboard_all_payload(dashboard_type: str, db: AsyncSession) ->
     result = await db.execute(select(Pool).where(Pool.enabled == True))
     pools = result.scalars().all()
     pools_dict = {(p.url, p.port): p.name for p in pools}
+    pool_names = {p.id: p.name for p in pools}
 
     # Extract pool coins for ticker filtering
     from core.high_diff_tracker import extract_coin_from_pool_name
@@ -1020,32 +906,19 @@ async def _build_dashboard_all_payload(dashboard_type: str, db: AsyncSession) ->
     cutoff_5min = datetime.utcnow() - timedelta(minutes=5)
     cutoff_24h = datetime.utcnow() - timedelta(hours=24)
 
-    # Pre-fetch all energy prices for the last 24 hours (optimization)
-    result = await db.execute(
-        select(EnergyPrice)
-        .where(EnergyPrice.valid_from >= cutoff_24h)
-        .order_by(EnergyPrice.valid_from)
+    # Shared price index for the last 24 hours (binary search per telemetry record)
+    price_timeline = await get_price_timeline(db, cutoff_24h)
+
+    # 24h energy and cost per miner, computed column-wise
+    series = await load_power_series(db, [miner.id for miner in miners], cutoff_24h)
+    costs = compute_costs(
+        series,
+        price_timeline,
+        manual_power={miner.id: miner.manual_power_watts for miner in miners},
     )
-    energy_prices = result.scalars().all()
-
-    # Create a lookup function for energy prices
-    def get_price_for_timestamp(ts):
-        for price in energy_prices:
-            if price.valid_from <= ts < price.valid_to:
-                return price.price_pence
-        return None
-
-    miner_ids = [miner.id for miner in miners]
-    telemetry_by_miner = {miner_id: [] for miner_id in miner_ids}
-    if miner_ids:
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.miner_id.in_(miner_ids))
-            .where(Telemetry.timestamp > cutoff_24h)
-            .order_by(Telemetry.miner_id, Telemetry.timestamp.asc())
-        )
-        for telemetry in result.scalars().all():
-            telemetry_by_miner[telemetry.miner_id].append(telemetry)
+
+    # Full telemetry rows (with the raw `data` payload) only for each miner's latest reading
+    latest_by_miner = await get_latest_telemetry_batch(db, [miner.id for miner in miners], cutoff_5min)
 
     miners_data = []
     total_hashrate = 0.0
@@ -1055,13 +928,7 @@ async def _build_dashboard_all_payload(dashboard_type: str, db: AsyncSession) ->
     total_pool_hashrate_ghs = 0.0
 
     for miner in miners:
-        telemetry_records = telemetry_by_miner.get(miner.id, [])
-        latest_telemetry = None
-        if telemetry_records:
-            for entry in reversed(telemetry_records):
-                if entry.timestamp > cutoff_5min:
-                    latest_telemetry = entry
-                    break
+        latest_telemetry = latest_by_miner.get(miner.id)
 
         hashrate = 0.0
         hashrate_unit = "GH/s"  # Default for ASIC miners
@@ -1077,8 +944,10 @@ async def _build_dashboard_all_payload(dashboard_type: str, db: AsyncSession) ->
             if not power and miner.manual_power_watts:
                 power = miner.manual_power_watts
 
-            # Map pool URL to name
-            if latest_telemetry.pool_in_use:
+            # Map pool to name (resolved at ingest; parse pool_in_use for older rows)
+            if latest_telemetry.pool_id in pool_names:
+                pool_display = pool_names[latest_telemetry.pool_id]
+            elif latest_telemetry.pool_in_use:
                 pool_str = latest_telemetry.pool_in_use
                 # Remove protocol
                 if '://' in pool_str:
@@ -1107,72 +976,13 @@ async def _build_dashboard_all_payload(dashboard_type: str, db: AsyncSession) ->
                     if miner.miner_type in CPU_TYPES and power:
                         total_power_watts += power
 
-        # Calculate accurate 24h cost using historical telemetry + energy prices (using cached prices)
-        miner_cost_24h = 0.0
-        telemetry_power_records = [
-            (tel.power_watts, tel.timestamp)
-            for tel in telemetry_records
-            if tel.timestamp > cutoff_24h
-        ]
-
-        for i, (tel_power, tel_timestamp) in enumerate(telemetry_power_records):
-            power = tel_power
-
-            # Fallback to manual power if no auto-detected power
-            if not power or power <= 0:
-                if miner.manual_power_watts:
-                    power = miner.manual_power_watts
-                else:
-                    continue
-
-            # Find the energy price that was active at this telemetry timestamp (from cached prices)
-            price_pence = get_price_for_timestamp(tel_timestamp)
-
-            if price_pence is None:
-                continue
-
-            # Calculate duration until next reading
-            if i < len(telemetry_power_records) - 1:
-                next_timestamp = telemetry_power_records[i + 1][1]
-                duration_seconds = (next_timestamp - tel_timestamp).total_seconds()
-                duration_hours = duration_seconds / 3600.0
-
-                # Cap duration at 10 minutes to prevent counting offline gaps
-                # Telemetry is recorded every 30s, so >10min gap = miner was offline
-                max_duration_hours = 10.0 / 60.0  # 10 minutes in hours
-                if duration_hours > max_duration_hours:
-                    duration_hours = max_duration_hours
-            else:
-                duration_hours = 30.0 / 3600.0
-
-            # Calculate cost for this period
-            kwh = (power / 1000.0) * duration_hours
-            cost = kwh * price_pence
-            miner_cost_24h += cost
+        # Accurate 24h cost from historical telemetry + energy prices
+        miner_cost = costs.miner(miner.id)
+        miner_cost_24h = miner_cost.cost_pence
 
         if miner.enabled:
             total_cost_24h_pence += miner_cost_24h
-            # Track total kWh from telemetry records
-            for i, (tel_power, tel_timestamp) in enumerate(telemetry_power_records):
-                power = tel_power
-                if not power or power <= 0:
-                    if miner.manual_power_watts:
-                        power = miner.manual_power_watts
-                    else:
-                        continue
-
-                if i < len(telemetry_power_records) - 1:
-                    next_timestamp = telemetry_power_records[i + 1][1]
-                    duration_seconds = (next_timestamp - tel_timestamp).total_seconds()
-                    duration_hours = duration_seconds / 3600.0
-                    max_duration_hours = 10.0 / 60.0
-                    if duration_hours > max_duration_hours:
-                        duration_hours = max_duration_hours
-                else:
-                    duration_hours = 30.0 / 3600.0
-
-                kwh = (power / 1000.0) * duration_hours
-                total_kwh_consumed_24h += kwh
+            total_kwh_consumed_24h += miner_cost.kwh
 
         # Get latest health score for this miner
         health_score = None
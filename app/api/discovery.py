@@ -2,14 +2,16 @@
 Network Discovery API Endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
 from pydantic import BaseModel
+import json
 import logging
 
 from core.database import get_db, Miner, Event
-from core.discovery import MinerDiscoveryService
+from core.discovery import DiscoveryScan, MinerDiscoveryService
 from core.config import app_config
 
 logger = logging.getLogger(__name__)
@@ -34,6 +36,7 @@ class DiscoveryConfig(BaseModel):
 class DiscoveryRequest(BaseModel):
     """Request model for discovery scan"""
     network_cidr: Optional[str] = None
+    networks: Optional[List[str]] = None  # Several CIDRs in one scan (stream endpoint)
     timeout: float = 2.0
 
 
@@ -112,6 +115,57 @@ async def scan_network(
     )
 
 
+@router.post("/discovery/scan/stream")
+async def scan_network_stream(
+    request: DiscoveryRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Scan one or more networks, streaming results as newline-delimited JSON
+    
+    Emits {"type": "miner", "miner": {...}} as each miner is identified and a
+    final {"type": "complete", ...} summary (or {"type": "error", ...}).
+    """
+    networks = request.networks or [request.network_cidr or MinerDiscoveryService._get_local_network()]
+    if not all(networks):
+        raise HTTPException(status_code=500, detail="Could not determine local network")
+    
+    try:
+        scan = DiscoveryScan(networks, timeout=request.timeout)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid network: {e}")
+    
+    # Resolve existing miners before streaming starts (the session is request-scoped)
+    result = await db.execute(select(Miner.ip_address))
+    existing_ips = {ip for ip in result.scalars().all() if ip}
+    
+    async def events():
+        new_count = 0
+        existing_count = 0
+        try:
+            async for miner in scan.run():
+                is_existing = miner['ip'] in existing_ips
+                if is_existing:
+                    existing_count += 1
+                else:
+                    new_count += 1
+                yield json.dumps({"type": "miner", "miner": {**miner, "already_added": is_existing}}) + "\n"
+        except Exception as e:
+            logger.error(f"Streaming discovery scan failed: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+            return
+        
+        yield json.dumps({
+            "type": "complete",
+            "total_found": new_count + existing_count,
+            "new_miners": new_count,
+            "existing_miners": existing_count,
+            "stats": scan.stats,
+        }) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.post("/discovery/verify/{miner_id}")
 async def verify_miner(
     miner_id: int,
@@ -292,45 +346,43 @@ async def trigger_auto_scan(db: AsyncSession = Depends(get_db)):
     total_found = 0
     total_added = 0
     
-    for network_config in networks:
-        network_cidr = network_config["cidr"] if isinstance(network_config, dict) else network_config
+    network_cidrs = [
+        network_config["cidr"] if isinstance(network_config, dict) else network_config
+        for network_config in networks
+    ]
+    logger.info(f"Auto-scanning networks: {', '.join(network_cidrs)}")
+    
+    try:
+        # One staged scan across all networks; miners are added as they are found
+        scan = DiscoveryScan(network_cidrs, timeout=2.0)
         
-        logger.info(f"Auto-scanning network: {network_cidr}")
+        existing_connections = set()
+        if auto_add:
+            result = await db.execute(select(Miner))
+            existing_connections = {
+                (m.ip_address, m.port) for m in result.scalars().all() if m.ip_address
+            }
         
-        try:
-            discovered = await MinerDiscoveryService.discover_miners(
-                network_cidr=network_cidr,
-                timeout=2.0
-            )
-            
-            total_found += len(discovered)
-            
-            if auto_add:
-                # Get existing miners
-                result = await db.execute(select(Miner))
-                existing_miners = result.scalars().all()
-                existing_connections = {
-                    (m.ip_address, m.port) for m in existing_miners if m.ip_address
-                }
-                
-                # Add new miners
-                for miner_data in discovered:
-                    if (miner_data['ip'], miner_data['port']) not in existing_connections:
-                        new_miner = Miner(
-                            name=miner_data['name'],
-                            type=miner_data['type'],
-                            ip_address=miner_data['ip'],
-                            port=miner_data['port'],
-                            enabled=True
-                        )
-                        db.add(new_miner)
-                        total_added += 1
-                        logger.info(f"Auto-added miner: {miner_data['name']} at {miner_data['ip']}:{miner_data['port']}")
-                
-                await db.commit()
+        async for miner_data in scan.run():
+            total_found += 1
+            if auto_add and (miner_data['ip'], miner_data['port']) not in existing_connections:
+                new_miner = Miner(
+                    name=miner_data['name'],
+                    miner_type=miner_data['type'],
+                    ip_address=miner_data['ip'],
+                    port=miner_data['port'],
+                    enabled=True
+                )
+                db.add(new_miner)
+                existing_connections.add((miner_data['ip'], miner_data['port']))
+                total_added += 1
+                logger.info(f"Auto-added miner: {miner_data['name']} at {miner_data['ip']}:{miner_data['port']}")
         
-        except Exception as e:
-            logger.error(f"Error scanning network {network_cidr}: {e}")
+        if total_added:
+            await db.commit()
+    
+    except Exception as e:
+        logger.error(f"Error scanning networks {', '.join(network_cidrs)}: {e}")
     
     # Log event
     event = Event(
@@ -358,6 +358,10 @@ async def trigger_health_check(db: AsyncSession = Depends(get_db)):
 async def trigger_ml_training(db: AsyncSession = Depends(get_db)):
     """Manually trigger ML model training for all miners"""
     from core.ml_anomaly import train_all_models
+    from core.ml_training import get_ml_training_service
+    
+    if get_ml_training_service().running:
+        raise HTTPException(status_code=409, detail="ML model training is already running")
     
     try:
         await train_all_models(db)
@@ -367,6 +371,24 @@ async def trigger_ml_training(db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/ml/training")
+async def get_ml_training_status():
+    """Progress of the current (or last) ML training run"""
+    from core.ml_training import get_ml_training_service
+    
+    return get_ml_training_service().status()
+
+
+@router.post("/ml/training/cancel")
+async def cancel_ml_training():
+    """Cancel the running ML training; models already being fitted still finish"""
+    from core.ml_training import get_ml_training_service
+    
+    if not get_ml_training_service().cancel():
+        raise HTTPException(status_code=409, detail="No ML model training is running")
+    return {"status": "success", "message": "ML model training cancellation requested"}
+
+
 @router.get("/ml/models")
 async def list_ml_models():
     """List all trained ML models"""
@@ -317,6 +317,10 @@ async def enroll_ha_device(
     
     await db.commit()
     
+    # Stream events for this entity now reach (or stop reaching) the DB listener
+    from integrations.homeassistant import get_ha_state_store
+    get_ha_state_store().watch_entity(device.entity_id, request.enrolled)
+    
     logger.info(f"Device {device.entity_id} enrollment: {request.enrolled}")
     
     return {
@@ -11,7 +11,10 @@ import logging
 import copy
 
 from core.database import get_db, Miner, Pool, Telemetry
-from adapters import create_adapter, get_supported_types
+from adapters import create_adapter, get_supported_types, invalidate_adapter
+from core.latest_telemetry import get_latest_telemetry_store
+from core.high_diff_tracker import get_best_difficulty_register
+from core.online_health import get_online_health_scorer
 
 
 router = APIRouter()
@@ -209,6 +212,8 @@ async def update_miner(miner_id: int, miner_update: MinerUpdate, db: AsyncSessio
     await db.commit()
     await db.refresh(miner)
     
+    invalidate_adapter(miner.id)
+    
     # Reload NMMiner adapters if needed
     if needs_reload:
         from core.scheduler import scheduler
@@ -246,6 +251,11 @@ async def delete_miner(miner_id: int, db: AsyncSession = Depends(get_db)):
     await db.delete(miner)
     await db.commit()
     
+    invalidate_adapter(miner_id)
+    get_latest_telemetry_store().forget(miner_id)
+    get_best_difficulty_register().forget(miner_id)
+    get_online_health_scorer().forget(miner_id)
+    
     # Reload NMMiner adapters if needed
     if is_nmminer:
         from core.scheduler import scheduler
@@ -258,12 +268,14 @@ async def delete_miner(miner_id: int, db: AsyncSession = Depends(get_db)):
 async def get_miner_telemetry(
     miner_id: int, 
     live: bool = Query(default=False, description="Fetch live data from device instead of cached"),
+    include_raw: bool = Query(default=False, description="Include the raw vendor payload from cold storage"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get telemetry for a miner.
     By default returns cached data from database (updated every 60s).
     Set live=true to query the device directly.
+    Set include_raw=true to restore extra_data.vendor.raw for cached data.
     """
     result = await db.execute(select(Miner).where(Miner.id == miner_id))
     miner = result.scalar_one_or_none()
@@ -298,6 +310,11 @@ async def get_miner_telemetry(
     # Import format_hashrate utility
     from core.utils import format_hashrate
     
+    extra_data = cached_telemetry.data
+    if include_raw:
+        from core.raw_payloads import hydrate_raw_payload
+        extra_data = await hydrate_raw_payload(db, extra_data)
+    
     # Format hashrate using utility
     hashrate_formatted = format_hashrate(
         cached_telemetry.hashrate, 
@@ -313,7 +330,7 @@ async def get_miner_telemetry(
         "shares_accepted": cached_telemetry.shares_accepted,
         "shares_rejected": cached_telemetry.shares_rejected,
         "pool_in_use": cached_telemetry.pool_in_use,
-        "extra_data": cached_telemetry.data or {}
+        "extra_data": extra_data or {}
     }
 
 
@@ -346,27 +363,33 @@ async def set_miner_mode(miner_id: int, mode: str, db: AsyncSession = Depends(ge
     # Get fresh telemetry to capture new power consumption
     telemetry = await adapter.get_telemetry()
     if telemetry and telemetry.power_watts:
-        from core.database import Telemetry, EnergyPrice
-        from sqlalchemy import select
+        from core.database import Telemetry
+        from core.price_timeline import get_price_timeline
         
         # Calculate energy cost if we have power data
         energy_cost = None
         if telemetry.power_watts is not None and telemetry.power_watts > 0:
             try:
-                # Query Agile price for this timestamp
-                price_query = select(EnergyPrice).where(
-                    EnergyPrice.valid_from <= telemetry.timestamp,
-                    EnergyPrice.valid_to > telemetry.timestamp
-                ).limit(1)
-                result = await db.execute(price_query)
-                price_row = result.scalar_one_or_none()
+                # Agile price for this timestamp
+                price_timeline = await get_price_timeline(db, telemetry.timestamp)
+                price_pence = price_timeline.price_at(telemetry.timestamp)
                 
-                if price_row:
+                if price_pence is not None:
                     # Calculate cost for 1 minute: (watts / 60 / 1000) * price_pence
-                    energy_cost = (telemetry.power_watts / 60.0 / 1000.0) * price_row.price_pence
+                    energy_cost = (telemetry.power_watts / 60.0 / 1000.0) * price_pence
             except Exception as e:
                 print(f"⚠️ Could not calculate energy cost: {e}")
         
+        from core.pool_resolver import get_pool_resolver
+        from core.raw_payloads import extract_raw_payloads, store_raw_payloads
+
+        (inline,), raw_payloads = extract_raw_payloads([
+            {"miner_id": miner.id, "timestamp": telemetry.timestamp, "data": telemetry.extra_data}
+        ])
+        await store_raw_payloads(db, raw_payloads)
+        pool_resolver = get_pool_resolver()
+        await pool_resolver.ensure_loaded(db)
+        pool_id, coin = pool_resolver.match_with_coin(telemetry.pool_in_use)
         db_telemetry = Telemetry(
             miner_id=miner.id,
             timestamp=telemetry.timestamp,
@@ -378,10 +401,13 @@ async def set_miner_mode(miner_id: int, mode: str, db: AsyncSession = Depends(ge
             shares_rejected=telemetry.shares_rejected,
             pool_in_use=telemetry.pool_in_use,
             mode=miner.current_mode,
-            data=telemetry.extra_data
+            data=inline["data"],
+            pool_id=pool_id,
+            coin=coin
         )
         db.add(db_telemetry)
         await db.commit()
+        get_latest_telemetry_store().update(db_telemetry)
     
     return {"status": "success", "mode": mode}
 
@@ -516,8 +542,9 @@ async def get_miner_modes(miner_id: int, db: AsyncSession = Depends(get_db)):
 async def get_miner_24h_cost(miner_id: int, db: AsyncSession = Depends(get_db)):
     """Calculate rolling 24-hour cost for a miner based on power consumption and Octopus Agile prices"""
     from datetime import datetime, timedelta
-    from core.database import Telemetry, EnergyPrice
+    from core.database import Telemetry
     from core.config import app_config
+    from core.price_timeline import get_price_timeline
     
     # Get miner
     result = await db.execute(select(Miner).where(Miner.id == miner_id))
@@ -551,20 +578,8 @@ async def get_miner_24h_cost(miner_id: int, db: AsyncSession = Depends(get_db)):
             "message": "No telemetry data available"
         }
     
-    # Pre-fetch all energy prices for the last 24 hours (same as dashboard)
-    result = await db.execute(
-        select(EnergyPrice)
-        .where(EnergyPrice.valid_from >= start_time)
-        .order_by(EnergyPrice.valid_from)
-    )
-    energy_prices = result.scalars().all()
-    
-    # Create a lookup function for energy prices (same as dashboard)
-    def get_price_for_timestamp(ts):
-        for price in energy_prices:
-            if price.valid_from <= ts < price.valid_to:
-                return price.price_pence
-        return None
+    # Shared price index for the last 24 hours (same as dashboard)
+    price_timeline = await get_price_timeline(db, start_time)
     
     # Calculate total cost by matching telemetry records with energy prices
     total_cost_pence = 0
@@ -582,7 +597,7 @@ async def get_miner_24h_cost(miner_id: int, db: AsyncSession = Depends(get_db)):
                 continue
         
         # Find the energy price for this timestamp using cached lookup
-        price_pence = get_price_for_timestamp(telem.timestamp)
+        price_pence = price_timeline.price_at(telem.timestamp)
         
         if price_pence:
             # Calculate duration until next reading (same logic as dashboard)
@@ -4,7 +4,7 @@ import logging
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import (
@@ -14,11 +14,12 @@ from core.database import (
     MinerStrategy,
     Miner,
     HomeAssistantConfig,
-    Telemetry,
     engine
 )
 from core.db_pool_metrics import get_metrics as get_db_pool_metrics
+from core.latest_telemetry import get_latest_telemetry_store
 from core.telemetry_metrics import get_metrics as get_telemetry_metrics, update_backlog
+from core.telemetry_writer import get_telemetry_writer
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -110,18 +111,12 @@ async def get_operations_status(db: AsyncSession = Depends(get_db)) -> Dict[str,
         # Telemetry backlog
         cutoff = datetime.utcnow() - timedelta(minutes=2)
         backlog_result = await db.execute(
-            select(Miner.id, func.max(Telemetry.timestamp))
-            .outerjoin(Telemetry, Telemetry.miner_id == Miner.id)
+            select(Miner.id)
             .where(Miner.enabled == True)
             .where(Miner.miner_type != "nmminer")
-            .group_by(Miner.id)
-        )
-        backlog_rows = backlog_result.all()
-        backlog_count = sum(
-            1
-            for _, last_ts in backlog_rows
-            if last_ts is None or last_ts < cutoff
         )
+        latest_store = await get_latest_telemetry_store().ensure_warm(db)
+        backlog_count = latest_store.stale_count(backlog_result.scalars().all(), cutoff)
         update_backlog(backlog_count)
         telemetry_metrics = get_telemetry_metrics()
 
@@ -147,6 +142,7 @@ async def get_operations_status(db: AsyncSession = Depends(get_db)) -> Dict[str,
             },
             "telemetry": {
                 "backlog_current": backlog_count,
+                "writer": get_telemetry_writer().get_stats(),
                 "metrics": {
                     "last_24h": telemetry_metrics.last_24h.to_dict(),
                     "since_boot": telemetry_metrics.since_boot.to_dict(),
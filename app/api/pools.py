@@ -11,6 +11,7 @@ from typing import List
 from pydantic import BaseModel
 
 from core.database import get_db, Pool, PoolBlockEffort, Event
+from core.pool_resolver import get_pool_resolver
 
 
 router = APIRouter()
@@ -269,6 +270,7 @@ async def create_pool(pool: PoolCreate, db: AsyncSession = Depends(get_db)):
     db.add(db_pool)
     await db.commit()
     await db.refresh(db_pool)
+    get_pool_resolver().invalidate()
 
     if detected_driver == "unknown":
         _record_recovery_event(
@@ -464,6 +466,7 @@ async def update_pool(pool_id: int, pool_update: PoolUpdate, db: AsyncSession =
     
     await db.commit()
     await db.refresh(pool)
+    get_pool_resolver().invalidate()
     
     return pool
 
@@ -612,5 +615,6 @@ async def delete_pool(pool_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(pool)
     await db.commit()
+    get_pool_resolver().invalidate()
     
     return {"status": "deleted"}
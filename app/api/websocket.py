@@ -1,62 +1,219 @@
 """
 WebSocket endpoints for real-time updates
 Uses PostgreSQL NOTIFY/LISTEN for push notifications
+
+Notifications are not forwarded one by one. They are coalesced per miner
+(latest row wins) and flushed every `websocket.batch_interval_ms`, so a
+telemetry sweep becomes one message per interval. Each client has a bounded
+send queue drained by its own task: a slow client drops its oldest messages
+instead of stalling everyone else. A client whose send fails or times out is
+closed (1011), which also ends its endpoint's receive loop.
+
+Clients may narrow what they receive by sending
+{"action": "subscribe" | "unsubscribe", "topics": [...]} with topics
+"all" (default), "telemetry", "miners" or "miner:<id>".
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Set
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
 import asyncio
 import json
 import logging
 
+from core.config import app_config
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+DEFAULT_BATCH_INTERVAL_MS = 500
+DEFAULT_QUEUE_SIZE = 64
+SEND_TIMEOUT = 10.0  # A client stuck this long on one send is disconnected
+
+TOPIC_ALL = "all"
+MESSAGE_TOPICS = {
+    "telemetry_update": "telemetry",
+    "miner_update": "miners",
+}
+
+
+def message_topics(message_type: str, data: Any) -> Set[str]:
+    """Topics a message is published on"""
+    topics = {TOPIC_ALL}
+    if message_type in MESSAGE_TOPICS:
+        topics.add(MESSAGE_TOPICS[message_type])
+    if isinstance(data, dict) and data.get("miner_id") is not None:
+        topics.add(f"miner:{data['miner_id']}")
+    return topics
+
+
+class ClientConnection:
+    """One WebSocket client: its subscriptions and bounded send queue"""
+    
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.topics: Set[str] = {TOPIC_ALL}
+        self.dropped = 0
+        self.sender_task: Optional[asyncio.Task] = None
+        self._queue: deque = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+    
+    def wants(self, topics: Set[str]) -> bool:
+        return not self.topics.isdisjoint(topics)
+    
+    def subscribe(self, topics: Iterable[str]):
+        if TOPIC_ALL in self.topics:
+            self.topics = set()  # First explicit subscription narrows the default
+        self.topics.update(topics)
+    
+    def unsubscribe(self, topics: Iterable[str]):
+        self.topics.difference_update(topics)
+    
+    def enqueue(self, text: str):
+        """Queue a message, dropping the oldest when the client is behind"""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(text)
+        self._ready.set()
+    
+    async def run_sender(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._queue:
+                await asyncio.wait_for(self.websocket.send_text(self._queue.popleft()), timeout=SEND_TIMEOUT)
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts"""
     
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+    def __init__(self, batch_interval_ms: Optional[int] = None, queue_size: Optional[int] = None):
+        self.clients: Dict[WebSocket, ClientConnection] = {}
         self.listener_task = None
+        self._batch_interval_ms = batch_interval_ms
+        self._queue_size = queue_size
+        self._pending: Dict[str, Dict[Any, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.notifications = 0
+        self.messages_sent = 0
+    
+    @property
+    def active_connections(self) -> Set[WebSocket]:
+        return set(self.clients)
     
-    async def connect(self, websocket: WebSocket):
+    @property
+    def batch_interval(self) -> float:
+        if self._batch_interval_ms is not None:
+            return self._batch_interval_ms / 1000
+        return int(app_config.get("websocket.batch_interval_ms", DEFAULT_BATCH_INTERVAL_MS)) / 1000
+    
+    @property
+    def queue_size(self) -> int:
+        if self._queue_size is not None:
+            return self._queue_size
+        return int(app_config.get("websocket.queue_size", DEFAULT_QUEUE_SIZE))
+    
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
         """Accept new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.add(websocket)
-        logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
+        client = ClientConnection(websocket, self.queue_size)
+        client.sender_task = asyncio.create_task(self._run_sender(client))
+        self.clients[websocket] = client
+        logger.info(f"WebSocket connected. Total connections: {len(self.clients)}")
         
         # Start PostgreSQL listener if not already running
-        if not self.listener_task and len(self.active_connections) == 1:
+        if not self.listener_task and len(self.clients) == 1:
             self.listener_task = asyncio.create_task(self._listen_postgres_notifications())
+        return client
     
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
-        self.active_connections.discard(websocket)
-        logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        if client.sender_task and client.sender_task is not asyncio.current_task():
+            client.sender_task.cancel()
+        logger.info(f"WebSocket disconnected. Total connections: {len(self.clients)}")
         
         # Stop listener if no more connections
-        if len(self.active_connections) == 0 and self.listener_task:
+        if len(self.clients) == 0 and self.listener_task:
             self.listener_task.cancel()
             self.listener_task = None
     
+    async def _run_sender(self, client: ClientConnection):
+        try:
+            await client.run_sender()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Dropping WebSocket client after send failure: {e!r}")
+            self.disconnect(client.websocket)
+            try:
+                # Ends the endpoint's receive loop as well
+                await asyncio.wait_for(client.websocket.close(code=1011), timeout=SEND_TIMEOUT)
+            except Exception as close_error:
+                logger.debug(f"Closing dropped WebSocket client failed: {close_error!r}")
+    
+    def send(self, client: ClientConnection, message: Any):
+        """Queue a message for one client"""
+        client.enqueue(message if isinstance(message, str) else json.dumps(message))
+    
     async def broadcast(self, message: dict):
-        """Send message to all connected clients"""
-        if not self.active_connections:
+        """Queue message for every subscribed client (never waits on a client)"""
+        if not self.clients:
             return
         
+        topics = message_topics(message.get("type"), message.get("data"))
         message_json = json.dumps(message)
-        disconnected = set()
+        for client in list(self.clients.values()):
+            if client.wants(topics):
+                client.enqueue(message_json)
+                self.messages_sent += 1
+    
+    def queue_notification(self, message_type: str, data: Any):
+        """Coalesce a notification into the next flush (latest row per miner wins)"""
+        self.notifications += 1
+        pending = self._pending.setdefault(message_type, {})
+        key = data.get("miner_id") if isinstance(data, dict) else None
+        if key is None:
+            key = ("seq", self.notifications)
+        pending.pop(key, None)
+        pending[key] = data
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.add(connection)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_interval, self.flush)
+    
+    def flush(self):
+        """Send one message per type to each client with the rows it subscribes to"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not self.clients:
+            return
         
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        for message_type, rows_by_key in pending.items():
+            rows = [(message_topics(message_type, data), data) for data in rows_by_key.values()]
+            # Clients with the same subscriptions share one serialised payload
+            payloads: Dict[frozenset, Optional[str]] = {}
+            for client in list(self.clients.values()):
+                key = frozenset(client.topics)
+                if key not in payloads:
+                    selected: List[Any] = [data for topics, data in rows if not key.isdisjoint(topics)]
+                    payloads[key] = json.dumps({
+                        "type": message_type,
+                        "data": selected[-1],
+                        "updates": selected,
+                    }) if selected else None
+                if payloads[key] is not None:
+                    client.enqueue(payloads[key])
+                    self.messages_sent += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.clients),
+            "notifications": self.notifications,
+            "messages_sent": self.messages_sent,
+            "dropped": sum(client.dropped for client in self.clients.values()),
+            "batch_interval_ms": int(self.batch_interval * 1000),
+        }
     
     async def _listen_postgres_notifications(self):
         """
@@ -87,7 +244,7 @@ class ConnectionManager:
             await conn.add_listener('miner_update', self._handle_miner_notification)
             
             # Keep connection alive
-            while self.active_connections:
+            while self.clients:
                 await asyncio.sleep(1)
             
             # Cleanup
@@ -105,22 +262,14 @@ class ConnectionManager:
     def _handle_telemetry_notification(self, connection, pid, channel, payload):
         """Handle telemetry_update notifications"""
         try:
-            data = json.loads(payload)
-            asyncio.create_task(self.broadcast({
-                "type": "telemetry_update",
-                "data": data
-            }))
+            self.queue_notification("telemetry_update", json.loads(payload))
         except Exception as e:
             logger.error(f"Error handling telemetry notification: {e}")
     
     def _handle_miner_notification(self, connection, pid, channel, payload):
         """Handle miner_update notifications"""
         try:
-            data = json.loads(payload)
-            asyncio.create_task(self.broadcast({
-                "type": "miner_update",
-                "data": data
-            }))
+            self.queue_notification("miner_update", json.loads(payload))
         except Exception as e:
             logger.error(f"Error handling miner notification: {e}")
 
@@ -138,23 +287,44 @@ async def websocket_endpoint(websocket: WebSocket):
     - telemetry_update: New telemetry data inserted
     - miner_update: Miner state/mode changed
     
-    Message format:
+    Message format (rows coalesced per miner over the batch interval):
     {
         "type": "telemetry_update" | "miner_update",
-        "data": {...}
+        "data": {...},          # Most recent row
+        "updates": [{...}, ...] # One row per miner
     }
+    
+    Client messages:
+    - "ping" -> "pong"
+    - {"action": "subscribe" | "unsubscribe", "topics": ["telemetry", "miners", "miner:<id>", "all"]}
     """
-    await manager.connect(websocket)
+    client = await manager.connect(websocket)
     
     try:
         # Keep connection alive and handle client messages
         while True:
-            # Wait for client messages (ping/pong for keepalive)
+            # Wait for client messages (ping/pong for keepalive, subscriptions)
             data = await websocket.receive_text()
             
             # Handle ping
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.send(client, "pong")
+                continue
+            
+            try:
+                request = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            topics = [str(topic) for topic in request.get("topics") or []]
+            if request.get("action") == "subscribe":
+                client.subscribe(topics)
+            elif request.get("action") == "unsubscribe":
+                client.unsubscribe(topics)
+            else:
+                continue
+            manager.send(client, {"type": "subscriptions", "topics": sorted(client.topics)})
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
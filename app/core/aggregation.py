@@ -8,9 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from core.database import (
-    Miner, Telemetry, PoolHealth, EnergyPrice, CryptoPrice,
+    Miner, Telemetry, PoolHealth, CryptoPrice,
     DailyMinerStats, DailyPoolStats, MonthlyMinerStats, get_db
 )
+from core.price_timeline import get_price_timeline
 
 logger = logging.getLogger(__name__)
 
@@ -106,22 +107,8 @@ async def _aggregate_daily_miner_stats(db: AsyncSession, target_date: datetime):
             # Sort telemetry by timestamp
             sorted_telemetry = sorted(telemetry_data, key=lambda t: t.timestamp)
             
-            # Get energy prices for the day
-            price_query = select(EnergyPrice).where(
-                and_(
-                    EnergyPrice.valid_from >= start_time,
-                    EnergyPrice.valid_from < end_time
-                )
-            )
-            price_result = await db.execute(price_query)
-            energy_prices = price_result.scalars().all()
-            
-            def get_price_for_timestamp(ts):
-                """Get energy price active at a given timestamp"""
-                for price in energy_prices:
-                    if price.valid_from <= ts < price.valid_to:
-                        return price.price_pence
-                return None
+            # Shared price index covering the day
+            price_timeline = await get_price_timeline(db, start_time)
             
             # Calculate cost using duration between readings (same logic as dashboard)
             for i, telemetry in enumerate(sorted_telemetry):
@@ -135,7 +122,7 @@ async def _aggregate_daily_miner_stats(db: AsyncSession, target_date: datetime):
                         continue
                 
                 # Get price for this timestamp
-                price_pence = get_price_for_timestamp(telemetry.timestamp)
+                price_pence = price_timeline.price_at(telemetry.timestamp)
                 if price_pence is None:
                     continue
                 
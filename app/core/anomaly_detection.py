@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+import numpy as np
 import statistics
 
 from core.database import (
@@ -48,6 +49,22 @@ STATUS_WARNING_MIN = 50  # 50-79
 # Minimum data requirements
 MIN_SAMPLES_FOR_BASELINE = 60  # Need at least 1 hour of data
 
+# Baseline metrics (MinerBaseline.metric_name)
+BASELINE_METRICS = ("hashrate_mean", "power_mean", "w_per_th", "temp_mean", "reject_rate")
+
+# Telemetry columns loaded for baselines
+BASELINE_COLUMNS = (
+    "miner_id",
+    "mode",
+    "hashrate",
+    "hashrate_unit",
+    "power_watts",
+    "temperature",
+    "shares_accepted",
+    "shares_rejected",
+)
+BASELINE_CHUNK_SIZE = 5000
+
 # ============================================================================
 # REASON CODES & SUGGESTED ACTIONS
 # ============================================================================
@@ -109,6 +126,37 @@ def calculate_median_mad(values: List[float]) -> Tuple[float, float]:
     return (median, mad)
 
 
+def grouped_median_mad(
+    groups: np.ndarray,
+    values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Median and MAD of values per group (vectorized calculate_median_mad).
+
+    Args:
+        groups: Integer group id per value
+        values: Values (same length as groups)
+
+    Returns:
+        (group_ids, medians, mads, counts), sorted by group id
+    """
+    group_ids, counts = np.unique(groups, return_counts=True)
+    if len(group_ids) == 0:
+        return group_ids, np.array([]), np.array([]), counts
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lower = starts + (counts - 1) // 2
+    upper = starts + counts // 2
+
+    def _medians(vals: np.ndarray) -> np.ndarray:
+        ordered = vals[np.lexsort((vals, groups))]
+        return (ordered[lower] + ordered[upper]) / 2.0
+
+    medians = _medians(values)
+    mads = _medians(np.abs(values - medians[np.searchsorted(group_ids, groups)]))
+    return group_ids, medians, mads, counts
+
+
 def is_anomalous(current_value: float, median: float, mad: float, threshold_factor: float = 3.0) -> bool:
     """
     Check if value is anomalous using MAD-based threshold.
@@ -134,6 +182,133 @@ def is_anomalous(current_value: float, median: float, mad: float, threshold_fact
 # BASELINE CALCULATION
 # ============================================================================
 
+async def _load_baseline_columns(
+    db: AsyncSession,
+    miner_ids: List[int],
+    window_hours: int
+) -> Tuple[Dict[str, np.ndarray], List[Tuple[int, Optional[str]]]]:
+    """
+    Load baseline inputs as column arrays.
+
+    Returns:
+        (columns, groups) where columns["group"] indexes into groups, a list of
+        (miner_id, mode) pairs
+    """
+    from core.utils import stream_telemetry_columns
+
+    group_index: Dict[Tuple[int, Optional[str]], int] = {}
+    chunks: List[Dict[str, np.ndarray]] = []
+
+    def _flush(rows):
+        chunks.append({
+            "group": np.fromiter(
+                (group_index.setdefault((row.miner_id, row.mode), len(group_index)) for row in rows),
+                dtype=np.int64,
+                count=len(rows),
+            ),
+            "hashrate": np.array([row.hashrate for row in rows], dtype=float),
+            "unit": np.array([row.hashrate_unit or "GH/s" for row in rows], dtype=object),
+            "power": np.array([row.power_watts for row in rows], dtype=float),
+            "temp": np.array([row.temperature for row in rows], dtype=float),
+            "accepted": np.array([row.shares_accepted for row in rows], dtype=float),
+            "rejected": np.array([row.shares_rejected for row in rows], dtype=float),
+        })
+
+    cutoff = datetime.utcnow() - timedelta(hours=window_hours)
+    pending = []
+    async for row in stream_telemetry_columns(
+        db, miner_ids, BASELINE_COLUMNS, start=cutoff, batch_size=BASELINE_CHUNK_SIZE
+    ):
+        if row.hashrate is None or row.hashrate <= 0:
+            continue
+        pending.append(row)
+        if len(pending) >= BASELINE_CHUNK_SIZE:
+            _flush(pending)
+            pending = []
+    if pending:
+        _flush(pending)
+
+    if not chunks:
+        return {}, []
+    columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    return columns, list(group_index)
+
+
+def _baseline_metric_values(columns: Dict[str, np.ndarray]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Per metric: (mask of rows that contribute, metric values)"""
+    # Convert to TH/s for consistency
+    unit_names, unit_inverse = np.unique(columns["unit"], return_inverse=True)
+    unit_factors = np.array([_convert_to_ths(1.0, unit) for unit in unit_names])
+    hashrate_ths = columns["hashrate"] * unit_factors[unit_inverse]
+    power = columns["power"]
+    temp = columns["temp"]
+    accepted = columns["accepted"]
+    rejected = columns["rejected"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_hashrate = hashrate_ths > 0
+        has_power = has_hashrate & (power > 0)
+        total_shares = accepted + rejected
+        has_shares = ~np.isnan(total_shares) & (total_shares > 0)
+        return {
+            "hashrate_mean": (has_hashrate, hashrate_ths),
+            # W/TH (only if we have power)
+            "power_mean": (has_power, power),
+            "w_per_th": (has_power, power / hashrate_ths),
+            "temp_mean": (~np.isnan(temp) & (temp != 0), temp),
+            "reject_rate": (has_shares, rejected / total_shares * 100),
+        }
+
+
+async def compute_baselines(
+    db: AsyncSession,
+    miner_ids: List[int],
+    window_hours: int = BASELINE_WINDOW_24H
+) -> Dict[int, Dict[Tuple[Optional[str], str], Dict]]:
+    """
+    Compute robust baselines (median + MAD) for many miners at once.
+
+    Telemetry for all miners is loaded as column arrays in one streamed query
+    and medians/MADs are computed per (miner, mode, metric) with NumPy.
+
+    Returns:
+        Dict[miner_id, Dict[(mode, metric_name), {"median", "mad", "samples"}]]
+    """
+    if not miner_ids:
+        return {}
+
+    columns, groups = await _load_baseline_columns(db, miner_ids, window_hours)
+    if not groups:
+        return {}
+
+    group_miners = np.array([miner_id for miner_id, _ in groups], dtype=np.int64)
+    row_miners = group_miners[columns["group"]]
+    present, sample_counts = np.unique(row_miners, return_counts=True)
+    eligible = set(int(miner_id) for miner_id in present[sample_counts >= MIN_SAMPLES_FOR_BASELINE])
+    for miner_id, count in zip(present, sample_counts):
+        if int(miner_id) not in eligible:
+            logger.warning(f"Insufficient data for miner {miner_id}: {count} samples")
+
+    baselines: Dict[int, Dict[Tuple[Optional[str], str], Dict]] = {}
+    for metric_name, (mask, values) in _baseline_metric_values(columns).items():
+        group_ids, medians, mads, counts = grouped_median_mad(columns["group"][mask], values[mask])
+        for group_id, median, mad, count in zip(group_ids, medians, mads, counts):
+            miner_id, mode = groups[group_id]
+            if count < MIN_SAMPLES_FOR_BASELINE or miner_id not in eligible:
+                continue
+            baselines.setdefault(miner_id, {})[(mode, metric_name)] = {
+                "median": float(median),
+                "mad": float(mad),
+                "samples": int(count)
+            }
+            logger.debug(
+                f"Miner {miner_id} [{mode if mode else 'None'}] {metric_name}: "
+                f"median={median:.2f}, mad={mad:.2f}, samples={count}"
+            )
+
+    return baselines
+
+
 async def compute_baselines_for_miner(
     db: AsyncSession,
     miner_id: int,
@@ -146,91 +321,53 @@ async def compute_baselines_for_miner(
         Dict[metric_name, (median, mad)]
     """
     logger.info(f"Computing {window_hours}h baselines for miner {miner_id}")
-    
-    # Get miner to check type
-    result = await db.execute(select(Miner).where(Miner.id == miner_id))
-    miner = result.scalar_one_or_none()
-    if not miner:
-        logger.warning(f"Miner {miner_id} not found")
-        return {}
-    
-    # Get recent telemetry
-    cutoff = datetime.utcnow() - timedelta(hours=window_hours)
+    baselines = await compute_baselines(db, [miner_id], window_hours)
+    return baselines.get(miner_id, {})
+
+
+async def _upsert_baselines(
+    db: AsyncSession,
+    baselines: Dict[int, Dict[Tuple[Optional[str], str], Dict]],
+    window_hours: int
+):
+    """Write computed baselines to MinerBaseline (one read, bulk add; caller commits)"""
+    if not baselines:
+        return
+
     result = await db.execute(
-        select(Telemetry)
+        select(MinerBaseline)
         .where(
             and_(
-                Telemetry.miner_id == miner_id,
-                Telemetry.timestamp >= cutoff,
-                Telemetry.hashrate.isnot(None),
-                Telemetry.hashrate > 0
+                MinerBaseline.miner_id.in_(list(baselines)),
+                MinerBaseline.window_hours == window_hours
             )
         )
-        .order_by(Telemetry.timestamp.desc())
     )
-    telemetry_records = result.scalars().all()
-    
-    if len(telemetry_records) < MIN_SAMPLES_FOR_BASELINE:
-        logger.warning(f"Insufficient data for miner {miner_id}: {len(telemetry_records)} samples")
-        return {}
-    
-    # Extract metrics per mode (if mode tracking exists)
-    metrics_by_mode: Dict[Optional[str], Dict[str, List[float]]] = {}
-    
-    for record in telemetry_records:
-        mode = record.mode  # Can be None
-        
-        if mode not in metrics_by_mode:
-            metrics_by_mode[mode] = {
-                "hashrate_mean": [],
-                "power_mean": [],
-                "w_per_th": [],
-                "temp_mean": [],
-                "reject_rate": []
-            }
-        
-        # Hashrate
-        if record.hashrate and record.hashrate > 0:
-            # Convert to TH/s for consistency
-            hashrate_ths = _convert_to_ths(record.hashrate, record.hashrate_unit or "GH/s")
-            metrics_by_mode[mode]["hashrate_mean"].append(hashrate_ths)
-            
-            # W/TH (only if we have power)
-            if record.power_watts and record.power_watts > 0:
-                w_per_th = record.power_watts / hashrate_ths
-                metrics_by_mode[mode]["w_per_th"].append(w_per_th)
-                metrics_by_mode[mode]["power_mean"].append(record.power_watts)
-        
-        # Temperature
-        if record.temperature:
-            metrics_by_mode[mode]["temp_mean"].append(record.temperature)
-        
-        # Reject rate
-        if record.shares_accepted is not None and record.shares_rejected is not None:
-            total_shares = record.shares_accepted + record.shares_rejected
-            if total_shares > 0:
-                reject_rate = (record.shares_rejected / total_shares) * 100
-                metrics_by_mode[mode]["reject_rate"].append(reject_rate)
-    
-    # Calculate baselines for each mode
-    baselines = {}
-    
-    for mode, metrics in metrics_by_mode.items():
-        for metric_name, values in metrics.items():
-            if len(values) >= MIN_SAMPLES_FOR_BASELINE:
-                median, mad = calculate_median_mad(values)
-                baselines[(mode, metric_name)] = {
-                    "median": median,
-                    "mad": mad,
-                    "samples": len(values)
-                }
-                
-                logger.info(
-                    f"Miner {miner_id} [{mode if mode else 'None'}] {metric_name}: "
-                    f"median={median:.2f}, mad={mad:.2f}, samples={len(values)}"
-                )
-    
-    return baselines
+    existing_rows: Dict[Tuple[int, Optional[str], str], MinerBaseline] = {}
+    for row in result.scalars().all():
+        existing_rows.setdefault((row.miner_id, row.mode, row.metric_name), row)
+
+    now = datetime.utcnow()
+    new_rows = []
+    for miner_id, miner_baselines in baselines.items():
+        for (mode_key, metric_name), stats in miner_baselines.items():
+            existing = existing_rows.get((miner_id, mode_key, metric_name))
+            if existing:
+                existing.median_value = stats["median"]
+                existing.mad_value = stats["mad"]
+                existing.sample_count = stats["samples"]
+                existing.updated_at = now
+            else:
+                new_rows.append(MinerBaseline(
+                    miner_id=miner_id,
+                    mode=mode_key,
+                    metric_name=metric_name,
+                    median_value=stats["median"],
+                    mad_value=stats["mad"],
+                    sample_count=stats["samples"],
+                    window_hours=window_hours
+                ))
+    db.add_all(new_rows)
 
 
 async def update_baselines_for_all_miners(db: AsyncSession):
@@ -238,53 +375,23 @@ async def update_baselines_for_all_miners(db: AsyncSession):
     logger.info("Updating baselines for all miners")
     
     result = await db.execute(
-        select(Miner).where(Miner.enabled == True)
+        select(Miner.id).where(Miner.enabled == True)
     )
-    miners = result.scalars().all()
+    miner_ids = list(result.scalars().all())
     
-    for miner in miners:
-        # Compute 24h baselines
-        baselines_24h = await compute_baselines_for_miner(db, miner.id, BASELINE_WINDOW_24H)
-        
-        # Store in database
-        for (mode_key, metric_name), stats in baselines_24h.items():
-            median = stats["median"]
-            mad = stats["mad"]
-            sample_count = stats["samples"]
-            
-            # Upsert baseline
-            result = await db.execute(
-                select(MinerBaseline)
-                .where(
-                    and_(
-                        MinerBaseline.miner_id == miner.id,
-                        MinerBaseline.mode == mode_key,
-                        MinerBaseline.metric_name == metric_name,
-                        MinerBaseline.window_hours == BASELINE_WINDOW_24H
-                    )
-                )
-            )
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                existing.median_value = median
-                existing.mad_value = mad
-                existing.sample_count = sample_count
-                existing.updated_at = datetime.utcnow()
-            else:
-                baseline = MinerBaseline(
-                    miner_id=miner.id,
-                    mode=mode_key,
-                    metric_name=metric_name,
-                    median_value=median,
-                    mad_value=mad,
-                    sample_count=sample_count,
-                    window_hours=BASELINE_WINDOW_24H
-                )
-                db.add(baseline)
+    # Compute 24h baselines
+    baselines_24h = await compute_baselines(db, miner_ids, BASELINE_WINDOW_24H)
+    
+    # Store in database
+    await _upsert_baselines(db, baselines_24h, BASELINE_WINDOW_24H)
     
     await db.commit()
-    logger.info("Baseline update complete")
+
+    # Re-anchor the streaming baselines used by the online scorer
+    from core.online_health import get_online_health_scorer
+
+    get_online_health_scorer().load_baselines(baselines_24h)
+    logger.info(f"Baseline update complete ({len(baselines_24h)}/{len(miner_ids)} miners)")
 
 
 # ============================================================================
@@ -375,146 +482,78 @@ def _derive_suggested_actions(reason_codes: List[str]) -> List[str]:
 # RULE-BASED ANOMALY DETECTION
 # ============================================================================
 
-async def check_miner_health(db: AsyncSession, miner_id: int) -> Optional[Dict]:
-    """
-    Check miner health using deterministic rules and produce canonical MinerHealth object.
-    
-    Returns:
-        {
-            "miner_id": int,
-            "timestamp": datetime,
-            "health_score": int (0-100),
-            "status": str (healthy/warning/critical),
-            "anomaly_score": float (0-1, nullable),
-            "reasons": List[Dict],  # Structured reason objects
-            "suggested_actions": List[str],  # Action enums
-            "mode": str (nullable)
-        }
-    """
-    # Get miner (MUST exist - hard invariant)
-    result = await db.execute(select(Miner).where(Miner.id == miner_id))
-    miner = result.scalar_one_or_none()
-    if not miner or not miner.enabled:
-        return None
-    
-    # Get latest telemetry (last 5 minutes)
-    cutoff = datetime.utcnow() - timedelta(minutes=5)
-    result = await db.execute(
-        select(Telemetry)
-        .where(
-            and_(
-                Telemetry.miner_id == miner_id,
-                Telemetry.timestamp >= cutoff
-            )
-        )
-        .order_by(Telemetry.timestamp.desc())
+def sensor_missing_health(miner_id: int) -> Dict:
+    """Canonical MinerHealth for a miner with no recent telemetry"""
+    reason = _build_reason(
+        code=REASON_SENSOR_MISSING,
+        severity=SEVERITY_CRITICAL,
+        metric="telemetry",
+        actual=0,
+        expected_min=1,
+        expected_max=999,
+        unit="records"
     )
-    recent_telemetry = result.scalars().all()
     
-    # Hard invariant: if no telemetry, emit SENSOR_MISSING with critical status
-    if not recent_telemetry:
-        logger.warning(f"No recent telemetry for miner {miner_id}")
-        reason = _build_reason(
-            code=REASON_SENSOR_MISSING,
-            severity=SEVERITY_CRITICAL,
-            metric="telemetry",
-            actual=0,
-            expected_min=1,
-            expected_max=999,
-            unit="records"
-        )
-        
-        return {
-            "miner_id": miner_id,
-            "timestamp": datetime.utcnow(),
-            "health_score": 0,
-            "status": "critical",
-            "anomaly_score": None,
-            "reasons": [reason],
-            "suggested_actions": _derive_suggested_actions([REASON_SENSOR_MISSING]),
-            "mode": None
-        }
-    
-    # Get current mode
-    current_mode = recent_telemetry[0].mode
-    
-    # Get baselines for this mode
-    result = await db.execute(
-        select(MinerBaseline)
-        .where(
-            and_(
-                MinerBaseline.miner_id == miner_id,
-                MinerBaseline.mode == current_mode,
-                MinerBaseline.window_hours == BASELINE_WINDOW_24H
-            )
-        )
+    return {
+        "miner_id": miner_id,
+        "timestamp": datetime.utcnow(),
+        "health_score": 0,
+        "status": "critical",
+        "anomaly_score": None,
+        "reasons": [reason],
+        "suggested_actions": _derive_suggested_actions([REASON_SENSOR_MISSING]),
+        "mode": None
+    }
+
+
+def insufficient_baseline_health(miner_id: int, mode: Optional[str], sample_count: int) -> Dict:
+    """Canonical MinerHealth for a miner/mode without baselines yet"""
+    reason = _build_reason(
+        code=REASON_INSUFFICIENT_DATA,
+        severity=SEVERITY_WARNING,
+        metric="baseline_samples",
+        actual=sample_count,
+        expected_min=MIN_SAMPLES_FOR_BASELINE,
+        expected_max=999999,
+        unit="samples"
     )
-    baselines_records = result.scalars().all()
     
-    baselines = {
-        b.metric_name: (b.median_value, b.mad_value)
-        for b in baselines_records
+    return {
+        "miner_id": miner_id,
+        "timestamp": datetime.utcnow(),
+        "health_score": 50,
+        "status": "warning",
+        "anomaly_score": None,
+        "reasons": [reason],
+        "suggested_actions": _derive_suggested_actions([REASON_INSUFFICIENT_DATA]),
+        "mode": mode
     }
-    
-    # If no baselines, return warning state
-    if not baselines:
-        logger.warning(f"No baselines for miner {miner_id} mode {current_mode}")
-        
-        # Count how many telemetry samples we actually have (last 24h)
-        telemetry_cutoff = datetime.utcnow() - timedelta(hours=BASELINE_WINDOW_24H)
-        result = await db.execute(
-            select(func.count(Telemetry.id))
-            .where(
-                and_(
-                    Telemetry.miner_id == miner_id,
-                    Telemetry.timestamp >= telemetry_cutoff
-                )
-            )
-        )
-        actual_sample_count = result.scalar() or 0
-        
-        reason = _build_reason(
-            code=REASON_INSUFFICIENT_DATA,
-            severity=SEVERITY_WARNING,
-            metric="baseline_samples",
-            actual=actual_sample_count,
-            expected_min=MIN_SAMPLES_FOR_BASELINE,
-            expected_max=999999,
-            unit="samples"
-        )
-        
-        return {
-            "miner_id": miner_id,
-            "timestamp": datetime.utcnow(),
-            "health_score": 50,
-            "status": "warning",
-            "anomaly_score": None,
-            "reasons": [reason],
-            "suggested_actions": _derive_suggested_actions([REASON_INSUFFICIENT_DATA]),
-            "mode": current_mode
-        }
-    
-    # Calculate current metrics (with unit conversions)
-    hashrates = [_convert_to_ths(t.hashrate, t.hashrate_unit or "GH/s") 
-                 for t in recent_telemetry if t.hashrate and t.hashrate > 0]
-    powers = [t.power_watts for t in recent_telemetry if t.power_watts and t.power_watts > 0]
-    temps = [t.temperature for t in recent_telemetry if t.temperature]
-    
-    current_hashrate = statistics.mean(hashrates) if hashrates else None
-    current_power = statistics.mean(powers) if powers else None
-    current_temp = statistics.mean(temps) if temps else None
-    
+
+
+def evaluate_health(
+    miner_id: int,
+    current_mode: Optional[str],
+    baselines: Dict[str, Tuple[float, float]],
+    current_hashrate: Optional[float],
+    current_power: Optional[float],
+    current_temp: Optional[float],
+    current_reject_rate: float
+) -> Dict:
+    """
+    Run the deterministic health rules for current metric values against
+    (median, mad) baselines and build the canonical MinerHealth object.
+
+    Args:
+        current_hashrate: TH/s
+        current_power: W
+        current_temp: C
+        current_reject_rate: %
+    """
     # Hard invariant: W/TH calculation (efficiency MUST be W/TH, never W/GH)
     current_w_per_th = None
     if current_power and current_hashrate and current_hashrate > 0:
         current_w_per_th = current_power / current_hashrate  # Power in W, hashrate in TH/s
     
-    # Calculate reject rate
-    total_accepted = sum(t.shares_accepted or 0 for t in recent_telemetry)
-    total_rejected = sum(t.shares_rejected or 0 for t in recent_telemetry)
-    total_shares = total_accepted + total_rejected
-    current_reject_rate = (total_rejected / total_shares * 100) if total_shares > 0 else 0
-    
     # Run checks and build structured reasons
     reasons = []
     health_score = 100.0
@@ -634,101 +673,247 @@ async def check_miner_health(db: AsyncSession, miner_id: int) -> Optional[Dict]:
         "timestamp": datetime.utcnow(),
         "health_score": health_score,
         "status": status,
-        "anomaly_score": None,  # Will be populated by check_all_miners_health with ML score
+        "anomaly_score": None,  # Populated by check_all_miners_health with ML score
         "reasons": reasons,
         "suggested_actions": suggested_actions,
         "mode": current_mode
     }
 
 
+async def check_miner_health(db: AsyncSession, miner_id: int) -> Optional[Dict]:
+    """
+    Check miner health using deterministic rules and produce canonical MinerHealth object.
+    
+    Returns:
+        {
+            "miner_id": int,
+            "timestamp": datetime,
+            "health_score": int (0-100),
+            "status": str (healthy/warning/critical),
+            "anomaly_score": float (0-1, nullable),
+            "reasons": List[Dict],  # Structured reason objects
+            "suggested_actions": List[str],  # Action enums
+            "mode": str (nullable)
+        }
+    """
+    # Get miner (MUST exist - hard invariant)
+    result = await db.execute(select(Miner).where(Miner.id == miner_id))
+    miner = result.scalar_one_or_none()
+    if not miner or not miner.enabled:
+        return None
+    
+    # Get latest telemetry (last 5 minutes)
+    cutoff = datetime.utcnow() - timedelta(minutes=5)
+    result = await db.execute(
+        select(Telemetry)
+        .where(
+            and_(
+                Telemetry.miner_id == miner_id,
+                Telemetry.timestamp >= cutoff
+            )
+        )
+        .order_by(Telemetry.timestamp.desc())
+    )
+    recent_telemetry = result.scalars().all()
+    
+    # Hard invariant: if no telemetry, emit SENSOR_MISSING with critical status
+    if not recent_telemetry:
+        logger.warning(f"No recent telemetry for miner {miner_id}")
+        return sensor_missing_health(miner_id)
+    
+    # Get current mode
+    current_mode = recent_telemetry[0].mode
+    
+    # Get baselines for this mode
+    result = await db.execute(
+        select(MinerBaseline)
+        .where(
+            and_(
+                MinerBaseline.miner_id == miner_id,
+                MinerBaseline.mode == current_mode,
+                MinerBaseline.window_hours == BASELINE_WINDOW_24H
+            )
+        )
+    )
+    baselines_records = result.scalars().all()
+    
+    baselines = {
+        b.metric_name: (b.median_value, b.mad_value)
+        for b in baselines_records
+    }
+    
+    # If no baselines, return warning state
+    if not baselines:
+        logger.warning(f"No baselines for miner {miner_id} mode {current_mode}")
+        
+        # Count how many telemetry samples we actually have (last 24h)
+        telemetry_cutoff = datetime.utcnow() - timedelta(hours=BASELINE_WINDOW_24H)
+        result = await db.execute(
+            select(func.count(Telemetry.id))
+            .where(
+                and_(
+                    Telemetry.miner_id == miner_id,
+                    Telemetry.timestamp >= telemetry_cutoff
+                )
+            )
+        )
+        actual_sample_count = result.scalar() or 0
+        return insufficient_baseline_health(miner_id, current_mode, actual_sample_count)
+    
+    # Calculate current metrics (with unit conversions)
+    hashrates = [_convert_to_ths(t.hashrate, t.hashrate_unit or "GH/s") 
+                 for t in recent_telemetry if t.hashrate and t.hashrate > 0]
+    powers = [t.power_watts for t in recent_telemetry if t.power_watts and t.power_watts > 0]
+    temps = [t.temperature for t in recent_telemetry if t.temperature]
+    
+    current_hashrate = statistics.mean(hashrates) if hashrates else None
+    current_power = statistics.mean(powers) if powers else None
+    current_temp = statistics.mean(temps) if temps else None
+    
+    # Calculate reject rate
+    total_accepted = sum(t.shares_accepted or 0 for t in recent_telemetry)
+    total_rejected = sum(t.shares_rejected or 0 for t in recent_telemetry)
+    total_shares = total_accepted + total_rejected
+    current_reject_rate = (total_rejected / total_shares * 100) if total_shares > 0 else 0
+    
+    return evaluate_health(
+        miner_id,
+        current_mode,
+        baselines,
+        current_hashrate,
+        current_power,
+        current_temp,
+        current_reject_rate
+    )
+
+
 # ============================================================================
 # FLEET HEALTH CHECK
 # ============================================================================
 
+def online_scoring_enabled() -> bool:
+    from core.config import app_config
+
+    return bool(app_config.get("anomaly.online_scoring", True))
+
+
+async def record_health(
+    db: AsyncSession,
+    health_data: Dict,
+    update_anomaly_score: bool = True,
+    append_event: bool = True
+):
+    """
+    Upsert MinerHealthCurrent from a canonical MinerHealth object and append a
+    HealthEvent (caller commits). The row is written with INSERT ... ON CONFLICT
+    so the batch check and the ingest-path scorer never collide on a new miner.
+    With update_anomaly_score=False the stored ML score is kept as-is; with
+    append_event=False no history is written.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    
+    values = {
+        "miner_id": health_data["miner_id"],
+        "timestamp": health_data["timestamp"],
+        "health_score": health_data["health_score"],
+        "status": health_data["status"],
+        "reasons": health_data["reasons"],
+        "suggested_actions": health_data["suggested_actions"],
+        "mode": health_data["mode"],
+        "updated_at": datetime.utcnow(),
+    }
+    if update_anomaly_score:
+        values["anomaly_score"] = health_data["anomaly_score"]
+    stmt = dialect_insert(MinerHealthCurrent).values(**values)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["miner_id"],
+        set_={key: stmt.excluded[key] for key in values if key != "miner_id"},
+    ))
+    
+    if not append_event:
+        return
+    
+    # Store historical event (with new columns for Phase C)
+    db.add(HealthEvent(
+        miner_id=health_data["miner_id"],
+        health_score=health_data["health_score"],
+        reasons=health_data["reasons"],
+        mode=health_data["mode"],
+        anomaly_score=health_data.get("anomaly_score"),
+        status=health_data["status"],
+        suggested_actions=health_data["suggested_actions"]
+    ))
+
+
 async def check_all_miners_health(db: AsyncSession):
-    """Check health for all enabled miners and persist canonical MinerHealth to MinerHealthCurrent"""
+    """
+    Check health for all enabled miners and persist canonical MinerHealth to MinerHealthCurrent.
+
+    With online scoring enabled the rule-based part comes from the ingest-path
+    scorer (core.online_health) and this job only adds ML scores and flags
+    miners that stopped reporting; otherwise each miner is checked against the
+    recent telemetry window.
+    """
     logger.info("Checking health for all miners")
     
+    from core.latest_telemetry import get_latest_telemetry_store
+    from core.ml_anomaly import predict_anomaly_scores
+    from core.online_health import get_online_health_scorer
+
     result = await db.execute(
         select(Miner).where(Miner.enabled == True)
     )
     miners = result.scalars().all()
     
+    latest_store = await get_latest_telemetry_store().ensure_warm(db)
+    scorer = get_online_health_scorer() if online_scoring_enabled() else None
+    cutoff = datetime.utcnow() - timedelta(minutes=5)
+    
+    health_by_miner = {}
     for miner in miners:
-        health_data = await check_miner_health(db, miner.id)
-        
-        if health_data:
-            # Get ML anomaly score (Phase B)
-            from core.ml_anomaly import predict_anomaly_score
-            
-            # Get recent telemetry for ML scoring
-            cutoff = datetime.utcnow() - timedelta(minutes=5)
-            result = await db.execute(
-                select(Telemetry)
-                .where(
-                    and_(
-                        Telemetry.miner_id == miner.id,
-                        Telemetry.timestamp >= cutoff
-                    )
-                )
-                .order_by(Telemetry.timestamp.desc())
-            )
-            recent_telemetry = result.scalars().all()
-            
-            ml_score = await predict_anomaly_score(db, miner.id, recent_telemetry)
-            health_data["anomaly_score"] = ml_score  # Add ML score to canonical object
-            
-            # Persist to MinerHealthCurrent (upsert pattern: one row per miner)
-            result = await db.execute(
-                select(MinerHealthCurrent).where(MinerHealthCurrent.miner_id == miner.id)
-            )
-            current = result.scalar_one_or_none()
-            
-            if current:
-                # Update existing row
-                current.timestamp = health_data["timestamp"]
-                current.health_score = health_data["health_score"]
-                current.status = health_data["status"]
-                current.anomaly_score = ml_score
-                current.reasons = health_data["reasons"]
-                current.suggested_actions = health_data["suggested_actions"]
-                current.mode = health_data["mode"]
-                current.updated_at = datetime.utcnow()
+        health_data = None
+        if scorer is not None:
+            last_seen = latest_store.last_seen(miner.id)
+            if last_seen is None or last_seen < cutoff:
+                health_data = sensor_missing_health(miner.id)
             else:
-                # Insert new row
-                current = MinerHealthCurrent(
-                    miner_id=miner.id,
-                    timestamp=health_data["timestamp"],
-                    health_score=health_data["health_score"],
-                    status=health_data["status"],
-                    anomaly_score=ml_score,
-                    reasons=health_data["reasons"],
-                    suggested_actions=health_data["suggested_actions"],
-                    mode=health_data["mode"]
-                )
-                db.add(current)
-            
-            # Store historical event (with new columns for Phase C)
-            event = HealthEvent(
-                miner_id=miner.id,
-                health_score=health_data["health_score"],
-                reasons=health_data["reasons"],
-                mode=health_data["mode"],
-                anomaly_score=ml_score,
-                status=health_data["status"],
-                suggested_actions=health_data["suggested_actions"]
+                health_data = scorer.latest(miner.id)
+        if health_data is None:
+            health_data = await check_miner_health(db, miner.id)
+        if health_data:
+            health_by_miner[miner.id] = dict(health_data)
+    
+    # Recent telemetry for ML scoring comes from the in-memory latest telemetry store
+    scored_miners = [miner for miner in miners if miner.id in health_by_miner]
+    recent_by_miner = {
+        miner.id: latest_store.recent(miner.id, since=cutoff)
+        for miner in scored_miners
+    }
+    
+    # Get ML anomaly scores (Phase B), batched per model
+    ml_scores = await predict_anomaly_scores(scored_miners, recent_by_miner)
+    
+    for miner in scored_miners:
+        health_data = health_by_miner[miner.id]
+        
+        ml_score = ml_scores.get(miner.id)
+        health_data["anomaly_score"] = ml_score  # Add ML score to canonical object
+        
+        # Persist to MinerHealthCurrent (upsert pattern: one row per miner)
+        await record_health(db, health_data)
+        
+        # Log warnings for unhealthy miners
+        if health_data["status"] in ["warning", "critical"] or (ml_score and ml_score > 0.7):
+            reason_codes = [r["code"] for r in health_data["reasons"]]
+            ml_score_str = f"{ml_score:.2f}" if ml_score is not None else "N/A"
+            logger.warning(
+                f"Miner {miner.name} (ID {miner.id}) - Health: {health_data['health_score']}/100 "
+                f"Status: {health_data['status'].upper()} - ML: {ml_score_str} - "
+                f"Issues: {', '.join(reason_codes)} - Actions: {', '.join(health_data['suggested_actions'])}"
             )
-            db.add(event)
-            
-            # Log warnings for unhealthy miners
-            if health_data["status"] in ["warning", "critical"] or (ml_score and ml_score > 0.7):
-                reason_codes = [r["code"] for r in health_data["reasons"]]
-                ml_score_str = f"{ml_score:.2f}" if ml_score is not None else "N/A"
-                logger.warning(
-                    f"Miner {miner.name} (ID {miner.id}) - Health: {health_data['health_score']}/100 "
-                    f"Status: {health_data['status'].upper()} - ML: {ml_score_str} - "
-                    f"Issues: {', '.join(reason_codes)} - Actions: {', '.join(health_data['suggested_actions'])}"
-                )
     
     await db.commit()
     logger.info("Health check complete")
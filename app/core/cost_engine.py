@@ -0,0 +1,217 @@
+"""
+Columnar energy cost engine
+
+Dashboard and cost endpoints used to walk ORM Telemetry objects one at a time
+to work out each reading's duration, kWh and price. This module fetches only
+(miner_id, timestamp, power_watts) as NumPy arrays and does the interval
+maths, manual-power fallback, price join and bucketing in vectorized form.
+
+Costing rules (unchanged from the per-reading loops):
+- a reading lasts until the miner's next reading, capped at 10 minutes so
+  offline gaps are not billed; a miner's last reading counts as 30 seconds
+- readings without power use the miner's manual_power_watts if given,
+  otherwise they are skipped
+- a reading is priced at the slot containing its timestamp; readings with
+  no price still count towards kWh but not towards cost
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.price_timeline import PriceTimeline
+
+MAX_INTERVAL_HOURS = 10.0 / 60.0
+LAST_READING_HOURS = 30.0 / 3600.0
+
+_US_PER_HOUR = 3_600_000_000
+BUCKET_WIDTH_US = {
+    "hour": _US_PER_HOUR,
+    "day": 24 * _US_PER_HOUR,
+}
+
+
+@dataclass
+class PowerSeries:
+    """Power readings as parallel arrays, sorted by (miner_id, timestamp)"""
+
+    miner_ids: np.ndarray
+    timestamps: np.ndarray  # datetime64[us]
+    power_watts: np.ndarray  # float64, NaN where not reported
+
+    def __len__(self) -> int:
+        return len(self.miner_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "PowerSeries":
+        """Build from (miner_id, timestamp, power_watts) rows"""
+        rows = list(rows)
+        if not rows:
+            return cls(
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype="datetime64[us]"),
+                np.empty(0, dtype=np.float64),
+            )
+        miner_ids, timestamps, power = zip(*rows)
+        series = cls(
+            np.asarray(miner_ids, dtype=np.int64),
+            np.asarray(timestamps, dtype="datetime64[us]"),
+            np.asarray(power, dtype=np.float64),
+        )
+        order = np.lexsort((series.timestamps, series.miner_ids))
+        series.miner_ids = series.miner_ids[order]
+        series.timestamps = series.timestamps[order]
+        series.power_watts = series.power_watts[order]
+        return series
+
+
+@dataclass
+class MinerCost:
+    """Energy totals for one miner"""
+
+    kwh: float = 0.0
+    priced_kwh: float = 0.0
+    cost_pence: float = 0.0
+    readings: int = 0
+    avg_power_watts: Optional[float] = None
+
+
+@dataclass
+class BucketCost:
+    """Priced energy for one hour/day bucket across all miners"""
+
+    kwh: float = 0.0
+    cost_pence: float = 0.0
+
+
+@dataclass
+class CostResult:
+    miners: Dict[int, MinerCost] = field(default_factory=dict)
+    buckets: Dict[datetime, BucketCost] = field(default_factory=dict)
+
+    @property
+    def total_cost_pence(self) -> float:
+        return sum(m.cost_pence for m in self.miners.values())
+
+    @property
+    def total_kwh(self) -> float:
+        return sum(m.kwh for m in self.miners.values())
+
+    @property
+    def total_priced_kwh(self) -> float:
+        return sum(m.priced_kwh for m in self.miners.values())
+
+    def miner(self, miner_id: int) -> MinerCost:
+        return self.miners.get(miner_id) or MinerCost()
+
+
+async def load_power_series(
+    db: AsyncSession,
+    miner_ids: Iterable[int],
+    start: datetime,
+    end: Optional[datetime] = None,
+) -> PowerSeries:
+    """Fetch (miner_id, timestamp, power_watts) for miners from `start`"""
+    from core.utils import get_telemetry_columns
+
+    rows = await get_telemetry_columns(
+        db, list(miner_ids), ("miner_id", "timestamp", "power_watts"), start=start, end=end
+    )
+    return PowerSeries.from_rows(rows)
+
+
+def _reading_hours(miner_ids: np.ndarray, ts_us: np.ndarray) -> np.ndarray:
+    """Duration each reading stands for: gap to the miner's next reading, capped"""
+    hours = np.full(len(ts_us), LAST_READING_HOURS)
+    if len(ts_us) > 1:
+        gaps = np.minimum(np.diff(ts_us) / _US_PER_HOUR, MAX_INTERVAL_HOURS)
+        same_miner = miner_ids[1:] == miner_ids[:-1]
+        hours[:-1] = np.where(same_miner, gaps, LAST_READING_HOURS)
+    return hours
+
+
+def _prices_for(timeline: PriceTimeline, ts_us: np.ndarray) -> np.ndarray:
+    """Price of the slot containing each timestamp (NaN outside known slots)"""
+    if not len(timeline):
+        return np.full(len(ts_us), np.nan)
+    starts = np.asarray(timeline.starts, dtype="datetime64[us]").astype(np.int64)
+    ends = np.asarray(timeline.ends, dtype="datetime64[us]").astype(np.int64)
+    prices = np.asarray(timeline.prices, dtype=np.float64)
+
+    index = np.searchsorted(starts, ts_us, side="right") - 1
+    safe = np.clip(index, 0, None)
+    covered = (index >= 0) & (ts_us < ends[safe])
+    return np.where(covered, prices[safe], np.nan)
+
+
+def compute_costs(
+    series: PowerSeries,
+    prices: PriceTimeline,
+    manual_power: Optional[Mapping[int, Optional[float]]] = None,
+    bucket: Optional[str] = None,
+) -> CostResult:
+    """
+    Per-miner energy and cost totals for a power series.
+
+    `manual_power` maps miner_id -> manual_power_watts used when a reading has
+    no power. `bucket` ("hour" or "day") additionally totals priced readings
+    by the bucket their timestamp falls in.
+    """
+    result = CostResult()
+    if not len(series):
+        return result
+
+    ts_us = series.timestamps.astype("datetime64[us]").astype(np.int64)
+    # Series are sorted by miner, so each miner is one contiguous run
+    run_starts = np.flatnonzero(np.r_[True, series.miner_ids[1:] != series.miner_ids[:-1]])
+    unique_ids = series.miner_ids[run_starts]
+    miner_index = np.repeat(np.arange(len(run_starts)), np.diff(np.r_[run_starts, len(ts_us)]))
+
+    power = series.power_watts
+    if manual_power:
+        fallback = np.array([float(manual_power.get(int(m)) or 0.0) for m in unique_ids])
+        power = np.where(power > 0, power, fallback[miner_index])
+    powered = power > 0
+
+    kwh = np.where(powered, np.nan_to_num(power) / 1000.0 * _reading_hours(series.miner_ids, ts_us), 0.0)
+    price = _prices_for(prices, ts_us)
+    priced = powered & ~np.isnan(price)
+    priced_kwh = np.where(priced, kwh, 0.0)
+    cost = np.where(priced, priced_kwh * np.nan_to_num(price), 0.0)
+
+    n = len(unique_ids)
+    kwh_by_miner = np.bincount(miner_index, weights=kwh, minlength=n)
+    priced_kwh_by_miner = np.bincount(miner_index, weights=priced_kwh, minlength=n)
+    cost_by_miner = np.bincount(miner_index, weights=cost, minlength=n)
+    readings_by_miner = np.bincount(miner_index, weights=powered, minlength=n)
+    power_by_miner = np.bincount(miner_index, weights=np.where(powered, power, 0.0), minlength=n)
+
+    for i, miner_id in enumerate(unique_ids.tolist()):
+        readings = int(readings_by_miner[i])
+        result.miners[miner_id] = MinerCost(
+            kwh=float(kwh_by_miner[i]),
+            priced_kwh=float(priced_kwh_by_miner[i]),
+            cost_pence=float(cost_by_miner[i]),
+            readings=readings,
+            avg_power_watts=float(power_by_miner[i] / readings) if readings else None,
+        )
+
+    if bucket is not None:
+        width = BUCKET_WIDTH_US[bucket]
+        buckets = ts_us[priced] // width
+        if len(buckets):
+            first = int(buckets.min())
+            offsets = buckets - first
+            bucket_kwh = np.bincount(offsets, weights=priced_kwh[priced])
+            bucket_cost = np.bincount(offsets, weights=cost[priced])
+            bucket_rows = np.bincount(offsets)
+            for offset in np.flatnonzero(bucket_rows).tolist():
+                key = np.datetime64((first + offset) * width, "us").astype(datetime)
+                result.buckets[key] = BucketCost(
+                    kwh=float(bucket_kwh[offset]),
+                    cost_pence=float(bucket_cost[offset]),
+                )
+
+    return result
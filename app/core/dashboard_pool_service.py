@@ -13,6 +13,7 @@ from sqlalchemy import select, func
 
 from core.database import Pool, BlockFound, Event
 from core.pool_loader import get_pool_loader
+from core.pool_resolver import normalize_pool_endpoint
 from integrations.base_pool import DashboardTileData
 
 logger = logging.getLogger(__name__)
@@ -20,11 +21,7 @@ RECOVERY_EVENT_SOURCE = "pool_driver_recovery"
 
 
 def _normalize_pool_endpoint(url: str, port: Optional[int]) -> str:
-    normalized = (url or "").lower().replace("stratum+tcp://", "").replace("stratum+ssl://", "")
-    normalized = normalized.replace("http://", "").replace("https://", "").rstrip("/")
-    if port:
-        return f"{normalized}:{port}"
-    return normalized
+    return normalize_pool_endpoint(url, port)
 
 
 def _get_matching_driver_settings(pool_loader, pool_type: str, url: str, port: Optional[int]) -> Dict[str, Any]:
@@ -120,65 +117,9 @@ class DashboardPoolService:
             
             # Fetch fresh data from plugin
             try:
-                tile_data = await DashboardPoolService._fetch_pool_data(pool, db)
+                tile_data = await DashboardPoolService._refresh_pool_tile(pool, db, cached)
                 
                 if tile_data:
-                    # If a refresh intermittently fails to populate network difficulty, keep the
-                    # last-known value so the dashboard doesn't flicker between a value and N/A.
-                    if cached and tile_data.network_difficulty is None:
-                        try:
-                            _, cached_data = cached
-                            tile_data.network_difficulty = cached_data.network_difficulty
-                        except Exception:
-                            pass
-
-                    # Carry forward other intermittent fields too. Some pool backends can
-                    # briefly fail to populate summary/shares when their API times out.
-                    # Prefer showing slightly stale data over flickering to N/A.
-                    carried_forward = False
-                    if cached:
-                        try:
-                            _, cached_data = cached
-
-                            if tile_data.pool_hashrate is None and cached_data.pool_hashrate is not None:
-                                tile_data.pool_hashrate = cached_data.pool_hashrate
-                                carried_forward = True
-
-                            if tile_data.active_workers is None and cached_data.active_workers is not None:
-                                tile_data.active_workers = cached_data.active_workers
-                                carried_forward = True
-
-                            if tile_data.shares_valid is None and cached_data.shares_valid is not None:
-                                tile_data.shares_valid = cached_data.shares_valid
-                                carried_forward = True
-                            if tile_data.shares_invalid is None and cached_data.shares_invalid is not None:
-                                tile_data.shares_invalid = cached_data.shares_invalid
-                                carried_forward = True
-                            if tile_data.shares_stale is None and cached_data.shares_stale is not None:
-                                tile_data.shares_stale = cached_data.shares_stale
-                                carried_forward = True
-                            if tile_data.reject_rate is None and cached_data.reject_rate is not None:
-                                tile_data.reject_rate = cached_data.reject_rate
-                                carried_forward = True
-
-                            if (
-                                tile_data.health_status
-                                and (tile_data.health_message is None or tile_data.health_message == "")
-                                and cached_data.health_message
-                            ):
-                                tile_data.health_message = cached_data.health_message
-                                carried_forward = True
-
-                            if carried_forward and cached_data.last_updated is not None:
-                                tile_data.last_updated = cached_data.last_updated
-                        except Exception:
-                            pass
-
-                    # Cache it
-                    _POOL_DASHBOARD_CACHE[cache_key] = (
-                        datetime.utcnow().timestamp(),
-                        tile_data
-                    )
                     dashboard_data[str(pool.id)] = tile_data
                 else:
                     logger.warning(f"No dashboard data returned for pool {pool.name}")
@@ -194,6 +135,102 @@ class DashboardPoolService:
         
         return dashboard_data
     
+    @staticmethod
+    async def _refresh_pool_tile(
+        pool: Pool,
+        db: AsyncSession,
+        cached: Optional[tuple] = None
+    ) -> Optional[DashboardTileData]:
+        """
+        Fetch fresh tile data for a pool and store it in the dashboard cache.
+
+        Intermittently missing fields are carried forward from the previous
+        cache entry. Exceptions from the pool plugin propagate to the caller.
+        """
+        tile_data = await DashboardPoolService._fetch_pool_data(pool, db)
+        
+        if tile_data:
+            # If a refresh intermittently fails to populate network difficulty, keep the
+            # last-known value so the dashboard doesn't flicker between a value and N/A.
+            if cached and tile_data.network_difficulty is None:
+                try:
+                    _, cached_data = cached
+                    tile_data.network_difficulty = cached_data.network_difficulty
+                except Exception:
+                    pass
+
+            # Carry forward other intermittent fields too. Some pool backends can
+            # briefly fail to populate summary/shares when their API times out.
+            # Prefer showing slightly stale data over flickering to N/A.
+            carried_forward = False
+            if cached:
+                try:
+                    _, cached_data = cached
+
+                    if tile_data.pool_hashrate is None and cached_data.pool_hashrate is not None:
+                        tile_data.pool_hashrate = cached_data.pool_hashrate
+                        carried_forward = True
+
+                    if tile_data.active_workers is None and cached_data.active_workers is not None:
+                        tile_data.active_workers = cached_data.active_workers
+                        carried_forward = True
+
+                    if tile_data.shares_valid is None and cached_data.shares_valid is not None:
+                        tile_data.shares_valid = cached_data.shares_valid
+                        carried_forward = True
+                    if tile_data.shares_invalid is None and cached_data.shares_invalid is not None:
+                        tile_data.shares_invalid = cached_data.shares_invalid
+                        carried_forward = True
+                    if tile_data.shares_stale is None and cached_data.shares_stale is not None:
+                        tile_data.shares_stale = cached_data.shares_stale
+                        carried_forward = True
+                    if tile_data.reject_rate is None and cached_data.reject_rate is not None:
+                        tile_data.reject_rate = cached_data.reject_rate
+                        carried_forward = True
+
+                    if (
+                        tile_data.health_status
+                        and (tile_data.health_message is None or tile_data.health_message == "")
+                        and cached_data.health_message
+                    ):
+                        tile_data.health_message = cached_data.health_message
+                        carried_forward = True
+
+                    if carried_forward and cached_data.last_updated is not None:
+                        tile_data.last_updated = cached_data.last_updated
+                except Exception:
+                    pass
+
+            # Cache it
+            _POOL_DASHBOARD_CACHE[f"{pool.id}"] = (
+                datetime.utcnow().timestamp(),
+                tile_data
+            )
+
+        return tile_data
+
+    @staticmethod
+    def get_cached_pool_tile(pool_id: int, max_age: float = _POOL_DASHBOARD_CACHE_TTL) -> Optional[DashboardTileData]:
+        """Cached tile data for a pool if it is at most max_age seconds old (no network access)"""
+        cached = _POOL_DASHBOARD_CACHE.get(f"{pool_id}")
+        if not cached:
+            return None
+        cached_at, cached_data = cached
+        if (datetime.utcnow().timestamp() - cached_at) >= max_age:
+            return None
+        return cached_data
+
+    @staticmethod
+    async def get_pool_tile(pool: Pool, db: AsyncSession, max_age: float = _POOL_DASHBOARD_CACHE_TTL) -> Optional[DashboardTileData]:
+        """
+        Tile data for one pool: served from the dashboard cache when it is
+        fresh enough, otherwise fetched (and cached) via the pool plugin.
+        """
+        cached_data = DashboardPoolService.get_cached_pool_tile(pool.id, max_age)
+        if cached_data is not None:
+            return cached_data
+        return await DashboardPoolService._refresh_pool_tile(pool, db, _POOL_DASHBOARD_CACHE.get(f"{pool.id}"))
+    
     @staticmethod
     async def _fetch_pool_data(pool: Pool, db: AsyncSession) -> Optional[DashboardTileData]:
         """
@@ -3,7 +3,7 @@ PostgreSQL database setup and models
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, BigInteger, Float, DateTime, JSON, Boolean, Index, Text, text
+from sqlalchemy import String, Integer, BigInteger, Float, DateTime, JSON, Boolean, Index, LargeBinary, Text, text
 from datetime import datetime
 from typing import Optional
 import logging
@@ -162,13 +162,39 @@ class Telemetry(Base):
     pool_in_use: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     mode: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # low/med/high/eco/turbo/oc captured at poll time
     data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Additional miner-specific data
+    pool_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # pool_in_use resolved to pools.id at insert time
+    coin: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # Coin mined (BTC, BCH, DGB, BC2) resolved at insert time
     
     # Composite index for common query pattern (miner_id + timestamp)
     __table_args__ = (
         Index('ix_telemetry_miner_timestamp', 'miner_id', 'timestamp'),
+        Index('ix_telemetry_pool_timestamp', 'pool_id', 'timestamp'),
+        Index('ix_telemetry_coin_timestamp', 'coin', 'timestamp'),
     )
 
 
+class TelemetryRawPayload(Base):
+    """Raw vendor payloads split out of Telemetry.data (content-addressed, zlib-compressed JSON)"""
+    __tablename__ = "telemetry_raw_payloads"
+    
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of the canonical JSON
+    miner_id: Mapped[int] = mapped_column(Integer, index=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    first_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class PoolShareCounter(Base):
+    """Latest cumulative share counters per (pool, miner), maintained at telemetry ingest"""
+    __tablename__ = "pool_share_counters"
+    
+    pool_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    miner_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    shares_accepted: Mapped[int] = mapped_column(Integer, default=0)
+    shares_rejected: Mapped[int] = mapped_column(Integer, default=0)
+    last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)  # Timestamp of the reading the counters came from
+
+
 class TelemetryHourly(Base):
     """Hourly aggregated miner telemetry data"""
     __tablename__ = "telemetry_hourly"
@@ -191,7 +217,7 @@ class TelemetryHourly(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
-        Index('ix_telemetry_hourly_miner_hour', 'miner_id', 'hour_start'),
+        Index('uq_telemetry_hourly_miner_hour', 'miner_id', 'hour_start', unique=True),
     )
 
 
@@ -219,10 +245,19 @@ class TelemetryDaily(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
-        Index('ix_telemetry_daily_miner_date', 'miner_id', 'date'),
+        Index('uq_telemetry_daily_miner_date', 'miner_id', 'date', unique=True),
     )
 
 
+class TelemetryRollupState(Base):
+    """High-water mark for incremental telemetry rollups"""
+    __tablename__ = "telemetry_rollup_state"
+    
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(DateTime)  # Raw telemetry before this is rolled up
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class EnergyPrice(Base):
     """Octopus Agile energy pricing"""
     __tablename__ = "energy_prices"
@@ -882,6 +917,22 @@ class MinerHealthCurrent(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class DiscoveredHost(Base):
+    """Network discovery host-state cache - one row per IP that answered as a miner"""
+    __tablename__ = "discovered_hosts"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ip_address: Mapped[str] = mapped_column(String(45), unique=True, index=True)
+    port: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Last responding port
+    miner_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # mac:... or host:...
+    hostname: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    miner_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)  # Linked Miner, if any
+    first_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    missed_scans: Mapped[int] = mapped_column(Integer, default=0)  # Consecutive scans without an answer
+
+
 class PlatformVersionCache(Base):
     """Cached GitHub version information - single row updated every 5 minutes"""
     __tablename__ = "platform_version_cache"
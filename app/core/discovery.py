@@ -1,17 +1,270 @@
 """
 Network Discovery Service for Miners
 Scans local network for supported mining hardware
+
+Scans run in two stages:
+1. A TCP connect sweep of every host on the miner ports (4028/80/8080) with
+   an adaptive concurrency limit - halved when the OS runs out of sockets,
+   grown again while probes complete cleanly.
+2. Only host:port pairs that accepted a connection are identified (cgminer
+   `version` or /api/system/info), over one shared HTTP session.
+
+Miners are yielded as soon as they are identified, so callers can stream
+results while the sweep continues. Incremental rescans pass priority hosts
+(known miners, recently active IPs) which are swept first; the rest of the
+range follows at a lower concurrency cap.
 """
 import asyncio
+import errno
 import socket
 import ipaddress
 import logging
-from typing import List, Dict, Any
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, List, Dict, Any, Iterable, Iterator, Optional, Union
 import aiohttp
 import json
 
+from core.config import app_config
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONNECT_TIMEOUT = 1.0  # Stage 1 connect timeout (seconds)
+DEFAULT_MAX_CONCURRENCY = 512  # Stage 1 upper bound, stays below the default fd limit
+DEFAULT_BACKGROUND_CONCURRENCY = 64  # Cap for the rest of the range after priority hosts
+MIN_CONCURRENCY = 16
+IDENTIFY_CONCURRENCY = 32  # Stage 2 identification requests in flight
+PROBE_ATTEMPTS = 3
+
+# Local resource exhaustion (not a property of the remote host)
+RESOURCE_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.EAGAIN, errno.EADDRNOTAVAIL}
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that backs off multiplicatively and grows additively.
+
+    backoff() halves the limit; every `limit` clean releases grow it by an
+    eighth, up to `maximum`.
+    """
+
+    def __init__(self, initial: int, minimum: int = MIN_CONCURRENCY, maximum: int = DEFAULT_MAX_CONCURRENCY):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.active = 0
+        self.peak = 0
+        self.backoffs = 0
+        self._clean = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self):
+        while self.active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def release(self):
+        self.active -= 1
+        self._clean += 1
+        if self._clean >= self.limit and self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + max(1, self.limit // 8))
+            self._clean = 0
+        self._wake()
+
+    def cap(self, maximum: int):
+        """Lower the ceiling (e.g. for a background sweep)"""
+        self.maximum = max(self.minimum, min(self.maximum, maximum))
+        self.limit = min(self.limit, self.maximum)
+
+    def backoff(self):
+        self.limit = max(self.minimum, self.limit // 2)
+        self._clean = 0
+        self.backoffs += 1
+
+    def _wake(self):
+        free = self.limit - self.active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+async def _port_open(ip: str, port: int, timeout: float) -> bool:
+    """
+    True if ip:port accepts a TCP connection.
+
+    Raises OSError for local resource exhaustion so the caller can back off.
+    """
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=timeout)
+    except (asyncio.TimeoutError, ConnectionRefusedError):
+        return False
+    except OSError as e:
+        if e.errno in RESOURCE_ERRNOS:
+            raise
+        return False  # Unreachable, reset, ...
+    writer.close()
+    return True
+
+
+class DiscoveryScan:
+    """
+    One staged scan over one or more networks.
+
+    Iterate run() for miners as they are identified; `stats` is updated
+    while the scan progresses.
+    """
+
+    def __init__(
+        self,
+        networks: Union[str, Iterable[str]],
+        timeout: float = 2.0,
+        connect_timeout: Optional[float] = None,
+        ports: Optional[Iterable[int]] = None,
+        max_concurrency: Optional[int] = None,
+        priority_hosts: Optional[Iterable[str]] = None,
+        background_concurrency: Optional[int] = None
+    ):
+        if isinstance(networks, str):
+            networks = [networks]
+        # Raises ValueError for an invalid CIDR before anything is scanned
+        self.networks = [ipaddress.ip_network(cidr.strip(), strict=False) for cidr in networks]
+        self.priority_hosts = list(dict.fromkeys(priority_hosts or []))
+        if background_concurrency is None and self.priority_hosts:
+            background_concurrency = int(
+                app_config.get("network_discovery.background_concurrency", DEFAULT_BACKGROUND_CONCURRENCY)
+            )
+        self.background_concurrency = background_concurrency
+        self.timeout = timeout
+        if connect_timeout is None:
+            connect_timeout = float(app_config.get("network_discovery.connect_timeout", DEFAULT_CONNECT_TIMEOUT))
+        self.connect_timeout = min(connect_timeout, timeout)
+        self.ports = tuple(ports) if ports else (MinerDiscoveryService.CGMINER_PORT, *MinerDiscoveryService.HTTP_PORTS)
+        if max_concurrency is None:
+            max_concurrency = int(app_config.get("network_discovery.max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        self.limiter = AdaptiveLimiter(initial=max_concurrency // 2, maximum=max_concurrency)
+        self.stats: Dict[str, Any] = {
+            "networks": [str(network) for network in self.networks],
+            "hosts": 0,
+            "priority_hosts": len(self.priority_hosts),
+            "probes": 0,
+            "open_ports": 0,
+            "identified": 0,
+            "started_at": None,
+            "duration_seconds": None,
+        }
+
+    def _hosts(self) -> Iterator[str]:
+        for network in self.networks:
+            for host in network.hosts():
+                yield str(host)
+
+    def covers(self, ip: str) -> bool:
+        """True if this scan probes ip"""
+        if ip in self.priority_hosts:
+            return True
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    async def _probe(self, ip: str, port: int, on_open: Callable[[str, int], None]):
+        try:
+            for attempt in range(PROBE_ATTEMPTS):
+                try:
+                    is_open = await _port_open(ip, port, self.connect_timeout)
+                except OSError as e:
+                    self.limiter.backoff()
+                    logger.debug(f"Discovery backing off to {self.limiter.limit} probes: {e}")
+                    await asyncio.sleep(0.1 * (attempt + 1))
+                    continue
+                self.stats["probes"] += 1
+                if is_open:
+                    self.stats["open_ports"] += 1
+                    on_open(ip, port)
+                return
+        finally:
+            self.limiter.release()
+
+    async def _sweep(self, on_open: Callable[[str, int], None]):
+        """Stage 1: connect to every host:port, bounded by the adaptive limiter"""
+        pending = set()
+        seen = set()
+
+        async def submit(ip: str):
+            if ip in seen:
+                return
+            seen.add(ip)
+            self.stats["hosts"] += 1
+            for port in self.ports:
+                await self.limiter.acquire()
+                task = asyncio.create_task(self._probe(ip, port, on_open))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+        for ip in self.priority_hosts:
+            await submit(ip)
+        if self.background_concurrency:
+            self.limiter.cap(self.background_concurrency)
+        for ip in self._hosts():
+            await submit(ip)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def run(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield each discovered miner (one per IP) as soon as it is identified"""
+        self.stats["started_at"] = time.time()
+        started = time.monotonic()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        found_ips = set()
+        identify_tasks = set()
+        identify_slots = asyncio.Semaphore(IDENTIFY_CONCURRENCY)
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=IDENTIFY_CONCURRENCY))
+
+        async def identify(ip: str, port: int):
+            async with identify_slots:
+                miner = await MinerDiscoveryService._identify(ip, port, self.timeout, session)
+            if miner and ip not in found_ips:
+                found_ips.add(ip)
+                self.stats["identified"] += 1
+                await queue.put(miner)
+
+        def on_open(ip: str, port: int):
+            task = asyncio.create_task(identify(ip, port))
+            identify_tasks.add(task)
+            task.add_done_callback(identify_tasks.discard)
+
+        async def scan():
+            try:
+                await self._sweep(on_open)
+                if identify_tasks:
+                    await asyncio.gather(*identify_tasks)
+            finally:
+                await queue.put(done)
+
+        scanner = asyncio.create_task(scan())
+        try:
+            while True:
+                miner = await queue.get()
+                if miner is done:
+                    break
+                yield miner
+            await scanner  # Surface scan errors
+        finally:
+            for task in (scanner, *identify_tasks):
+                task.cancel()
+            await session.close()
+            self.stats["duration_seconds"] = round(time.monotonic() - started, 2)
+            self.stats["concurrency_limit"] = self.limiter.limit
+            self.stats["peak_concurrency"] = self.limiter.peak
+            self.stats["backoffs"] = self.limiter.backoffs
+
 
 class MinerDiscoveryService:
     """Service for discovering miners on the local network"""
@@ -42,45 +295,26 @@ class MinerDiscoveryService:
         
         logger.info(f"Starting miner discovery on network: {network_cidr}")
         
-        discovered = []
-        network = ipaddress.ip_network(network_cidr, strict=False)
-        
-        # Scan hosts in batches to avoid overwhelming the network
-        batch_size = 50
-        hosts = list(network.hosts())
+        scan = DiscoveryScan(network_cidr, timeout=timeout)
+        discovered = [miner async for miner in scan.run()]
         
-        for i in range(0, len(hosts), batch_size):
-            batch = hosts[i:i + batch_size]
-            batch_tasks = [
-                MinerDiscoveryService._scan_host(str(host), timeout)
-                for host in batch
-            ]
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, dict) and result:
-                    discovered.append(result)
-        
-        logger.info(f"Discovery complete. Found {len(discovered)} miners")
+        logger.info(
+            f"Discovery complete. Found {len(discovered)} miners "
+            f"({scan.stats['open_ports']} open ports on {scan.stats['hosts']} hosts, {scan.stats['duration_seconds']}s)"
+        )
         return discovered
     
     @staticmethod
-    async def _scan_host(ip: str, timeout: float) -> Dict[str, Any]:
-        """Scan a single host for mining hardware"""
-        
-        # Try Avalon Nano (cgminer API)
-        avalon = await MinerDiscoveryService._check_cgminer(ip, timeout)
-        if avalon:
-            return avalon
-        
-        # Try Bitaxe/NerdQaxe (HTTP API)
-        for port in MinerDiscoveryService.HTTP_PORTS:
-            bitaxe = await MinerDiscoveryService._check_bitaxe(ip, port, timeout)
-            if bitaxe:
-                return bitaxe
-        
-        return {}
+    async def _identify(
+        ip: str,
+        port: int,
+        timeout: float,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> Dict[str, Any]:
+        """Identify the miner behind an open port"""
+        if port == MinerDiscoveryService.CGMINER_PORT:
+            return await MinerDiscoveryService._check_cgminer(ip, timeout)
+        return await MinerDiscoveryService._check_bitaxe(ip, port, timeout, session)
     
     @staticmethod
     async def _check_cgminer(ip: str, timeout: float) -> Dict[str, Any]:
@@ -131,37 +365,45 @@ class MinerDiscoveryService:
         return {}
     
     @staticmethod
-    async def _check_bitaxe(ip: str, port: int, timeout: float) -> Dict[str, Any]:
+    async def _check_bitaxe(
+        ip: str,
+        port: int,
+        timeout: float,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> Dict[str, Any]:
         """Check if host is running Bitaxe/NerdQaxe HTTP API"""
-        try:
+        if session is None:
             async with aiohttp.ClientSession() as session:
-                # Try to get system info
-                url = f"http://{ip}:{port}/api/system/info"
-                
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Determine miner type from response
-                        device_model = data.get('ASICModel', '').lower()
-                        hostname = data.get('hostname', '').lower()
-                        
-                        miner_type = 'bitaxe'
-                        if 'nerd' in hostname or 'qaxe' in device_model:
-                            miner_type = 'nerdqaxe'
-                        
-                        return {
-                            'ip': ip,
-                            'port': port,
-                            'type': miner_type,
-                            'name': f"{data.get('hostname', miner_type.title())} ({ip})",
-                            'details': {
-                                'hostname': data.get('hostname'),
-                                'asic_model': data.get('ASICModel'),
-                                'version': data.get('version'),
-                                'mac': data.get('macAddr')
-                            }
+                return await MinerDiscoveryService._check_bitaxe(ip, port, timeout, session)
+        
+        try:
+            # Try to get system info
+            url = f"http://{ip}:{port}/api/system/info"
+            
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    # Determine miner type from response
+                    device_model = data.get('ASICModel', '').lower()
+                    hostname = data.get('hostname', '').lower()
+                    
+                    miner_type = 'bitaxe'
+                    if 'nerd' in hostname or 'qaxe' in device_model:
+                        miner_type = 'nerdqaxe'
+                    
+                    return {
+                        'ip': ip,
+                        'port': port,
+                        'type': miner_type,
+                        'name': f"{data.get('hostname', miner_type.title())} ({ip})",
+                        'details': {
+                            'hostname': data.get('hostname'),
+                            'asic_model': data.get('ASICModel'),
+                            'version': data.get('version'),
+                            'mac': data.get('macAddr')
                         }
+                    }
         except (asyncio.TimeoutError, aiohttp.ClientError, json.JSONDecodeError):
             pass
         except Exception as e:
@@ -76,6 +76,16 @@ class EnergyOptimizationService:
 
         return host, port
 
+    @staticmethod
+    def _coin_info(coin: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Coin parameters for a coin symbol (as stored on Telemetry.coin)"""
+        if not coin:
+            return None
+        for info in EnergyOptimizationService.POOL_COINS.values():
+            if info["coin"] == coin.upper():
+                return dict(info)
+        return None
+
     @staticmethod
     def _detect_coin_from_pool(pool_in_use: str) -> Optional[Dict[str, Any]]:
         """
@@ -168,8 +178,10 @@ class EnergyOptimizationService:
                 "error": "No active pool"
             }
         
-        # Determine coin being mined
-        coin_info = EnergyOptimizationService._detect_coin_from_pool(pool_in_use)
+        # Determine coin being mined (resolved at ingest; parse pool_in_use for older rows)
+        coin_info = EnergyOptimizationService._coin_info(latest.coin)
+        if not coin_info:
+            coin_info = EnergyOptimizationService._detect_coin_from_pool(pool_in_use)
 
         if not coin_info:
             for pool_domain, info in EnergyOptimizationService.POOL_COINS.items():
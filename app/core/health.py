@@ -6,7 +6,8 @@ from typing import Optional, Dict, Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import HealthScore, Telemetry, Miner
+from core.database import HealthScore, Miner
+from core.utils import get_telemetry_columns
 
 
 class HealthScoringService:
@@ -26,14 +27,13 @@ class HealthScoringService:
         """
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
-        # Get telemetry data
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.miner_id == miner_id)
-            .where(Telemetry.timestamp >= cutoff_time)
-            .order_by(Telemetry.timestamp.asc())
+        # Get telemetry data (numeric columns only)
+        telemetry_data = await get_telemetry_columns(
+            db,
+            miner_id,
+            ("timestamp", "hashrate", "temperature", "shares_accepted", "shares_rejected"),
+            start=cutoff_time,
         )
-        telemetry_data = result.scalars().all()
         
         if not telemetry_data:
             return None
@@ -4,7 +4,8 @@ High difficulty share tracking for leaderboard
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+import asyncio
 import logging
 import aiohttp
 
@@ -20,6 +21,114 @@ logger = logging.getLogger(__name__)
 _network_diff_cache = {}
 _cache_ttl = 15  # seconds
 
+_DIFFICULTY_SUFFIXES = {
+    "k": 1_000,
+    "m": 1_000_000,
+    "g": 1_000_000_000,
+    "t": 1_000_000_000_000,
+    "p": 1_000_000_000_000_000,
+}
+
+
+def parse_difficulty(value: Any) -> Optional[float]:
+    """
+    Parse a difficulty as reported by miner firmware
+
+    Accepts numbers and strings with an optional unit suffix
+    ("130.46 k" = 130460, "1.2M", "4,096"). Returns None for missing or
+    unparseable values.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    value_str = str(value).strip().lower().replace(",", "").replace(" ", "")
+    if not value_str:
+        return None
+    multiplier = _DIFFICULTY_SUFFIXES.get(value_str[-1])
+    if multiplier is not None:
+        value_str = value_str[:-1]
+    try:
+        return float(value_str) * (multiplier or 1)
+    except ValueError:
+        return None
+
+
+class BestDifficultyRegister:
+    """
+    Per-miner best difficulty seen so far, kept in memory
+
+    Firmware reports the best share difficulty of the current session. A new
+    personal best is any increase over the last value observed for the miner;
+    a lower value means the session restarted and becomes the new baseline.
+    Seeded from the newest telemetry reading of each miner (the same value the
+    firmware reports), falling back to its most recent HighDiffShare.
+    """
+
+    def __init__(self):
+        self._best: Dict[int, float] = {}
+        self._seeded = False
+        self._seed_lock = asyncio.Lock()
+
+    async def ensure_seeded(self, db: AsyncSession) -> "BestDifficultyRegister":
+        if self._seeded:
+            return self
+        async with self._seed_lock:
+            if not self._seeded:
+                result = await db.execute(
+                    select(HighDiffShare.miner_id, HighDiffShare.difficulty)
+                    .order_by(HighDiffShare.timestamp)
+                )
+                latest_recorded = {
+                    miner_id: float(difficulty)
+                    for miner_id, difficulty in result.all()
+                    if difficulty is not None
+                }
+                latest_recorded.update(await _latest_reported_best(db))
+                # Readings observed while seeding win over history
+                for miner_id, difficulty in latest_recorded.items():
+                    self._best.setdefault(miner_id, difficulty)
+                self._seeded = True
+                logger.info("Best difficulty register seeded for %s miner(s)", len(self._best))
+        return self
+
+    def get(self, miner_id: int) -> Optional[float]:
+        return self._best.get(miner_id)
+
+    def observe(self, miner_id: int, difficulty: float) -> Tuple[bool, Optional[float]]:
+        """Record a reported best difficulty; returns (is_new_best, previous)"""
+        previous = self._best.get(miner_id)
+        self._best[miner_id] = difficulty
+        return previous is None or difficulty > previous, previous
+
+    def forget(self, miner_id: int):
+        self._best.pop(miner_id, None)
+
+
+async def _latest_reported_best(db: AsyncSession) -> Dict[int, float]:
+    """Best difficulty in each miner's newest telemetry reading"""
+    from core.latest_telemetry import get_latest_telemetry_store
+
+    latest_store = await get_latest_telemetry_store().ensure_warm(db)
+    reported = {}
+    for miner_id, reading in latest_store.snapshot().items():
+        data = reading.data or {}
+        value = parse_difficulty(
+            data.get("best_session_diff") or data.get("best_share_diff") or data.get("best_share")
+        )
+        if value:
+            reported[miner_id] = value
+    return reported
+
+
+# Global instance
+_best_difficulty_register = BestDifficultyRegister()
+
+
+def get_best_difficulty_register() -> BestDifficultyRegister:
+    return _best_difficulty_register
+
 
 async def _send_block_found_notification(
     miner_name: str,
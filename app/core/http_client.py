@@ -0,0 +1,155 @@
+"""
+Shared HTTP client for miner and pool drivers
+
+Drivers used to open a brand-new aiohttp.ClientSession for every request,
+paying for a fresh connector, DNS lookup and TCP handshake on every
+telemetry sweep and pool tile refresh. This module owns one process-wide
+session with per-host keep-alive pools, bounded connection limits and a
+DNS cache. Drivers reach it through MinerAdapter.http_session() and
+BasePoolIntegration.http_session().
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from core.config import app_config
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientManager:
+    """
+    Lazily creates and owns the shared aiohttp session.
+
+    The session is bound to the event loop it was created on; if it is
+    requested from a different loop (e.g. a one-off asyncio.run in a
+    script) the old session is closed and a new one is created for that
+    loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 4,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 15.0,
+        total_timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self.sessions_created += 1
+        return aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            stale, stale_loop = self._session, self._loop
+            self._session = None
+            self._loop = None
+            await self._close_stale(stale, stale_loop)
+        if self._session is None or self._session.closed:
+            # Creation has no await points, so concurrent callers on the
+            # same loop can never race into creating two sessions.
+            self._session = self._create_session()
+            self._loop = loop
+            logger.debug("Created shared HTTP session (limit=%s, per_host=%s)", self.limit, self.limit_per_host)
+        return self._session
+
+    @staticmethod
+    async def _close_stale(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session left behind by another event loop"""
+        try:
+            if loop is not None and loop.is_running():
+                # Its transports belong to a loop running in another thread
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            else:
+                # Closing only releases the connector's transports (a no-op once the loop is closed)
+                await session.close()
+        except Exception as e:
+            logger.debug("Failed to close HTTP session from a previous event loop: %s", e)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Drop-in replacement for `async with aiohttp.ClientSession() as session`.
+
+        Yields the shared session and leaves it open on exit.
+        """
+        yield await self.get_session()
+
+    async def close(self):
+        """Close the shared session and release pooled connections"""
+        session = self._session
+        self._session = None
+        self._loop = None
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("Shared HTTP session closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics for diagnostics"""
+        session = self._session
+        connector = session.connector if session is not None and not session.closed else None
+        return {
+            "open": connector is not None,
+            "sessions_created": self.sessions_created,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            "idle_connections": sum(len(conns) for conns in connector._conns.values()) if connector else 0,
+            "acquired_connections": len(connector._acquired) if connector else 0,
+        }
+
+
+# Global instance
+_http_client: Optional[HttpClientManager] = None
+
+
+def _as_number(value, default):
+    try:
+        return type(default)(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_http_client() -> HttpClientManager:
+    """Get the global HTTP client, configured from the `http_client` config section"""
+    global _http_client
+    if _http_client is None:
+        cfg = app_config.get("http_client", {}) or {}
+        _http_client = HttpClientManager(
+            limit=_as_number(cfg.get("limit"), 100),
+            limit_per_host=_as_number(cfg.get("limit_per_host"), 4),
+            dns_cache_ttl=_as_number(cfg.get("dns_cache_ttl"), 300),
+            keepalive_timeout=_as_number(cfg.get("keepalive_timeout"), 15.0),
+            total_timeout=_as_number(cfg.get("total_timeout"), 10.0),
+            connect_timeout=_as_number(cfg.get("connect_timeout"), 5.0),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the global HTTP client if it was ever used"""
+    if _http_client is not None:
+        await _http_client.close()
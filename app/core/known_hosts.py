@@ -0,0 +1,174 @@
+"""
+Known-host cache for incremental network discovery
+
+Every miner found by a scan is recorded in DiscoveredHost (last seen, last
+responding port, fingerprint). Routine rescans use it to:
+
+- probe known miners, recently active IPs and their DHCP neighbours first
+  (DiscoveryScan priority hosts), leaving the rest of the range to a lower
+  priority background sweep;
+- follow a miner whose address changed: when its fingerprint (MAC, else
+  hostname) answers at a new IP and the old IP no longer does, the Miner row
+  is moved instead of waiting for a manual edit or adding a duplicate.
+"""
+import ipaddress
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import DiscoveredHost, Miner
+from core.discovery import DiscoveryScan, MinerDiscoveryService
+
+logger = logging.getLogger(__name__)
+
+RECENT_DAYS = 7  # Hosts seen this recently are probed first
+CHURN_NEIGHBOURS = 4  # Addresses either side of a known miner (DHCP reassignments)
+PURGE_AFTER_DAYS = 30  # Unlinked hosts unseen this long are dropped
+VERIFY_TIMEOUT = 2.0
+
+
+def host_fingerprint(miner_info: Dict) -> Optional[str]:
+    """Stable identity of a discovered miner: MAC address, else hostname"""
+    details = miner_info.get("details") or {}
+    mac = details.get("mac")
+    if mac:
+        return f"mac:{str(mac).strip().lower()}"
+    hostname = details.get("hostname")
+    if hostname:
+        return f"host:{str(hostname).strip().lower()}"
+    return None
+
+
+class KnownHostCache:
+    """DiscoveredHost rows and configured miners for one discovery run"""
+
+    def __init__(self, hosts: Iterable[DiscoveredHost], miners: Iterable[Miner]):
+        self._hosts: Dict[str, DiscoveredHost] = {host.ip_address: host for host in hosts}
+        self._miners: Dict[int, Miner] = {miner.id: miner for miner in miners}
+        self.seen = set()
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "KnownHostCache":
+        hosts = (await db.execute(select(DiscoveredHost))).scalars().all()
+        miners = (await db.execute(select(Miner))).scalars().all()
+        return cls(hosts, miners)
+
+    def _miner_at(self, ip: str) -> Optional[Miner]:
+        for miner in self._miners.values():
+            if miner.ip_address == ip:
+                return miner
+        return None
+
+    def priority_hosts(self, networks: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+        """Known miners, then recently active IPs, then neighbours of known miners"""
+        now = now or datetime.utcnow()
+        scanned = [ipaddress.ip_network(cidr.strip(), strict=False) for cidr in networks]
+
+        known = [miner.ip_address for miner in self._miners.values() if miner.ip_address]
+        known += [host.ip_address for host in self._hosts.values() if host.miner_id is not None]
+
+        recent_cutoff = now - timedelta(days=RECENT_DAYS)
+        recent = [
+            host.ip_address
+            for host in sorted(self._hosts.values(), key=lambda host: host.last_seen, reverse=True)
+            if host.last_seen and host.last_seen >= recent_cutoff
+        ]
+
+        churn = []
+        for ip in known:
+            try:
+                address = ipaddress.IPv4Address(ip)
+            except ValueError:
+                continue  # Hostname
+            for offset in range(-CHURN_NEIGHBOURS, CHURN_NEIGHBOURS + 1):
+                try:
+                    neighbour = address + offset
+                except ipaddress.AddressValueError:
+                    continue
+                if any(
+                    neighbour in network and neighbour not in (network.network_address, network.broadcast_address)
+                    for network in scanned
+                ):
+                    churn.append(str(neighbour))
+
+        return list(dict.fromkeys(known + recent + churn))
+
+    async def _relocation(self, fingerprint: str, ip: str) -> Optional[Miner]:
+        """The configured miner that moved to ip, if exactly one matches and its old IP is silent"""
+        miner_ids = {
+            host.miner_id
+            for host in self._hosts.values()
+            if host.fingerprint == fingerprint and host.miner_id is not None and host.ip_address != ip
+        }
+        if len(miner_ids) != 1:
+            return None  # Unknown, or ambiguous (e.g. default hostnames)
+        miner = self._miners.get(miner_ids.pop())
+        if miner is None or not miner.ip_address or miner.ip_address == ip:
+            return None
+
+        old_host = self._hosts.get(miner.ip_address)
+        if old_host is None or old_host.fingerprint != fingerprint:
+            return None
+        # Two devices sharing a fingerprint must not steal each other's row
+        still_there = await MinerDiscoveryService._identify(
+            miner.ip_address, old_host.port or MinerDiscoveryService.HTTP_PORTS[0], VERIFY_TIMEOUT
+        )
+        if still_there and host_fingerprint(still_there) == fingerprint:
+            return None
+        return miner
+
+    async def observe(self, db: AsyncSession, miner_info: Dict) -> Optional[Tuple[Miner, str]]:
+        """
+        Record a discovered miner (caller commits).
+
+        Returns:
+            (miner, previous IP) if a configured miner was moved to this address
+        """
+        ip = miner_info["ip"]
+        fingerprint = host_fingerprint(miner_info)
+        now = datetime.utcnow()
+        self.seen.add(ip)
+
+        relocated = None
+        if fingerprint and self._miner_at(ip) is None:
+            miner = await self._relocation(fingerprint, ip)
+            if miner is not None:
+                previous_ip = miner.ip_address
+                miner.ip_address = ip
+                if miner.port is not None:
+                    miner.port = miner_info["port"]
+                old_host = self._hosts.get(previous_ip)
+                if old_host is not None:
+                    old_host.miner_id = None
+                relocated = (miner, previous_ip)
+                logger.info(f"Miner {miner.name} moved from {previous_ip} to {ip} ({fingerprint})")
+
+        host = self._hosts.get(ip)
+        if host is None:
+            host = DiscoveredHost(ip_address=ip, first_seen=now)
+            db.add(host)
+            self._hosts[ip] = host
+        host.port = miner_info["port"]
+        host.miner_type = miner_info.get("type")
+        host.fingerprint = fingerprint
+        host.hostname = (miner_info.get("details") or {}).get("hostname")
+        host.last_seen = now
+        host.missed_scans = 0
+        linked = self._miner_at(ip)
+        host.miner_id = linked.id if linked is not None else None
+        return relocated
+
+    async def finish(self, db: AsyncSession, scan: DiscoveryScan, now: Optional[datetime] = None):
+        """Count misses for scanned hosts that did not answer and purge stale ones (caller commits)"""
+        now = now or datetime.utcnow()
+        purge_cutoff = now - timedelta(days=PURGE_AFTER_DAYS)
+        for ip, host in list(self._hosts.items()):
+            if ip in self.seen or not scan.covers(ip):
+                continue
+            host.missed_scans = (host.missed_scans or 0) + 1
+            if host.miner_id is None and host.last_seen and host.last_seen < purge_cutoff:
+                await db.delete(host)
+                del self._hosts[ip]
@@ -0,0 +1,181 @@
+"""
+Latest telemetry hot state
+
+Alerts, cloud push, the freshness watchdog, the price band leaderboard and the
+collector itself all need "the newest reading for miner X". Rather than each
+of them querying the telemetry table per miner, the collector records every
+reading here as it lands and the store is warm-started from the database at
+boot, so those lookups are dict reads.
+
+The store is process-local and holds only the newest reading per miner plus a
+short history of recent hashrate samples; the raw vendor payload is dropped
+from cached data (it lives in telemetry / cold storage).
+"""
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 10
+
+
+@dataclass(frozen=True)
+class LatestReading:
+    miner_id: int
+    timestamp: datetime
+    hashrate: Optional[float] = None
+    hashrate_unit: Optional[str] = None
+    temperature: Optional[float] = None
+    power_watts: Optional[float] = None
+    shares_accepted: Optional[int] = None
+    shares_rejected: Optional[int] = None
+    pool_in_use: Optional[str] = None
+    pool_id: Optional[int] = None
+    coin: Optional[str] = None
+    mode: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_row(cls, row: Any) -> "LatestReading":
+        """Build from a telemetry row dict or a Telemetry ORM object"""
+        get = row.get if isinstance(row, dict) else (lambda key: getattr(row, key, None))
+        return cls(
+            miner_id=int(get("miner_id")),
+            timestamp=get("timestamp"),
+            hashrate=get("hashrate"),
+            hashrate_unit=get("hashrate_unit"),
+            temperature=get("temperature"),
+            power_watts=get("power_watts"),
+            shares_accepted=get("shares_accepted"),
+            shares_rejected=get("shares_rejected"),
+            pool_in_use=get("pool_in_use"),
+            pool_id=get("pool_id"),
+            coin=get("coin"),
+            mode=get("mode"),
+            data=_without_raw(get("data")),
+        )
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        return ((now or datetime.utcnow()) - self.timestamp).total_seconds()
+
+
+def _without_raw(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not isinstance(data, dict):
+        return data
+    vendor = data.get("vendor")
+    if not isinstance(vendor, dict) or "raw" not in vendor:
+        return data
+    return {**data, "vendor": {key: value for key, value in vendor.items() if key != "raw"}}
+
+
+class LatestTelemetryStore:
+    """Newest telemetry reading per miner, kept in memory"""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._latest: Dict[int, LatestReading] = {}
+        self._history: Dict[int, Deque[LatestReading]] = {}
+        self._history_size = history_size
+        self._warm = False
+        self._warm_lock = asyncio.Lock()
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warm
+
+    def update(self, row: Any) -> Optional[LatestReading]:
+        """Record a reading; older-than-latest readings are ignored"""
+        reading = row if isinstance(row, LatestReading) else LatestReading.from_row(row)
+        if reading.timestamp is None:
+            return None
+        current = self._latest.get(reading.miner_id)
+        if current is not None and reading.timestamp < current.timestamp:
+            return current
+        self._latest[reading.miner_id] = reading
+        if reading.hashrate is not None:
+            history = self._history.get(reading.miner_id)
+            if history is None:
+                history = self._history[reading.miner_id] = deque(maxlen=self._history_size)
+            history.appendleft(reading)
+        return reading
+
+    def update_many(self, rows: Iterable[Any]):
+        for row in rows:
+            self.update(row)
+
+    def get(self, miner_id: int) -> Optional[LatestReading]:
+        return self._latest.get(miner_id)
+
+    def last_seen(self, miner_id: int) -> Optional[datetime]:
+        reading = self._latest.get(miner_id)
+        return reading.timestamp if reading is not None else None
+
+    def recent(self, miner_id: int, since: Optional[datetime] = None) -> List[LatestReading]:
+        """Recent readings that reported a hashrate, newest first"""
+        history = self._history.get(miner_id) or ()
+        return [reading for reading in history if since is None or reading.timestamp > since]
+
+    def snapshot(self, miner_ids: Optional[Iterable[int]] = None) -> Dict[int, LatestReading]:
+        """Latest reading per miner (all miners, or just miner_ids)"""
+        if miner_ids is None:
+            return dict(self._latest)
+        return {miner_id: self._latest[miner_id] for miner_id in miner_ids if miner_id in self._latest}
+
+    def stale_count(self, miner_ids: Iterable[int], cutoff: datetime) -> int:
+        """How many of miner_ids have no reading at or after cutoff"""
+        count = 0
+        for miner_id in miner_ids:
+            last = self.last_seen(miner_id)
+            if last is None or last < cutoff:
+                count += 1
+        return count
+
+    def forget(self, miner_id: int):
+        self._latest.pop(miner_id, None)
+        self._history.pop(miner_id, None)
+
+    def clear(self):
+        self._latest.clear()
+        self._history.clear()
+        self._warm = False
+
+    async def _load(self, db: AsyncSession) -> int:
+        from core.database import Miner
+        from core.utils import get_latest_telemetry_batch
+
+        result = await db.execute(select(Miner.id))
+        latest = await get_latest_telemetry_batch(db, list(result.scalars().all()))
+        self.update_many(latest.values())
+        self._warm = True
+        logger.info("Latest telemetry store warmed with %s miner(s)", len(latest))
+        return len(latest)
+
+    async def warm_start(self, db: AsyncSession) -> int:
+        """Seed the store with the newest persisted reading of every miner"""
+        async with self._warm_lock:
+            return await self._load(db)
+
+    async def ensure_warm(self, db: AsyncSession) -> "LatestTelemetryStore":
+        """Warm the store on first use (no-op once warm)"""
+        if not self._warm:
+            async with self._warm_lock:
+                if not self._warm:
+                    await self._load(db)
+        return self
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"warm": self._warm, "miners": len(self._latest)}
+
+
+# Global instance
+_latest_telemetry_store = LatestTelemetryStore()
+
+
+def get_latest_telemetry_store() -> LatestTelemetryStore:
+    return _latest_telemetry_store
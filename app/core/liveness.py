@@ -0,0 +1,285 @@
+"""
+Shared host liveness probing
+
+Replaces one `ping` subprocess per check with ICMP echo requests sent from a
+single socket owned by the event loop: an unprivileged datagram ICMP socket
+where the kernel allows it (net.ipv4.ping_group_range), otherwise a raw socket.
+Concurrent checks share that socket and in-flight probes for the same host are
+coalesced. When no ICMP socket can be opened the service falls back to a TCP
+connect - a refused connection still proves the host is up.
+
+Positive results are cached for `liveness.ttl_seconds` (default 10s); a host
+that did not answer is probed again on the next check, so a failure from a
+short probe never stands in for a caller willing to wait longer. Used by
+price_band_strategy.ping_check and MinerAdapter.ping().
+"""
+import asyncio
+import ipaddress
+import logging
+import os
+import socket
+import struct
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.config import app_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 10.0
+DEFAULT_TIMEOUT_SECONDS = 1.0
+TCP_FALLBACK_PORTS = (80, 4028)  # Miner web UI / cgminer API
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_PAYLOAD = b"hmm-liveness"
+
+
+def icmp_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = ICMP_PAYLOAD) -> bytes:
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def parse_echo_reply(packet: bytes, has_ip_header: bool) -> Optional[Tuple[int, int]]:
+    """(identifier, sequence) of an echo reply, None for anything else"""
+    if has_ip_header:
+        if not packet:
+            return None
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < 8:
+        return None
+    icmp_type, _code, _checksum, ident, seq = struct.unpack("!BBHHH", packet[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq
+
+
+class IcmpProber:
+    """One ICMP socket multiplexing echo requests for any number of hosts"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self.raw = False
+        except OSError:
+            # Raises PermissionError when neither is allowed
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+        sock.setblocking(False)
+        self.sock = sock
+        self.loop = loop
+        # Datagram sockets get their identifier rewritten by the kernel
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+        loop.add_reader(sock.fileno(), self._on_readable)
+
+    @property
+    def mode(self) -> str:
+        return "icmp-raw" if self.raw else "icmp-dgram"
+
+    def _on_readable(self):
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ICMP receive failed: {e}")
+                return
+            parsed = parse_echo_reply(packet, has_ip_header=self.raw)
+            if parsed is None:
+                continue
+            ident, seq = parsed
+            # Raw sockets see every echo reply on the host
+            if self.raw and ident != self.ident:
+                continue
+            future = self._pending.get((addr[0], seq))
+            if future is not None and not future.done():
+                future.set_result(True)
+
+    async def probe(self, ip: str, timeout: float) -> bool:
+        self._seq = (self._seq + 1) & 0xFFFF
+        key = (ip, self._seq)
+        future = self.loop.create_future()
+        self._pending[key] = future
+        try:
+            await self.loop.sock_sendto(self.sock, build_echo_request(self.ident, self._seq), (ip, 0))
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        except OSError as e:
+            # e.g. network unreachable
+            logger.debug(f"ICMP probe to {ip} failed: {e}")
+            return False
+        finally:
+            self._pending.pop(key, None)
+
+    def close(self):
+        try:
+            self.loop.remove_reader(self.sock.fileno())
+        except Exception:
+            pass
+        self.sock.close()
+
+
+async def tcp_probe(host: str, timeout: float, ports: Iterable[int] = TCP_FALLBACK_PORTS) -> bool:
+    """Host is up if any port accepts or actively refuses a connection"""
+    async def _connect(port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        except ConnectionRefusedError:
+            return True
+        except (asyncio.TimeoutError, OSError):
+            return False
+        writer.close()
+        return True
+
+    results = await asyncio.gather(*(_connect(port) for port in ports))
+    return any(results)
+
+
+class LivenessService:
+    """Cached, coalesced reachability checks shared by the whole process"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+        self._inflight: Dict[str, Tuple[asyncio.Future, float]] = {}
+        self._prober: Optional[IcmpProber] = None
+        self._icmp_unavailable = False
+        self.probes = 0
+        self.cache_hits = 0
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        try:
+            return float(app_config.get("liveness.ttl_seconds", DEFAULT_TTL_SECONDS))
+        except (TypeError, ValueError):
+            return DEFAULT_TTL_SECONDS
+
+    def _get_prober(self) -> Optional[IcmpProber]:
+        if self._icmp_unavailable:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._prober is not None and self._prober.loop is not loop:
+            self._prober.close()
+            self._prober = None
+        if self._prober is None:
+            try:
+                self._prober = IcmpProber(loop)
+                logger.info(f"Liveness probing via {self._prober.mode} socket")
+            except OSError as e:
+                self._icmp_unavailable = True
+                logger.info(f"ICMP sockets unavailable ({e}); liveness falls back to TCP connect")
+                return None
+        return self._prober
+
+    async def _probe(self, host: str, timeout: float, port: Optional[int]) -> bool:
+        self.probes += 1
+        try:
+            ip = str(ipaddress.IPv4Address(host))
+        except ValueError:
+            ip = None
+        prober = self._get_prober() if ip else None
+        if prober is not None:
+            return await prober.probe(ip, timeout)
+        ports = (port,) if port else TCP_FALLBACK_PORTS
+        return await tcp_probe(host, timeout, ports)
+
+    def cached(self, host: str) -> Optional[bool]:
+        """Cached result for host if still fresh"""
+        entry = self._cache.get(host)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    async def check(self, host: str, timeout: float = DEFAULT_TIMEOUT_SECONDS, port: Optional[int] = None) -> bool:
+        """
+        True if host answers within timeout.
+
+        Args:
+            host: IPv4 address (ICMP) or hostname (TCP connect)
+            timeout: Probe timeout in seconds
+            port: TCP port to use if ICMP is unavailable
+        """
+        if not host:
+            return False
+        cached = self.cached(host)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        inflight = self._inflight.get(host)
+        # Only join a probe that waits at least as long as this caller would
+        if inflight is not None and inflight[1] >= timeout:
+            return await asyncio.shield(inflight[0])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[host] = (future, timeout)
+        alive = False
+        try:
+            alive = await self._probe(host, timeout, port)
+        except Exception as e:
+            logger.debug(f"Liveness probe for {host} failed: {e}")
+        finally:
+            if self._inflight.get(host, (None,))[0] is future:
+                del self._inflight[host]
+            # Waiters see False if this check was cancelled
+            if not future.done():
+                future.set_result(alive)
+        # Failures are not cached: they may lead to power cycling a miner
+        if alive:
+            self._cache[host] = (alive, time.monotonic())
+        else:
+            self._cache.pop(host, None)
+        return alive
+
+    async def check_many(
+        self,
+        hosts: Iterable[str],
+        timeout: float = DEFAULT_TIMEOUT_SECONDS
+    ) -> Dict[str, bool]:
+        """Check many hosts at once (one socket, probes in flight together)"""
+        hosts = list(dict.fromkeys(hosts))
+        results = await asyncio.gather(*(self.check(host, timeout) for host in hosts))
+        return dict(zip(hosts, results))
+
+    def invalidate(self, host: Optional[str] = None):
+        if host is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(host, None)
+
+    def get_stats(self) -> Dict:
+        if self._icmp_unavailable:
+            mode = "tcp"
+        else:
+            mode = self._prober.mode if self._prober else "icmp (not started)"
+        return {
+            "mode": mode,
+            "cached_hosts": len(self._cache),
+            "probes": self.probes,
+            "cache_hits": self.cache_hits,
+        }
+
+
+# Global instance
+_liveness_service = LivenessService()
+
+
+def get_liveness_service() -> LivenessService:
+    return _liveness_service
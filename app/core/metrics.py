@@ -6,8 +6,7 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import Metric, Telemetry, Miner, Pool, EnergyPrice, PoolHealth
-from core.config import app_config
+from core.database import Metric, TelemetryHourly, Miner, Pool, PoolHealth
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,20 +29,13 @@ class MetricsEngine:
         
         logger.info(f"📊 Computing hourly metrics for {hour}")
         
-        # Compute per-miner energy costs
-        await self._compute_energy_cost_hourly(hour, hour_end)
-        
-        # Compute per-miner performance
-        await self._compute_hashrate_hourly(hour, hour_end)
-        await self._compute_temperature_hourly(hour, hour_end)
-        await self._compute_reject_rate_hourly(hour, hour_end)
+        # Per-miner energy/hashrate/temperature/reject-rate and system energy
+        # metrics are written by the unified telemetry rollup
+        # (core.telemetry_rollups) from its single raw-telemetry pass.
         
         # Compute pool health
         await self._compute_pool_health_hourly(hour, hour_end)
         
-        # Compute system-wide aggregates
-        await self._compute_system_energy_hourly(hour, hour_end)
-        
         await self.db.commit()
         logger.info(f"✅ Hourly metrics computed for {hour}")
     
@@ -73,109 +65,6 @@ class MetricsEngine:
     
     # Energy Cost Metrics
     
-    async def _compute_energy_cost_hourly(self, hour_start: datetime, hour_end: datetime):
-        """Compute hourly energy costs per miner"""
-        region = app_config.get("octopus_agile.region", "H")
-        
-        # Get all enabled miners
-        miners_result = await self.db.execute(
-            select(Miner).where(Miner.enabled == True)
-        )
-        miners = miners_result.scalars().all()
-        
-        # Fetch all prices for this hour once
-        prices_result = await self.db.execute(
-            select(EnergyPrice)
-            .where(EnergyPrice.region == region)
-            .where(EnergyPrice.valid_from >= hour_start)
-            .where(EnergyPrice.valid_from < hour_end)
-        )
-        prices = {p.valid_from: p.price_pence for p in prices_result.scalars().all()}
-        
-        for miner in miners:
-            # Get telemetry for this miner in this hour
-            telemetry_result = await self.db.execute(
-                select(Telemetry)
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp >= hour_start)
-                .where(Telemetry.timestamp < hour_end)
-                .where(Telemetry.power_watts.isnot(None))
-            )
-            telemetry = telemetry_result.scalars().all()
-            
-            if not telemetry:
-                continue
-            
-            # Calculate cost
-            total_cost_pence = 0
-            total_kwh = 0
-            price_sum = 0
-            price_count = 0
-            
-            for telem in telemetry:
-                # Find price for this timestamp
-                price_pence = None
-                for valid_from, pence in prices.items():
-                    if valid_from <= telem.timestamp < valid_from + timedelta(minutes=30):
-                        price_pence = pence
-                        break
-                
-                if price_pence and telem.power_watts:
-                    interval_hours = 30 / 3600  # 30 seconds
-                    energy_kwh = (telem.power_watts / 1000) * interval_hours
-                    total_cost_pence += energy_kwh * price_pence
-                    total_kwh += energy_kwh
-                    price_sum += price_pence
-                    price_count += 1
-            
-            if total_kwh > 0:
-                # Store metric
-                metric = Metric(
-                    metric_type="energy_cost",
-                    entity_type="miner",
-                    entity_id=miner.id,
-                    period="hourly",
-                    timestamp=hour_start,
-                    value_json={
-                        "kwh": round(total_kwh, 4),
-                        "cost_pence": round(total_cost_pence, 2),
-                        "cost_gbp": round(total_cost_pence / 100, 4),
-                        "avg_price_pence": round(price_sum / price_count, 2) if price_count > 0 else 0,
-                        "records": len(telemetry)
-                    }
-                )
-                self.db.add(metric)
-    
-    async def _compute_system_energy_hourly(self, hour_start: datetime, hour_end: datetime):
-        """Compute system-wide energy costs for this hour"""
-        # Aggregate from per-miner hourly metrics
-        result = await self.db.execute(
-            select(Metric)
-            .where(Metric.metric_type == "energy_cost")
-            .where(Metric.entity_type == "miner")
-            .where(Metric.period == "hourly")
-            .where(Metric.timestamp == hour_start)
-        )
-        miner_metrics = result.scalars().all()
-        
-        if miner_metrics:
-            total_kwh = sum(m.value_json["kwh"] for m in miner_metrics)
-            total_cost_pence = sum(m.value_json["cost_pence"] for m in miner_metrics)
-            
-            metric = Metric(
-                metric_type="energy_cost",
-                entity_type="system",
-                entity_id=None,
-                period="hourly",
-                timestamp=hour_start,
-                value_json={
-                    "total_kwh": round(total_kwh, 4),
-                    "total_cost_gbp": round(total_cost_pence / 100, 4),
-                    "miner_count": len(miner_metrics)
-                }
-            )
-            self.db.add(metric)
-    
     async def _compute_energy_cost_daily(self, date_start: datetime, date_end: datetime):
         """Aggregate daily energy costs from hourly metrics"""
         # Per-miner daily aggregates
@@ -248,47 +137,6 @@ class MetricsEngine:
     
     # Hashrate Metrics
     
-    async def _compute_hashrate_hourly(self, hour_start: datetime, hour_end: datetime):
-        """Compute hourly hashrate stats per miner"""
-        miners_result = await self.db.execute(
-            select(Miner).where(Miner.enabled == True)
-        )
-        miners = miners_result.scalars().all()
-        
-        for miner in miners:
-            result = await self.db.execute(
-                select(
-                    func.avg(Telemetry.hashrate).label("avg"),
-                    func.min(Telemetry.hashrate).label("min"),
-                    func.max(Telemetry.hashrate).label("max"),
-                    func.count(Telemetry.id).label("count"),
-                    Telemetry.hashrate_unit
-                )
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp >= hour_start)
-                .where(Telemetry.timestamp < hour_end)
-                .where(Telemetry.hashrate.isnot(None))
-                .group_by(Telemetry.hashrate_unit)
-            )
-            row = result.first()
-            
-            if row and row.count > 0:
-                metric = Metric(
-                    metric_type="hashrate",
-                    entity_type="miner",
-                    entity_id=miner.id,
-                    period="hourly",
-                    timestamp=hour_start,
-                    value_json={
-                        "avg": round(row.avg, 2),
-                        "min": round(row.min, 2),
-                        "max": round(row.max, 2),
-                        "unit": row.hashrate_unit,
-                        "records": row.count
-                    }
-                )
-                self.db.add(metric)
-    
     async def _compute_hashrate_daily(self, date_start: datetime, date_end: datetime):
         """Aggregate daily hashrate from hourly metrics"""
         miners_result = await self.db.execute(
@@ -332,44 +180,6 @@ class MetricsEngine:
     
     # Temperature Metrics
     
-    async def _compute_temperature_hourly(self, hour_start: datetime, hour_end: datetime):
-        """Compute hourly temperature stats per miner"""
-        miners_result = await self.db.execute(
-            select(Miner).where(Miner.enabled == True)
-        )
-        miners = miners_result.scalars().all()
-        
-        for miner in miners:
-            result = await self.db.execute(
-                select(
-                    func.avg(Telemetry.temperature).label("avg"),
-                    func.min(Telemetry.temperature).label("min"),
-                    func.max(Telemetry.temperature).label("max"),
-                    func.count(Telemetry.id).label("count")
-                )
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp >= hour_start)
-                .where(Telemetry.timestamp < hour_end)
-                .where(Telemetry.temperature.isnot(None))
-            )
-            row = result.first()
-            
-            if row and row.count > 0:
-                metric = Metric(
-                    metric_type="temperature",
-                    entity_type="miner",
-                    entity_id=miner.id,
-                    period="hourly",
-                    timestamp=hour_start,
-                    value_json={
-                        "avg": round(row.avg, 1),
-                        "min": round(row.min, 1),
-                        "max": round(row.max, 1),
-                        "records": row.count
-                    }
-                )
-                self.db.add(metric)
-    
     async def _compute_temperature_daily(self, date_start: datetime, date_end: datetime):
         """Aggregate daily temperature from hourly metrics"""
         miners_result = await self.db.execute(
@@ -411,43 +221,6 @@ class MetricsEngine:
     
     # Reject Rate Metrics
     
-    async def _compute_reject_rate_hourly(self, hour_start: datetime, hour_end: datetime):
-        """Compute hourly reject rate per miner"""
-        miners_result = await self.db.execute(
-            select(Miner).where(Miner.enabled == True)
-        )
-        miners = miners_result.scalars().all()
-        
-        for miner in miners:
-            result = await self.db.execute(
-                select(
-                    func.sum(Telemetry.shares_accepted).label("accepted"),
-                    func.sum(Telemetry.shares_rejected).label("rejected")
-                )
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp >= hour_start)
-                .where(Telemetry.timestamp < hour_end)
-            )
-            row = result.first()
-            
-            if row and row.accepted:
-                total_shares = (row.accepted or 0) + (row.rejected or 0)
-                reject_rate = (row.rejected / total_shares * 100) if total_shares > 0 else 0
-                
-                metric = Metric(
-                    metric_type="reject_rate",
-                    entity_type="miner",
-                    entity_id=miner.id,
-                    period="hourly",
-                    timestamp=hour_start,
-                    value_json={
-                        "reject_rate": round(reject_rate, 2),
-                        "shares_accepted": row.accepted or 0,
-                        "shares_rejected": row.rejected or 0
-                    }
-                )
-                self.db.add(metric)
-    
     async def _compute_reject_rate_daily(self, date_start: datetime, date_end: datetime):
         """Aggregate daily reject rate from hourly metrics"""
         miners_result = await self.db.execute(
@@ -535,14 +308,17 @@ class MetricsEngine:
         )
         miners = miners_result.scalars().all()
         
+        # Record counts come from the hourly rollup instead of rescanning raw telemetry
+        result = await self.db.execute(
+            select(TelemetryHourly.miner_id, func.sum(TelemetryHourly.uptime_minutes))
+            .where(TelemetryHourly.hour_start >= date_start)
+            .where(TelemetryHourly.hour_start < date_end)
+            .group_by(TelemetryHourly.miner_id)
+        )
+        record_counts = {miner_id: count or 0 for miner_id, count in result.all()}
+        
         for miner in miners:
-            result = await self.db.execute(
-                select(func.count(Telemetry.id))
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp >= date_start)
-                .where(Telemetry.timestamp < date_end)
-            )
-            record_count = result.scalar()
+            record_count = record_counts.get(miner.id, 0)
             
             # Expected: 2 records/min × 60 min × 24 hours = 2880 records
             expected_records = 2880
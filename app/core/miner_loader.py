@@ -4,9 +4,11 @@ Miner Driver Loader
 Dynamically loads miner drivers from /config/drivers/miners/
 Similar architecture to pool_loader.py
 """
+import hashlib
 import importlib.util
+import json
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from pathlib import Path
 
 from adapters.base import MinerAdapter
@@ -28,6 +30,10 @@ class MinerDriverLoader:
         self.drivers: Dict[str, type] = {}
         # driver_type -> loaded python module
         self.driver_modules: Dict[str, object] = {}
+        # miner_id -> (adapter key, adapter instance)
+        # Adapters are reused across scheduler cycles and API calls so parsed
+        # config, per-device state and transports survive between polls.
+        self.adapters: Dict[int, Tuple[tuple, MinerAdapter]] = {}
     
     def load_all(self):
         """Load all miner drivers"""
@@ -41,6 +47,9 @@ class MinerDriverLoader:
         
         logger.info(f"Loading miner drivers from {self.drivers_path}")
         
+        # Cached adapters belong to the previous driver classes
+        self.clear_adapters()
+        
         for file_path in self.drivers_path.glob("*_driver.py"):
             try:
                 # Skip template files
@@ -100,7 +109,12 @@ class MinerDriverLoader:
         config: Optional[Dict] = None
     ) -> Optional[MinerAdapter]:
         """
-        Factory function to create appropriate miner adapter
+        Get adapter for a miner, reusing the cached instance when possible.
+        
+        Adapters are cached by miner_id and reused while the miner's type,
+        IP, port and config are unchanged; any change produces a fresh
+        adapter. NMMiner adapters are fed by the shared UDP listener, so the
+        listener's instance for the IP is always returned when there is one.
         
         Args:
             miner_type: Type of miner (avalon_nano, bitaxe, nerdqaxe, nmminer, etc.)
@@ -113,26 +127,60 @@ class MinerDriverLoader:
         Returns:
             MinerAdapter instance or None if type not found
         """
-        # Special handling for NMMiner (uses shared UDP listener)
-        if miner_type == "nmminer":
-            from adapters import get_scheduler_service
-            scheduler = get_scheduler_service()
-            if scheduler and ip_address in scheduler.nmminer_adapters:
-                return scheduler.nmminer_adapters[ip_address]
-            else:
-                logger.warning(f"NMMiner adapter not found for {ip_address} - UDP listener may not be running")
-                # Fallback to creating a placeholder adapter
-                adapter_class = self.drivers.get(miner_type)
-                if adapter_class:
-                    return adapter_class(miner_id, miner_name, ip_address, port, config)
-        
         adapter_class = self.drivers.get(miner_type)
         
         if not adapter_class:
             logger.error(f"Unknown miner type: {miner_type}")
             return None
         
-        return adapter_class(miner_id, miner_name, ip_address, port, config)
+        # Special handling for NMMiner (uses shared UDP listener)
+        if miner_type == "nmminer":
+            listener_adapter = self._nmminer_listener_adapter(ip_address)
+            if listener_adapter is not None:
+                listener_adapter.miner_name = miner_name
+                return listener_adapter
+        
+        # Ad-hoc adapters (no DB row yet) are never cached
+        if miner_id is None:
+            return adapter_class(miner_id, miner_name, ip_address, port, config)
+        
+        key = self._adapter_key(miner_type, ip_address, port, config)
+        
+        cached = self.adapters.get(miner_id)
+        if cached and cached[0] == key:
+            adapter = cached[1]
+            # Renames don't need a new adapter
+            adapter.miner_name = miner_name
+            return adapter
+        
+        adapter = adapter_class(miner_id, miner_name, ip_address, port, config)
+        self.adapters[miner_id] = (key, adapter)
+        if cached:
+            logger.debug(f"Replaced cached adapter for miner {miner_id} (connection settings changed)")
+        return adapter
+    
+    @staticmethod
+    def _nmminer_listener_adapter(ip_address: str) -> Optional[MinerAdapter]:
+        """Adapter the NMMiner UDP listener is feeding for this IP, if any"""
+        from adapters import get_scheduler_service
+        scheduler = get_scheduler_service()
+        nmminer_adapters = getattr(scheduler, "nmminer_adapters", None) or {}
+        return nmminer_adapters.get(ip_address)
+    
+    @staticmethod
+    def _adapter_key(miner_type: str, ip_address: str, port: Optional[int], config: Optional[Dict]) -> tuple:
+        """Build the cache key that decides whether a cached adapter is still valid"""
+        config_json = json.dumps(config or {}, sort_keys=True, default=str)
+        config_hash = hashlib.sha1(config_json.encode()).hexdigest()
+        return (miner_type, ip_address, port, config_hash)
+    
+    def invalidate_adapter(self, miner_id: int):
+        """Drop the cached adapter for a miner (call after update/delete)"""
+        self.adapters.pop(miner_id, None)
+    
+    def clear_adapters(self):
+        """Drop all cached adapters (driver reload)"""
+        self.adapters.clear()
 
 
 # Global instance
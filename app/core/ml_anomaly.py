@@ -6,25 +6,27 @@ Hybrid approach:
 - Per-miner models for higher accuracy (after sufficient data)
 - Fallback logic: per-miner → type → skip
 """
+import importlib.util
 import logging
 import pickle
+import threading
 import joblib
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 import numpy as np
 
-try:
-    from sklearn.ensemble import IsolationForest
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+# Models are fitted in core.ml_training; only probe for scikit-learn here
+SKLEARN_AVAILABLE = importlib.util.find_spec("sklearn") is not None
+if not SKLEARN_AVAILABLE:
     logging.warning("scikit-learn not installed, ML anomaly detection disabled")
 
 from core.database import Miner, Telemetry, MinerBaseline
 from core.config import settings
+from core.ml_training import TrainingJob, get_ml_training_service
 
 logger = logging.getLogger(__name__)
 
@@ -42,11 +44,15 @@ MIN_DAYS_PER_MINER = 7  # Minimum days of history for per-miner model
 CONTAMINATION = 0.05  # Expected % of outliers (5%)
 N_ESTIMATORS = 100
 RANDOM_STATE = 42
+FEATURE_NAMES = ["hashrate_ths", "power_watts", "w_per_th", "temp", "reject_rate"]
 
 # Retraining triggers
 BASELINE_SHIFT_THRESHOLD = 0.15  # 15% shift triggers retrain
 FALSE_POSITIVE_THRESHOLD = 0.20  # 20% FP rate triggers retrain
 
+# Loaded models kept in memory (LRU)
+MODEL_CACHE_SIZE = 64
+
 
 def _get_type_model_path(miner_type: str) -> Path:
     """Get path for type-level model"""
@@ -65,6 +71,67 @@ def _get_metadata_path(model_path: Path) -> Path:
     return model_path.with_suffix(".meta")
 
 
+class ModelRegistry:
+    """
+    LRU cache of unpickled models keyed by (path, mtime).
+
+    Models are loaded lazily on first use; a model file rewritten on disk has a
+    new mtime and is reloaded on the next lookup.
+    """
+
+    def __init__(self, max_size: int = MODEL_CACHE_SIZE):
+        self.max_size = max_size
+        self._models: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, path: Path) -> Optional[Any]:
+        """Model stored at path, or None if there is no such file"""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        key = (str(path), mtime)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+
+        model = joblib.load(path)
+        with self._lock:
+            self.loads += 1
+            self._drop(str(path))
+            self._models[key] = model
+            while len(self._models) > self.max_size:
+                self._models.popitem(last=False)
+        return model
+
+    def invalidate(self, path: Optional[Path] = None):
+        """Forget the cached model for path (all models when path is None)"""
+        with self._lock:
+            if path is None:
+                self._models.clear()
+            else:
+                self._drop(str(path))
+
+    def _drop(self, path: str):
+        for key in [key for key in self._models if key[0] == path]:
+            del self._models[key]
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+_model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _model_registry
+
+
 async def _extract_features(telemetry_records: List[Telemetry]) -> np.ndarray:
     """
     Extract feature matrix from telemetry records.
@@ -105,6 +172,208 @@ async def _extract_features(telemetry_records: List[Telemetry]) -> np.ndarray:
     return np.array(features)
 
 
+def _isolation_forest_params() -> Dict[str, Any]:
+    return {
+        "contamination": CONTAMINATION,
+        "n_estimators": N_ESTIMATORS,
+        "random_state": RANDOM_STATE,
+    }
+
+
+def _training_workers() -> Optional[int]:
+    """Configured training process count (None = ml_training default)"""
+    from core.config import app_config
+
+    try:
+        workers = int(app_config.get("ml.training_workers", 0) or 0)
+    except (TypeError, ValueError):
+        workers = 0
+    return workers if workers > 0 else None
+
+
+def _feature_columns(columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column-wise equivalent of _extract_features().
+
+    Returns:
+        (mask of complete rows, float32 feature matrix of those rows)
+    """
+    def _truthy(values: np.ndarray) -> np.ndarray:
+        return ~np.isnan(values) & (values != 0)
+
+    unit_names, unit_inverse = np.unique(columns["unit"], return_inverse=True)
+    unit_factors = np.array([_convert_to_ths(1.0, unit) for unit in unit_names])
+    hashrate_ths = columns["hashrate"] * unit_factors[unit_inverse]
+    power = columns["power"]
+    temp = columns["temp"]
+    accepted = np.nan_to_num(columns["accepted"])
+    rejected = np.nan_to_num(columns["rejected"])
+    total_shares = accepted + rejected
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w_per_th = power / hashrate_ths
+        reject_rate = np.where(total_shares > 0, rejected / total_shares * 100, 0.0)
+
+    # Only include records with complete data
+    mask = (hashrate_ths > 0) & _truthy(power) & _truthy(w_per_th) & _truthy(temp)
+    X = np.column_stack([hashrate_ths, power, w_per_th, temp, reject_rate])[mask]
+    return mask, X.astype(np.float32)
+
+
+async def _load_training_features(
+    db: AsyncSession,
+    miner_ids: List[int],
+    window_days: int
+) -> Dict[Tuple[int, Optional[str]], Tuple[int, np.ndarray]]:
+    """
+    Read the training window once for all miners.
+
+    Returns:
+        (miner_id, mode) -> (telemetry sample count, complete feature rows)
+    """
+    from core.anomaly_detection import _load_baseline_columns
+
+    columns, groups = await _load_baseline_columns(db, miner_ids, window_days * 24)
+    if not groups:
+        return {}
+
+    mask, X = _feature_columns(columns)
+    sample_counts = np.bincount(columns["group"], minlength=len(groups))
+    complete_groups = columns["group"][mask]
+    order = np.argsort(complete_groups, kind="stable")
+    bounds = np.searchsorted(complete_groups[order], np.arange(len(groups) + 1))
+    X = X[order]
+    return {
+        group: (int(sample_counts[i]), X[bounds[i]:bounds[i + 1]])
+        for i, group in enumerate(groups)
+    }
+
+
+def _type_training_job(
+    miner_type: str,
+    miner_ids: List[int],
+    features: Dict[Tuple[int, Optional[str]], Tuple[int, np.ndarray]],
+    window_days: int
+) -> Optional[TrainingJob]:
+    """Training job for a miner type, or None if there is not enough data"""
+    ids = set(miner_ids)
+    groups = [key for key in features if key[0] in ids]
+    sample_count = sum(features[key][0] for key in groups)
+
+    if sample_count < MIN_SAMPLES_TYPE_MODEL:
+        logger.warning(
+            f"Insufficient data for {miner_type}: {sample_count} samples "
+            f"(need {MIN_SAMPLES_TYPE_MODEL})"
+        )
+        return None
+
+    X = np.concatenate([features[key][1] for key in groups])
+    if len(X) < MIN_SAMPLES_TYPE_MODEL:
+        logger.warning(f"Insufficient complete records for {miner_type}: {len(X)}")
+        return None
+
+    return TrainingJob(
+        key=f"type:{miner_type}",
+        model_path=_get_type_model_path(miner_type),
+        X=X,
+        metadata={
+            "miner_type": miner_type,
+            "window_days": window_days,
+            "contamination": CONTAMINATION,
+            "n_estimators": N_ESTIMATORS,
+            "feature_names": FEATURE_NAMES,
+            "miner_count": len(miner_ids),
+        },
+        params=_isolation_forest_params(),
+    )
+
+
+def _miner_training_jobs(
+    miner: Miner,
+    features: Dict[Tuple[int, Optional[str]], Tuple[int, np.ndarray]],
+    window_days: int
+) -> List[TrainingJob]:
+    """
+    Per-miner-per-mode training jobs.
+
+    Each mode the miner uses gets its own model ("miner_1_low.pkl",
+    "miner_5_eco.pkl", ...) once that mode alone has MIN_SAMPLES_PER_MINER
+    samples; miners without mode info (NMMiner) get a single model.
+    """
+    # Check age threshold
+    miner_age_days = (datetime.utcnow() - miner.created_at).days
+    if miner_age_days < MIN_DAYS_PER_MINER:
+        logger.info(
+            f"Miner {miner.id} too young: {miner_age_days} days "
+            f"(need {MIN_DAYS_PER_MINER})"
+        )
+        return []
+
+    by_mode = {mode: rows for (miner_id, mode), rows in features.items() if miner_id == miner.id}
+    sample_count = sum(count for count, _ in by_mode.values())
+    if sample_count < MIN_SAMPLES_PER_MINER:
+        logger.info(
+            f"Insufficient data for miner {miner.id}: {sample_count} samples "
+            f"(need {MIN_SAMPLES_PER_MINER})"
+        )
+        return []
+
+    def _job(mode: Optional[str], X: np.ndarray) -> TrainingJob:
+        return TrainingJob(
+            key=f"miner:{miner.id}:{mode}" if mode else f"miner:{miner.id}",
+            model_path=_get_miner_model_path(miner.id, mode),
+            X=X,
+            metadata={
+                "miner_id": miner.id,
+                "miner_type": miner.miner_type,
+                "mode": mode,
+                "window_days": window_days,
+                "contamination": CONTAMINATION,
+                "n_estimators": N_ESTIMATORS,
+                "feature_names": FEATURE_NAMES,
+            },
+            params=_isolation_forest_params(),
+        )
+
+    modes = [mode for mode in by_mode if mode]
+    if not modes:
+        # No mode info - train single model for whole miner (NMMiner case)
+        X = np.concatenate([rows for _, rows in by_mode.values()])
+        if len(X) < MIN_SAMPLES_PER_MINER:
+            logger.warning(f"Insufficient complete records for miner {miner.id}: {len(X)}")
+            return []
+        return [_job(None, X)]
+
+    jobs = []
+    for mode in modes:
+        mode_count, X = by_mode[mode]
+        if mode_count < MIN_SAMPLES_PER_MINER:
+            logger.info(
+                f"Skipping miner {miner.id} mode '{mode}': {mode_count} samples "
+                f"(need {MIN_SAMPLES_PER_MINER})"
+            )
+            continue
+        if len(X) < MIN_SAMPLES_PER_MINER:
+            logger.warning(
+                f"Insufficient complete records for miner {miner.id} mode '{mode}': {len(X)}"
+            )
+            continue
+        jobs.append(_job(mode, X))
+
+    if not jobs:
+        logger.info(f"Miner {miner.id}: no modes had sufficient data")
+    return jobs
+
+
+async def _run_training_jobs(jobs: List[TrainingJob]) -> Dict[str, int]:
+    """Fit jobs on the training process pool; returns job key -> sample count"""
+    results = await get_ml_training_service().run(jobs, workers=_training_workers())
+    registry = get_model_registry()
+    for job in jobs:
+        registry.invalidate(job.model_path)
+    return results
+
+
 async def train_type_model(
     db: AsyncSession,
     miner_type: str,
@@ -122,86 +391,30 @@ async def train_type_model(
     
     logger.info(f"Training type model for {miner_type}")
     
-    # Get all miners of this type
     result = await db.execute(
-        select(Miner).where(
+        select(Miner.id).where(
             and_(
                 Miner.miner_type == miner_type,
                 Miner.enabled == True
             )
         )
     )
-    miners = result.scalars().all()
-    
-    if not miners:
+    miner_ids = list(result.scalars().all())
+    if not miner_ids:
         logger.warning(f"No miners of type {miner_type}")
         return None
     
-    # Get telemetry from all miners of this type
-    miner_ids = [m.id for m in miners]
-    cutoff = datetime.utcnow() - timedelta(days=window_days)
-    
-    result = await db.execute(
-        select(Telemetry)
-        .where(
-            and_(
-                Telemetry.miner_id.in_(miner_ids),
-                Telemetry.timestamp >= cutoff,
-                Telemetry.hashrate.isnot(None),
-                Telemetry.hashrate > 0
-            )
-        )
-    )
-    telemetry_records = result.scalars().all()
-    
-    if len(telemetry_records) < MIN_SAMPLES_TYPE_MODEL:
-        logger.warning(
-            f"Insufficient data for {miner_type}: {len(telemetry_records)} samples "
-            f"(need {MIN_SAMPLES_TYPE_MODEL})"
-        )
+    features = await _load_training_features(db, miner_ids, window_days)
+    job = _type_training_job(miner_type, miner_ids, features, window_days)
+    if job is None:
         return None
     
-    # Extract features
-    X = await _extract_features(telemetry_records)
-    
-    if len(X) < MIN_SAMPLES_TYPE_MODEL:
-        logger.warning(f"Insufficient complete records for {miner_type}: {len(X)}")
+    results = await _run_training_jobs([job])
+    if job.key not in results:
         return None
     
-    # Train Isolation Forest
-    model = IsolationForest(
-        contamination=CONTAMINATION,
-        n_estimators=N_ESTIMATORS,
-        random_state=RANDOM_STATE,
-        n_jobs=-1
-    )
-    
-    model.fit(X)
-    
-    # Save model
-    model_path = _get_type_model_path(miner_type)
-    joblib.dump(model, model_path)
-    
-    # Save metadata
-    metadata = {
-        "miner_type": miner_type,
-        "trained_at": datetime.utcnow().isoformat(),
-        "sample_count": len(X),
-        "window_days": window_days,
-        "contamination": CONTAMINATION,
-        "n_estimators": N_ESTIMATORS,
-        "feature_names": ["hashrate_ths", "power_watts", "w_per_th", "temp", "reject_rate"]
-    }
-    
-    meta_path = _get_metadata_path(model_path)
-    with open(meta_path, "wb") as f:
-        pickle.dump(metadata, f)
-    
-    logger.info(
-        f"✅ Trained {miner_type} model: {len(X)} samples from {len(miner_ids)} miners"
-    )
-    
-    return metadata
+    logger.info(f"✅ Trained {miner_type} model: {results[job.key]} samples from {len(miner_ids)} miners")
+    return {**job.metadata, "sample_count": results[job.key]}
 
 
 async def train_miner_model(
@@ -212,174 +425,120 @@ async def train_miner_model(
     """
     Train per-miner-per-mode anomaly detection models.
     
-    NEW APPROACH: Train separate models for each mode the miner uses.
-    - "miner_1_low.pkl" for Avalon Nano in low mode
-    - "miner_1_med.pkl" for Avalon Nano in med mode
-    - "miner_5_eco.pkl" for Bitaxe in eco mode
-    
-    Each mode-specific model only needs MIN_SAMPLES_PER_MINER samples
-    in THAT mode, making training achievable in ~2 weeks per mode.
-    
     Returns:
-        Model metadata dict with per-mode training results
+        {"miner_id", "trained_modes": [(mode, samples), ...]} or None if no
+        model had sufficient data
     """
     if not SKLEARN_AVAILABLE:
         return None
     
     logger.info(f"Training per-miner model for miner {miner_id}")
     
-    # Get miner
     result = await db.execute(select(Miner).where(Miner.id == miner_id))
     miner = result.scalar_one_or_none()
     if not miner:
         logger.warning(f"Miner {miner_id} not found")
         return None
     
-    # Check age threshold
-    miner_age_days = (datetime.utcnow() - miner.created_at).days
-    if miner_age_days < MIN_DAYS_PER_MINER:
-        logger.info(
-            f"Miner {miner_id} too young: {miner_age_days} days "
-            f"(need {MIN_DAYS_PER_MINER})"
-        )
+    features = await _load_training_features(db, [miner_id], window_days)
+    jobs = _miner_training_jobs(miner, features, window_days)
+    if not jobs:
         return None
     
-    # Get telemetry
-    cutoff = datetime.utcnow() - timedelta(days=window_days)
-    
-    result = await db.execute(
-        select(Telemetry)
-        .where(
-            and_(
-                Telemetry.miner_id == miner_id,
-                Telemetry.timestamp >= cutoff,
-                Telemetry.hashrate.isnot(None),
-                Telemetry.hashrate > 0
-            )
-        )
-    )
-    telemetry_records = result.scalars().all()
-    
-    if len(telemetry_records) < MIN_SAMPLES_PER_MINER:
-        logger.info(
-            f"Insufficient data for miner {miner_id}: {len(telemetry_records)} samples "
-            f"(need {MIN_SAMPLES_PER_MINER})"
-        )
+    results = await _run_training_jobs(jobs)
+    trained_modes = [(job.metadata["mode"], results[job.key]) for job in jobs if job.key in results]
+    if not trained_modes:
         return None
     
-    # Group by mode
-    modes = set(r.mode for r in telemetry_records if r.mode)
-    
-    if not modes:
-        # No mode info - train single model for whole miner (NMMiner case)
-        logger.info(f"Training single model for miner {miner_id} (no modes)")
-        X = await _extract_features(telemetry_records)
-        
-        if len(X) < MIN_SAMPLES_PER_MINER:
-            logger.warning(f"Insufficient complete records for miner {miner_id}: {len(X)}")
-            return None
-        
-        model = IsolationForest(
-            contamination=CONTAMINATION,
-            n_estimators=N_ESTIMATORS,
-            random_state=RANDOM_STATE,
-            n_jobs=-1
-        )
-        model.fit(X)
-        
-        model_path = _get_miner_model_path(miner_id)
-        joblib.dump(model, model_path)
-        
-        metadata = {
-            "miner_id": miner_id,
-            "miner_type": miner.miner_type,
-            "mode": None,
-            "trained_at": datetime.utcnow().isoformat(),
-            "sample_count": len(X),
-            "window_days": window_days,
-            "contamination": CONTAMINATION,
-            "n_estimators": N_ESTIMATORS,
-            "feature_names": ["hashrate_ths", "power_watts", "w_per_th", "temp", "reject_rate"]
-        }
-        
-        meta_path = _get_metadata_path(model_path)
-        with open(meta_path, "wb") as f:
-            pickle.dump(metadata, f)
-        
-        logger.info(f"✅ Trained miner {miner_id} model: {len(X)} samples")
-        return metadata
-    
-    # Train per-mode models
-    trained_modes = []
-    skipped_modes = []
-    
-    for mode in modes:
-        mode_records = [r for r in telemetry_records if r.mode == mode]
-        
-        if len(mode_records) < MIN_SAMPLES_PER_MINER:
-            logger.info(
-                f"Skipping miner {miner_id} mode '{mode}': {len(mode_records)} samples "
-                f"(need {MIN_SAMPLES_PER_MINER})"
-            )
-            skipped_modes.append((mode, len(mode_records)))
+    logger.info(f"✅ Miner {miner_id}: trained {len(trained_modes)} model(s)")
+    return {"miner_id": miner_id, "trained_modes": trained_modes}
+
+
+def _normalize_score(raw_score: float) -> float:
+    """Map decision_function output to 0.0 (normal) - 1.0 (highly anomalous)"""
+    return max(0.0, min(1.0, (-raw_score + 0.5)))
+
+
+def _candidate_models(miner_id: int, miner_type: str, mode: Optional[str]) -> List[Tuple[str, Path]]:
+    """Model files to try for a miner, most specific first"""
+    candidates = []
+    if mode:
+        candidates.append(("per-miner-mode", _get_miner_model_path(miner_id, mode)))
+    candidates.append(("per-miner", _get_miner_model_path(miner_id)))
+    candidates.append(("type model", _get_type_model_path(miner_type)))
+    return candidates
+
+
+def _select_model(miner_id: int, miner_type: str, mode: Optional[str]) -> Optional[Tuple[str, Path, Any]]:
+    """
+    Pick the model for a miner using the hybrid fallback:
+    per-miner-mode → per-miner → type model.
+    """
+    registry = get_model_registry()
+    for label, path in _candidate_models(miner_id, miner_type, mode):
+        try:
+            model = registry.get(path)
+        except Exception as e:
+            logger.warning(f"Failed to load {label} model {path.name} for miner {miner_id}: {e}")
             continue
-        
-        # Extract features for this mode
-        X = await _extract_features(mode_records)
-        
-        if len(X) < MIN_SAMPLES_PER_MINER:
-            logger.warning(
-                f"Insufficient complete records for miner {miner_id} mode '{mode}': {len(X)}"
-            )
-            skipped_modes.append((mode, len(X)))
+        if model is not None:
+            return label, path, model
+    return None
+
+
+async def predict_anomaly_scores(
+    miners: Iterable[Miner],
+    recent_by_miner: Dict[int, List[Telemetry]]
+) -> Dict[int, Optional[float]]:
+    """
+    Score many miners at once.
+
+    Each miner's recent samples are averaged into one feature row; rows that
+    resolve to the same model (e.g. every miner sharing a type model) are
+    scored with a single decision_function call.
+
+    Returns:
+        Dict of miner_id -> anomaly score (0.0-1.0) or None
+    """
+    scores: Dict[int, Optional[float]] = {}
+    if not SKLEARN_AVAILABLE:
+        return scores
+
+    batches: Dict[Path, Tuple[Any, str, List[int], List[np.ndarray]]] = {}
+    for miner in miners:
+        scores[miner.id] = None
+        recent_telemetry = recent_by_miner.get(miner.id) or []
+
+        # Extract features from recent telemetry
+        X = await _extract_features(recent_telemetry)
+        if len(X) == 0:
             continue
-        
-        # Train Isolation Forest for this mode
-        model = IsolationForest(
-            contamination=CONTAMINATION,
-            n_estimators=N_ESTIMATORS,
-            random_state=RANDOM_STATE,
-            n_jobs=-1
-        )
-        model.fit(X)
-        
-        # Save model
-        model_path = _get_miner_model_path(miner_id, mode)
-        joblib.dump(model, model_path)
-        
-        # Save metadata
-        metadata = {
-            "miner_id": miner_id,
-            "miner_type": miner.miner_type,
-            "mode": mode,
-            "trained_at": datetime.utcnow().isoformat(),
-            "sample_count": len(X),
-            "window_days": window_days,
-            "contamination": CONTAMINATION,
-            "n_estimators": N_ESTIMATORS,
-            "feature_names": ["hashrate_ths", "power_watts", "w_per_th", "temp", "reject_rate"]
-        }
-        
-        meta_path = _get_metadata_path(model_path)
-        with open(meta_path, "wb") as f:
-            pickle.dump(metadata, f)
-        
-        trained_modes.append((mode, len(X)))
-        logger.info(f"✅ Trained miner {miner_id} mode '{mode}': {len(X)} samples")
-    
-    if trained_modes:
-        logger.info(
-            f"✅ Miner {miner_id}: trained {len(trained_modes)} modes, "
-            f"skipped {len(skipped_modes)} modes"
-        )
-        return {
-            "miner_id": miner_id,
-            "trained_modes": trained_modes,
-            "skipped_modes": skipped_modes
-        }
-    else:
-        logger.info(f"Miner {miner_id}: no modes had sufficient data")
-        return None
+
+        # Get current mode from most recent telemetry
+        current_mode = recent_telemetry[0].mode if recent_telemetry[0].mode else None
+
+        selected = _select_model(miner.id, miner.miner_type, current_mode)
+        if selected is None:
+            logger.debug(f"No ML model available for miner {miner.id}")
+            continue
+
+        label, path, model = selected
+        batch = batches.setdefault(path, (model, label, [], []))
+        batch[2].append(miner.id)
+        # Take average of recent samples (last 5 minutes typically)
+        batch[3].append(X.mean(axis=0))
+
+    for path, (model, label, miner_ids, rows) in batches.items():
+        try:
+            raw_scores = model.decision_function(np.vstack(rows))
+        except Exception as e:
+            logger.warning(f"Failed to score {len(miner_ids)} miner(s) with {path.name}: {e}")
+            continue
+        for miner_id, raw_score in zip(miner_ids, raw_scores):
+            scores[miner_id] = _normalize_score(float(raw_score))
+            logger.debug(f"Miner {miner_id} anomaly score ({label}): {scores[miner_id]:.3f}")
+
+    return scores
 
 
 async def predict_anomaly_score(
@@ -409,103 +568,70 @@ async def predict_anomaly_score(
     if not miner:
         return None
     
-    # Extract features from recent telemetry
-    X = await _extract_features(recent_telemetry)
-    if len(X) == 0:
-        return None
-    
-    # Take average of recent samples (last 5 minutes typically)
-    X_avg = X.mean(axis=0).reshape(1, -1)
-    
-    # Get current mode from most recent telemetry
-    current_mode = recent_telemetry[0].mode if recent_telemetry and recent_telemetry[0].mode else None
-    
-    # Try per-miner-per-mode model first (if mode exists)
-    if current_mode:
-        miner_mode_model_path = _get_miner_model_path(miner_id, current_mode)
-        if miner_mode_model_path.exists():
-            try:
-                model = joblib.load(miner_mode_model_path)
-                score = model.decision_function(X_avg)[0]
-                normalized_score = max(0.0, min(1.0, (-score + 0.5)))
-                
-                logger.debug(f"Miner {miner_id} mode '{current_mode}' anomaly score (per-miner-mode): {normalized_score:.3f}")
-                return normalized_score
-            except Exception as e:
-                logger.warning(f"Failed to load per-miner-mode model for {miner_id}/{current_mode}: {e}")
-    
-    # Fall back to per-miner model (no mode)
-    miner_model_path = _get_miner_model_path(miner_id)
-    if miner_model_path.exists():
-        try:
-            model = joblib.load(miner_model_path)
-            score = model.decision_function(X_avg)[0]
-            normalized_score = max(0.0, min(1.0, (-score + 0.5)))
-            
-            logger.debug(f"Miner {miner_id} anomaly score (per-miner): {normalized_score:.3f}")
-            return normalized_score
-        except Exception as e:
-            logger.warning(f"Failed to load per-miner model for {miner_id}: {e}")
-    
-    # Fall back to type model
-    type_model_path = _get_type_model_path(miner.miner_type)
-    if type_model_path.exists():
-        try:
-            model = joblib.load(type_model_path)
-            score = model.decision_function(X_avg)[0]
-            normalized_score = max(0.0, min(1.0, (-score + 0.5)))
-            
-            logger.debug(f"Miner {miner_id} anomaly score (type model): {normalized_score:.3f}")
-            return normalized_score
-        except Exception as e:
-            logger.warning(f"Failed to load type model for {miner.miner_type}: {e}")
-    
-    # No model available
-    logger.debug(f"No ML model available for miner {miner_id}")
-    return None
+    scores = await predict_anomaly_scores([miner], {miner_id: recent_telemetry})
+    return scores.get(miner_id)
 
 
-async def train_all_models(db: AsyncSession):
+async def train_all_models(db: AsyncSession, window_days: int = 30):
     """
     Train all type models and per-miner models.
     Called by weekly scheduler job.
+
+    The training window is read once; fitting runs on the ml_training process
+    pool so the event loop stays responsive. Progress and cancellation are
+    exposed through get_ml_training_service().
     """
     if not SKLEARN_AVAILABLE:
         logger.warning("scikit-learn not available, skipping ML training")
         return
     
-    logger.info("🤖 Starting ML model training (all types + per-miner)")
-    
-    # Get all unique miner types
-    result = await db.execute(
-        select(Miner.miner_type)
-        .where(Miner.enabled == True)
-        .distinct()
-    )
-    miner_types = [row[0] for row in result.all()]
-    
-    # Train type models
-    type_models_trained = 0
-    for miner_type in miner_types:
-        metadata = await train_type_model(db, miner_type)
-        if metadata:
-            type_models_trained += 1
-    
-    logger.info(f"✅ Trained {type_models_trained}/{len(miner_types)} type models")
+    service = get_ml_training_service()
+    if service.running:
+        logger.warning("ML model training already running, skipping")
+        return
     
-    # Train per-miner models (only for miners with sufficient data)
-    result = await db.execute(
-        select(Miner).where(Miner.enabled == True)
-    )
-    miners = result.scalars().all()
+    # Reserve the run before the (long) feature load so status, cancel and
+    # concurrent triggers all see it
+    async with service.reserve():
+        logger.info("🤖 Starting ML model training (all types + per-miner)")
+        
+        result = await db.execute(
+            select(Miner).where(Miner.enabled == True)
+        )
+        miners = result.scalars().all()
+        
+        miner_ids_by_type: Dict[str, List[int]] = {}
+        for miner in miners:
+            miner_ids_by_type.setdefault(miner.miner_type, []).append(miner.id)
+        
+        features = await service.prepare(
+            _load_training_features(db, [miner.id for miner in miners], window_days)
+        )
+        if features is None or service.cancel_requested:
+            logger.info("🤖 ML model training cancelled while loading training data")
+            return
+        
+        type_jobs = []
+        for miner_type, miner_ids in miner_ids_by_type.items():
+            job = _type_training_job(miner_type, miner_ids, features, window_days)
+            if job is not None:
+                type_jobs.append(job)
+        
+        # Per-miner models (only for miners with sufficient data)
+        miner_jobs = []
+        for miner in miners:
+            miner_jobs.extend(_miner_training_jobs(miner, features, window_days))
+        del features
+        
+        results = await _run_training_jobs(type_jobs + miner_jobs)
     
-    miner_models_trained = 0
-    for miner in miners:
-        metadata = await train_miner_model(db, miner.id)
-        if metadata:
-            miner_models_trained += 1
+    type_models_trained = sum(1 for job in type_jobs if job.key in results)
+    logger.info(f"✅ Trained {type_models_trained}/{len(miner_ids_by_type)} type models")
     
+    miner_models_trained = len({job.metadata["miner_id"] for job in miner_jobs if job.key in results})
     logger.info(f"✅ Trained {miner_models_trained}/{len(miners)} per-miner models")
+    # Models reload lazily from the freshly written files
+    get_model_registry().invalidate()
     logger.info("🤖 ML model training complete")
 
 
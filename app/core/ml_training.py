@@ -0,0 +1,240 @@
+"""
+Out-of-process IsolationForest training
+
+Fitting runs in a ProcessPoolExecutor so the weekly retrain does not block the
+event loop shared with telemetry collection, the API and strategy jobs. The
+parent builds compact float32 feature matrices (core.ml_anomaly) and submits
+one TrainingJob per model; workers fit, write the model and its metadata, and
+return the sample count.
+
+Workers are started with the "spawn" method and only import this module, so
+they never inherit the parent's database connections, locks or threads.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+from contextlib import asynccontextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class TrainingJob:
+    """One model to fit: where it goes, its feature matrix and metadata"""
+    key: str
+    model_path: Path
+    X: np.ndarray
+    metadata: Dict[str, Any]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def fit_isolation_forest(
+    model_path: str,
+    X: np.ndarray,
+    metadata: Dict[str, Any],
+    params: Dict[str, Any]
+) -> int:
+    """Worker entry point: fit, persist model + metadata, return the sample count"""
+    from sklearn.ensemble import IsolationForest
+
+    # Parallelism comes from the pool, one core per fit
+    model = IsolationForest(n_jobs=1, **params)
+    model.fit(X)
+
+    model_path = Path(model_path)
+    joblib.dump(model, model_path)
+
+    metadata = dict(metadata)
+    metadata["trained_at"] = datetime.utcnow().isoformat()
+    metadata["sample_count"] = len(X)
+    with open(model_path.with_suffix(".meta"), "wb") as f:
+        pickle.dump(metadata, f)
+    return len(X)
+
+
+def default_worker_count() -> int:
+    """Leave one core for the event loop"""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class MLTrainingService:
+    """
+    Runs training jobs on a process pool and tracks progress.
+
+    Only one run at a time. The pool exists for the duration of a run.
+    cancel() drops jobs that have not started; fits already running finish
+    and are counted.
+
+    Callers that prepare their jobs first (e.g. loading the feature window)
+    hold the run with ``async with service.reserve()`` from the start, and
+    wrap the preparation in prepare() so cancel() can interrupt it.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._holder: Optional[asyncio.Task] = None
+        self._prepare_task: Optional[asyncio.Future] = None
+        self._futures: List[Future] = []
+        self._cancel_requested = False
+        self._status: Dict[str, Any] = {"state": "idle"}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def status(self) -> Dict[str, Any]:
+        status = dict(self._status)
+        status["running_jobs"] = list(status.get("running_jobs", []))
+        return status
+
+    def cancel(self) -> bool:
+        """Request cancellation of the current run (False if nothing is running)"""
+        if not self.running:
+            return False
+        self._cancel_requested = True
+        self._status["state"] = "cancelling"
+        if self._prepare_task is not None:
+            self._prepare_task.cancel()
+        dropped = sum(1 for future in self._futures if future.cancel())
+        logger.info(f"ML training cancellation requested ({dropped} pending job(s) dropped)")
+        return True
+
+    @asynccontextmanager
+    async def reserve(self):
+        """Hold the single training run, from job preparation through fitting"""
+        if self.running:
+            raise RuntimeError("ML training is already running")
+
+        async with self._lock:
+            self._holder = asyncio.current_task()
+            self._cancel_requested = False
+            self._status = {
+                "state": "preparing",
+                "total_jobs": 0,
+                "completed_jobs": 0,
+                "failed_jobs": 0,
+                "cancelled_jobs": 0,
+                "running_jobs": [],
+                "workers": None,
+                "started_at": datetime.utcnow().isoformat(),
+                "finished_at": None,
+            }
+            try:
+                yield self
+            except BaseException:
+                self._status["state"] = "failed"
+                self._status["finished_at"] = datetime.utcnow().isoformat()
+                raise
+            finally:
+                self._holder = None
+            if self._status["state"] in ("preparing", "cancelling"):
+                # Nothing was fitted (cancelled or no jobs)
+                self._finish({})
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested
+
+    async def prepare(self, awaitable: Awaitable[T]) -> Optional[T]:
+        """Await a preparation step of the reserved run; None if cancel() interrupted it"""
+        task = asyncio.ensure_future(awaitable)
+        self._prepare_task = task
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            self._prepare_task = None
+        if task.cancelled():
+            return None
+        return task.result()
+
+    async def run(self, jobs: List[TrainingJob], workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Fit all jobs in parallel (within the caller's reserve(), or as a run of its own).
+
+        Returns:
+            Dict of job key -> sample count for every model written
+        """
+        if self._holder is not None and self._holder is asyncio.current_task():
+            return await self._run_jobs(jobs, workers)
+        async with self.reserve():
+            return await self._run_jobs(jobs, workers)
+
+    async def _run_jobs(self, jobs: List[TrainingJob], workers: Optional[int]) -> Dict[str, int]:
+        workers = max(1, min(workers or default_worker_count(), len(jobs) or 1))
+        self._status.update({
+            "state": "cancelling" if self._cancel_requested else "running",
+            "total_jobs": len(jobs),
+            "workers": workers,
+        })
+        results: Dict[str, int] = {}
+        if self._cancel_requested:
+            self._status["cancelled_jobs"] += len(jobs)
+            return self._finish(results)
+        if not jobs:
+            return self._finish(results)
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            pending = {}
+            for job in jobs:
+                future = executor.submit(
+                    fit_isolation_forest, str(job.model_path), job.X, job.metadata, job.params
+                )
+                self._futures.append(future)
+                pending[asyncio.wrap_future(future)] = job
+            self._status["running_jobs"] = [job.key for job in jobs[:workers]]
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    if future.cancelled():
+                        self._status["cancelled_jobs"] += 1
+                        continue
+                    try:
+                        results[job.key] = future.result()
+                        self._status["completed_jobs"] += 1
+                    except Exception as e:
+                        self._status["failed_jobs"] += 1
+                        logger.error(f"ML training job {job.key} failed: {e}")
+                self._status["running_jobs"] = [
+                    pending[future].key for future in pending
+                ][:workers]
+        finally:
+            self._futures = []
+            # Never wait on the pool from the event loop
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._finish(results)
+
+    def _finish(self, results: Dict[str, int]) -> Dict[str, int]:
+        self._status["state"] = "cancelled" if self._cancel_requested else "completed"
+        self._status["running_jobs"] = []
+        self._status["finished_at"] = datetime.utcnow().isoformat()
+        return results
+
+
+# Global instance
+_ml_training_service = MLTrainingService()
+
+
+def get_ml_training_service() -> MLTrainingService:
+    return _ml_training_service
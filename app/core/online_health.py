@@ -0,0 +1,267 @@
+"""
+Online miner health scoring on the telemetry ingest path
+
+Instead of re-reading a telemetry window per miner every few minutes, each
+reading is scored as it is collected:
+
+- current metric values are exponentially weighted moving averages (reset when
+  the miner changes mode), standing in for the old 5-minute window mean;
+- baselines are kept per (mode, metric) as streaming median/MAD estimates,
+  seeded from MinerBaseline and nudged towards new readings by a bounded,
+  sign-based step; readings outside the 3-MAD band, or taken while the miner
+  is flagged, are not learned, so a sustained fault keeps being flagged;
+- the result goes through the same rules as the batch check
+  (anomaly_detection.evaluate_health) and MinerHealthCurrent is updated when
+  the status or reason codes change. HealthEvent history is left to the
+  5-minute health check, which also refreshes scores in between.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.anomaly_detection import (
+    BASELINE_WINDOW_24H,
+    MIN_SAMPLES_FOR_BASELINE,
+    REASON_INSUFFICIENT_DATA,
+    _convert_to_ths,
+    calculate_median_mad,
+    evaluate_health,
+    insufficient_baseline_health,
+    record_health,
+)
+from core.database import AsyncSessionLocal, MinerBaseline
+
+logger = logging.getLogger(__name__)
+
+EWMA_ALPHA = 0.3  # ~5 readings of memory for current values
+BASELINE_STEP = 0.05  # Fraction of the anchored MAD a baseline median moves per reading
+BASELINE_BAND_MADS = 3  # Readings further than this many MADs from the median are not learned
+MAD_GROWTH_CAP = 2.0  # A streaming MAD never exceeds this multiple of its anchored value
+
+
+class RobustStat:
+    """
+    Streaming median/MAD estimate.
+
+    The first MIN_SAMPLES_FOR_BASELINE values are kept and summarised exactly;
+    after that median and MAD each move by a fixed step (a fraction of the MAD
+    they were anchored with) towards every new value, and the MAD is capped at
+    MAD_GROWTH_CAP times its anchored value.
+    """
+
+    __slots__ = ("median", "mad", "count", "_warmup", "_scale")
+
+    def __init__(self, median: Optional[float] = None, mad: float = 0.0, count: int = 0):
+        self.median = median
+        self.mad = mad
+        self.count = count
+        self._warmup: Optional[List[float]] = [] if median is None else None
+        self._scale = self._anchor_scale() if median is not None else 0.0
+
+    def _anchor_scale(self) -> float:
+        return max(self.mad, abs(self.median) * 0.001, 1e-9)
+
+    @property
+    def ready(self) -> bool:
+        return self.median is not None and self.count >= MIN_SAMPLES_FOR_BASELINE
+
+    def within_band(self, value: float, mads: float = BASELINE_BAND_MADS) -> bool:
+        """Whether value lies inside the median +/- mads * MAD band"""
+        if self.median is None:
+            return True
+        return abs(value - self.median) <= mads * max(self.mad, abs(self.median) * 0.001, 1e-9)
+
+    def update(self, value: float, step: float = BASELINE_STEP):
+        self.count += 1
+        if self._warmup is not None:
+            self._warmup.append(value)
+            if len(self._warmup) >= MIN_SAMPLES_FOR_BASELINE:
+                self.median, self.mad = calculate_median_mad(self._warmup)
+                self._warmup = None
+                self._scale = self._anchor_scale()
+            return
+
+        scale = self._scale * step
+        if value > self.median:
+            self.median += scale
+        elif value < self.median:
+            self.median -= scale
+        deviation = abs(value - self.median)
+        if deviation > self.mad:
+            self.mad = min(self.mad + scale, self._scale * MAD_GROWTH_CAP)
+        elif deviation < self.mad:
+            self.mad = max(0.0, self.mad - scale)
+
+
+def _reading_metrics(reading: Dict[str, Any]) -> Dict[str, float]:
+    """Baseline metric values carried by one telemetry reading"""
+    metrics: Dict[str, float] = {}
+    hashrate = reading.get("hashrate")
+    power = reading.get("power_watts")
+    if hashrate and hashrate > 0:
+        hashrate_ths = _convert_to_ths(hashrate, reading.get("hashrate_unit") or "GH/s")
+        metrics["hashrate_mean"] = hashrate_ths
+        if power and power > 0 and hashrate_ths > 0:
+            metrics["power_mean"] = power
+            metrics["w_per_th"] = power / hashrate_ths
+    temperature = reading.get("temperature")
+    if temperature:
+        metrics["temp_mean"] = temperature
+    accepted = reading.get("shares_accepted")
+    rejected = reading.get("shares_rejected")
+    if accepted is not None and rejected is not None and accepted + rejected > 0:
+        metrics["reject_rate"] = rejected / (accepted + rejected) * 100
+    return metrics
+
+
+class _MinerState:
+    __slots__ = ("mode", "current", "baselines", "health", "signature")
+
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self.current: Dict[str, float] = {}
+        self.baselines: Dict[Tuple[Optional[str], str], RobustStat] = {}
+        self.health: Optional[Dict] = None
+        self.signature: Optional[tuple] = None
+
+
+class OnlineHealthScorer:
+    """Per-miner rolling health state, updated from each telemetry reading"""
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self._miners: Dict[int, _MinerState] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def _state(self, miner_id: int) -> _MinerState:
+        state = self._miners.get(miner_id)
+        if state is None:
+            state = self._miners[miner_id] = _MinerState()
+        return state
+
+    async def ensure_loaded(self, db: AsyncSession) -> "OnlineHealthScorer":
+        """Seed baselines from MinerBaseline once per process"""
+        if self._loaded:
+            return self
+        async with self._load_lock:
+            if not self._loaded:
+                result = await db.execute(
+                    select(MinerBaseline).where(MinerBaseline.window_hours == BASELINE_WINDOW_24H)
+                )
+                for row in result.scalars().all():
+                    self._state(row.miner_id).baselines.setdefault(
+                        (row.mode, row.metric_name),
+                        RobustStat(row.median_value, row.mad_value, row.sample_count),
+                    )
+                self._loaded = True
+                logger.info("Online health scorer seeded for %s miner(s)", len(self._miners))
+        return self
+
+    def load_baselines(self, baselines: Dict[int, Dict[Tuple[Optional[str], str], Dict]]):
+        """Reset streaming baselines to freshly computed batch values"""
+        for miner_id, miner_baselines in baselines.items():
+            state = self._state(miner_id)
+            for key, stats in miner_baselines.items():
+                state.baselines[key] = RobustStat(stats["median"], stats["mad"], stats["samples"])
+
+    def score(self, reading: Dict[str, Any]) -> Dict:
+        """Fold one reading into the miner's state and return its canonical MinerHealth"""
+        miner_id = reading["miner_id"]
+        mode = reading.get("mode")
+        state = self._state(miner_id)
+        if mode != state.mode:
+            state.mode = mode
+            state.current = {}
+
+        metrics = _reading_metrics(reading)
+        for name, value in metrics.items():
+            previous = state.current.get(name)
+            state.current[name] = value if previous is None else previous + self.alpha * (value - previous)
+
+        # Score against the baselines as they were before this reading
+        ready = {
+            metric: (stat.median, stat.mad)
+            for (stat_mode, metric), stat in state.baselines.items()
+            if stat_mode == mode and stat.ready
+        }
+        # Faults must not teach themselves into the baseline
+        flagged = state.health is not None and any(
+            reason["code"] != REASON_INSUFFICIENT_DATA for reason in state.health["reasons"]
+        )
+        for name, value in metrics.items():
+            stat = state.baselines.get((mode, name))
+            if stat is None:
+                stat = state.baselines[(mode, name)] = RobustStat()
+            if stat.ready and (flagged or not stat.within_band(value)):
+                continue
+            stat.update(value)
+
+        if ready:
+            current = state.current
+            health = evaluate_health(
+                miner_id,
+                mode,
+                ready,
+                current.get("hashrate_mean"),
+                current.get("power_mean"),
+                current.get("temp_mean"),
+                current.get("reject_rate", 0),
+            )
+        else:
+            samples = max(
+                (stat.count for (stat_mode, _), stat in state.baselines.items() if stat_mode == mode),
+                default=0,
+            )
+            health = insufficient_baseline_health(miner_id, mode, samples)
+
+        state.health = health
+        return health
+
+    def latest(self, miner_id: int) -> Optional[Dict]:
+        """Most recent health computed for a miner (None before its first reading)"""
+        state = self._miners.get(miner_id)
+        return dict(state.health) if state is not None and state.health is not None else None
+
+    async def observe(self, db: AsyncSession, reading: Dict[str, Any]) -> Dict:
+        """
+        Score a reading and update MinerHealthCurrent when its status or
+        reason codes changed.
+
+        The row is upserted and committed in a session of its own, so a
+        rollback of the collector's session cannot lose a status change; the
+        change only counts as persisted once that commit succeeded.
+        """
+        await self.ensure_loaded(db)
+        health = self.score(reading)
+        state = self._miners[reading["miner_id"]]
+
+        signature = (health["status"], tuple(reason["code"] for reason in health["reasons"]))
+        if signature != state.signature:
+            async with AsyncSessionLocal() as session:
+                await record_health(session, health, update_anomaly_score=False, append_event=False)
+                await session.commit()
+            state.signature = signature
+            if signature[0] != "healthy" and health["reasons"]:
+                logger.info(
+                    "Miner %s health %s/100 (%s): %s",
+                    health["miner_id"],
+                    health["health_score"],
+                    health["status"],
+                    ", ".join(signature[1]),
+                )
+        return health
+
+    def forget(self, miner_id: int):
+        self._miners.pop(miner_id, None)
+
+
+# Global instance
+_online_health_scorer = OnlineHealthScorer()
+
+
+def get_online_health_scorer() -> OnlineHealthScorer:
+    return _online_health_scorer
@@ -2,14 +2,75 @@
 Pool Health Monitoring Service
 """
 import asyncio
+import logging
+import random
 import socket
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import Pool, PoolHealth, Telemetry, Miner
+from core.database import AsyncSessionLocal, Pool, PoolHealth, Miner
+from core.pool_shares import get_pool_share_totals, reject_stats as _reject_stats
+
+logger = logging.getLogger(__name__)
+
+# Health checks accept dashboard tiles up to one monitoring interval old
+TILE_MAX_AGE_SECONDS = 300.0
+
+
+class _HostRateLimiter:
+    """Serialize requests to the same pool host and space them at least min_interval apart"""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_used: Dict[str, float] = {}
+    
+    @asynccontextmanager
+    async def slot(self, host: str):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self._last_used.get(host, 0.0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                self._last_used[host] = time.monotonic()
+
+
+def _api_host_key(pool: Pool) -> str:
+    """Rate-limit key for pool API calls: tiles are fetched from the pool driver's API, not the stratum host"""
+    driver = (pool.pool_config or {}).get("driver") or pool.pool_type
+    if not driver or driver == "unknown":
+        return f"api:{pool.url}"
+    return f"api:{driver}"
+
+
+def _tile_hashrate(tile) -> Optional[float]:
+    if not tile or tile.pool_hashrate is None:
+        return None
+    # Extract numeric value from structured format {display, value, unit}
+    return tile.pool_hashrate.get('value') if isinstance(tile.pool_hashrate, dict) else tile.pool_hashrate
+
+
+def _luck_from_reject_rate(reject_rate: Optional[float]) -> Optional[float]:
+    if reject_rate is None:
+        return None
+    
+    # Simple luck calculation: 100% minus half the reject rate
+    # This means 0% reject = 100% luck, 10% reject = 95% luck
+    # This is a placeholder - real luck needs block finding data
+    luck = 100 - (reject_rate * 0.5)
+    
+    # Add some randomness to simulate real pool luck variation
+    luck_variance = random.uniform(-5, 5)
+    luck = max(50, min(150, luck + luck_variance))
+    
+    return round(luck, 2)
 
 
 class PoolHealthService:
@@ -71,7 +132,7 @@ class PoolHealthService:
     @staticmethod
     async def calculate_pool_reject_rate(pool_id: int, db: AsyncSession, hours: int = 24) -> Dict[str, Any]:
         """
-        Calculate reject rate for a pool based on telemetry from miners using it
+        Calculate reject rate for a pool from the latest share counters of miners using it
         
         Returns:
             Dict with reject_rate, shares_accepted, shares_rejected
@@ -83,52 +144,9 @@ class PoolHealthService:
         if not pool:
             return {"error": "Pool not found"}
         
-        # Get telemetry from miners using this pool
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        pool_url = f"{pool.url}:{pool.port}"
-        
-        result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.timestamp >= cutoff)
-            .where(Telemetry.pool_in_use.like(f"%{pool.url}%"))
-            .order_by(Telemetry.timestamp.desc())
-        )
-        telemetry_data = result.scalars().all()
-        
-        if not telemetry_data:
-            return {
-                "reject_rate": None,
-                "shares_accepted": 0,
-                "shares_rejected": 0,
-                "error": "No telemetry data"
-            }
-        
-        # Calculate aggregate stats
-        total_accepted = 0
-        total_rejected = 0
-        
-        # Group by miner to get latest shares from each
-        miner_shares = {}
-        for telem in telemetry_data:
-            if telem.miner_id not in miner_shares:
-                miner_shares[telem.miner_id] = {
-                    "accepted": telem.shares_accepted or 0,
-                    "rejected": telem.shares_rejected or 0
-                }
-        
-        # Sum up shares
-        for shares in miner_shares.values():
-            total_accepted += shares["accepted"]
-            total_rejected += shares["rejected"]
-        
-        total_shares = total_accepted + total_rejected
-        reject_rate = (total_rejected / total_shares * 100) if total_shares > 0 else 0
-        
-        return {
-            "reject_rate": round(reject_rate, 2),
-            "shares_accepted": total_accepted,
-            "shares_rejected": total_rejected
-        }
+        # Latest share counters from each miner using this pool (maintained at ingest)
+        share_totals = await get_pool_share_totals(db, [pool.id], hours)
+        return _reject_stats(share_totals.get(pool.id))
     
     @staticmethod
     async def calculate_pool_luck(pool_id: int, db: AsyncSession, hours: int = 24) -> Optional[float]:
@@ -145,22 +163,7 @@ class PoolHealthService:
         - High reject rate = worse luck (fewer shares count)
         """
         reject_stats = await PoolHealthService.calculate_pool_reject_rate(pool_id, db, hours)
-        
-        if reject_stats.get("reject_rate") is None:
-            return None
-        
-        # Simple luck calculation: 100% minus half the reject rate
-        # This means 0% reject = 100% luck, 10% reject = 95% luck
-        # This is a placeholder - real luck needs block finding data
-        reject_rate = reject_stats["reject_rate"]
-        luck = 100 - (reject_rate * 0.5)
-        
-        # Add some randomness to simulate real pool luck variation
-        import random
-        luck_variance = random.uniform(-5, 5)
-        luck = max(50, min(150, luck + luck_variance))
-        
-        return round(luck, 2)
+        return _luck_from_reject_rate(reject_stats.get("reject_rate"))
     
     @staticmethod
     async def calculate_health_score(
@@ -222,83 +225,161 @@ class PoolHealthService:
         if not pool:
             return {"error": "Pool not found"}
         
-        # Check connectivity
-        connectivity = await PoolHealthService.check_pool_connectivity(pool)
+        results = await PoolHealthService.monitor_pools(db, [pool])
+        return results[0]
+    
+    @staticmethod
+    async def monitor_pools(
+        db: AsyncSession,
+        pools: Optional[List[Pool]] = None,
+        concurrency: int = 8,
+        per_host_interval: float = 1.0,
+        tile_max_age: float = TILE_MAX_AGE_SECONDS
+    ) -> List[Dict[str, Any]]:
+        """
+        Health check many pools concurrently and record all metrics in one transaction
+        
+        - Reject rates (from the per-pool share counters) and recent failure
+          counts come from one query each for all pools
+        - Connectivity checks and pool hashrate lookups run in parallel, at most
+          `concurrency` network calls at a time; calls to the same host (the
+          stratum host for connectivity, the pool driver's API for hashrate)
+          are made one at a time, `per_host_interval` seconds apart
+        - Pool hashrate is taken from the dashboard tile cache when it is less
+          than `tile_max_age` seconds old, otherwise fetched once and cached
+        
+        Args:
+            db: Database session (used for the batch queries and the final commit)
+            pools: Pools to check (defaults to all enabled pools)
+        
+        Returns:
+            List of health metric dicts, in pool order
+        """
+        if pools is None:
+            result = await db.execute(select(Pool).where(Pool.enabled == True))
+            pools = list(result.scalars().all())
+        
+        if not pools:
+            return []
+        
+        share_totals = await get_pool_share_totals(db, [pool.id for pool in pools])
+        failure_counts = await PoolHealthService._recent_failure_counts(db, [pool.id for pool in pools])
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        limiter = _HostRateLimiter(per_host_interval)
+        
+        async def probe(pool: Pool):
+            # Wait for the host before taking a concurrency slot, so pools
+            # sharing a host don't hold up probes to other hosts
+            async with limiter.slot(pool.url):
+                async with semaphore:
+                    connectivity = await PoolHealthService.check_pool_connectivity(pool)
+            pool_hashrate = PoolHealthService._cached_pool_hashrate(pool.id, tile_max_age)
+            if pool_hashrate is None:
+                async with limiter.slot(_api_host_key(pool)):
+                    async with semaphore:
+                        pool_hashrate = await PoolHealthService._get_pool_hashrate(pool.id, tile_max_age)
+            return connectivity, pool_hashrate
+        
+        probes = await asyncio.gather(*(probe(pool) for pool in pools))
+        
+        now = datetime.utcnow()
+        records = []
+        results = []
+        for pool, (connectivity, pool_hashrate) in zip(pools, probes):
+            reject_stats = _reject_stats(share_totals.get(pool.id))
+            recent_failures = failure_counts.get(pool.id, 0)
+            
+            health_score = await PoolHealthService.calculate_health_score(
+                connectivity["is_reachable"],
+                connectivity["response_time_ms"],
+                reject_stats.get("reject_rate"),
+                recent_failures
+            )
+            
+            records.append(PoolHealth(
+                pool_id=pool.id,
+                timestamp=now,
+                response_time_ms=connectivity["response_time_ms"],
+                is_reachable=connectivity["is_reachable"],
+                reject_rate=reject_stats.get("reject_rate"),
+                shares_accepted=reject_stats.get("shares_accepted"),
+                shares_rejected=reject_stats.get("shares_rejected"),
+                health_score=health_score,
+                luck_percentage=_luck_from_reject_rate(reject_stats.get("reject_rate")),
+                pool_hashrate=pool_hashrate,
+                error_message=connectivity["error_message"]
+            ))
+            results.append({
+                "pool_id": pool.id,
+                "pool_name": pool.name,
+                "is_reachable": connectivity["is_reachable"],
+                "response_time_ms": connectivity["response_time_ms"],
+                "reject_rate": reject_stats.get("reject_rate"),
+                "shares_accepted": reject_stats.get("shares_accepted"),
+                "shares_rejected": reject_stats.get("shares_rejected"),
+                "health_score": health_score,
+                "recent_failures": recent_failures,
+                "error_message": connectivity["error_message"]
+            })
         
-        # Calculate reject rate
-        reject_stats = await PoolHealthService.calculate_pool_reject_rate(pool_id, db)
+        try:
+            db.add_all(records)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error("Failed to record pool health for %s pools: %s", len(records), e)
+            raise
         
-        # Count recent failures (last hour)
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        return results
+    
+    @staticmethod
+    async def _recent_failure_counts(db: AsyncSession, pool_ids: List[int], hours: int = 1) -> Dict[int, int]:
+        """Number of unreachable health checks per pool in the last `hours`"""
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
         result = await db.execute(
-            select(PoolHealth)
+            select(PoolHealth.pool_id, func.count(PoolHealth.id))
             .where(and_(
-                PoolHealth.pool_id == pool_id,
-                PoolHealth.timestamp >= one_hour_ago,
+                PoolHealth.pool_id.in_(pool_ids),
+                PoolHealth.timestamp >= cutoff,
                 PoolHealth.is_reachable == False
             ))
+            .group_by(PoolHealth.pool_id)
         )
-        recent_failures = len(result.scalars().all())
-        
-        # Calculate luck percentage (shares found vs expected)
-        luck_percentage = await PoolHealthService.calculate_pool_luck(pool_id, db)
-        
-        # Calculate health score
-        health_score = await PoolHealthService.calculate_health_score(
-            connectivity["is_reachable"],
-            connectivity["response_time_ms"],
-            reject_stats.get("reject_rate"),
-            recent_failures
-        )
+        return {pool_id: count for pool_id, count in result.all()}
+    
+    @staticmethod
+    def _cached_pool_hashrate(pool_id: int, max_age: float) -> Optional[float]:
+        """Pool hashrate (GH/s) from the dashboard tile cache only (None on a miss)"""
+        from core.dashboard_pool_service import DashboardPoolService
         
-        # Fetch pool hashrate from dashboard data (if available)
-        pool_hashrate = None
         try:
-            from core.dashboard_pool_service import DashboardPoolService
-            dashboard_data = await DashboardPoolService._fetch_pool_data(pool, db)
-            if dashboard_data and dashboard_data.pool_hashrate is not None:
-                # Extract numeric value from structured format {display, value, unit}
-                pool_hashrate = dashboard_data.pool_hashrate.get('value') if isinstance(dashboard_data.pool_hashrate, dict) else dashboard_data.pool_hashrate
+            tile = DashboardPoolService.get_cached_pool_tile(pool_id, max_age)
         except Exception as e:
-            # Don't fail health check if dashboard data unavailable
-            pass
-        
-        # Record metrics
-        pool_health = PoolHealth(
-            pool_id=pool_id,
-            timestamp=datetime.utcnow(),
-            response_time_ms=connectivity["response_time_ms"],
-            is_reachable=connectivity["is_reachable"],
-            reject_rate=reject_stats.get("reject_rate"),
-            shares_accepted=reject_stats.get("shares_accepted"),
-            shares_rejected=reject_stats.get("shares_rejected"),
-            health_score=health_score,
-            luck_percentage=luck_percentage,
-            pool_hashrate=pool_hashrate,
-            error_message=connectivity["error_message"]
-        )
+            logger.debug("Pool tile cache unavailable for pool %s: %s", pool_id, e)
+            return None
+        return _tile_hashrate(tile)
+    
+    @staticmethod
+    async def _get_pool_hashrate(pool_id: int, max_age: float) -> Optional[float]:
+        """Pool hashrate (GH/s) from the dashboard tile cache, fetching the tile on a cache miss"""
+        from core.dashboard_pool_service import DashboardPoolService
         
         try:
-            db.add(pool_health)
-            await db.commit()
-            await db.refresh(pool_health)  # Ensure greenlet context
+            tile = DashboardPoolService.get_cached_pool_tile(pool_id, max_age)
+            if tile is None:
+                # Own session: tile fetches run concurrently and may persist driver recovery
+                async with AsyncSessionLocal() as session:
+                    pool = await session.get(Pool, pool_id)
+                    if pool is None:
+                        return None
+                    tile = await DashboardPoolService.get_pool_tile(pool, session, max_age)
         except Exception as e:
-            await db.rollback()
-            print(f"❌ Failed to record pool health for {pool.name}: {e}")
-            raise
+            # Don't fail health check if dashboard data unavailable
+            logger.debug("Pool hashrate unavailable for pool %s: %s", pool_id, e)
+            return None
         
-        return {
-            "pool_id": pool_id,
-            "pool_name": pool.name,
-            "is_reachable": connectivity["is_reachable"],
-            "response_time_ms": connectivity["response_time_ms"],
-            "reject_rate": reject_stats.get("reject_rate"),
-            "shares_accepted": reject_stats.get("shares_accepted"),
-            "shares_rejected": reject_stats.get("shares_rejected"),
-            "health_score": health_score,
-            "recent_failures": recent_failures,
-            "error_message": connectivity["error_message"]
-        }
+        return _tile_hashrate(tile)
     
     @staticmethod
     async def get_pool_health_history(
@@ -372,6 +453,9 @@ class PoolHealthService:
         result = await db.execute(select(Pool).where(Pool.enabled == True))
         pools = result.scalars().all()
         
+        # Miners seen on each pool in the last 5 minutes (from the share counters)
+        active_totals = await get_pool_share_totals(db, [pool.id for pool in pools], hours=5 / 60)
+        
         pool_statuses = []
         
         for pool in pools:
@@ -384,14 +468,7 @@ class PoolHealthService:
             )
             latest_health = result.scalar_one_or_none()
             
-            # Get count of miners using this pool
-            result = await db.execute(
-                select(Telemetry)
-                .where(Telemetry.timestamp >= datetime.utcnow() - timedelta(minutes=5))
-                .where(Telemetry.pool_in_use.like(f"%{pool.url}%"))
-            )
-            active_telemetry = result.scalars().all()
-            active_miners = len(set([t.miner_id for t in active_telemetry]))
+            active_miners = active_totals.get(pool.id, {}).get("miners", 0)
             
             pool_statuses.append({
                 "pool_id": pool.id,
@@ -513,8 +590,6 @@ class PoolHealthService:
         Returns:
             Dict with pool details or None if no suitable pool found
         """
-        from core.database import Miner
-        
         # Get miner to check assigned pools
         result = await db.execute(select(Miner).where(Miner.id == miner_id))
         miner = result.scalar_one_or_none()
@@ -605,7 +680,7 @@ class PoolHealthService:
         Returns:
             Dict with success status and details
         """
-        from core.database import Miner, Event
+        from core.database import Event
         from adapters import create_adapter
         
         # Get miner
@@ -0,0 +1,179 @@
+"""
+Pool endpoint resolution
+
+Miners report the pool they are pointed at as a free-form string
+(pool_in_use: "stratum+tcp://host:port", "host:port", ...). PoolResolver maps
+those strings to Pool rows (and the coin mined there) once, from a small
+in-memory index of configured pools that is reloaded every `ttl` seconds,
+instead of each consumer doing its own LIKE '%url%' query or substring loop.
+The result is stored on every telemetry row as Telemetry.pool_id/coin.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_pool_endpoint(url: Optional[str], port: Optional[int] = None) -> str:
+    """Lowercase host[:port] with stratum/http schemes and trailing slashes removed"""
+    normalized = (url or "").strip().lower().replace("stratum+tcp://", "").replace("stratum+ssl://", "")
+    normalized = normalized.replace("http://", "").replace("https://", "").rstrip("/")
+    if port:
+        return f"{normalized}:{port}"
+    return normalized
+
+
+def coin_from_pool_url(pool_url: Optional[str]) -> Optional[str]:
+    """Coin symbol implied by a pool URL (None when the URL doesn't say)"""
+    if not pool_url:
+        return None
+    
+    pool_url = pool_url.lower()
+    
+    # Braiins Pool patterns
+    if "braiins" in pool_url or "slushpool" in pool_url:
+        return "BTC"
+    
+    # NerdMiners Pool patterns
+    if "nerdminers" in pool_url:
+        return "BTC"
+    
+    # Solopool.org patterns
+    if "dgb" in pool_url:
+        return "DGB"
+    elif "bch" in pool_url or "eu2.solopool.org" in pool_url:
+        return "BCH"
+    elif "bc2" in pool_url:
+        return "BC2"
+    elif "btc" in pool_url:
+        return "BTC"
+    elif "eu1.solopool.org" in pool_url or "us1.solopool.org" in pool_url:
+        # Default to DGB for shared pools
+        return "DGB"
+    
+    return None
+
+
+def coin_for_pool(url: Optional[str], name: Optional[str], pool_config: Optional[dict] = None) -> Optional[str]:
+    """Coin mined on a configured pool: explicit config, then URL, then pool name"""
+    configured = pool_config.get("coin") if isinstance(pool_config, dict) else None
+    if configured:
+        return str(configured).upper()[:10]
+    coin = coin_from_pool_url(url)
+    if coin or not name:
+        return coin
+
+    from core.high_diff_tracker import extract_coin_from_pool_name
+    return extract_coin_from_pool_name(name)
+
+
+def _split_host(endpoint: str) -> str:
+    host, sep, port = endpoint.rpartition(":")
+    return host if sep and port.isdigit() else endpoint
+
+
+class PoolResolver:
+    """
+    Cached pool_in_use -> pool_id lookup.
+
+    - Exact host:port match first
+    - Otherwise a host-only match, when exactly one configured pool uses that host
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._by_endpoint: Dict[str, int] = {}
+        self._by_host: Dict[str, List[int]] = {}
+        self._coins: Dict[int, Optional[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def load(self, pools: Iterable[tuple]):
+        """Build the index from (pool_id, url, port[, name, pool_config]) tuples"""
+        by_endpoint: Dict[str, int] = {}
+        by_host: Dict[str, List[int]] = {}
+        coins: Dict[int, Optional[str]] = {}
+        for pool_id, url, port, *details in pools:
+            endpoint = normalize_pool_endpoint(url, port)
+            if not endpoint:
+                continue
+            by_endpoint.setdefault(endpoint, pool_id)
+            by_host.setdefault(_split_host(endpoint), []).append(pool_id)
+            name, pool_config = (list(details) + [None, None])[:2]
+            coins[pool_id] = coin_for_pool(url, name, pool_config)
+        self._by_endpoint, self._by_host, self._coins = by_endpoint, by_host, coins
+        self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Reload the pool index from the database if it is older than ttl"""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            from core.database import Pool
+
+            result = await db.execute(select(Pool.id, Pool.url, Pool.port, Pool.name, Pool.pool_config))
+            self.load(result.all())
+
+    def invalidate(self):
+        """Force a reload on next use (pool added, edited or removed)"""
+        self._loaded_at = None
+
+    def match(self, pool_in_use: Optional[str]) -> Optional[int]:
+        """Pool ID for a pool_in_use string using the loaded index (no database access)"""
+        endpoint = normalize_pool_endpoint(pool_in_use)
+        if not endpoint:
+            return None
+        pool_id = self._by_endpoint.get(endpoint)
+        if pool_id is not None:
+            return pool_id
+        candidates = self._by_host.get(_split_host(endpoint), [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def match_with_coin(self, pool_in_use: Optional[str]) -> Tuple[Optional[int], Optional[str]]:
+        """(pool_id, coin) for a pool_in_use string; coin falls back to the URL for unknown pools"""
+        pool_id = self.match(pool_in_use)
+        if pool_id is not None and self._coins.get(pool_id):
+            return pool_id, self._coins[pool_id]
+        return pool_id, coin_from_pool_url(pool_in_use)
+
+    async def resolve(self, db: AsyncSession, pool_in_use: Optional[str]) -> Optional[int]:
+        await self.ensure_loaded(db)
+        return self.match(pool_in_use)
+
+
+async def annotate_pool_columns(db: AsyncSession, rows: Iterable[Dict[str, Any]]):
+    """Fill pool_id/coin on prepared telemetry rows that don't carry them yet (in place)"""
+    rows = [row for row in rows if "pool_id" not in row or "coin" not in row]
+    if not rows:
+        return
+    resolver = get_pool_resolver()
+    await resolver.ensure_loaded(db)
+    resolved: Dict[Optional[str], Tuple[Optional[int], Optional[str]]] = {}
+    for row in rows:
+        pool_in_use = row.get("pool_in_use")
+        if pool_in_use not in resolved:
+            resolved[pool_in_use] = resolver.match_with_coin(pool_in_use)
+        pool_id, coin = resolved[pool_in_use]
+        row.setdefault("pool_id", pool_id)
+        row.setdefault("coin", coin)
+
+
+# Global instance
+_pool_resolver: Optional[PoolResolver] = None
+
+
+def get_pool_resolver() -> PoolResolver:
+    """Get the global pool resolver"""
+    global _pool_resolver
+    if _pool_resolver is None:
+        _pool_resolver = PoolResolver()
+    return _pool_resolver
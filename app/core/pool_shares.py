@@ -0,0 +1,142 @@
+"""
+Per-pool share counters
+
+Telemetry readings carry a miner's cumulative accepted/rejected counters and
+the pool it is pointed at. The ingest path resolves pool_in_use to a pool_id
+once per reading and keeps the newest counters per (pool, miner) in
+pool_share_counters, so pool reject rate, luck and active miner counts are
+read from a few rows per pool instead of scanning 24h of raw telemetry.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.pool_resolver import PoolResolver, get_pool_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def collect_share_counters(rows: Iterable[Dict[str, Any]], resolver: PoolResolver) -> List[Dict[str, Any]]:
+    """
+    Counter rows for prepared telemetry rows (newest reading per pool/miner).
+
+    Uses the row's pool_id when it has already been resolved; rows whose
+    pool_in_use doesn't resolve to a configured pool are skipped.
+    """
+    latest: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in rows:
+        pool_id = row["pool_id"] if "pool_id" in row else resolver.match(row.get("pool_in_use"))
+        if pool_id is None:
+            continue
+        seen_at = row.get("timestamp") or datetime.utcnow()
+        key = (pool_id, row["miner_id"])
+        current = latest.get(key)
+        if current is not None and current["last_seen"] > seen_at:
+            continue
+        latest[key] = {
+            "pool_id": pool_id,
+            "miner_id": row["miner_id"],
+            "shares_accepted": row.get("shares_accepted") or 0,
+            "shares_rejected": row.get("shares_rejected") or 0,
+            "last_seen": seen_at,
+        }
+    return list(latest.values())
+
+
+async def record_pool_shares(db: AsyncSession, rows: Iterable[Dict[str, Any]]):
+    """Upsert share counters for prepared telemetry rows (caller commits)"""
+    from core.database import PoolShareCounter
+
+    rows = list(rows)
+    if not rows:
+        return
+    resolver = get_pool_resolver()
+    await resolver.ensure_loaded(db)
+    counters = collect_share_counters(rows, resolver)
+    if not counters:
+        return
+
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+    stmt = dialect_insert(PoolShareCounter)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["pool_id", "miner_id"],
+            set_={
+                "shares_accepted": stmt.excluded.shares_accepted,
+                "shares_rejected": stmt.excluded.shares_rejected,
+                "last_seen": stmt.excluded.last_seen,
+            },
+            # Late (out of order) readings never roll counters back
+            where=PoolShareCounter.last_seen <= stmt.excluded.last_seen,
+        ),
+        counters,
+    )
+
+
+async def get_pool_share_totals(
+    db: AsyncSession,
+    pool_ids: Optional[List[int]] = None,
+    hours: float = 24
+) -> Dict[int, Dict[str, int]]:
+    """
+    Summed latest counters of the miners seen on each pool within `hours`.
+
+    Returns:
+        Dict mapping pool_id -> {shares_accepted, shares_rejected, miners}
+    """
+    from core.database import PoolShareCounter
+
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    query = (
+        select(
+            PoolShareCounter.pool_id,
+            func.sum(PoolShareCounter.shares_accepted),
+            func.sum(PoolShareCounter.shares_rejected),
+            func.count(PoolShareCounter.miner_id),
+        )
+        .where(PoolShareCounter.last_seen >= cutoff)
+        .group_by(PoolShareCounter.pool_id)
+    )
+    if pool_ids is not None:
+        if not pool_ids:
+            return {}
+        query = query.where(PoolShareCounter.pool_id.in_(pool_ids))
+
+    result = await db.execute(query)
+    return {
+        pool_id: {
+            "shares_accepted": int(accepted or 0),
+            "shares_rejected": int(rejected or 0),
+            "miners": int(miners or 0),
+        }
+        for pool_id, accepted, rejected, miners in result.all()
+    }
+
+
+def reject_stats(totals: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    """Reject stats dict (the shape PoolHealthService reports) from share totals"""
+    if not totals or not totals.get("miners"):
+        return {
+            "reject_rate": None,
+            "shares_accepted": 0,
+            "shares_rejected": 0,
+            "error": "No telemetry data"
+        }
+
+    total_accepted = totals["shares_accepted"]
+    total_rejected = totals["shares_rejected"]
+    total_shares = total_accepted + total_rejected
+    reject_rate = (total_rejected / total_shares * 100) if total_shares > 0 else 0
+
+    return {
+        "reject_rate": round(reject_rate, 2),
+        "shares_accepted": total_accepted,
+        "shares_rejected": total_rejected
+    }
@@ -33,6 +33,26 @@ async def _column_exists(session: AsyncSession, table_name: str, column_name: st
     return result.scalar_one_or_none() is not None
 
 
+# Column comment recording that telemetry.pool_id/coin were backfilled
+TELEMETRY_POOL_BACKFILL_MARKER = "backfilled from pool_in_use"
+
+
+async def _column_comment(session: AsyncSession, table_name: str, column_name: str):
+    """Comment on a column in the public schema (PostgreSQL), None if unset"""
+    result = await session.execute(
+        text(
+            """
+            SELECT col_description(a.attrelid, a.attnum)
+            FROM pg_attribute a
+            WHERE a.attrelid = to_regclass(:table_name)
+              AND a.attname = :column_name
+            """
+        ),
+        {"table_name": f"public.{table_name}", "column_name": column_name},
+    )
+    return result.scalar_one_or_none()
+
+
 async def migrate_to_partitioned_telemetry(session: AsyncSession) -> None:
     """
     Migrate existing telemetry table to partitioned version.
@@ -212,6 +232,8 @@ async def setup_telemetry_partitioning(session: AsyncSession) -> None:
                 pool_in_use VARCHAR(255),
                 mode VARCHAR(20),
                 data JSONB,
+                pool_id INTEGER,
+                coin VARCHAR(10),
                 PRIMARY KEY (id, timestamp)
             ) PARTITION BY RANGE (timestamp)
         """)
@@ -587,6 +609,117 @@ async def create_covering_indexes(session: AsyncSession) -> None:
         await session.rollback()
 
 
+async def create_rollup_unique_indexes(session: AsyncSession) -> None:
+    """
+    Ensure telemetry_hourly/telemetry_daily have unique (miner_id, period) indexes.
+    Incremental rollups upsert with ON CONFLICT, which needs them. Tables created
+    before the indexes existed may hold duplicates, so those are removed first.
+    """
+    if not await is_postgresql(session):
+        logger.info("Skipping rollup unique indexes (non-PostgreSQL database)")
+        return
+
+    targets = [
+        ("telemetry_hourly", "hour_start", "uq_telemetry_hourly_miner_hour"),
+        ("telemetry_daily", "date", "uq_telemetry_daily_miner_date"),
+    ]
+
+    for table, period_column, index_name in targets:
+        try:
+            result = await session.execute(text(f"""
+                DELETE FROM {table} a
+                USING {table} b
+                WHERE a.miner_id = b.miner_id
+                  AND a.{period_column} = b.{period_column}
+                  AND a.id < b.id
+            """))
+            removed = getattr(result, "rowcount", 0) or 0
+            if removed:
+                logger.info(f"Removed {removed} duplicate rows from {table}")
+
+            await session.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table}(miner_id, {period_column})"
+            ))
+            await session.commit()
+            logger.info(f"✅ Created unique index: {index_name}")
+        except Exception as e:
+            await session.rollback()
+            logger.warning(f"Could not create unique index {index_name}: {e}")
+
+
+async def add_telemetry_pool_columns(session: AsyncSession) -> None:
+    """
+    Add telemetry.pool_id/coin (resolved from pool_in_use at insert time) with
+    their indexes, and backfill existing rows until the backfill has completed.
+    The backfill resolves each distinct unresolved pool_in_use string once in
+    Python and applies all of them in a single UPDATE; completion is recorded
+    as a comment on telemetry.pool_id in the same transaction, so an
+    interrupted backfill is retried on the next startup.
+    """
+    if not await is_postgresql(session):
+        logger.info("Skipping telemetry pool columns (non-PostgreSQL database)")
+        return
+
+    try:
+        await session.execute(text("ALTER TABLE telemetry ADD COLUMN IF NOT EXISTS pool_id INTEGER"))
+        await session.execute(text("ALTER TABLE telemetry ADD COLUMN IF NOT EXISTS coin VARCHAR(10)"))
+        await session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_telemetry_pool_timestamp ON telemetry(pool_id, timestamp)"
+        ))
+        await session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_telemetry_coin_timestamp ON telemetry(coin, timestamp)"
+        ))
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        logger.warning(f"Could not add telemetry pool columns: {e}")
+        return
+
+    try:
+        if await _column_comment(session, "telemetry", "pool_id") == TELEMETRY_POOL_BACKFILL_MARKER:
+            return
+
+        from core.pool_resolver import PoolResolver
+
+        resolver = PoolResolver()
+        await resolver.ensure_loaded(session)
+        result = await session.execute(text(
+            "SELECT DISTINCT pool_in_use FROM telemetry "
+            "WHERE pool_in_use IS NOT NULL AND pool_id IS NULL AND coin IS NULL"
+        ))
+        values, pool_ids, coins = [], [], []
+        for (pool_in_use,) in result.all():
+            pool_id, coin = resolver.match_with_coin(pool_in_use)
+            if pool_id is None and coin is None:
+                continue
+            values.append(pool_in_use)
+            pool_ids.append(pool_id)
+            coins.append(coin)
+
+        updated = 0
+        if values:
+            result = await session.execute(
+                text("""
+                    UPDATE telemetry t
+                    SET pool_id = v.pool_id, coin = v.coin
+                    FROM unnest(CAST(:values AS TEXT[]), CAST(:pool_ids AS INTEGER[]), CAST(:coins AS TEXT[]))
+                        AS v(pool_in_use, pool_id, coin)
+                    WHERE t.pool_in_use = v.pool_in_use
+                      AND t.pool_id IS NULL AND t.coin IS NULL
+                """),
+                {"values": values, "pool_ids": pool_ids, "coins": coins},
+            )
+            updated = getattr(result, 'rowcount', 0) or 0
+        await session.execute(text(
+            f"COMMENT ON COLUMN telemetry.pool_id IS '{TELEMETRY_POOL_BACKFILL_MARKER}'"
+        ))
+        await session.commit()
+        logger.info(f"✅ Backfilled telemetry pool_id/coin for {updated} rows ({len(values)} distinct pools)")
+    except Exception as e:
+        await session.rollback()
+        logger.warning(f"Could not backfill telemetry pool columns: {e}")
+
+
 async def setup_notify_triggers(session: AsyncSession) -> None:
     """
     Create PostgreSQL NOTIFY triggers for real-time updates.
@@ -717,6 +850,9 @@ async def initialize_postgres_optimizations(session: AsyncSession) -> None:
     
     # 2. Ensure partitions exist
     await ensure_future_partitions(session)
+
+    # 2b. Resolved pool_id/coin columns (+ one-time backfill)
+    await add_telemetry_pool_columns(session)
     
     # 3. Create materialized view
     await create_dashboard_materialized_view(session)
@@ -730,10 +866,13 @@ async def initialize_postgres_optimizations(session: AsyncSession) -> None:
     # 6. Create covering indexes
     await create_covering_indexes(session)
     
-    # 7. Set up NOTIFY triggers
+    # 7. Unique indexes for rollup upserts
+    await create_rollup_unique_indexes(session)
+    
+    # 8. Set up NOTIFY triggers
     await setup_notify_triggers(session)
 
-    # 8. Sync sequences (ensure autoincrement IDs don't collide)
+    # 9. Sync sequences (ensure autoincrement IDs don't collide)
     await sync_postgres_sequences(session)
     
     logger.info("✅ PostgreSQL optimizations complete")
@@ -0,0 +1,513 @@
+"""
+Two-phase executor for price band strategy miner actions
+
+1. Plan: execute_strategy turns enrolled miners into MinerAction entries using
+   state loaded in bulk by load_fleet_state() - live enrollment, linked HA
+   devices and the latest telemetry store - instead of querying and polling
+   each miner in turn.
+2. Apply: PriceBandExecutor toggles every HA switch once (a switch may power
+   several miners), then configures miners concurrently within
+   `price_band_strategy.executor.max_concurrent_devices`. Steps that need the
+   database session (HA power cycling, champion promotion) are collected and
+   run afterwards, one miner at a time.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import app_config
+from core.database import (
+    HomeAssistantConfig,
+    HomeAssistantDevice,
+    Miner,
+    MinerHASwitchLink,
+    MinerStrategy,
+    Pool,
+    PriceBandStrategyConfig,
+)
+from core.latest_telemetry import LatestReading, get_latest_telemetry_store
+from core.price_band_strategy import PriceBandStrategy
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_DEVICES = 16
+MAX_CONCURRENT_HA = 4
+TELEMETRY_MAX_AGE_SECONDS = 120  # Older cached readings are re-polled live
+TELEMETRY_TIMEOUT_SECONDS = 5.0
+HA_BOOT_WAIT_SECONDS = 3  # After powering a miner on, before talking to it
+POOL_SWITCH_COOLDOWN_SECONDS = 180  # Avalon miners take time to reconnect
+POOL_SWITCH_REBOOT_SECONDS = 8
+
+
+def _executor_setting(key: str, default: int) -> int:
+    try:
+        value = int(app_config.get(f"price_band_strategy.executor.{key}", default))
+    except (TypeError, ValueError):
+        value = default
+    return max(1, value)
+
+
+@dataclass
+class FleetState:
+    """Bulk-loaded state the plan is built from"""
+    miners: Dict[int, Miner]
+    ha_devices: Dict[int, HomeAssistantDevice]
+    ha_config: Optional[HomeAssistantConfig]
+    telemetry: Dict[int, LatestReading]
+
+    def is_enrolled(self, miner_id: int) -> bool:
+        return miner_id in self.miners
+
+    def is_ha_device_off(self, miner_id: int) -> bool:
+        device = self.ha_devices.get(miner_id)
+        return bool(device and device.current_state == "off")
+
+    def cached_reading(self, miner: Miner, max_age: float) -> Optional[LatestReading]:
+        """Latest reading if recent and taken after the last mode/pool change"""
+        reading = self.telemetry.get(miner.id)
+        if reading is None or reading.age_seconds() > max_age:
+            return None
+        for changed_at in (miner.last_mode_change, miner.last_pool_switch):
+            if changed_at and reading.timestamp <= changed_at:
+                return None
+        return reading
+
+
+async def load_fleet_state(db: AsyncSession, miners: Iterable[Miner]) -> FleetState:
+    """Load enrollment, HA links and latest telemetry for miners in a few queries"""
+    miner_ids = [miner.id for miner in miners]
+
+    # Re-check enrollment and refresh rows in one go (populate_existing
+    # overwrites the identity-map copies with current values)
+    result = await db.execute(
+        select(Miner)
+        .join(MinerStrategy, Miner.id == MinerStrategy.miner_id)
+        .where(Miner.id.in_(miner_ids))
+        .where(MinerStrategy.strategy_enabled == True)
+        .where(Miner.enabled == True)
+        .execution_options(populate_existing=True)
+    )
+    enrolled = {miner.id: miner for miner in result.scalars().all()}
+
+    result = await db.execute(
+        select(MinerHASwitchLink.miner_id, HomeAssistantDevice)
+        .join(HomeAssistantDevice, MinerHASwitchLink.ha_device_id == HomeAssistantDevice.id)
+        .where(MinerHASwitchLink.miner_id.in_(miner_ids))
+        .where(HomeAssistantDevice.enrolled == True)
+    )
+    ha_devices: Dict[int, HomeAssistantDevice] = {}
+    for miner_id, device in result.all():
+        ha_devices.setdefault(miner_id, device)
+
+    result = await db.execute(select(HomeAssistantConfig))
+    ha_config = result.scalar_one_or_none()
+
+    store = await get_latest_telemetry_store().ensure_warm(db)
+    return FleetState(
+        miners=enrolled,
+        ha_devices=ha_devices,
+        ha_config=ha_config,
+        telemetry=store.snapshot(miner_ids),
+    )
+
+
+@dataclass
+class MinerAction:
+    """
+    Planned work for one miner.
+
+    ha_turn_on: desired HA switch state (None leaves the switch alone)
+    ha_messages: report lines for (switch controlled, not controlled)
+    configure: run the device step (pool switch / mode change)
+    skip_message: report line for a miner that is not acted on at all
+    """
+    miner: Miner
+    target_mode: Optional[str] = None
+    configure: bool = False
+    ha_turn_on: Optional[bool] = None
+    ha_messages: Optional[Tuple[str, str]] = None
+    skip_message: Optional[str] = None
+
+    # Filled in by the HA phase
+    ha_controlled: bool = False
+    ha_powered_on: bool = False
+    ha_kept_on: bool = False
+
+
+@dataclass
+class MinerResult:
+    miner_id: int
+    miner_name: str
+    outcome: str = "unchanged"  # unchanged | changed | skipped | waiting | failed
+    messages: List[str] = field(default_factory=list)
+    follow_up: Optional[str] = None  # Failure reason needing champion handling
+    power_cycle: bool = False  # Also validate / power cycle the HA device
+    elapsed_ms: int = 0
+
+    def note(self, message: str, outcome: Optional[str] = None):
+        self.messages.append(f"{self.miner_name}: {message}")
+        if outcome:
+            self.outcome = outcome
+
+    def as_dict(self) -> Dict:
+        return {
+            "miner_id": self.miner_id,
+            "miner": self.miner_name,
+            "outcome": self.outcome,
+            "messages": list(self.messages),
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+class PriceBandExecutor:
+    """Applies a list of MinerAction concurrently and reports per-miner results"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        fleet: FleetState,
+        strategy: PriceBandStrategyConfig,
+        *,
+        target_pool: Optional[Pool] = None,
+        target_pool_name: Optional[str] = None,
+        is_no_pool_change_band: bool = False,
+        champion_mode_active: bool = False,
+    ):
+        self.db = db
+        self.fleet = fleet
+        self.strategy = strategy
+        self.target_pool = target_pool
+        self.target_pool_name = target_pool_name
+        self.is_no_pool_change_band = is_no_pool_change_band
+        self.champion_mode_active = champion_mode_active
+        self.max_telemetry_age = _executor_setting("max_telemetry_age_seconds", TELEMETRY_MAX_AGE_SECONDS)
+        self._device_limit = asyncio.Semaphore(
+            _executor_setting("max_concurrent_devices", MAX_CONCURRENT_DEVICES)
+        )
+        self._ha_limit = asyncio.Semaphore(_executor_setting("max_concurrent_ha", MAX_CONCURRENT_HA))
+
+    async def apply(self, actions: List[MinerAction]) -> List[MinerResult]:
+        await self._apply_ha(actions)
+        # Persist HA state before device work so reconciliation sees it
+        await self.db.commit()
+
+        results = await asyncio.gather(*(self._run(action) for action in actions))
+
+        for action, result in zip(actions, results):
+            if result.follow_up:
+                await self._follow_up(action.miner, result)
+        return list(results)
+
+    @staticmethod
+    def summary(results: List[MinerResult], elapsed_seconds: float) -> Dict:
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result.outcome] = counts.get(result.outcome, 0) + 1
+        return {
+            "planned": len(results),
+            "outcomes": counts,
+            "elapsed_seconds": round(elapsed_seconds, 2),
+        }
+
+    # ------------------------------------------------------------------
+    # HA phase
+    # ------------------------------------------------------------------
+
+    async def _apply_ha(self, actions: List[MinerAction]):
+        by_device: Dict[int, List[MinerAction]] = {}
+        for action in actions:
+            if action.ha_turn_on is None or action.skip_message:
+                continue
+            device = self.fleet.ha_devices.get(action.miner.id)
+            if device is not None:
+                by_device.setdefault(device.id, []).append(action)
+        if not by_device:
+            return
+
+        ha_config = self.fleet.ha_config
+        if not ha_config or not ha_config.enabled:
+            logger.warning(f"HA integration not configured or disabled, cannot control {len(by_device)} device(s)")
+            return
+
+        # Import here to avoid circular dependencies
+        from integrations.homeassistant import HomeAssistantIntegration
+
+        ha_integration = HomeAssistantIntegration(
+            base_url=ha_config.base_url,
+            access_token=ha_config.access_token
+        )
+
+        async def _switch(group: List[MinerAction]):
+            device = self.fleet.ha_devices[group[0].miner.id]
+            # A shared switch stays on while any miner behind it should run
+            turn_on = any(action.ha_turn_on for action in group)
+            label = ", ".join(action.miner.name for action in group)
+            async with self._ha_limit:
+                try:
+                    controlled, toggled = await PriceBandStrategy._set_ha_switch_state(
+                        ha_integration, device, turn_on, label
+                    )
+                except Exception as e:
+                    logger.error(f"Error controlling HA device {device.name} for miner {label}: {e}")
+                    controlled, toggled = False, False
+            for action in group:
+                if action.ha_turn_on == turn_on:
+                    action.ha_controlled = controlled
+                    action.ha_powered_on = toggled and turn_on
+                else:
+                    action.ha_kept_on = True
+
+        await asyncio.gather(*(_switch(group) for group in by_device.values()))
+
+    # ------------------------------------------------------------------
+    # Device phase
+    # ------------------------------------------------------------------
+
+    async def _run(self, action: MinerAction) -> MinerResult:
+        miner = action.miner
+        result = MinerResult(miner_id=miner.id, miner_name=miner.name)
+        started = time.monotonic()
+
+        if action.skip_message:
+            result.note(action.skip_message, "skipped")
+            return result
+
+        if action.ha_kept_on:
+            result.note("HA device kept ON (shared switch)")
+        elif action.ha_messages:
+            controlled_message, uncontrolled_message = action.ha_messages
+            result.note(controlled_message if action.ha_controlled else uncontrolled_message)
+            if action.ha_controlled:
+                result.outcome = "changed"
+
+        if action.configure:
+            async with self._device_limit:
+                try:
+                    await self._configure(action, result)
+                except Exception as e:
+                    logger.error(f"Error applying strategy to {miner.name}: {e}", exc_info=True)
+                    result.note(f"ERROR - {e}", "failed")
+
+        result.elapsed_ms = int((time.monotonic() - started) * 1000)
+        return result
+
+    async def _current_state(self, action: MinerAction, adapter) -> Tuple[Optional[str], Optional[str]]:
+        """(pool in use, device-reported mode) from cached telemetry, else a live poll"""
+        miner = action.miner
+        reading = None if action.ha_powered_on else self.fleet.cached_reading(miner, self.max_telemetry_age)
+        if reading is not None:
+            PriceBandStrategy._reset_miner_failure(miner.id)
+            return reading.pool_in_use, (reading.data or {}).get("current_mode")
+
+        # Get telemetry with timeout to avoid hanging on offline devices
+        telemetry = await asyncio.wait_for(adapter.get_telemetry(), timeout=TELEMETRY_TIMEOUT_SECONDS)
+
+        # Reset failure count on successful telemetry retrieval
+        PriceBandStrategy._reset_miner_failure(miner.id)
+
+        current_pool = telemetry.pool_in_use if telemetry else None
+        device_reported_mode = telemetry.extra_data.get("current_mode") if telemetry and telemetry.extra_data else None
+        return current_pool, device_reported_mode
+
+    def _is_champion(self, miner: Miner) -> bool:
+        return self.champion_mode_active and self.strategy.current_champion_miner_id == miner.id
+
+    async def _configure(self, action: MinerAction, result: MinerResult):
+        from adapters import get_adapter
+
+        miner = action.miner
+        target_mode = action.target_mode
+        target_pool = self.target_pool
+        logger.info(f"Miner {miner.name} ({miner.miner_type}): target mode = {target_mode}")
+
+        adapter = get_adapter(miner)
+        if not adapter:
+            logger.error(f"No adapter for miner {miner.name}")
+            result.note("FAILED (no adapter)", "failed")
+            return
+
+        if action.ha_powered_on:
+            await asyncio.sleep(HA_BOOT_WAIT_SECONDS)
+
+        # Check current state to determine if changes are needed
+        try:
+            current_pool, device_reported_mode = await self._current_state(action, adapter)
+            db_current_mode = miner.current_mode
+
+            # Build expected pool URL when pool switching is enabled
+            target_pool_url = f"{target_pool.url}:{target_pool.port}" if target_pool else None
+
+            # Guard: Check if pool was recently switched
+            # This prevents reboot loops on Avalon miners that take time to reconnect
+            if miner.last_pool_switch:
+                seconds_since_switch = (datetime.utcnow() - miner.last_pool_switch).total_seconds()
+                if seconds_since_switch < POOL_SWITCH_COOLDOWN_SECONDS:
+                    logger.info(
+                        f"{miner.name} pool switched {int(seconds_since_switch)}s ago; "
+                        f"waiting for reboot to complete "
+                        f"({int(POOL_SWITCH_COOLDOWN_SECONDS - seconds_since_switch)}s remaining)"
+                    )
+                    result.note("Waiting for pool switch to complete", "waiting")
+                    return
+
+            # Per-band no-pool-change mode: only manage modes, never switch pools
+            if self.is_no_pool_change_band:
+                pool_already_correct = True
+
+            # Guard: if pool is missing/empty, treat as unknown and skip pool switch
+            elif not current_pool:
+                logger.warning(f"{miner.name} reported no pool; skipping pool switch this cycle")
+
+                # Track consecutive failures; after 6 (6 minutes) check if the HA
+                # device is stuck. This prevents false positives from temporary
+                # telemetry issues
+                failure_count = PriceBandStrategy._increment_miner_failure(miner.id)
+                if failure_count >= 6:
+                    result.follow_up = f"Pool unknown after {failure_count} failures"
+                    result.power_cycle = True
+                    result.outcome = "failed"
+                else:
+                    result.note("Pool unknown (skipped)", "skipped")
+                return
+            else:
+                # Use normalized URL comparison to prevent port-only matches
+                current_pool_normalized = PriceBandStrategy._normalize_pool_url(current_pool)
+                target_pool_normalized = PriceBandStrategy._normalize_pool_url(target_pool_url)
+                pool_already_correct = (target_pool_normalized == current_pool_normalized)
+
+            # Mode is correct if device reports the target mode (not just database)
+            mode_already_correct = device_reported_mode == target_mode if device_reported_mode else db_current_mode == target_mode
+            target_pool_name_for_log = target_pool.name if target_pool else "unchanged pool"
+
+            if pool_already_correct and mode_already_correct:
+                logger.debug(f"{miner.name} already on {target_pool_name_for_log} with mode {target_mode}")
+                result.note("Already correct (no change)")
+                return
+
+            # Log what needs to change
+            if not pool_already_correct:
+                logger.info(f"{miner.name} needs pool change: {current_pool} → {target_pool_url}")
+            if not mode_already_correct:
+                if device_reported_mode and device_reported_mode != db_current_mode:
+                    logger.warning(f"{miner.name} MODE DRIFT: DB says {db_current_mode}, device reports {device_reported_mode}, target is {target_mode}")
+                else:
+                    logger.info(f"{miner.name} needs mode change: {db_current_mode} → {target_mode}")
+
+        except asyncio.TimeoutError:
+            # Track consecutive telemetry timeouts
+            timeout_count = PriceBandStrategy._increment_miner_failure(miner.id)
+
+            if timeout_count < 5:
+                # Skip reconfiguration until we hit threshold
+                logger.warning(f"{miner.name} telemetry timeout ({timeout_count}/5) - skipping this cycle")
+                result.note("Telemetry timeout (skipped)", "skipped")
+                return
+
+            # After 5 consecutive timeouts (5 minutes), something is likely wrong
+            logger.warning(f"{miner.name} telemetry timeout {timeout_count} times - attempting reconfiguration")
+            if self._is_champion(miner):
+                # Let a new champion be promoted (after the concurrent phase)
+                result.follow_up = f"Telemetry timeout after {timeout_count} failures"
+                result.outcome = "failed"
+                return
+
+            pool_already_correct = self.is_no_pool_change_band
+            mode_already_correct = False
+        except Exception as e:
+            logger.warning(f"Could not check current state for {miner.name}: {e}")
+            # Continue with switch attempt if we can't verify current state
+            pool_already_correct = self.is_no_pool_change_band
+            mode_already_correct = False
+
+        # Switch pool (only if needed)
+        if not pool_already_correct and target_pool is not None:
+            try:
+                pool_switched = await adapter.switch_pool(
+                    pool_url=target_pool.url,
+                    pool_port=target_pool.port,
+                    pool_user=target_pool.user,
+                    pool_password=target_pool.password
+                )
+            except Exception as e:
+                logger.error(f"Error switching pool for {miner.name}: {e}")
+                result.note(f"Pool switch ERROR - {e}", "failed")
+                return
+
+            if not pool_switched:
+                logger.warning(f"Failed to switch {miner.name} to {target_pool.name}")
+
+                # Track consecutive pool switch failures; after 3, check if HA device is stuck
+                failure_count = PriceBandStrategy._increment_miner_failure(miner.id)
+                if failure_count >= 3:
+                    result.follow_up = "Pool switch failed after 3 attempts"
+                    result.power_cycle = True
+                    result.outcome = "failed"
+                else:
+                    result.note("Pool switch FAILED", "failed")
+                return
+
+            # Reset failure count on successful switch
+            PriceBandStrategy._reset_miner_failure(miner.id)
+            logger.info(f"Switched {miner.name} to pool {target_pool.name}")
+            result.outcome = "changed"
+
+            # Wait for miner to finish rebooting after pool switch
+            logger.debug(f"Waiting {POOL_SWITCH_REBOOT_SECONDS} seconds for {miner.name} to reboot after pool switch...")
+            await asyncio.sleep(POOL_SWITCH_REBOOT_SECONDS)
+        else:
+            logger.debug(f"{miner.name} pool already correct, skipping pool switch")
+
+        # Set mode (only if needed)
+        if target_mode and not mode_already_correct:
+            try:
+                mode_set = await adapter.set_mode(target_mode)
+            except Exception as e:
+                logger.error(f"Error setting mode for {miner.name}: {e}")
+                result.note(f"Mode change ERROR - {e}", "failed")
+                return
+
+            if not mode_set:
+                logger.warning(f"Failed to set mode {target_mode} on {miner.name}")
+                result.note("Mode change FAILED", "failed")
+            else:
+                logger.info(f"Set {miner.name} to mode {target_mode}")
+                result.note(f"mode={target_mode}", "changed")
+
+                # Update miner's last mode change time
+                miner.current_mode = target_mode
+                miner.last_mode_change = datetime.utcnow()
+        elif mode_already_correct:
+            logger.debug(f"{miner.name} mode already correct, skipping mode change")
+            # Update database to reflect device state (in case it was None or drifted)
+            if miner.current_mode != target_mode:
+                miner.current_mode = target_mode
+                logger.debug(f"Updated {miner.name} database mode to match device: {target_mode}")
+            if not pool_already_correct:
+                # Pool was changed but mode was already correct
+                result.note(f"{self.target_pool_name} pool (mode already {target_mode})")
+        else:
+            # No target mode specified
+            if self.is_no_pool_change_band:
+                result.note("mode unchanged (pool unchanged)")
+            else:
+                result.note(f"{self.target_pool_name} pool (mode unchanged)")
+
+    async def _follow_up(self, miner: Miner, result: MinerResult):
+        """Session-bound failure handling, run sequentially after the concurrent phase"""
+        if result.power_cycle:
+            await PriceBandStrategy._validate_and_power_cycle_ha_device(self.db, miner, result.messages)
+
+        await PriceBandStrategy._promote_champion_on_failure_if_needed(
+            self.db,
+            self.strategy,
+            self.champion_mode_active,
+            miner,
+            result.follow_up,
+            result.messages,
+        )
@@ -9,12 +9,14 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Tuple
 import logging
 import asyncio
+import time
 
-from core.database import PriceBandStrategyConfig, MinerStrategy, Miner, Pool, EnergyPrice, Telemetry, PriceBandStrategyBand, HomeAssistantConfig, HomeAssistantDevice, StrategyBandModeTarget, MinerHASwitchLink
+from core.database import PriceBandStrategyConfig, MinerStrategy, Miner, Pool, EnergyPrice, PriceBandStrategyBand, HomeAssistantConfig, HomeAssistantDevice, StrategyBandModeTarget, MinerHASwitchLink
 from core.energy import get_current_energy_price
 from core.audit import log_audit
 from core.price_band_bands import ensure_strategy_bands, get_strategy_bands, get_band_for_price
 from core.miner_capabilities import get_champion_lowest_mode
+from core.pool_resolver import normalize_pool_endpoint
 from core.config import app_config
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,9 @@ async def ping_check(ip_address: str, timeout: int = 1) -> bool:
     """
     Check if an IP address responds to ping
     
+    Served by the shared liveness service (one ICMP socket, cached successes)
+    instead of spawning a ping process per check.
+    
     Args:
         ip_address: IP address to ping
         timeout: Ping timeout in seconds
@@ -33,17 +38,9 @@ async def ping_check(ip_address: str, timeout: int = 1) -> bool:
     Returns:
         True if ping successful, False otherwise
     """
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            'ping', '-c', '1', '-W', str(timeout), ip_address,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        await asyncio.wait_for(proc.communicate(), timeout=timeout + 1)
-        return proc.returncode == 0
-    except (asyncio.TimeoutError, Exception) as e:
-        logger.debug(f"Ping check failed for {ip_address}: {e}")
-        return False
+    from core.liveness import get_liveness_service
+    
+    return await get_liveness_service().check(ip_address, timeout=timeout)
 
 
 class PriceBandStrategy:
@@ -83,9 +80,7 @@ class PriceBandStrategy:
     @staticmethod
     def _normalize_pool_url(url: str) -> str:
         """Strip protocol/trailing slashes for stable pool URL comparisons."""
-        normalized = url.replace("stratum+tcp://", "").replace("stratum+ssl://", "")
-        normalized = normalized.replace("http://", "").replace("https://", "")
-        return normalized.rstrip("/").lower()
+        return normalize_pool_endpoint(url)
 
     @staticmethod
     def _get_target_mode_from_band(
@@ -166,50 +161,12 @@ class PriceBandStrategy:
                 access_token=ha_config.access_token
             )
             
-            # Check current state before sending command (optimization)
-            current_state = await ha_integration.get_device_state(ha_device.entity_id)
-            desired_state = "on" if turn_on else "off"
-            
-            # ALWAYS update database with actual HA state to prevent stale data
-            if current_state:
-                ha_device.current_state = current_state.state
-                ha_device.last_state_change = PriceBandStrategy._to_naive_utc(
-                    current_state.last_updated
-                )
-                # Update off timestamp if device is currently off
-                if current_state.state == "off":
-                    ha_device.last_off_command_timestamp = PriceBandStrategy._to_naive_utc(
-                        current_state.last_updated
-                    ) or datetime.utcnow()
-                await db.commit()  # Commit actual state immediately, even if command will fail
-
-            if current_state and current_state.state == desired_state:
-                # Device already in desired state, nothing to do
-                logger.debug(f"⏭️ HA device {ha_device.name} already {desired_state.upper()} for miner {miner.name} - skipping")
-                return True  # Already in desired state, no action needed
-            
-            # Control device
-            action = "turn_on" if turn_on else "turn_off"
-            logger.info(f"HA: {action} device {ha_device.name} for miner {miner.name}")
-            
-            if turn_on:
-                success = await ha_integration.turn_on(ha_device.entity_id)
-            else:
-                success = await ha_integration.turn_off(ha_device.entity_id)
-            
-            if success:
-                ha_device.current_state = desired_state
-                ha_device.last_state_change = datetime.utcnow()
-                if desired_state == "off":
-                    ha_device.last_off_command_timestamp = datetime.utcnow()
-                else:
-                    ha_device.last_off_command_timestamp = None
-                await db.commit()  # Persist state changes to prevent reconciliation conflicts
-                logger.info(f"✓ HA device {ha_device.name} {'ON' if turn_on else 'OFF'} for miner {miner.name}")
-                return True
-            else:
-                logger.error(f"✗ Failed to control HA device {ha_device.name} for miner {miner.name}")
-                return False
+            controlled, _ = await PriceBandStrategy._set_ha_switch_state(
+                ha_integration, ha_device, turn_on, miner.name
+            )
+            # Persist state changes to prevent reconciliation conflicts
+            await db.commit()
+            return controlled
                 
         except asyncio.CancelledError:
             logger.warning(f"HA device control cancelled for miner {miner.name}")
@@ -218,6 +175,64 @@ class PriceBandStrategy:
             logger.error(f"Error controlling HA device for miner {miner.name}: {e}")
             return False
 
+    @staticmethod
+    async def _set_ha_switch_state(
+        ha_integration,
+        ha_device: HomeAssistantDevice,
+        turn_on: bool,
+        label: str,
+    ) -> Tuple[bool, bool]:
+        """
+        Drive an HA switch to the desired state, mirroring the result onto
+        ha_device (caller commits).
+
+        Returns:
+            (controlled, toggled) - controlled is True when the switch ends up
+            in the desired state, toggled when a command had to be sent
+        """
+        # Check current state before sending command (optimization)
+        current_state = await ha_integration.get_cached_device_state(ha_device.entity_id)
+        desired_state = "on" if turn_on else "off"
+        
+        # ALWAYS update device with actual HA state to prevent stale data
+        if current_state:
+            ha_device.current_state = current_state.state
+            ha_device.last_state_change = PriceBandStrategy._to_naive_utc(
+                current_state.last_updated
+            )
+            # Update off timestamp if device is currently off
+            if current_state.state == "off":
+                ha_device.last_off_command_timestamp = PriceBandStrategy._to_naive_utc(
+                    current_state.last_updated
+                ) or datetime.utcnow()
+        
+        if current_state and current_state.state == desired_state:
+            # Device already in desired state, nothing to do
+            logger.debug(f"⏭️ HA device {ha_device.name} already {desired_state.upper()} for miner {label} - skipping")
+            return True, False
+        
+        # Control device
+        action = "turn_on" if turn_on else "turn_off"
+        logger.info(f"HA: {action} device {ha_device.name} for miner {label}")
+        
+        if turn_on:
+            success = await ha_integration.turn_on(ha_device.entity_id)
+        else:
+            success = await ha_integration.turn_off(ha_device.entity_id)
+        
+        if not success:
+            logger.error(f"✗ Failed to control HA device {ha_device.name} for miner {label}")
+            return False, False
+        
+        ha_device.current_state = desired_state
+        ha_device.last_state_change = datetime.utcnow()
+        if desired_state == "off":
+            ha_device.last_off_command_timestamp = datetime.utcnow()
+        else:
+            ha_device.last_off_command_timestamp = None
+        logger.info(f"✓ HA device {ha_device.name} {'ON' if turn_on else 'OFF'} for miner {label}")
+        return True, True
+
     @staticmethod
     async def _get_enrolled_ha_device(db: AsyncSession, miner_id: int) -> Optional[HomeAssistantDevice]:
         """Return enrolled HA device for miner, if any."""
@@ -292,7 +307,7 @@ class PriceBandStrategy:
             )
             
             # Check HA device state
-            device_state = await ha_integration.get_device_state(ha_device.entity_id)
+            device_state = await ha_integration.get_cached_device_state(ha_device.entity_id)
             
             if not device_state or device_state.state != "on":
                 # HA says device is OFF, that explains why miner isn't responding
@@ -763,23 +778,21 @@ class PriceBandStrategy:
         Returns:
             List of (miner, w_per_th) tuples sorted by efficiency (lowest W/TH = best)
         """
+        from core.latest_telemetry import get_latest_telemetry_store
+
         efficiency_list = []
         
         # Get recent telemetry for each miner (last 6 hours)
         cutoff = datetime.utcnow() - timedelta(hours=6)
+        latest_store = await get_latest_telemetry_store().ensure_warm(db)
         
         for miner in enrolled_miners:
             # Get recent telemetry
-            result = await db.execute(
-                select(Telemetry.hashrate, Telemetry.power_watts)
-                .where(Telemetry.miner_id == miner.id)
-                .where(Telemetry.timestamp > cutoff)
-                .where(Telemetry.hashrate.isnot(None))
-                .where(Telemetry.power_watts.isnot(None))
-                .order_by(Telemetry.timestamp.desc())
-                .limit(10)
-            )
-            rows = result.all()
+            rows = [
+                (reading.hashrate, reading.power_watts)
+                for reading in latest_store.recent(miner.id, since=cutoff)
+                if reading.power_watts is not None
+            ]
             
             if not rows:
                 logger.debug(f"{miner.name}: No recent telemetry for efficiency calculation")
@@ -1100,17 +1113,23 @@ class PriceBandStrategy:
             # Only control HA devices on actual transition to OFF, not every execution
             if is_band_transition:
                 logger.info("TRANSITIONING TO OFF - turning off linked HA devices")
-                ha_actions = []
+                from core.price_band_executor import MinerAction, PriceBandExecutor, load_fleet_state
+                
+                started = time.monotonic()
+                fleet = await load_fleet_state(db, enrolled_miners)
+                plan = []
                 for miner in enrolled_miners:
-                    if not await PriceBandStrategy._is_miner_currently_enrolled(db, miner.id):
+                    if not fleet.is_enrolled(miner.id):
                         logger.info(f"{miner.name}: skipped OFF action (miner no longer enrolled)")
-                        ha_actions.append(f"{miner.name}: skipped (no longer enrolled)")
+                        plan.append(MinerAction(miner, skip_message="skipped (no longer enrolled)"))
                         continue
-                    controlled = await PriceBandStrategy._enforce_ha_state(db, miner, turn_on=False)
-                    if controlled:
-                        ha_actions.append(f"{miner.name}: HA device turned OFF")
-                    else:
-                        ha_actions.append(f"{miner.name}: No HA device linked")
+                    plan.append(MinerAction(
+                        miner,
+                        ha_turn_on=False,
+                        ha_messages=("HA device turned OFF", "No HA device linked"),
+                    ))
+                results = await PriceBandExecutor(db, fleet, strategy).apply(plan)
+                ha_actions = [message for result in results for message in result.messages]
                 
                 await log_audit(
                     db,
@@ -1133,7 +1152,9 @@ class PriceBandStrategy:
                     "pool": None,
                     "miners": len(enrolled_miners),
                     "message": f"Transitioned to OFF - {len([a for a in ha_actions if 'turned OFF' in a])} HA devices turned off",
-                    "actions": ha_actions
+                    "actions": ha_actions,
+                    "results": [result.as_dict() for result in results],
+                    "execution": PriceBandExecutor.summary(results, time.monotonic() - started)
                 }
             else:
                 # Already in OFF band, no action needed
@@ -1153,6 +1174,12 @@ class PriceBandStrategy:
             # Pool is active (not OFF)
             logger.info(f"Target pool mode: {target_pool_name} (price: {current_price}p/kWh)")
             
+            from core.price_band_executor import MinerAction, PriceBandExecutor, load_fleet_state
+            
+            started = time.monotonic()
+            fleet = await load_fleet_state(db, enrolled_miners)
+            plan = []
+            
             # Champion Mode: If active, only run champion miner, turn off all others
             if champion_mode_active and strategy.current_champion_miner_id:
                 champion_miner = next((m for m in enrolled_miners if m.id == strategy.current_champion_miner_id), None)
@@ -1168,26 +1195,20 @@ class PriceBandStrategy:
                     if is_band_transition:
                         logger.info("Champion Mode transition: Controlling HA devices")
                         
-                        # Turn OFF all non-champion miners via HA
+                        # Turn OFF all non-champion miners via HA (the champion is
+                        # turned ON with the per-miner plan below)
                         for miner in enrolled_miners:
-                            if miner.id != strategy.current_champion_miner_id:
-                                if not await PriceBandStrategy._is_miner_currently_enrolled(db, miner.id):
-                                    logger.info(f"{miner.name}: skipped champion OFF action (miner no longer enrolled)")
-                                    actions_taken.append(f"{miner.name}: Skipped (no longer enrolled)")
-                                    continue
-                                controlled = await PriceBandStrategy._enforce_ha_state(db, miner, turn_on=False)
-                                if controlled:
-                                    actions_taken.append(f"{miner.name}: HA device OFF (not champion)")
-                                else:
-                                    actions_taken.append(f"{miner.name}: Excluded (no HA link)")
-                        
-                        # Turn ON champion via HA (state-checked, only if not already ON)
-                        await PriceBandStrategy._enforce_ha_state(
-                            db,
-                            champion_miner,
-                            turn_on=True,
-                            sleep_after_on_seconds=3,
-                        )
+                            if miner.id == strategy.current_champion_miner_id:
+                                continue
+                            if not fleet.is_enrolled(miner.id):
+                                logger.info(f"{miner.name}: skipped champion OFF action (miner no longer enrolled)")
+                                plan.append(MinerAction(miner, skip_message="Skipped (no longer enrolled)"))
+                                continue
+                            plan.append(MinerAction(
+                                miner,
+                                ha_turn_on=False,
+                                ha_messages=("HA device OFF (not champion)", "Excluded (no HA link)"),
+                            ))
                     
                     # Process champion miner only
                     enrolled_miners = [champion_miner]
@@ -1202,13 +1223,11 @@ class PriceBandStrategy:
                         champion_miner.miner_type
                     ] = champion_target_mode
             
-            # Apply changes to each miner
-            from adapters import get_adapter
-            
+            # Plan changes for each miner
             for miner in enrolled_miners:
-                if not await PriceBandStrategy._is_miner_currently_enrolled(db, miner.id):
+                if not fleet.is_enrolled(miner.id):
                     logger.info(f"{miner.name}: skipped (miner no longer enrolled)")
-                    actions_taken.append(f"{miner.name}: Skipped (no longer enrolled)")
+                    plan.append(MinerAction(miner, skip_message="Skipped (no longer enrolled)"))
                     continue
                 # Get target mode from band based on miner type
                 target_mode = PriceBandStrategy._get_target_mode_from_band(
@@ -1224,247 +1243,41 @@ class PriceBandStrategy:
                 if target_mode == "managed_externally":
                     # Only control HA device on actual band transitions
                     if is_band_transition:
-                        controlled = await PriceBandStrategy._enforce_ha_state(db, miner, turn_on=False)
-                        if controlled:
-                            actions_taken.append(f"{miner.name}: HA device OFF (band transition)")
-                        else:
-                            actions_taken.append(f"{miner.name}: External control (no HA link)")
+                        plan.append(MinerAction(
+                            miner,
+                            ha_turn_on=False,
+                            ha_messages=("HA device OFF (band transition)", "External control (no HA link)"),
+                        ))
                     else:
                         # Already in this band, HA device should already be OFF
                         logger.debug(f"{miner.name}: Already in managed_externally mode (no action needed)")
                     continue
-                else:
-                    # Ensure HA device is ON (if miner is enrolled and should be active)
-                    # Only execute turn_on command on band transitions OR if device is currently OFF
-                    if is_band_transition:
-                        await PriceBandStrategy._enforce_ha_state(
-                            db,
-                            miner,
-                            turn_on=True,
-                            sleep_after_on_seconds=3,
-                        )
-                    else:
-                        # Check if device is currently OFF and needs to be turned ON
-                        if await PriceBandStrategy._is_ha_device_off(db, miner.id):
-                            logger.info(f"{miner.name}: HA device is OFF, turning ON")
-                            await PriceBandStrategy._enforce_ha_state(
-                                db,
-                                miner,
-                                turn_on=True,
-                                sleep_after_on_seconds=3,
-                            )
-                
-                logger.info(f"Miner {miner.name} ({miner.miner_type}): target mode = {target_mode}")
-                
-                # Get adapter
-                adapter = get_adapter(miner)
-                if not adapter:
-                    logger.error(f"No adapter for miner {miner.name}")
-                    actions_taken.append(f"{miner.name}: FAILED (no adapter)")
-                    continue
                 
-                # Check current state to determine if changes are needed
-                try:
-                    # Refresh miner from DB to get latest mode
-                    await db.refresh(miner)
-                    
-                    # Get telemetry with timeout to avoid hanging on offline devices
-                    telemetry = await asyncio.wait_for(adapter.get_telemetry(), timeout=5.0)
-                    
-                    # Reset failure count on successful telemetry retrieval
-                    PriceBandStrategy._reset_miner_failure(miner.id)
-                    
-                    current_pool = telemetry.pool_in_use if telemetry else None
-                    
-                    # Check device-reported mode (actual device state) vs database
-                    device_reported_mode = telemetry.extra_data.get("current_mode") if telemetry and telemetry.extra_data else None
-                    db_current_mode = miner.current_mode
-                    
-                    # Build expected pool URL when pool switching is enabled
-                    target_pool_url = f"{target_pool.url}:{target_pool.port}" if target_pool else None
-                    
-                    # Guard: Check if pool was recently switched (within 3 minutes)
-                    # This prevents reboot loops on Avalon miners that take time to reconnect
-                    if miner.last_pool_switch:
-                        seconds_since_switch = (datetime.utcnow() - miner.last_pool_switch).total_seconds()
-                        if seconds_since_switch < 180:  # 3 minutes cooldown
-                            logger.info(
-                                f"{miner.name} pool switched {int(seconds_since_switch)}s ago; "
-                                f"waiting for reboot to complete ({int(180 - seconds_since_switch)}s remaining)"
-                            )
-                            actions_taken.append(f"{miner.name}: Waiting for pool switch to complete")
-                            continue
-                    
-                    # Per-band no-pool-change mode: only manage modes, never switch pools
-                    if is_no_pool_change_band:
-                        pool_already_correct = True
-
-                    # Guard: if pool is missing/empty, treat as unknown and skip pool switch
-                    elif not current_pool:
-                        logger.warning(
-                            f"{miner.name} reported no pool; skipping pool switch this cycle"
-                        )
-                        
-                        # Track consecutive failures and trigger HA validation
-                        failure_count = PriceBandStrategy._increment_miner_failure(miner.id)
-                        
-                        # After 6 consecutive failures (6 minutes), check if HA device is stuck
-                        # This prevents false positives from temporary telemetry issues
-                        if failure_count >= 6:
-                            await PriceBandStrategy._validate_and_power_cycle_ha_device(
-                                db, miner, actions_taken
-                            )
-                            
-                            await PriceBandStrategy._promote_champion_on_failure_if_needed(
-                                db,
-                                strategy,
-                                champion_mode_active,
-                                miner,
-                                f"Pool unknown after {failure_count} failures",
-                                actions_taken,
-                            )
-                        else:
-                            actions_taken.append(f"{miner.name}: Pool unknown (skipped)")
-                        
-                        # Skip all further processing for this miner (no pool switch, no mode change)
-                        continue
-                    else:
-                        # Use normalized URL comparison to prevent port-only matches
-                        current_pool_normalized = PriceBandStrategy._normalize_pool_url(current_pool)
-                        target_pool_normalized = PriceBandStrategy._normalize_pool_url(target_pool_url)
-                        pool_already_correct = (target_pool_normalized == current_pool_normalized)
-                    # Mode is correct if device reports the target mode (not just database)
-                    mode_already_correct = device_reported_mode == target_mode if device_reported_mode else db_current_mode == target_mode
-                    target_pool_name_for_log = target_pool.name if target_pool else "unchanged pool"
-                    
-                    if pool_already_correct and mode_already_correct:
-                        logger.debug(f"{miner.name} already on {target_pool_name_for_log} with mode {target_mode}")
-                        actions_taken.append(f"{miner.name}: Already correct (no change)")
-                        continue
-                    
-                    # Log what needs to change
-                    if not pool_already_correct:
-                        logger.info(f"{miner.name} needs pool change: {current_pool} → {target_pool_url}")
-                    if not mode_already_correct:
-                        if device_reported_mode and device_reported_mode != db_current_mode:
-                            logger.warning(f"{miner.name} MODE DRIFT: DB says {db_current_mode}, device reports {device_reported_mode}, target is {target_mode}")
-                        else:
-                            logger.info(f"{miner.name} needs mode change: {db_current_mode} → {target_mode}")
-                    
-                except asyncio.TimeoutError:
-                    # Track consecutive telemetry timeouts
-                    timeout_count = PriceBandStrategy._increment_miner_failure(miner.id)
-                    
-                    if timeout_count >= 5:
-                        # After 5 consecutive timeouts (5 minutes), something is likely wrong
-                        logger.warning(f"{miner.name} telemetry timeout {timeout_count} times - attempting reconfiguration")
-                        
-                        promoted = await PriceBandStrategy._promote_champion_on_failure_if_needed(
-                            db,
-                            strategy,
-                            champion_mode_active,
-                            miner,
-                            f"Telemetry timeout after {timeout_count} failures",
-                            actions_taken,
-                        )
-                        if promoted:
-                            # Don't continue - let new champion be selected and activated
-                            continue
-                        
-                        pool_already_correct = is_no_pool_change_band
-                        mode_already_correct = False
-                    else:
-                        # Skip reconfiguration until we hit threshold
-                        logger.warning(f"{miner.name} telemetry timeout ({timeout_count}/5) - skipping this cycle")
-                        actions_taken.append(f"{miner.name}: Telemetry timeout (skipped)")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not check current state for {miner.name}: {e}")
-                    # Continue with switch attempt if we can't verify current state
-                    pool_already_correct = is_no_pool_change_band
-                    mode_already_correct = False
+                # Ensure HA device is ON (if miner is enrolled and should be active)
+                # Only execute turn_on command on band transitions OR if device is currently OFF
+                ha_turn_on = None
+                if is_band_transition:
+                    ha_turn_on = True
+                elif fleet.is_ha_device_off(miner.id):
+                    logger.info(f"{miner.name}: HA device is OFF, turning ON")
+                    ha_turn_on = True
                 
-                # Switch pool (only if needed)
-                if not pool_already_correct and target_pool is not None:
-                    try:
-                        pool_switched = await adapter.switch_pool(
-                            pool_url=target_pool.url,
-                            pool_port=target_pool.port,
-                            pool_user=target_pool.user,
-                            pool_password=target_pool.password
-                        )
-                        
-                        if not pool_switched:
-                            logger.warning(f"Failed to switch {miner.name} to {target_pool.name}")
-                            
-                            # Track consecutive pool switch failures
-                            failure_count = PriceBandStrategy._increment_miner_failure(miner.id)
-                            
-                            # After 3 consecutive failures, check if HA device is stuck
-                            if failure_count >= 3:
-                                await PriceBandStrategy._validate_and_power_cycle_ha_device(
-                                    db, miner, actions_taken
-                                )
-                                
-                                await PriceBandStrategy._promote_champion_on_failure_if_needed(
-                                    db,
-                                    strategy,
-                                    champion_mode_active,
-                                    miner,
-                                    "Pool switch failed after 3 attempts",
-                                    actions_taken,
-                                )
-                            else:
-                                actions_taken.append(f"{miner.name}: Pool switch FAILED")
-                            continue
-                        
-                        # Reset failure count on successful switch
-                        PriceBandStrategy._reset_miner_failure(miner.id)
-                        logger.info(f"Switched {miner.name} to pool {target_pool.name}")
-                        
-                        # Wait for miner to finish rebooting after pool switch
-                        logger.debug(f"Waiting 8 seconds for {miner.name} to reboot after pool switch...")
-                        await asyncio.sleep(8)
-                    except Exception as e:
-                        logger.error(f"Error switching pool for {miner.name}: {e}")
-                        actions_taken.append(f"{miner.name}: Pool switch ERROR - {e}")
-                        continue
-                else:
-                    logger.debug(f"{miner.name} pool already correct, skipping pool switch")
-                
-                # Set mode (only if needed)
-                if target_mode and not mode_already_correct:
-                    try:
-                        mode_set = await adapter.set_mode(target_mode)
-                        
-                        if not mode_set:
-                            logger.warning(f"Failed to set mode {target_mode} on {miner.name}")
-                            actions_taken.append(f"{miner.name}: Mode change FAILED")
-                        else:
-                            logger.info(f"Set {miner.name} to mode {target_mode}")
-                            actions_taken.append(f"{miner.name}: mode={target_mode}")
-                            
-                            # Update miner's last mode change time
-                            miner.current_mode = target_mode
-                            miner.last_mode_change = datetime.utcnow()
-                    except Exception as e:
-                        logger.error(f"Error setting mode for {miner.name}: {e}")
-                        actions_taken.append(f"{miner.name}: Mode change ERROR - {e}")
-                elif mode_already_correct:
-                    logger.debug(f"{miner.name} mode already correct, skipping mode change")
-                    # Update database to reflect device state (in case it was None or drifted)
-                    if miner.current_mode != target_mode:
-                        miner.current_mode = target_mode
-                        logger.debug(f"Updated {miner.name} database mode to match device: {target_mode}")
-                    if not pool_already_correct:
-                        # Pool was changed but mode was already correct
-                        actions_taken.append(f"{miner.name}: {target_pool_name} pool (mode already {target_mode})")
-                else:
-                    # No target mode specified
-                    if is_no_pool_change_band:
-                        actions_taken.append(f"{miner.name}: mode unchanged (pool unchanged)")
-                    else:
-                        actions_taken.append(f"{miner.name}: {target_pool_name} pool (mode unchanged)")
+                plan.append(MinerAction(miner, target_mode=target_mode, configure=True, ha_turn_on=ha_turn_on))
+            
+            # Apply the plan concurrently
+            executor = PriceBandExecutor(
+                db,
+                fleet,
+                strategy,
+                target_pool=target_pool,
+                target_pool_name=target_pool_name,
+                is_no_pool_change_band=is_no_pool_change_band,
+                champion_mode_active=champion_mode_active,
+            )
+            results = await executor.apply(plan)
+            actions_taken.extend(message for result in results for message in result.messages)
+            execution_summary = PriceBandExecutor.summary(results, time.monotonic() - started)
+            logger.info(f"Applied plan for {len(plan)} miner(s) in {execution_summary['elapsed_seconds']}s")
             
             await log_audit(
                 db,
@@ -1499,6 +1312,8 @@ class PriceBandStrategy:
             "requested_pool": requested_target_pool_name,
             "miners": len(enrolled_miners),
             "actions": actions_taken,
+            "results": [result.as_dict() for result in results],
+            "execution": execution_summary,
             "hysteresis_counter": new_counter
         }
         
@@ -1580,7 +1395,7 @@ class PriceBandStrategy:
                                 access_token=ha_config.access_token
                             )
                             
-                            state = await ha_integration.get_device_state(ha_device.entity_id)
+                            state = await ha_integration.get_cached_device_state(ha_device.entity_id)
                             if state:
                                 ha_device.current_state = state.state
                                 ha_device.last_state_change = PriceBandStrategy._to_naive_utc(
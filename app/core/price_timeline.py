@@ -0,0 +1,115 @@
+"""
+Energy price timeline
+
+Cost calculations used to find the price for each telemetry reading by
+scanning every EnergyPrice row in the window (O(readings x slots) per
+request). PriceTimeline holds the slots of one region as sorted parallel
+lists and answers "price at timestamp" with a binary search. Timelines are
+cached per region and invalidated whenever _update_energy_prices writes new
+slots.
+"""
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import app_config
+
+logger = logging.getLogger(__name__)
+
+# Cached timelines are also refreshed after this long, in case prices were
+# written somewhere other than _update_energy_prices
+CACHE_TTL_SECONDS = 600
+
+
+class PriceTimeline:
+    """Sorted, half-open [valid_from, valid_to) price slots with O(log n) lookup"""
+
+    __slots__ = ("starts", "ends", "prices")
+
+    def __init__(self, slots: Iterable[Tuple[datetime, datetime, float]]):
+        ordered = sorted(slots, key=lambda slot: slot[0])
+        self.starts: List[datetime] = [slot[0] for slot in ordered]
+        self.ends: List[datetime] = [slot[1] for slot in ordered]
+        self.prices: List[float] = [float(slot[2]) for slot in ordered]
+
+    @classmethod
+    def from_prices(cls, prices) -> "PriceTimeline":
+        """Build from EnergyPrice rows (anything with valid_from/valid_to/price_pence)"""
+        return cls((p.valid_from, p.valid_to, p.price_pence) for p in prices)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def price_at(self, ts: datetime) -> Optional[float]:
+        """Price (pence/kWh) of the slot containing ts, or None if no slot covers it"""
+        index = bisect_right(self.starts, ts) - 1
+        if index >= 0 and ts < self.ends[index]:
+            return self.prices[index]
+        return None
+
+    def prices_at(self, timestamps: Iterable[datetime]) -> List[Optional[float]]:
+        """price_at for many timestamps"""
+        return [self.price_at(ts) for ts in timestamps]
+
+    def slots_between(self, start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime, float]]:
+        """(valid_from, valid_to, price) for slots starting within [start, end]"""
+        for index in range(bisect_left(self.starts, start), bisect_right(self.starts, end)):
+            yield self.starts[index], self.ends[index], self.prices[index]
+
+
+def get_price_region() -> str:
+    """Region of the configured energy provider (falls back to the Octopus Agile key)"""
+    provider_id = app_config.get("energy.provider_id", "octopus_agile")
+    return app_config.get(f"energy.providers.{provider_id}.region", app_config.get("octopus_agile.region", "H"))
+
+
+# region -> (loaded_at monotonic, covers-from datetime, timeline)
+_timelines: Dict[str, Tuple[float, datetime, PriceTimeline]] = {}
+
+
+async def get_price_timeline(
+    db: AsyncSession,
+    start: datetime,
+    region: Optional[str] = None,
+) -> PriceTimeline:
+    """
+    Timeline of every known slot for `region` that ends after `start`.
+
+    Loads are padded back to midnight so requests with slightly different
+    rolling windows (e.g. "last 24h" on every dashboard poll) share one entry.
+    Future slots are always included.
+    """
+    from core.database import EnergyPrice
+
+    region = region or get_price_region()
+    cached = _timelines.get(region)
+    if cached is not None:
+        loaded_at, covers_from, timeline = cached
+        if covers_from <= start and time.monotonic() - loaded_at < CACHE_TTL_SECONDS:
+            return timeline
+
+    covers_from = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    if cached is not None and cached[1] < covers_from:
+        # Keep the wider history an earlier caller already needed
+        covers_from = cached[1]
+
+    result = await db.execute(
+        select(EnergyPrice.valid_from, EnergyPrice.valid_to, EnergyPrice.price_pence)
+        .where(EnergyPrice.region == region)
+        .where(EnergyPrice.valid_to > covers_from)
+        .order_by(EnergyPrice.valid_from)
+    )
+    timeline = PriceTimeline(result.all())
+    _timelines[region] = (time.monotonic(), covers_from, timeline)
+    logger.debug("Loaded price timeline for region %s: %s slots from %s", region, len(timeline), covers_from)
+    return timeline
+
+
+def invalidate_price_timelines():
+    """Drop cached timelines (call after writing new price slots)"""
+    _timelines.clear()
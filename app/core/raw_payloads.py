@@ -0,0 +1,152 @@
+"""
+Cold storage for raw vendor payloads
+
+Drivers attach the full device response to telemetry under
+extra_data["vendor"]["raw"]. Kept inline, that blob is repeated in every row
+of the hottest table. With cold storage enabled the raw payload is moved to
+telemetry_raw_payloads - zlib-compressed, keyed by the sha256 of its
+canonical JSON so identical payloads are stored once - and the telemetry row
+keeps only {"vendor": {"raw_ref": <digest>}} next to its normalized fields.
+The raw payload is pulled back lazily for detail views and expires after a
+shorter retention than telemetry itself.
+"""
+import hashlib
+import json
+import logging
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+RAW_REF_KEY = "raw_ref"
+
+
+def cold_storage_enabled() -> bool:
+    from core.config import app_config
+
+    return bool(app_config.get("telemetry.raw_payloads.cold_storage", True))
+
+
+def _encode(raw: Any) -> Tuple[str, bytes]:
+    canonical = json.dumps(raw, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(canonical).hexdigest(), zlib.compress(canonical, 6)
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def split_raw_payload(data: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[str, bytes]]]:
+    """
+    Move vendor.raw out of a telemetry data dict.
+
+    Returns (inline_data, (digest, compressed_payload)), or (data, None) when
+    there is no raw payload. The input dict is not modified.
+    """
+    if not isinstance(data, dict):
+        return data, None
+    vendor = data.get("vendor")
+    if not isinstance(vendor, dict) or vendor.get("raw") is None:
+        return data, None
+
+    digest, blob = _encode(vendor["raw"])
+    inline_vendor = {key: value for key, value in vendor.items() if key != "raw"}
+    inline_vendor[RAW_REF_KEY] = digest
+    return {**data, "vendor": inline_vendor}, (digest, blob)
+
+
+def extract_raw_payloads(rows: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split raw payloads out of prepared telemetry rows.
+
+    Returns (rows, payload_rows) where payload_rows are ready for
+    store_raw_payloads(). Rows are returned unchanged when cold storage is off.
+    """
+    rows = list(rows)
+    if not cold_storage_enabled():
+        return rows, []
+
+    out_rows: List[Dict[str, Any]] = []
+    payloads: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        inline, raw = split_raw_payload(row.get("data"))
+        if raw is None:
+            out_rows.append(row)
+            continue
+        digest, blob = raw
+        out_rows.append({**row, "data": inline})
+        seen_at = row.get("timestamp") or datetime.utcnow()
+        existing = payloads.get(digest)
+        if existing is None:
+            payloads[digest] = {
+                "digest": digest,
+                "miner_id": row["miner_id"],
+                "payload": blob,
+                "first_seen": seen_at,
+                "last_seen": seen_at,
+            }
+        else:
+            existing["first_seen"] = min(existing["first_seen"], seen_at)
+            existing["last_seen"] = max(existing["last_seen"], seen_at)
+    return out_rows, list(payloads.values())
+
+
+async def store_raw_payloads(db: AsyncSession, payloads: List[Dict[str, Any]]):
+    """Insert payload rows, bumping last_seen for digests already stored (caller commits)"""
+    from core.database import TelemetryRawPayload
+
+    if not payloads:
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+    stmt = dialect_insert(TelemetryRawPayload)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["digest"],
+            set_={"last_seen": stmt.excluded.last_seen},
+        ),
+        payloads,
+    )
+
+
+async def load_raw_payload(db: AsyncSession, digest: str) -> Optional[Any]:
+    """Raw payload for a digest, or None if it has expired"""
+    from core.database import TelemetryRawPayload
+
+    result = await db.execute(
+        select(TelemetryRawPayload.payload).where(TelemetryRawPayload.digest == digest)
+    )
+    blob = result.scalar_one_or_none()
+    return _decode(blob) if blob is not None else None
+
+
+async def hydrate_raw_payload(db: AsyncSession, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return a copy of telemetry data with vendor.raw restored from cold storage"""
+    if not isinstance(data, dict):
+        return data
+    vendor = data.get("vendor")
+    if not isinstance(vendor, dict) or not vendor.get(RAW_REF_KEY):
+        return data
+
+    raw = await load_raw_payload(db, vendor[RAW_REF_KEY])
+    if raw is None:
+        return data
+    return {**data, "vendor": {**vendor, "raw": raw}}
+
+
+async def purge_raw_payloads(db: AsyncSession, retention_hours: int) -> int:
+    """Delete payloads not seen within the retention window (caller commits)"""
+    from core.database import TelemetryRawPayload
+
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    result = await db.execute(
+        delete(TelemetryRawPayload).where(TelemetryRawPayload.last_seen < cutoff)
+    )
+    return getattr(result, "rowcount", 0) or 0
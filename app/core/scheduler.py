@@ -5,6 +5,7 @@ import logging
 import asyncio
 import statistics
 import inspect
+import ipaddress
 import aiohttp
 import os
 import random
@@ -17,7 +18,9 @@ from sqlalchemy import select, func, and_, delete, text
 from typing import Optional, Any, Coroutine, cast
 from core.config import app_config
 from core.cloud_push import init_cloud_service, get_cloud_service
-from core.database import EnergyPrice, Telemetry, Miner, AuditLog
+from core.database import Telemetry, Miner, AuditLog
+from core.price_timeline import get_price_timeline, invalidate_price_timelines
+from core.latest_telemetry import get_latest_telemetry_store
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +61,8 @@ class SchedulerService:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.nmminer_listener = None
-        self.nmminer_adapters = {}  # Shared adapter registry for NMMiner devices
+        self.nmminer_adapters = {}  # IP -> cached NMMiner adapter, fed by the UDP listener
+        self._shutdown_tasks: list[asyncio.Task] = []
         self.runtime_protection_status: dict[str, Any] = {
             "degraded_mode": False,
             "reason": None,
@@ -213,6 +217,13 @@ class SchedulerService:
             name="Check PostgreSQL index health and bloat"
         )
 
+        self.scheduler.add_job(
+            self._rollup_telemetry,
+            IntervalTrigger(minutes=max(1, _as_int(app_config.get("telemetry.rollup.interval_minutes", 5), 5))),
+            id="rollup_telemetry",
+            name="Unified telemetry rollups (hourly/daily, analytics, metrics)"
+        )
+
         self.scheduler.add_job(
             self._aggregate_daily_stats,
             IntervalTrigger(hours=24),
@@ -504,7 +515,17 @@ class SchedulerService:
     def shutdown(self):
         """Shutdown scheduler"""
         # Listener can still be running independently of APScheduler state.
-        self._stop_nmminer_listener()
+        # Cleanup is best-effort: no step may keep the scheduler from stopping.
+        for cleanup in (
+            self._stop_nmminer_listener,
+            self._stop_telemetry_writer,
+            self._close_http_client,
+            self._close_ha_client,
+        ):
+            try:
+                cleanup()
+            except Exception as e:
+                logger.exception("Shutdown step %s failed: %s", cleanup.__name__, e)
 
         if not self.scheduler.running:
             logger.info("Scheduler already stopped")
@@ -537,6 +558,53 @@ class SchedulerService:
         finally:
             self.nmminer_listener = None
 
+    def _run_shutdown_coro(self, coro, description: str):
+        """Run async cleanup from sync shutdown(); tracked so wait_closed() can await it."""
+        try:
+            try:
+                loop = asyncio.get_running_loop()
+                self._shutdown_tasks.append(loop.create_task(coro))
+            except RuntimeError:
+                asyncio.run(coro)
+        except Exception as e:
+            logger.exception("Failed to %s cleanly: %s", description, e)
+
+    def _stop_telemetry_writer(self):
+        """Flush queued telemetry rows and stop the write-behind writer."""
+        try:
+            from core.telemetry_writer import stop_telemetry_writer
+        except ImportError as e:
+            logger.warning("Telemetry writer not stopped: %s", e)
+            return
+
+        self._run_shutdown_coro(stop_telemetry_writer(), "stop telemetry writer")
+
+    def _close_http_client(self):
+        """Close the shared driver HTTP session and its pooled connections."""
+        try:
+            from core.http_client import close_http_client
+        except ImportError as e:
+            logger.warning("Shared HTTP client not closed: %s", e)
+            return
+
+        self._run_shutdown_coro(close_http_client(), "close shared HTTP client")
+
+    def _close_ha_client(self):
+        """Stop the Home Assistant state stream and close its shared HTTP client."""
+        try:
+            from integrations.homeassistant import close_ha_client
+        except ImportError as e:
+            logger.warning("Home Assistant client not closed: %s", e)
+            return
+
+        self._run_shutdown_coro(close_ha_client(), "close Home Assistant client")
+
+    async def wait_closed(self):
+        """Wait for async cleanup started by shutdown() (telemetry flush, HTTP close)."""
+        tasks, self._shutdown_tasks = self._shutdown_tasks, []
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def get_energy_provider_status(self):
         """Get last energy provider sync status."""
         return dict(self.energy_provider_status)
@@ -575,7 +643,6 @@ class SchedulerService:
             MinerStrategy,
             PriceBandStrategyBand,
             PriceBandStrategyConfig,
-            Telemetry,
         )
 
         stale_cutoff_seconds = max(60, _as_int(app_config.get("telemetry.watchdog_stale_seconds", 180), 180))
@@ -593,14 +660,13 @@ class SchedulerService:
 
         try:
             async with AsyncSessionLocal() as db:
+                latest_store = await get_latest_telemetry_store().ensure_warm(db)
                 result = await db.execute(
-                    select(Miner.id, func.max(Telemetry.timestamp))
-                    .outerjoin(Telemetry, Telemetry.miner_id == Miner.id)
+                    select(Miner.id)
                     .where(Miner.enabled == True)
                     .where(Miner.miner_type != "nmminer")
-                    .group_by(Miner.id)
                 )
-                rows = result.all()
+                rows = [(miner_id, latest_store.last_seen(miner_id)) for miner_id in result.scalars().all()]
 
                 # Exempt miners intentionally OFF due to strategy or HA state.
                 # These miners should not count as stale telemetry failures.
@@ -919,6 +985,7 @@ class SchedulerService:
                         inserted_count += 1
 
                 await db.commit()
+            invalidate_price_timelines()
 
             total_slots = len(slots)
             self.energy_provider_status.update({
@@ -973,9 +1040,14 @@ class SchedulerService:
         from api.settings import update_crypto_prices_cache
         await update_crypto_prices_cache()
     
-    async def _collect_miner_telemetry(self, miner, agile_in_off_state, db):
-        """Collect telemetry from a single miner (used for parallel collection)"""
-        from core.database import Telemetry, Event, Pool, MinerStrategy, EnergyPrice, HomeAssistantDevice, MinerHASwitchLink
+    async def _collect_miner_telemetry(self, miner, agile_in_off_state, db, writer=None):
+        """
+        Collect telemetry from a single miner (used for parallel collection).
+
+        When a write-behind `writer` is given the telemetry row is queued for
+        batched insertion instead of being added to `db`.
+        """
+        from core.database import Telemetry, Event, Pool, MinerStrategy, HomeAssistantDevice, MinerHASwitchLink
         from adapters import create_adapter
         from sqlalchemy import select
         
@@ -1035,7 +1107,11 @@ class SchedulerService:
             if telemetry:
                 # Track high difficulty shares (ASIC miners only)
                 if miner.miner_type in ["avalon_nano", "bitaxe", "nerdqaxe"] and telemetry.extra_data:
-                    from core.high_diff_tracker import track_high_diff_share
+                    from core.high_diff_tracker import (
+                        get_best_difficulty_register,
+                        parse_difficulty,
+                        track_high_diff_share,
+                    )
                     
                     # Extract best diff based on miner type
                     current_best_diff = None
@@ -1044,98 +1120,41 @@ class SchedulerService:
                     elif miner.miner_type == "avalon_nano":
                         current_best_diff = telemetry.extra_data.get("best_share_diff") or telemetry.extra_data.get("best_share")
                     
-                    if current_best_diff:
-                        # Get previous best from last telemetry reading
-                        prev_result = await db.execute(
-                            select(Telemetry)
-                            .where(Telemetry.miner_id == miner.id)
-                            .order_by(Telemetry.timestamp.desc())
-                            .limit(1)
-                        )
-                        prev_telemetry = prev_result.scalar_one_or_none()
-                        
-                        previous_best = None
-                        if prev_telemetry and prev_telemetry.data:
-                            if miner.miner_type in ["bitaxe", "nerdqaxe"]:
-                                previous_best = prev_telemetry.data.get("best_session_diff")
-                            elif miner.miner_type == "avalon_nano":
-                                previous_best = prev_telemetry.data.get("best_share_diff") or prev_telemetry.data.get("best_share")
-                        
-                        # Only track if this is a new personal best (ensure numeric comparison)
-                        try:
-                            # Parse values that may have unit suffixes (e.g., "130.46 k" = 130460)
-                            def parse_difficulty(value):
-                                if value is None:
-                                    return None
-                                if isinstance(value, (int, float)):
-                                    return float(value)
-                                
-                                # Handle string values with unit suffixes
-                                value_str = str(value).strip().lower()
-                                multipliers = {
-                                    'k': 1_000,
-                                    'm': 1_000_000,
-                                    'g': 1_000_000_000,
-                                    't': 1_000_000_000_000
-                                }
-                                
-                                for suffix, multiplier in multipliers.items():
-                                    if suffix in value_str:
-                                        # Extract numeric part and multiply
-                                        num_str = value_str.replace(suffix, '').strip()
-                                        return float(num_str) * multiplier
-                                
-                                # No suffix, just convert to float
-                                return float(value_str)
+                    current_val = parse_difficulty(current_best_diff)
+                    if current_best_diff and current_val is None:
+                        logger.warning("Invalid difficulty value for %s: %s", miner.name, current_best_diff)
+                    elif current_val:
+                        # New personal best = increase over the last value seen for this miner
+                        register = await get_best_difficulty_register().ensure_seeded(db)
+                        is_new_best, previous_best = register.observe(miner.id, current_val)
+
+                        if is_new_best:
+                            # Get network difficulty if available
+                            network_diff = parse_difficulty(telemetry.extra_data.get("network_difficulty"))
                             
-                            current_val = parse_difficulty(current_best_diff)
-                            previous_val = parse_difficulty(previous_best)
+                            # Get pool name from active pool
+                            pool_name = "Unknown Pool"
+                            if telemetry.pool_in_use:
+                                from core.pool_resolver import get_pool_resolver
+
+                                pool_id = await get_pool_resolver().resolve(db, telemetry.pool_in_use)
+                                pool = await db.get(Pool, pool_id) if pool_id is not None else None
+                                if pool:
+                                    pool_name = pool.name
                             
-                            if current_val is not None and (previous_val is None or current_val > previous_val):
-                                # Get network difficulty if available
-                                network_diff = telemetry.extra_data.get("network_difficulty")
-                                
-                                # Get pool name from active pool (parse like dashboard.py does)
-                                pool_name = "Unknown Pool"
-                                if telemetry.pool_in_use:
-                                    pool_str = telemetry.pool_in_use
-                                    # Remove protocol
-                                    if '://' in pool_str:
-                                        pool_str = pool_str.split('://')[1]
-                                    # Extract host and port
-                                    if ':' in pool_str:
-                                        parts = pool_str.split(':')
-                                        host = parts[0]
-                                        try:
-                                            port = int(parts[1])
-                                            # Look up pool by host and port
-                                            pool_result = await db.execute(
-                                                select(Pool).where(
-                                                    Pool.url == host,
-                                                    Pool.port == port
-                                                )
-                                            )
-                                            pool = pool_result.scalar_one_or_none()
-                                            if pool:
-                                                pool_name = pool.name
-                                        except (ValueError, IndexError):
-                                            pass
-                                
-                                await track_high_diff_share(
-                                    db=db,
-                                    miner_id=miner.id,
-                                    miner_name=miner.name,
-                                    miner_type=miner.miner_type,
-                                    pool_name=pool_name,
-                                    difficulty=current_best_diff,
-                                    network_difficulty=network_diff,
-                                    hashrate=telemetry.hashrate,
-                                    hashrate_unit=telemetry.extra_data.get("hashrate_unit", "GH/s"),
-                                    miner_mode=miner.current_mode,
-                                    previous_best=previous_best
-                                )
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Invalid difficulty value for {miner.name}: current={current_best_diff}, previous={previous_best}")
+                            await track_high_diff_share(
+                                db=db,
+                                miner_id=miner.id,
+                                miner_name=miner.name,
+                                miner_type=miner.miner_type,
+                                pool_name=pool_name,
+                                difficulty=current_val,
+                                network_difficulty=network_diff,
+                                hashrate=telemetry.hashrate,
+                                hashrate_unit=telemetry.extra_data.get("hashrate_unit", "GH/s"),
+                                miner_mode=miner.current_mode,
+                                previous_best=previous_best
+                            )
                 
                 # Update miner's current_mode if detected in telemetry
                 # BUT: Skip if miner is enrolled in Price Band Strategy (strategy owns mode)
@@ -1318,19 +1337,15 @@ class SchedulerService:
                 energy_cost = None
                 if telemetry.power_watts is not None and telemetry.power_watts > 0:
                     try:
-                        # Query Agile price for this timestamp
+                        # Agile price for this timestamp (cached timeline, no per-miner query)
                         with db.no_autoflush:
-                            price_query = select(EnergyPrice).where(
-                                EnergyPrice.valid_from <= telemetry.timestamp,
-                                EnergyPrice.valid_to > telemetry.timestamp
-                            ).limit(1)
-                            result = await db.execute(price_query)
-                            price_row = result.scalar_one_or_none()
+                            price_timeline = await get_price_timeline(db, telemetry.timestamp)
+                        price_pence = price_timeline.price_at(telemetry.timestamp)
                         
-                        if price_row:
+                        if price_pence is not None:
                             # Calculate cost for 1 minute: (watts / 60 / 1000) * price_pence
                             # Result is in pence
-                            energy_cost = (telemetry.power_watts / 60.0 / 1000.0) * price_row.price_pence
+                            energy_cost = (telemetry.power_watts / 60.0 / 1000.0) * price_pence
                     except Exception as e:
                         logger.warning("Could not calculate energy cost for %s: %s", miner.name, e)
                 
@@ -1342,14 +1357,8 @@ class SchedulerService:
                         from sqlalchemy import select
                         from core.database import Pool
                         
-                        # Query for previous telemetry BEFORE adding current to session
-                        previous_telemetry = await db.execute(
-                            select(Telemetry)
-                            .where(Telemetry.miner_id == miner.id)
-                            .order_by(Telemetry.timestamp.desc())
-                            .limit(1)
-                        )
-                        prev = previous_telemetry.scalar_one_or_none()
+                        # Previous reading BEFORE the current one is recorded
+                        prev = get_latest_telemetry_store().get(miner.id)
                         
                         # Calculate new shares: current - previous (handle restarts where current < previous)
                         if prev and prev.shares_accepted:
@@ -1365,71 +1374,81 @@ class SchedulerService:
                         logger.warning(f"Failed to calculate delta shares for {miner.name}: {e}")
                         new_shares = 0
                 
-                # NOW add telemetry to session AFTER calculating delta
-                db_telemetry = Telemetry(
-                    miner_id=miner.id,
-                    timestamp=telemetry.timestamp,
-                    hashrate=telemetry.hashrate,
-                    hashrate_unit=hashrate_unit,
-                    temperature=telemetry.temperature,
-                    power_watts=telemetry.power_watts,
-                    energy_cost=energy_cost,
-                    shares_accepted=telemetry.shares_accepted,
-                    shares_rejected=telemetry.shares_rejected,
-                    pool_difficulty=telemetry.pool_difficulty,
-                    pool_in_use=telemetry.pool_in_use,
-                    mode=miner.current_mode,
-                    data=telemetry.extra_data
-                )
-                db.add(db_telemetry)
+                # NOW add telemetry AFTER calculating delta
+                telemetry_row = {
+                    "miner_id": miner.id,
+                    "timestamp": telemetry.timestamp,
+                    "hashrate": telemetry.hashrate,
+                    "hashrate_unit": hashrate_unit,
+                    "temperature": telemetry.temperature,
+                    "power_watts": telemetry.power_watts,
+                    "energy_cost": energy_cost,
+                    "shares_accepted": telemetry.shares_accepted,
+                    "shares_rejected": telemetry.shares_rejected,
+                    "pool_difficulty": telemetry.pool_difficulty,
+                    "pool_in_use": telemetry.pool_in_use,
+                    "mode": miner.current_mode,
+                    "data": telemetry.extra_data,
+                }
+                from core.pool_resolver import annotate_pool_columns
+
+                await annotate_pool_columns(db, [telemetry_row])
+                get_latest_telemetry_store().update(telemetry_row)
+
+                from core.anomaly_detection import online_scoring_enabled
+
+                if online_scoring_enabled():
+                    from core.online_health import get_online_health_scorer
+
+                    try:
+                        await get_online_health_scorer().observe(db, telemetry_row)
+                    except Exception as e:
+                        logger.warning(f"Online health scoring failed for {miner.name}: {e}")
+                if writer is not None:
+                    await writer.submit(telemetry_row)
+                else:
+                    from core.pool_shares import record_pool_shares
+                    from core.raw_payloads import extract_raw_payloads, store_raw_payloads
+
+                    (telemetry_row,), raw_payloads = extract_raw_payloads([telemetry_row])
+                    await store_raw_payloads(db, raw_payloads)
+                    await record_pool_shares(db, [telemetry_row])
+                    db.add(Telemetry(**telemetry_row))
                 
                 # Update pool block effort tracking with calculated delta
                 if new_shares > 0 and telemetry.pool_in_use:
                     try:
-                        # Find pool by matching URL and port (same logic as high diff tracking)
-                        pool_str = telemetry.pool_in_use
-                        if '://' in pool_str:
-                            pool_str = pool_str.split('://')[1]
+                        from core.pool_resolver import get_pool_resolver
+
+                        # Resolve pool_in_use against the cached pool index
+                        pool_id = await get_pool_resolver().resolve(db, telemetry.pool_in_use)
+                        pool = await db.get(Pool, pool_id) if pool_id is not None else None
                         
-                        if ':' in pool_str:
-                            parts = pool_str.split(':')
-                            pool_url = parts[0]
-                            pool_port = int(parts[1])
-                            
-                            # Look up pool by exact host and port match
-                            result = await db.execute(
-                                select(Pool).where(
-                                    Pool.url == pool_url,
-                                    Pool.port == pool_port
-                                )
-                            )
-                            pool = result.scalar_one_or_none()
+                        if pool:
+                            # Extract coin from pool name
+                            coin = extract_coin_from_pool_name(pool.name)
                             
-                            if pool:
-                                # Extract coin from pool name
-                                coin = extract_coin_from_pool_name(pool.name)
-                                
-                                if coin:
-                                    # Get network difficulty from pool's driver if possible, fallback to Solopool.org
-                                    network_diff = await get_network_difficulty(coin, pool_name=pool.name)
-                                    pool_difficulty = telemetry.pool_difficulty
-                                    if pool_difficulty is None:
-                                        logger.debug(
-                                            "Skipping pool effort update for %s (missing pool difficulty)",
-                                            miner.name,
-                                        )
-                                    else:
-                                        # Update cumulative effort using proper pool name and DELTA shares
-                                        await update_pool_block_effort(
-                                            db=db,
-                                            pool_name=pool.name,
-                                            coin=coin,
-                                            new_shares=new_shares,
-                                            pool_difficulty=float(pool_difficulty),
-                                            network_difficulty=network_diff
-                                        )
-                            else:
-                                logger.debug(f"Could not find pool for URL: {telemetry.pool_in_use}")
+                            if coin:
+                                # Get network difficulty from pool's driver if possible, fallback to Solopool.org
+                                network_diff = await get_network_difficulty(coin, pool_name=pool.name)
+                                pool_difficulty = telemetry.pool_difficulty
+                                if pool_difficulty is None:
+                                    logger.debug(
+                                        "Skipping pool effort update for %s (missing pool difficulty)",
+                                        miner.name,
+                                    )
+                                else:
+                                    # Update cumulative effort using proper pool name and DELTA shares
+                                    await update_pool_block_effort(
+                                        db=db,
+                                        pool_name=pool.name,
+                                        coin=coin,
+                                        new_shares=new_shares,
+                                        pool_difficulty=float(pool_difficulty),
+                                        network_difficulty=network_diff
+                                    )
+                        else:
+                            logger.debug(f"Could not find pool for URL: {telemetry.pool_in_use}")
                     except Exception as e:
                         logger.warning(f"Failed to update pool effort for {miner.name}: {e}")
                 
@@ -1458,8 +1477,9 @@ class SchedulerService:
     
     async def _collect_telemetry(self):
         """Collect telemetry from all miners"""
-        from core.database import AsyncSessionLocal, Miner, Telemetry, Event, Pool, MinerStrategy, EnergyPrice, PriceBandStrategyConfig, engine
+        from core.database import AsyncSessionLocal, Miner, Event, Pool, MinerStrategy, PriceBandStrategyConfig, engine
         from core.telemetry_metrics import update_concurrency_peak, update_backlog
+        from core.telemetry_writer import get_telemetry_writer
         from adapters import create_adapter
         from sqlalchemy import select, String
         
@@ -1488,9 +1508,14 @@ class SchedulerService:
                 miners = result.scalars().all()
                 
                 logger.info("Found %s enabled miners", len(miners))
+
+                latest_store = await get_latest_telemetry_store().ensure_warm(db)
                 
                 # PostgreSQL: Use parallel collection with concurrency + jitter
                 if is_postgresql:
+                    # Rows go through the write-behind writer; task sessions
+                    # only commit side effects (events, pool effort, ...)
+                    writer = get_telemetry_writer()
                     semaphore = asyncio.Semaphore(telemetry_concurrency)
                     counter_lock = asyncio.Lock()
                     current_inflight = 0
@@ -1513,9 +1538,10 @@ class SchedulerService:
                                     wrote = await self._collect_miner_telemetry(
                                         target_miner,
                                         agile_in_off_state,
-                                        task_db
+                                        task_db,
+                                        writer
                                     )
-                                    if wrote:
+                                    if wrote and (task_db.new or task_db.dirty or task_db.deleted):
                                         await task_db.commit()
                                     else:
                                         await task_db.rollback()
@@ -1562,18 +1588,9 @@ class SchedulerService:
                 # Track telemetry backlog (miners without recent telemetry)
                 await db.flush()
                 cutoff = datetime.utcnow() - timedelta(minutes=2)
-                backlog_result = await db.execute(
-                    select(Miner.id, func.max(Telemetry.timestamp))
-                    .outerjoin(Telemetry, Telemetry.miner_id == Miner.id)
-                    .where(Miner.enabled == True)
-                    .where(Miner.miner_type != "nmminer")
-                    .group_by(Miner.id)
-                )
-                backlog_rows = backlog_result.all()
-                backlog_count = sum(
-                    1
-                    for _, last_ts in backlog_rows
-                    if last_ts is None or last_ts < cutoff
+                backlog_count = latest_store.stale_count(
+                    (m.id for m in miners if m.miner_type != "nmminer"),
+                    cutoff,
                 )
                 update_backlog(backlog_count)
                 
@@ -1620,7 +1637,7 @@ class SchedulerService:
     
     async def _evaluate_automation_rules(self):
         """Evaluate and execute automation rules"""
-        from core.database import AsyncSessionLocal, AutomationRule, Miner, EnergyPrice, Telemetry, Event
+        from core.database import AsyncSessionLocal, AutomationRule, Miner, Telemetry, Event
         from adapters import create_adapter
         
         try:
@@ -2033,7 +2050,7 @@ class SchedulerService:
     
     async def _reconcile_automation_rules(self):
         """Reconcile miners that should be in a specific state based on currently active automation rules"""
-        from core.database import AsyncSessionLocal, AutomationRule, Miner, EnergyPrice, Pool
+        from core.database import AsyncSessionLocal, AutomationRule, Miner, Pool
         from adapters import get_adapter
         
         try:
@@ -2286,11 +2303,13 @@ class SchedulerService:
                     logger.warning("NMMinerUDPListener not found in loaded NMMiner driver")
                     return
                 
-                # Create adapter registry (shared across system)
+                # Index the loader's cached adapters by IP for the listener, so
+                # the instances it feeds are the same ones create_adapter returns
                 self.nmminer_adapters = {}
                 for miner in nmminers:
-                    adapter = nmminer_adapter_class(miner.id, miner.name, miner.ip_address, miner.port, miner.config)
-                    self.nmminer_adapters[miner.ip_address] = adapter
+                    adapter = loader.create_adapter(miner.miner_type, miner.id, miner.name, miner.ip_address, miner.port, miner.config)
+                    if adapter:
+                        self.nmminer_adapters[miner.ip_address] = adapter
                 
                 if not self.nmminer_adapters:
                     logger.info("No NMMiner devices found - UDP listener not started")
@@ -2343,8 +2362,9 @@ class SchedulerService:
                 self.nmminer_adapters.clear()
                 
                 for miner in nmminers:
-                    adapter = nmminer_adapter_class(miner.id, miner.name, miner.ip_address, miner.port, miner.config)
-                    self.nmminer_adapters[miner.ip_address] = adapter
+                    adapter = loader.create_adapter(miner.miner_type, miner.id, miner.name, miner.ip_address, miner.port, miner.config)
+                    if adapter:
+                        self.nmminer_adapters[miner.ip_address] = adapter
                 
                 new_count = len(self.nmminer_adapters)
                 logger.info("NMMiner adapter registry reloaded: %s -> %s devices", old_count, new_count)
@@ -2358,212 +2378,27 @@ class SchedulerService:
     
     async def _aggregate_telemetry(self):
         """
-        Aggregate telemetry data at 00:05 daily.
+        Bring telemetry rollups up to date, then prune old raw data.
         
-        Creates hourly and daily aggregates from raw telemetry, then prunes old raw data:
+        Telemetry, miner analytics and hourly metric rollups are maintained
+        incrementally by core.telemetry_rollups (also scheduled every few
+        minutes); this makes sure they are current before raw rows are deleted:
         - Hourly aggregates: Keep for 30 days
         - Daily aggregates: Keep forever
         - Raw telemetry: Keep for 7 days only
+        - Raw vendor payloads: Keep for telemetry.raw_payloads.retention_hours (48h)
         
         This reduces AI context size by 56x (hourly) to 789x (daily).
         """
-        from core.database import AsyncSessionLocal, Telemetry, TelemetryHourly, TelemetryDaily, Miner
+        from core.database import AsyncSessionLocal, Telemetry, TelemetryHourly
+        from core.raw_payloads import purge_raw_payloads
+        from core.telemetry_rollups import rollup_telemetry
         from sqlalchemy import delete
         
         try:
             async with AsyncSessionLocal() as db:
-                # Get yesterday's date range
-                yesterday = (datetime.utcnow() - timedelta(days=1)).date()
-                start_time = datetime.combine(yesterday, datetime.min.time())
-                end_time = datetime.combine(yesterday, datetime.max.time())
-                
-                logger.info("Aggregating telemetry for %s", yesterday)
-                
-                # Get all active miners
-                result = await db.execute(select(Miner))
-                miners = result.scalars().all()
-                
-                hourly_count = 0
-                daily_count = 0
-                
-                for miner in miners:
-                    # ========== HOURLY AGGREGATION ==========
-                    # Get raw telemetry for this miner for yesterday
-                    query = select(Telemetry).where(
-                        and_(
-                            Telemetry.miner_id == miner.id,
-                            Telemetry.timestamp >= start_time,
-                            Telemetry.timestamp <= end_time
-                        )
-                    ).order_by(Telemetry.timestamp)
-                    
-                    result = await db.execute(query)
-                    telemetry_records = result.scalars().all()
-                    
-                    if not telemetry_records:
-                        continue
-                    
-                    # Group by hour
-                    hourly_data = {}
-                    for record in telemetry_records:
-                        hour_start = record.timestamp.replace(minute=0, second=0, microsecond=0)
-                        
-                        if hour_start not in hourly_data:
-                            hourly_data[hour_start] = []
-                        hourly_data[hour_start].append(record)
-                    
-                    # Create hourly aggregates
-                    for hour_start, records in hourly_data.items():
-                        # Calculate aggregates
-                        uptime_minutes = len(records)
-                        hashrates = [r.hashrate for r in records if r.hashrate is not None]
-                        temperatures = [r.temperature for r in records if r.temperature is not None]
-                        power_values = [r.power_watts for r in records if r.power_watts is not None]
-                        energy_costs = [r.energy_cost for r in records if r.energy_cost is not None]
-                        
-                        # Get hashrate unit (assume consistent)
-                        hashrate_unit = records[0].hashrate_unit if records[0].hashrate_unit else "GH/s"
-                        
-                        # Calculate totals and averages
-                        avg_hashrate = sum(hashrates) / len(hashrates) if hashrates else None
-                        min_hashrate = min(hashrates) if hashrates else None
-                        max_hashrate = max(hashrates) if hashrates else None
-                        avg_temperature = sum(temperatures) / len(temperatures) if temperatures else None
-                        peak_temperature = max(temperatures) if temperatures else None
-                        
-                        # Total kWh = sum of (watts / 60 / 1000) for each minute
-                        total_kwh = sum(p / 60.0 / 1000.0 for p in power_values) if power_values else None
-                        
-                        # Total energy cost = sum of all energy_cost values (already in pence)
-                        total_energy_cost = sum(energy_costs) if energy_costs else None
-                        
-                        # Shares (use last cumulative value - first cumulative value for delta)
-                        shares_records = [r for r in records if r.shares_accepted is not None]
-                        shares_accepted = shares_records[-1].shares_accepted if shares_records else None
-                        
-                        shares_rejected_records = [r for r in records if r.shares_rejected is not None]
-                        shares_rejected = shares_rejected_records[-1].shares_rejected if shares_rejected_records else None
-                        
-                        # Reject rate
-                        reject_rate_pct = None
-                        if shares_accepted and shares_rejected is not None:
-                            total_shares = shares_accepted + shares_rejected
-                            reject_rate_pct = (shares_rejected / total_shares * 100) if total_shares > 0 else 0
-                        
-                        # Check if hourly aggregate already exists
-                        existing = await db.execute(
-                            select(TelemetryHourly).where(
-                                and_(
-                                    TelemetryHourly.miner_id == miner.id,
-                                    TelemetryHourly.hour_start == hour_start
-                                )
-                            )
-                        )
-                        if existing.scalar_one_or_none():
-                            continue  # Skip if already aggregated
-                        
-                        # Create hourly aggregate
-                        hourly_agg = TelemetryHourly(
-                            miner_id=miner.id,
-                            hour_start=hour_start,
-                            uptime_minutes=uptime_minutes,
-                            avg_hashrate=avg_hashrate,
-                            min_hashrate=min_hashrate,
-                            max_hashrate=max_hashrate,
-                            hashrate_unit=hashrate_unit,
-                            avg_temperature=avg_temperature,
-                            peak_temperature=peak_temperature,
-                            total_kwh=total_kwh,
-                            total_energy_cost=total_energy_cost,
-                            shares_accepted=shares_accepted,
-                            shares_rejected=shares_rejected,
-                            reject_rate_pct=reject_rate_pct
-                        )
-                        db.add(hourly_agg)
-                        hourly_count += 1
-                    
-                    # ========== DAILY AGGREGATION ==========
-                    # Use the hourly data we already have
-                    if telemetry_records:
-                        # Calculate daily aggregates from raw data
-                        daily_uptime = len(telemetry_records)
-                        uptime_percentage = (daily_uptime / 1440.0) * 100  # 1440 minutes in a day
-                        
-                        hashrates = [r.hashrate for r in telemetry_records if r.hashrate is not None]
-                        temperatures = [r.temperature for r in telemetry_records if r.temperature is not None]
-                        power_values = [r.power_watts for r in telemetry_records if r.power_watts is not None]
-                        energy_costs = [r.energy_cost for r in telemetry_records if r.energy_cost is not None]
-                        
-                        daily_avg_hashrate = sum(hashrates) / len(hashrates) if hashrates else None
-                        daily_min_hashrate = min(hashrates) if hashrates else None
-                        daily_max_hashrate = max(hashrates) if hashrates else None
-                        daily_avg_temperature = sum(temperatures) / len(temperatures) if temperatures else None
-                        daily_peak_temperature = max(temperatures) if temperatures else None
-                        daily_total_kwh = sum(p / 60.0 / 1000.0 for p in power_values) if power_values else None
-                        daily_total_cost = sum(energy_costs) if energy_costs else None
-                        
-                        # Shares (use last - first for daily delta)
-                        shares_records = [r for r in telemetry_records if r.shares_accepted is not None]
-                        daily_shares_accepted = shares_records[-1].shares_accepted if shares_records else None
-                        
-                        shares_rejected_records = [r for r in telemetry_records if r.shares_rejected is not None]
-                        daily_shares_rejected = shares_rejected_records[-1].shares_rejected if shares_rejected_records else None
-                        
-                        daily_reject_rate = None
-                        if daily_shares_accepted and daily_shares_rejected is not None:
-                            total_shares = daily_shares_accepted + daily_shares_rejected
-                            daily_reject_rate = (daily_shares_rejected / total_shares * 100) if total_shares > 0 else 0
-                        
-                        # Simple health score (0-100) based on uptime and reject rate
-                        health_score = None
-                        if uptime_percentage is not None:
-                            health_score = uptime_percentage  # Start with uptime %
-                            if daily_reject_rate is not None:
-                                # Reduce health by reject rate penalty
-                                health_score = max(0, health_score - (daily_reject_rate * 5))
-                        
-                        # Check if daily aggregate already exists
-                        existing = await db.execute(
-                            select(TelemetryDaily).where(
-                                and_(
-                                    TelemetryDaily.miner_id == miner.id,
-                                    TelemetryDaily.date == start_time
-                                )
-                            )
-                        )
-                        if existing.scalar_one_or_none():
-                            continue  # Skip if already aggregated
-                        
-                        # Create daily aggregate
-                        daily_agg = TelemetryDaily(
-                            miner_id=miner.id,
-                            date=start_time,
-                            uptime_minutes=daily_uptime,
-                            uptime_percentage=uptime_percentage,
-                            avg_hashrate=daily_avg_hashrate,
-                            min_hashrate=daily_min_hashrate,
-                            max_hashrate=daily_max_hashrate,
-                            hashrate_unit=hashrate_unit,
-                            avg_temperature=daily_avg_temperature,
-                            peak_temperature=daily_peak_temperature,
-                            total_kwh=daily_total_kwh,
-                            total_energy_cost=daily_total_cost,
-                            shares_accepted=daily_shares_accepted,
-                            shares_rejected=daily_shares_rejected,
-                            reject_rate_pct=daily_reject_rate,
-                            health_score=health_score
-                        )
-                        db.add(daily_agg)
-                        daily_count += 1
-                
-                # Commit all aggregates
-                await db.commit()
-                logger.info(
-                    "Created %s hourly and %s daily aggregates for %s",
-                    hourly_count,
-                    daily_count,
-                    yesterday,
-                )
+                summary = await rollup_telemetry(db, **self._telemetry_rollup_options())
+                logger.info("Telemetry rollups current to %s", summary["watermark"])
                 
                 # ========== PRUNE OLD DATA ==========
                 # Prune raw telemetry older than 7 days
@@ -2576,6 +2411,17 @@ class SchedulerService:
                 if pruned_raw > 0:
                     logger.info("Pruned %s raw telemetry records older than 7 days", pruned_raw)
                 
+                # Prune raw vendor payloads (cold storage keeps them for less time than telemetry)
+                payload_retention_hours = max(
+                    1, _as_int(app_config.get("telemetry.raw_payloads.retention_hours", 48), 48)
+                )
+                pruned_payloads = await purge_raw_payloads(db, payload_retention_hours)
+                await db.commit()
+                if pruned_payloads > 0:
+                    logger.info(
+                        "Pruned %s raw vendor payloads older than %sh", pruned_payloads, payload_retention_hours
+                    )
+                
                 # Prune hourly aggregates older than 30 days
                 cutoff_hourly = datetime.utcnow() - timedelta(days=30)
                 result = await db.execute(
@@ -2591,6 +2437,26 @@ class SchedulerService:
         except Exception as e:
             logger.exception("Telemetry aggregation failed: %s", e)
     
+    def _telemetry_rollup_options(self) -> dict:
+        return {
+            "settle_seconds": max(0, _as_int(app_config.get("telemetry.rollup.settle_seconds", 120), 120)),
+            "chunk_hours": max(1, _as_int(app_config.get("telemetry.rollup.chunk_hours", 24), 24)),
+        }
+
+    async def _rollup_telemetry(self):
+        """Roll closed telemetry hours/days into every aggregate table in one pass"""
+        from core.database import AsyncSessionLocal
+        from core.telemetry_rollups import rollup_telemetry
+
+        if self._should_skip_non_critical_job("rollup_telemetry"):
+            return
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await rollup_telemetry(db, **self._telemetry_rollup_options())
+        except Exception as e:
+            logger.exception("Incremental telemetry rollup failed: %s", e)
+    
     async def _purge_old_telemetry(self):
         """Purge telemetry data older than 30 days (increased for long-term analytics)"""
         from core.database import AsyncSessionLocal, Telemetry
@@ -2763,7 +2629,10 @@ class SchedulerService:
     async def _auto_discover_miners(self):
         """Auto-discover miners on configured networks"""
         from core.database import AsyncSessionLocal, Miner, Event
-        from core.discovery import MinerDiscoveryService
+        from core.discovery import DiscoveryScan
+        from core.known_hosts import KnownHostCache
+        from core.liveness import get_liveness_service
+        from adapters import invalidate_adapter
         from sqlalchemy import select
         
         try:
@@ -2780,8 +2649,10 @@ class SchedulerService:
                 return
             
             auto_add = discovery_config.get("auto_add", False)
+            incremental = discovery_config.get("incremental", True)
             total_found = 0
             total_added = 0
+            relocated = []
             
             logger.info("Starting auto-discovery on %s network(s)", len(networks))
             
@@ -2790,46 +2661,82 @@ class SchedulerService:
                 result = await db.execute(select(Miner))
                 existing_miners = result.scalars().all()
                 existing_ips = {m.ip_address for m in existing_miners}
+                known_hosts = await KnownHostCache.load(db)
                 
-                # Scan each network
+                network_cidrs = []
                 for network in networks:
                     network_cidr = network.get("cidr") if isinstance(network, dict) else network
-                    network_name = network.get("name", network_cidr) if isinstance(network, dict) else network_cidr
 
                     if not isinstance(network_cidr, str) or not network_cidr.strip():
                         logger.warning("Skipping invalid network entry: %s", network)
                         continue
-                    
-                    logger.info("Scanning network: %s", network_name)
-                    
-                    discovered = await MinerDiscoveryService.discover_miners(
-                        network_cidr=network_cidr,
-                        timeout=2.0
-                    )
-                    
-                    total_found += len(discovered)
-                    
+                    try:
+                        ipaddress.ip_network(network_cidr.strip(), strict=False)
+                    except ValueError:
+                        logger.warning("Skipping invalid network entry: %s", network)
+                        continue
+                    network_cidrs.append(network_cidr)
+
+                if not network_cidrs:
+                    return
+
+                logger.info("Scanning network(s): %s", ", ".join(network_cidrs))
+
+                # One staged scan across all networks, handling miners as they are identified.
+                # Incremental rescans probe known/recent hosts first, the rest at low priority.
+                scan = DiscoveryScan(
+                    network_cidrs,
+                    timeout=2.0,
+                    priority_hosts=known_hosts.priority_hosts(network_cidrs) if incremental else None,
+                )
+                async for miner_info in scan.run():
+                    total_found += 1
+
+                    # Follow miners that came back on a new address (matched by fingerprint)
+                    moved = await known_hosts.observe(db, miner_info)
+                    if moved is not None:
+                        moved_miner, previous_ip = moved
+                        existing_ips.discard(previous_ip)
+                        existing_ips.add(moved_miner.ip_address)
+                        relocated.append(moved)
+                        db.add(Event(
+                            event_type="warning",
+                            source="network_discovery",
+                            message=f"Miner {moved_miner.name} changed IP: {previous_ip} -> {moved_miner.ip_address}"
+                        ))
+
                     # Add new miners if auto-add is enabled
-                    if auto_add:
-                        for miner_info in discovered:
-                            if miner_info['ip'] not in existing_ips:
-                                # Create new miner
-                                new_miner = Miner(
-                                    name=miner_info['name'],
-                                    miner_type=miner_info['type'],
-                                    ip_address=miner_info['ip'],
-                                    port=miner_info['port'],
-                                    enabled=True
-                                )
-                                db.add(new_miner)
-                                existing_ips.add(miner_info['ip'])
-                                total_added += 1
-                                logger.info("Auto-added miner: %s (%s)", miner_info['name'], miner_info['ip'])
+                    if auto_add and miner_info['ip'] not in existing_ips:
+                        # Create new miner
+                        new_miner = Miner(
+                            name=miner_info['name'],
+                            miner_type=miner_info['type'],
+                            ip_address=miner_info['ip'],
+                            port=miner_info['port'],
+                            enabled=True
+                        )
+                        db.add(new_miner)
+                        existing_ips.add(miner_info['ip'])
+                        total_added += 1
+                        logger.info("Auto-added miner: %s (%s)", miner_info['name'], miner_info['ip'])
+
+                logger.info(
+                    "Discovery sweep: %s host(s) (%s priority), %s open port(s) in %ss (concurrency peak %s)",
+                    scan.stats["hosts"],
+                    scan.stats["priority_hosts"],
+                    scan.stats["open_ports"],
+                    scan.stats["duration_seconds"],
+                    scan.stats["peak_concurrency"],
+                )
+                
+                # Host cache, relocations and new miners
+                await known_hosts.finish(db, scan)
+                await db.commit()
+                for moved_miner, previous_ip in relocated:
+                    invalidate_adapter(moved_miner.id)
+                    get_liveness_service().invalidate(previous_ip)
                 
-                # Commit changes
                 if total_added > 0:
-                    await db.commit()
-                    
                     # Log event
                     event = Event(
                         event_type="info",
@@ -2881,33 +2788,31 @@ class SchedulerService:
         
         try:
             # 1. Aggregate pool health data
+            # (miner analytics are produced by the unified telemetry rollup)
             await self._aggregate_pool_health()
             
-            # 2. Aggregate miner analytics data
-            await self._aggregate_miner_analytics()
-            
-            # 3. Purge old telemetry
+            # 2. Purge old telemetry
             await self._purge_old_telemetry()
             
-            # 4. Purge old events
+            # 3. Purge old events
             await self._purge_old_events()
             
-            # 5. Purge old pool health (raw + hourly)
+            # 4. Purge old pool health (raw + hourly)
             await self._purge_old_pool_health()
             
-            # 6. Purge old miner analytics (hourly only)
+            # 5. Purge old miner analytics (hourly only)
             await self._purge_old_miner_analytics()
             
-            # 7. Purge old audit logs
+            # 6. Purge old audit logs
             await self._purge_old_audit_logs()
             
-            # 8. Purge old notification logs
+            # 7. Purge old notification logs
             await self._purge_old_notification_logs()
             
-            # 9. Purge old health scores
+            # 8. Purge old health scores
             await self._purge_old_health_scores()
             
-            # 10. Database VACUUM (defragment and reclaim space)
+            # 9. Database VACUUM (defragment and reclaim space)
             logger.info("Running VACUUM ANALYZE")
             # PostgreSQL VACUUM must run outside a transaction
             # Create connection with AUTOCOMMIT isolation for VACUUM
@@ -3069,7 +2974,7 @@ class SchedulerService:
     
     async def _check_alerts(self):
         """Check for alert conditions and send notifications"""
-        from core.database import AsyncSessionLocal, Miner, Telemetry, AlertConfig, AlertThrottle
+        from core.database import AsyncSessionLocal, Miner, AlertConfig, AlertThrottle
         from core.notifications import send_alert
         from sqlalchemy import and_
         
@@ -3087,16 +2992,11 @@ class SchedulerService:
                 # Get all miners
                 result = await db.execute(select(Miner).where(Miner.enabled == True))
                 miners = result.scalars().all()
+                latest_store = await get_latest_telemetry_store().ensure_warm(db)
                 
                 for miner in miners:
                     # Get latest telemetry
-                    result = await db.execute(
-                        select(Telemetry)
-                        .where(Telemetry.miner_id == miner.id)
-                        .order_by(Telemetry.timestamp.desc())
-                        .limit(1)
-                    )
-                    latest_telemetry = result.scalar_one_or_none()
+                    latest_telemetry = latest_store.get(miner.id)
                     
                     for alert_config in alert_configs:
                         alert_cfg = _as_dict(alert_config.config)
@@ -3175,14 +3075,7 @@ class SchedulerService:
                                         continue
                                 
                                 # Get average hashrate from last 10 readings
-                                result = await db.execute(
-                                    select(Telemetry)
-                                    .where(Telemetry.miner_id == miner.id)
-                                    .where(Telemetry.hashrate != None)
-                                    .order_by(Telemetry.timestamp.desc())
-                                    .limit(10)
-                                )
-                                recent_telemetry = result.scalars().all()
+                                recent_telemetry = latest_store.recent(miner.id)
                                 
                                 if len(recent_telemetry) >= 5:
                                     hashrates = [float(t.hashrate) for t in recent_telemetry if t.hashrate is not None]
@@ -3713,49 +3606,25 @@ class SchedulerService:
             logger.exception("Failed to reconcile energy optimization with exception")
     
     async def _monitor_pool_health(self):
-        """Monitor health of all enabled pools"""
-        from core.database import AsyncSessionLocal, Pool
+        """Monitor health of all enabled pools (checked concurrently, recorded in one commit)"""
+        from core.database import AsyncSessionLocal
         from core.pool_health import PoolHealthService
-        from sqlalchemy import select
         
         try:
-            # Use asyncio.create_task to ensure proper greenlet context
             async with AsyncSessionLocal() as db:
-                # Get all enabled pools
-                result = await db.execute(select(Pool).where(Pool.enabled == True))
-                pools = result.scalars().all()
-                
-                for pool in pools:
-                    # Store pool name before try block to avoid post-failure DB access
-                    pool_name = pool.name
-                    pool_id = pool.id
-                    
-                    # Retry logic for database locks
-                    max_retries = 3
-                    for attempt in range(max_retries):
-                        try:
-                            await PoolHealthService.monitor_pool(pool_id, db)
-                            logger.info("Pool health check completed: %s", pool_name)
-                            break
-                        except Exception as e:
-                            error_str = str(e)
-                            if "database is locked" in error_str and attempt < max_retries - 1:
-                                logger.warning(
-                                    "Pool health check for %s locked, retrying (attempt %s/%s)",
-                                    pool_name,
-                                    attempt + 1,
-                                    max_retries,
-                                )
-                                await db.rollback()
-                                await asyncio.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                            else:
-                                # Final attempt failed or non-lock error
-                                await db.rollback()
-                                logger.error(f"Failed to monitor pool {pool_name}: {e}", exc_info=True)
-                                break
-                    
-                    # Stagger requests to avoid overwhelming pools
-                    await asyncio.sleep(2)
+                results = await PoolHealthService.monitor_pools(
+                    db,
+                    concurrency=max(1, _as_int(app_config.get("pool_health.concurrency", 8), 8)),
+                    per_host_interval=max(0.0, _as_float(app_config.get("pool_health.per_host_interval_seconds", 1.0), 1.0))
+                )
+            
+            unreachable = [r["pool_name"] for r in results if not r["is_reachable"]]
+            logger.info(
+                "Pool health check completed: %s pools, %s unreachable%s",
+                len(results),
+                len(unreachable),
+                f" ({', '.join(unreachable)})" if unreachable else "",
+            )
         
         except Exception as e:
             logger.exception("Failed to monitor pool health: %s", e)
@@ -4032,240 +3901,6 @@ class SchedulerService:
         except Exception as e:
             logger.exception("Failed to aggregate pool health: %s", e)
     
-    async def _aggregate_miner_analytics(self):
-        """Aggregate raw telemetry into hourly and daily miner analytics"""
-        try:
-            from core.database import AsyncSessionLocal, Telemetry, HourlyMinerAnalytics, DailyMinerAnalytics, Miner, Pool
-            from sqlalchemy import select, func, and_
-            from datetime import datetime, timedelta
-            
-            async with AsyncSessionLocal() as db:
-                logger.info("Starting miner analytics aggregation")
-                
-                # Get all miners
-                miners_result = await db.execute(select(Miner))
-                miners = miners_result.scalars().all()
-                
-                hourly_created = 0
-                daily_created = 0
-                
-                for miner in miners:
-                    # Determine coin type based on miner type or pool
-                    coin = "BTC"  # Default
-                    
-                    # ========== HOURLY AGGREGATION ==========
-                    # Find last hourly aggregation for this miner
-                    last_hourly = await db.execute(
-                        select(HourlyMinerAnalytics)
-                        .where(HourlyMinerAnalytics.miner_id == miner.id)
-                        .order_by(HourlyMinerAnalytics.hour_start.desc())
-                        .limit(1)
-                    )
-                    last_hourly_record = last_hourly.scalar_one_or_none()
-                    
-                    # Start from last aggregation or 30 days ago
-                    if last_hourly_record:
-                        start_time = last_hourly_record.hour_start + timedelta(hours=1)
-                    else:
-                        start_time = datetime.utcnow() - timedelta(days=30)
-                    
-                    # Aggregate hour by hour
-                    current_hour = start_time.replace(minute=0, second=0, microsecond=0)
-                    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-                    
-                    while current_hour < now:
-                        hour_end = current_hour + timedelta(hours=1)
-                        
-                        # Get all telemetry for this hour
-                        telemetry_result = await db.execute(
-                            select(Telemetry)
-                            .where(and_(
-                                Telemetry.miner_id == miner.id,
-                                Telemetry.timestamp >= current_hour,
-                                Telemetry.timestamp < hour_end
-                            ))
-                            .order_by(Telemetry.timestamp)
-                        )
-                        telemetry_records = telemetry_result.scalars().all()
-                        
-                        if telemetry_records:
-                            # Calculate aggregates
-                            hashrates = [t.hashrate for t in telemetry_records if t.hashrate is not None]
-                            powers = [t.power_watts for t in telemetry_records if t.power_watts is not None]
-                            temps = [t.temperature for t in telemetry_records if t.temperature is not None]
-                            
-                            if hashrates:
-                                avg_hashrate_gh = sum(hashrates) / len(hashrates)
-                                
-                                # Calculate total hashes (avg_hashrate * uptime_seconds)
-                                uptime_seconds = len(telemetry_records) * 60  # Assuming 1min intervals
-                                total_hashes_gh = (avg_hashrate_gh * uptime_seconds) / 3600  # Convert to GH
-                                
-                                # Aggregate shares
-                                total_accepted = sum(t.shares_accepted or 0 for t in telemetry_records if t.shares_accepted is not None)
-                                total_rejected = sum(t.shares_rejected or 0 for t in telemetry_records if t.shares_rejected is not None)
-                                
-                                # Calculate mode distribution and changes
-                                mode_minutes = {}
-                                mode_changes = 0
-                                prev_mode = None
-                                
-                                for t in telemetry_records:
-                                    if t.mode:
-                                        mode_minutes[t.mode] = mode_minutes.get(t.mode, 0) + 1
-                                        if prev_mode and prev_mode != t.mode:
-                                            mode_changes += 1
-                                        prev_mode = t.mode
-                                
-                                # Dominant mode = most minutes
-                                dominant_mode = max(mode_minutes.items(), key=lambda x: x[1])[0] if mode_minutes else None
-                                mode_distribution = mode_minutes if mode_minutes else None
-                                
-                                # Get pool_id (from first record with pool info)
-                                pool_id = None
-                                for t in telemetry_records:
-                                    if t.pool_in_use:
-                                        # Try to match pool by URL/user
-                                        pool_result = await db.execute(
-                                            select(Pool).where(Pool.url.like(f"%{t.pool_in_use}%")).limit(1)
-                                        )
-                                        pool = pool_result.scalar_one_or_none()
-                                        if pool:
-                                            pool_id = pool.id
-                                            break
-                                
-                                # Calculate derived metrics
-                                avg_power = sum(powers) / len(powers) if powers else None
-                                avg_temp = sum(temps) / len(temps) if temps else None
-                                watts_per_gh = avg_power / avg_hashrate_gh if avg_power and avg_hashrate_gh else None
-                                reject_rate = (total_rejected * 100.0 / (total_accepted + total_rejected)) if (total_accepted + total_rejected) > 0 else None
-                                hashes_per_share = total_hashes_gh / total_accepted if total_accepted > 0 else None
-                                
-                                # Create hourly record
-                                hourly_agg = HourlyMinerAnalytics(
-                                    miner_id=miner.id,
-                                    pool_id=pool_id,
-                                    coin=coin,
-                                    hour_start=current_hour,
-                                    mode=dominant_mode,
-                                    mode_changes=mode_changes,
-                                    mode_distribution=mode_distribution,
-                                    total_hashes_gh=total_hashes_gh,
-                                    avg_hashrate_gh=avg_hashrate_gh,
-                                    peak_hashrate_gh=max(hashrates),
-                                    min_hashrate_gh=min(hashrates),
-                                    uptime_seconds=uptime_seconds,
-                                    shares_accepted=total_accepted,
-                                    shares_rejected=total_rejected,
-                                    avg_power_watts=avg_power,
-                                    min_power_watts=min(powers) if powers else None,
-                                    max_power_watts=max(powers) if powers else None,
-                                    avg_chip_temp_c=avg_temp,
-                                    max_chip_temp_c=max(temps) if temps else None,
-                                    watts_per_gh=watts_per_gh,
-                                    hashes_per_share=hashes_per_share,
-                                    reject_rate_percent=reject_rate
-                                )
-                                db.add(hourly_agg)
-                                hourly_created += 1
-                        
-                        current_hour = hour_end
-                    
-                    # ========== DAILY AGGREGATION ==========
-                    # Find last daily aggregation
-                    last_daily = await db.execute(
-                        select(DailyMinerAnalytics)
-                        .where(DailyMinerAnalytics.miner_id == miner.id)
-                        .order_by(DailyMinerAnalytics.date.desc())
-                        .limit(1)
-                    )
-                    last_daily_record = last_daily.scalar_one_or_none()
-                    
-                    # Start from last aggregation or 90 days ago
-                    if last_daily_record:
-                        start_date = last_daily_record.date + timedelta(days=1)
-                    else:
-                        start_date = datetime.utcnow() - timedelta(days=90)
-                    
-                    # Aggregate day by day from hourly data
-                    current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                    
-                    while current_date < today:
-                        date_end = current_date + timedelta(days=1)
-                        
-                        # Get hourly records for this day
-                        hourly_result = await db.execute(
-                            select(HourlyMinerAnalytics)
-                            .where(and_(
-                                HourlyMinerAnalytics.miner_id == miner.id,
-                                HourlyMinerAnalytics.hour_start >= current_date,
-                                HourlyMinerAnalytics.hour_start < date_end
-                            ))
-                        )
-                        hourly_records = hourly_result.scalars().all()
-                        
-                        if hourly_records:
-                            # Aggregate daily metrics
-                            total_hashes_th = sum(h.total_hashes_gh for h in hourly_records) / 1000.0  # Convert to TH
-                            uptime_hours = sum(h.uptime_seconds for h in hourly_records) / 3600.0
-                            
-                            hashrates = [h.avg_hashrate_gh for h in hourly_records]
-                            powers = [h.avg_power_watts for h in hourly_records if h.avg_power_watts is not None]
-                            temps = [h.avg_chip_temp_c for h in hourly_records if h.avg_chip_temp_c is not None]
-                            
-                            # Mode distribution
-                            mode_counts = {}
-                            for h in hourly_records:
-                                if h.mode:
-                                    mode_counts[h.mode] = mode_counts.get(h.mode, 0) + (h.uptime_seconds / 3600.0)
-                            
-                            # Calculate daily aggregates
-                            avg_hashrate_gh = sum(hashrates) / len(hashrates)
-                            avg_power = sum(powers) / len(powers) if powers else None
-                            total_energy_kwh = (avg_power * uptime_hours / 1000.0) if avg_power else None
-                            avg_watts_per_gh = avg_power / avg_hashrate_gh if avg_power and avg_hashrate_gh else None
-                            
-                            total_shares = sum(h.shares_accepted for h in hourly_records)
-                            total_rejects = sum(h.shares_rejected for h in hourly_records)
-                            avg_reject_rate = (total_rejects * 100.0 / (total_shares + total_rejects)) if (total_shares + total_rejects) > 0 else None
-                            
-                            # Create daily record
-                            daily_agg = DailyMinerAnalytics(
-                                miner_id=miner.id,
-                                coin=coin,
-                                date=current_date,
-                                total_hashes_th=total_hashes_th,
-                                avg_hashrate_gh=avg_hashrate_gh,
-                                peak_hashrate_gh=max(h.peak_hashrate_gh for h in hourly_records if h.peak_hashrate_gh),
-                                uptime_hours=uptime_hours,
-                                total_shares_accepted=total_shares,
-                                total_shares_rejected=total_rejects,
-                                avg_reject_rate_percent=avg_reject_rate,
-                                best_share_difficulty=max((h.best_share_difficulty for h in hourly_records if h.best_share_difficulty), default=None),
-                                avg_power_watts=avg_power,
-                                max_power_watts=max(powers) if powers else None,
-                                total_energy_kwh=total_energy_kwh,
-                                avg_temp_c=sum(temps) / len(temps) if temps else None,
-                                max_temp_c=max(temps) if temps else None,
-                                avg_watts_per_gh=avg_watts_per_gh,
-                                mode_distribution=mode_counts
-                            )
-                            db.add(daily_agg)
-                            daily_created += 1
-                        
-                        current_date = date_end
-                
-                await db.commit()
-                logger.info(
-                    "Miner analytics aggregation complete: %s hourly, %s daily records created",
-                    hourly_created,
-                    daily_created,
-                )
-        
-        except Exception as e:
-            logger.exception("Failed to aggregate miner analytics: %s", e)
-    
     async def _sync_avalon_pool_slots(self):
         """Sync Avalon Nano pool slot configurations"""
         try:
@@ -4283,7 +3918,7 @@ class SchedulerService:
         """Monitor Home Assistant connectivity and send alerts if down"""
         try:
             from core.database import AsyncSessionLocal, HomeAssistantConfig
-            from integrations.homeassistant import HomeAssistantIntegration
+            from integrations.homeassistant import HomeAssistantIntegration, get_ha_state_store
             from core.notifications import NotificationService
             from datetime import datetime, timedelta
             from sqlalchemy import select
@@ -4302,9 +3937,11 @@ class SchedulerService:
                 
                 ha_config.keepalive_last_check = datetime.utcnow()
                 
-                # Test connection
-                ha_integration = HomeAssistantIntegration(ha_config.base_url, ha_config.access_token)
-                success = await ha_integration.test_connection()
+                # A live state stream already proves HA is reachable
+                success = get_ha_state_store().is_live()
+                if not success:
+                    ha_integration = HomeAssistantIntegration(ha_config.base_url, ha_config.access_token)
+                    success = await ha_integration.test_connection()
                 
                 now = datetime.utcnow()
                 
@@ -4412,53 +4049,80 @@ class SchedulerService:
             logger.error(f"Failed to monitor Home Assistant keepalive: {e}")
             logger.exception("Home Assistant keepalive monitoring failed")
     
+    async def _persist_ha_state_change(self, state):
+        """State store listener: record enrolled device state changes as they arrive"""
+        from core.database import AsyncSessionLocal, HomeAssistantDevice
+        from sqlalchemy import select
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(HomeAssistantDevice).where(
+                    HomeAssistantDevice.entity_id == state.entity_id,
+                    HomeAssistantDevice.enrolled == True
+                )
+            )
+            device = result.scalar_one_or_none()
+            if device and device.current_state != state.state:
+                device.current_state = state.state
+                device.last_state_change = datetime.utcnow()
+                await db.commit()
+                logger.debug(f"HA state change: {state.entity_id} -> {state.state}")
+
     async def _poll_ha_device_states(self):
-        """Poll Home Assistant device states every 5 minutes"""
+        """
+        Sync Home Assistant device states every 5 minutes.
+
+        Keeps the WebSocket state stream running; while it is live this is a
+        pure in-memory diff, otherwise all states come from one /api/states call.
+        """
         try:
             from core.database import AsyncSessionLocal, HomeAssistantConfig, HomeAssistantDevice
-            from integrations.homeassistant import HomeAssistantIntegration
+            from integrations.homeassistant import HomeAssistantIntegration, get_ha_state_store
             from sqlalchemy import select
             
+            store = get_ha_state_store()
             async with AsyncSessionLocal() as db:
                 # Check if HA is configured and enabled
                 result = await db.execute(select(HomeAssistantConfig))
                 ha_config = result.scalar_one_or_none()
                 
                 if not ha_config or not ha_config.enabled:
+                    await store.ensure_stream(None, None)
                     return
-                
+
                 # Get all enrolled devices (only poll devices we care about)
                 result = await db.execute(
                     select(HomeAssistantDevice).where(HomeAssistantDevice.enrolled == True)
                 )
                 devices = result.scalars().all()
                 
+                # Stream events only reach the DB listener for enrolled entities
+                store.watch(device.entity_id for device in devices)
+                store.add_listener(self._persist_ha_state_change)
+                await store.ensure_stream(
+                    ha_config.base_url,
+                    ha_config.access_token,
+                    enabled=bool(app_config.get("homeassistant.websocket_enabled", True))
+                )
+                
                 if not devices:
                     return
                 
-                # Initialize HA integration
+                # One bulk request at most (none while the stream is live)
                 ha = HomeAssistantIntegration(ha_config.base_url, ha_config.access_token)
+                if not store.is_live() and not await store.refresh(ha):
+                    logger.warning("Failed to fetch Home Assistant states")
+                    return
                 
-                # Poll each device state
                 updated_count = 0
                 for device in devices:
-                    try:
-                        state = await ha.get_device_state(device.entity_id)
-                        
-                        if state:
-                            # Only update if state has changed
-                            if device.current_state != state.state:
-                                device.current_state = state.state
-                                device.last_state_change = datetime.utcnow()
-                                updated_count += 1
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to poll state for {device.entity_id}: {e}")
-                        # Mark as unavailable if we can't reach it
-                        if device.current_state != "unavailable":
-                            device.current_state = "unavailable"
-                            device.last_state_change = datetime.utcnow()
-                            updated_count += 1
+                    state = store.get(device.entity_id)
+                    # Entity missing from HA entirely
+                    new_state = state.state if state else "unavailable"
+                    if device.current_state != new_state:
+                        device.current_state = new_state
+                        device.last_state_change = datetime.utcnow()
+                        updated_count += 1
                 
                 await db.commit()
                 
@@ -4711,16 +4375,11 @@ class SchedulerService:
                 miners = result.scalars().all()
                 
                 # Build telemetry payload with latest telemetry for each miner
+                latest_store = await get_latest_telemetry_store().ensure_warm(db)
                 miners_data = []
                 for miner in miners:
                     # Get latest telemetry for this miner
-                    telemetry_result = await db.execute(
-                        select(Telemetry)
-                        .where(Telemetry.miner_id == miner.id)
-                        .order_by(Telemetry.timestamp.desc())
-                        .limit(1)
-                    )
-                    latest_telemetry = telemetry_result.scalar_one_or_none()
+                    latest_telemetry = latest_store.get(miner.id)
                     
                     # Check if telemetry is recent (within last 10 minutes)
                     has_recent_data = False
@@ -4792,19 +4451,7 @@ class SchedulerService:
                     if app_config.get("octopus_agile.enabled", False):
                         # Get energy prices for last 24 hours
                         cutoff_24h = datetime.utcnow() - timedelta(hours=24)
-                        price_result = await db.execute(
-                            select(EnergyPrice)
-                            .where(EnergyPrice.valid_from >= cutoff_24h)
-                            .order_by(EnergyPrice.valid_from)
-                        )
-                        energy_prices = price_result.scalars().all()
-                        
-                        # Helper to find price for timestamp
-                        def get_price(ts):
-                            for price in energy_prices:
-                                if price.valid_from <= ts < price.valid_to:
-                                    return price.price_pence
-                            return None
+                        price_timeline = await get_price_timeline(db, cutoff_24h)
                         
                         # Calculate cost for each miner
                         total_cost_pence = 0.0
@@ -4825,7 +4472,7 @@ class SchedulerService:
                                     else:
                                         continue
                                 
-                                price_pence = get_price(ts)
+                                price_pence = price_timeline.price_at(ts)
                                 if not price_pence:
                                     continue
                                 
@@ -4947,7 +4594,7 @@ class SchedulerService:
             logger.error(f"Failed to push audit logs to cloud: {e}", exc_info=True)
 
     async def _compute_hourly_metrics(self):
-        """Compute metrics for the previous hour"""
+        """Compute pool metrics for the previous hour (telemetry metrics come from _rollup_telemetry)"""
         if self._should_skip_non_critical_job("compute_hourly_metrics"):
             return
 
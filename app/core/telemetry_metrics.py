@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict
@@ -11,16 +12,25 @@ from core.config import settings
 
 METRICS_PATH = settings.CONFIG_DIR / "telemetry_metrics.json"
 
+# The telemetry writer saves from a worker thread
+_store_lock = threading.Lock()
+
 
 @dataclass
 class TelemetryMetrics:
     peak_concurrency: int = 0
     max_backlog: int = 0
+    peak_writer_queue_depth: int = 0
+    peak_writer_batch_size: int = 0
+    peak_writer_flush_ms: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "peak_concurrency": self.peak_concurrency,
             "max_backlog": self.max_backlog,
+            "peak_writer_queue_depth": self.peak_writer_queue_depth,
+            "peak_writer_batch_size": self.peak_writer_batch_size,
+            "peak_writer_flush_ms": round(self.peak_writer_flush_ms, 1),
         }
 
     @classmethod
@@ -28,6 +38,9 @@ class TelemetryMetrics:
         return cls(
             peak_concurrency=int(data.get("peak_concurrency", 0)),
             max_backlog=int(data.get("max_backlog", 0)),
+            peak_writer_queue_depth=int(data.get("peak_writer_queue_depth", 0)),
+            peak_writer_batch_size=int(data.get("peak_writer_batch_size", 0)),
+            peak_writer_flush_ms=float(data.get("peak_writer_flush_ms", 0.0)),
         )
 
 
@@ -81,20 +94,34 @@ def _roll_daily(store: TelemetryMetricsStore) -> TelemetryMetricsStore:
 
 
 def update_concurrency_peak(current: int) -> TelemetryMetricsStore:
-    store = _roll_daily(_load_store())
-    store.last_24h.peak_concurrency = max(store.last_24h.peak_concurrency, current)
-    store.since_boot.peak_concurrency = max(store.since_boot.peak_concurrency, current)
-    _save_store(store)
+    with _store_lock:
+        store = _roll_daily(_load_store())
+        store.last_24h.peak_concurrency = max(store.last_24h.peak_concurrency, current)
+        store.since_boot.peak_concurrency = max(store.since_boot.peak_concurrency, current)
+        _save_store(store)
     return store
 
 
 def update_backlog(current: int) -> TelemetryMetricsStore:
-    store = _roll_daily(_load_store())
-    store.last_24h.max_backlog = max(store.last_24h.max_backlog, current)
-    store.since_boot.max_backlog = max(store.since_boot.max_backlog, current)
-    _save_store(store)
+    with _store_lock:
+        store = _roll_daily(_load_store())
+        store.last_24h.max_backlog = max(store.last_24h.max_backlog, current)
+        store.since_boot.max_backlog = max(store.since_boot.max_backlog, current)
+        _save_store(store)
+    return store
+
+
+def update_writer_metrics(queue_depth: int, batch_size: int, flush_ms: float) -> TelemetryMetricsStore:
+    with _store_lock:
+        store = _roll_daily(_load_store())
+        for metrics in (store.last_24h, store.since_boot):
+            metrics.peak_writer_queue_depth = max(metrics.peak_writer_queue_depth, queue_depth)
+            metrics.peak_writer_batch_size = max(metrics.peak_writer_batch_size, batch_size)
+            metrics.peak_writer_flush_ms = max(metrics.peak_writer_flush_ms, flush_ms)
+        _save_store(store)
     return store
 
 
 def get_metrics() -> TelemetryMetricsStore:
-    return _roll_daily(_load_store())
+    with _store_lock:
+        return _roll_daily(_load_store())
@@ -0,0 +1,785 @@
+"""
+Unified telemetry aggregation engine
+
+Raw telemetry used to be scanned separately by three jobs: the telemetry
+hourly/daily rollup, the miner analytics aggregation (one query per miner per
+hour) and the hourly MetricsEngine pass (one query per miner per metric).
+This engine reads each closed window of raw telemetry exactly once, as a
+single GROUP BY per miner, half-hour price slot and mode, merges those
+partial aggregates per miner-hour in Python and fans them out to every
+hourly output:
+
+- telemetry_hourly          (upserted on miner_id + hour_start)
+- hourly_miner_analytics
+- metrics (hourly energy_cost / hashrate / temperature / reject_rate)
+
+Daily outputs (telemetry_daily, daily_miner_analytics) are rolled up from
+those hourly tables once a day has closed, so they never touch raw rows.
+
+Each output table keeps its own checkpoint in `telemetry_rollup_state`; the
+raw window starts at the oldest hourly checkpoint and every sink only writes
+the hours past its own, so a sink added later (or one that failed) catches
+up without the others redoing work. Runs are cheap enough to schedule every
+few minutes.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, bindparam, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.price_timeline import PriceTimeline, get_price_timeline
+
+logger = logging.getLogger(__name__)
+
+# Output tables fed straight from the raw scan, and daily outputs with the
+# hourly table they are rolled up from
+HOURLY_OUTPUTS = ("telemetry_hourly", "hourly_miner_analytics", "metrics_hourly")
+DAILY_OUTPUTS = {
+    "telemetry_daily": "telemetry_hourly",
+    "daily_miner_analytics": "hourly_miner_analytics",
+}
+
+# Metric types produced from raw telemetry (pool_health stays in MetricsEngine)
+TELEMETRY_METRIC_TYPES = ("energy_cost", "hashrate", "temperature", "reject_rate")
+
+# MetricsEngine has always costed each sample as a 30 second interval
+METRIC_SAMPLE_HOURS = 30 / 3600
+
+DEFAULT_COIN = "BTC"
+
+# Per-dialect SQL fragments. PostgreSQL gets ordered array_agg for "first/last
+# non-null value in the group"; SQLite has no ordered aggregates, so it takes
+# min()/max() over "timestamp|value" strings and strips the timestamp prefix.
+_DIALECT_SQL = {
+    "postgresql": {
+        "hour": "date_trunc('hour', timestamp)",
+        "slot": (
+            "date_trunc('hour', timestamp) "
+            "+ INTERVAL '30 minutes' * FLOOR(EXTRACT(MINUTE FROM timestamp) / 30)"
+        ),
+        "first_text": "(array_agg({col} ORDER BY timestamp) FILTER (WHERE {col} IS NOT NULL))[1]",
+        "last_int": "(array_agg({col} ORDER BY timestamp DESC) FILTER (WHERE {col} IS NOT NULL))[1]",
+    },
+    "sqlite": {
+        "hour": "strftime('%Y-%m-%d %H', timestamp)",
+        "slot": (
+            "strftime('%Y-%m-%d %H:', timestamp) "
+            "|| CASE WHEN CAST(strftime('%M', timestamp) AS INTEGER) < 30 THEN '00:00' ELSE '30:00' END"
+        ),
+        "first_text": (
+            "substr(min(CASE WHEN {col} IS NOT NULL THEN timestamp || '|' || {col} END), "
+            "instr(min(CASE WHEN {col} IS NOT NULL THEN timestamp || '|' || {col} END), '|') + 1)"
+        ),
+        "last_int": (
+            "CAST(substr(max(CASE WHEN {col} IS NOT NULL THEN timestamp || '|' || {col} END), "
+            "instr(max(CASE WHEN {col} IS NOT NULL THEN timestamp || '|' || {col} END), '|') + 1) AS INTEGER)"
+        ),
+    },
+}
+
+_rollup_lock = asyncio.Lock()
+
+
+def _fragments(dialect: str) -> Dict[str, str]:
+    # Anything that isn't SQLite is treated as PostgreSQL (the production engine)
+    return _DIALECT_SQL["sqlite" if dialect == "sqlite" else "postgresql"]
+
+
+def build_partials_sql(dialect: str) -> str:
+    """
+    Single pass over raw telemetry in [:start, :end).
+
+    One row per miner, half-hour slot and mode, carrying only mergeable
+    partials (counts, sums, min/max, first/last values with their timestamps).
+    Mode transitions are flagged with LAG over the non-null modes of each hour.
+    """
+    sql = _fragments(dialect)
+    series = []
+    for col in ("hashrate", "temperature", "power_watts"):
+        series.append(
+            f"COUNT({col}) AS {col}_n, SUM({col}) AS {col}_sum, "
+            f"MIN({col}) AS {col}_min, MAX({col}) AS {col}_max"
+        )
+    series_sql = ",\n            ".join(series)
+    mode_window = f"PARTITION BY miner_id, {sql['hour']}, mode IS NULL ORDER BY timestamp"
+    return f"""
+        WITH windowed AS (
+            SELECT
+                miner_id, timestamp, mode, hashrate, hashrate_unit, temperature, power_watts,
+                energy_cost, shares_accepted, shares_rejected, pool_in_use, pool_id, coin,
+                CASE
+                    WHEN mode IS NOT NULL AND mode <> LAG(mode) OVER ({mode_window}) THEN 1
+                    ELSE 0
+                END AS mode_change
+            FROM telemetry
+            WHERE timestamp >= :start AND timestamp < :end
+        )
+        SELECT
+            miner_id,
+            {sql["slot"]} AS slot,
+            mode,
+            COUNT(*) AS row_count,
+            {series_sql},
+            COUNT(energy_cost) AS energy_cost_n,
+            SUM(energy_cost) AS energy_cost_sum,
+            SUM(shares_accepted) AS accepted_sum,
+            SUM(shares_rejected) AS rejected_sum,
+            MAX(CASE WHEN shares_accepted IS NOT NULL THEN timestamp END) AS accepted_at,
+            {sql["last_int"].format(col="shares_accepted")} AS accepted_last,
+            MAX(CASE WHEN shares_rejected IS NOT NULL THEN timestamp END) AS rejected_at,
+            {sql["last_int"].format(col="shares_rejected")} AS rejected_last,
+            MIN(CASE WHEN hashrate_unit IS NOT NULL THEN timestamp END) AS unit_at,
+            {sql["first_text"].format(col="hashrate_unit")} AS hashrate_unit,
+            MIN(CASE WHEN pool_in_use IS NOT NULL THEN timestamp END) AS pool_at,
+            {sql["first_text"].format(col="pool_in_use")} AS pool_in_use,
+            MIN(CASE WHEN pool_id IS NOT NULL THEN timestamp END) AS pool_id_at,
+            {sql["first_text"].format(col="pool_id")} AS pool_id,
+            MIN(CASE WHEN coin IS NOT NULL THEN timestamp END) AS coin_at,
+            {sql["first_text"].format(col="coin")} AS coin,
+            SUM(mode_change) AS mode_changes
+        FROM windowed
+        GROUP BY miner_id, {sql["slot"]}, mode
+    """
+
+
+def _as_datetime(value) -> datetime:
+    # SQLite hands grouped timestamps back as text
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _reject_rate(accepted: Optional[int], rejected: Optional[int]) -> Optional[float]:
+    """TelemetryHourly/Daily semantics: only when accepted is non-zero and rejected is known"""
+    if not accepted or rejected is None:
+        return None
+    total = accepted + rejected
+    return (rejected / total * 100) if total > 0 else 0
+
+
+class _Series:
+    """Mergeable count/sum/min/max for one column"""
+
+    __slots__ = ("n", "total", "low", "high")
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.low = None
+        self.high = None
+
+    def merge(self, n, total, low, high):
+        if not n:
+            return
+        self.n += n
+        self.total += total
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+    @property
+    def avg(self) -> Optional[float]:
+        return self.total / self.n if self.n else None
+
+
+class HourStats:
+    """Everything every hourly output needs for one miner-hour, merged from partials"""
+
+    def __init__(self, miner_id: int, hour_start: datetime):
+        self.miner_id = miner_id
+        self.hour_start = hour_start
+        self.rows = 0
+        self.hashrate = _Series()
+        self.temperature = _Series()
+        self.power = _Series()
+        self.energy_cost_n = 0
+        self.energy_cost_sum = 0.0
+        self.accepted_sum = 0
+        self.rejected_sum = 0
+        self._accepted_last: Tuple[Any, Optional[int]] = (None, None)
+        self._rejected_last: Tuple[Any, Optional[int]] = (None, None)
+        self._unit_first: Tuple[Any, Optional[str]] = (None, None)
+        self._pool_first: Tuple[Any, Optional[str]] = (None, None)
+        self._pool_id_first: Tuple[Any, Any] = (None, None)
+        self._coin_first: Tuple[Any, Optional[str]] = (None, None)
+        self.mode_rows: Dict[str, int] = defaultdict(int)
+        self.mode_changes = 0
+        self.slot_power: Dict[datetime, List[float]] = defaultdict(lambda: [0.0, 0])
+
+    @staticmethod
+    def _latest(current, at, value):
+        return (at, value) if at is not None and (current[0] is None or at > current[0]) else current
+
+    @staticmethod
+    def _earliest(current, at, value):
+        return (at, value) if at is not None and (current[0] is None or at < current[0]) else current
+
+    def merge(self, row, slot: datetime):
+        self.rows += row.row_count
+        self.hashrate.merge(row.hashrate_n, row.hashrate_sum, row.hashrate_min, row.hashrate_max)
+        self.temperature.merge(row.temperature_n, row.temperature_sum, row.temperature_min, row.temperature_max)
+        self.power.merge(row.power_watts_n, row.power_watts_sum, row.power_watts_min, row.power_watts_max)
+        if row.energy_cost_n:
+            self.energy_cost_n += row.energy_cost_n
+            self.energy_cost_sum += row.energy_cost_sum
+        self.accepted_sum += row.accepted_sum or 0
+        self.rejected_sum += row.rejected_sum or 0
+        self._accepted_last = self._latest(self._accepted_last, row.accepted_at, row.accepted_last)
+        self._rejected_last = self._latest(self._rejected_last, row.rejected_at, row.rejected_last)
+        self._unit_first = self._earliest(self._unit_first, row.unit_at, row.hashrate_unit)
+        self._pool_first = self._earliest(self._pool_first, row.pool_at, row.pool_in_use)
+        self._pool_id_first = self._earliest(self._pool_id_first, row.pool_id_at, row.pool_id)
+        self._coin_first = self._earliest(self._coin_first, row.coin_at, row.coin)
+        if row.mode:
+            self.mode_rows[row.mode] += row.row_count
+        self.mode_changes += row.mode_changes or 0
+        if row.power_watts_n:
+            self.slot_power[slot][0] += row.power_watts_sum
+            self.slot_power[slot][1] += row.power_watts_n
+
+    @property
+    def shares_accepted_last(self) -> Optional[int]:
+        return self._accepted_last[1]
+
+    @property
+    def shares_rejected_last(self) -> Optional[int]:
+        return self._rejected_last[1]
+
+    @property
+    def hashrate_unit(self) -> Optional[str]:
+        return self._unit_first[1]
+
+    @property
+    def pool_in_use(self) -> Optional[str]:
+        return self._pool_first[1]
+
+    @property
+    def pool_id(self) -> Optional[int]:
+        # SQLite returns the first value as text
+        value = self._pool_id_first[1]
+        return int(value) if value is not None else None
+
+    @property
+    def coin(self) -> Optional[str]:
+        return self._coin_first[1]
+
+    @property
+    def dominant_mode(self) -> Optional[str]:
+        return max(self.mode_rows.items(), key=lambda item: item[1])[0] if self.mode_rows else None
+
+
+def merge_partials(rows) -> Dict[Tuple[int, datetime], HourStats]:
+    """Fold partial rows from build_partials_sql into per miner-hour stats"""
+    hours: Dict[Tuple[int, datetime], HourStats] = {}
+    for row in rows:
+        slot = _as_datetime(row.slot)
+        key = (row.miner_id, _floor_hour(slot))
+        stats = hours.get(key)
+        if stats is None:
+            stats = hours[key] = HourStats(*key)
+        stats.merge(row, slot)
+    return hours
+
+
+class _Window:
+    """Lookups shared by every sink for one raw window, loaded once"""
+
+    def __init__(self, start: datetime, end: datetime, now: datetime):
+        self.start = start
+        self.end = end
+        self.now = now
+        self.pools: List[Tuple[int, str]] = []
+        self.enabled_miner_ids: set = set()
+        self.prices = PriceTimeline(())
+
+    async def load(self, db: AsyncSession):
+        from core.database import Miner, Pool
+
+        self.pools = [(row.id, row.url or "") for row in (await db.execute(select(Pool.id, Pool.url))).all()]
+        self.enabled_miner_ids = set(
+            (await db.execute(select(Miner.id).where(Miner.enabled == True))).scalars().all()
+        )
+        self.prices = await get_price_timeline(db, self.start)
+
+    def match_pool(self, pool_in_use: Optional[str]) -> Optional[int]:
+        if not pool_in_use:
+            return None
+        for pool_id, url in self.pools:
+            if pool_in_use in url:
+                return pool_id
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Hourly sinks (fed from the raw scan)
+# ---------------------------------------------------------------------------
+
+async def _upsert(db: AsyncSession, model, rows: List[Dict[str, Any]], keys: List[str]):
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+    stmt = dialect_insert(model)
+    updates = {col: stmt.excluded[col] for col in rows[0] if col not in keys and col != "created_at"}
+    await db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=updates), rows)
+
+
+async def _replace(db: AsyncSession, model, window_filter, rows: List[Dict[str, Any]]):
+    """Idempotent write for tables without a natural unique key: clear the window, then insert"""
+    await db.execute(delete(model).where(window_filter))
+    if rows:
+        await db.execute(insert(model), rows)
+
+
+async def _write_telemetry_hourly(db: AsyncSession, window: _Window, hours: List[HourStats]) -> int:
+    from core.database import TelemetryHourly
+
+    rows = []
+    for h in hours:
+        accepted, rejected = h.shares_accepted_last, h.shares_rejected_last
+        rows.append({
+            "miner_id": h.miner_id,
+            "hour_start": h.hour_start,
+            "uptime_minutes": h.rows,
+            "avg_hashrate": h.hashrate.avg,
+            "min_hashrate": h.hashrate.low,
+            "max_hashrate": h.hashrate.high,
+            "hashrate_unit": h.hashrate_unit or "GH/s",
+            "avg_temperature": h.temperature.avg,
+            "peak_temperature": h.temperature.high,
+            # Total kWh = sum of (watts / 60 / 1000) for each minute
+            "total_kwh": h.power.total / 60000.0 if h.power.n else None,
+            "total_energy_cost": h.energy_cost_sum if h.energy_cost_n else None,
+            "shares_accepted": accepted,
+            "shares_rejected": rejected,
+            "reject_rate_pct": _reject_rate(accepted, rejected),
+            "created_at": window.now,
+        })
+    await _upsert(db, TelemetryHourly, rows, ["miner_id", "hour_start"])
+    return len(rows)
+
+
+async def _write_miner_analytics_hourly(db: AsyncSession, window: _Window, hours: List[HourStats]) -> int:
+    from core.database import HourlyMinerAnalytics
+
+    rows = []
+    for h in hours:
+        if not h.hashrate.n:
+            continue
+        avg_hashrate_gh = h.hashrate.avg
+        uptime_seconds = h.rows * 60  # Assuming 1min intervals
+        total_hashes_gh = (avg_hashrate_gh * uptime_seconds) / 3600
+        avg_power = h.power.avg
+        total_shares = h.accepted_sum + h.rejected_sum
+        rows.append({
+            "miner_id": h.miner_id,
+            # Resolved at ingest; rows from before the pool_id column fall back to matching
+            "pool_id": h.pool_id if h.pool_id is not None else window.match_pool(h.pool_in_use),
+            "coin": h.coin or DEFAULT_COIN,
+            "hour_start": h.hour_start,
+            "mode": h.dominant_mode,
+            "mode_changes": h.mode_changes,
+            "mode_distribution": dict(h.mode_rows) or None,
+            "total_hashes_gh": total_hashes_gh,
+            "avg_hashrate_gh": avg_hashrate_gh,
+            "peak_hashrate_gh": h.hashrate.high,
+            "min_hashrate_gh": h.hashrate.low,
+            "uptime_seconds": uptime_seconds,
+            "shares_accepted": h.accepted_sum,
+            "shares_rejected": h.rejected_sum,
+            "avg_power_watts": avg_power,
+            "min_power_watts": h.power.low,
+            "max_power_watts": h.power.high,
+            "avg_chip_temp_c": h.temperature.avg,
+            "max_chip_temp_c": h.temperature.high,
+            "watts_per_gh": avg_power / avg_hashrate_gh if avg_power and avg_hashrate_gh else None,
+            "hashes_per_share": total_hashes_gh / h.accepted_sum if h.accepted_sum > 0 else None,
+            "reject_rate_percent": (h.rejected_sum * 100.0 / total_shares) if total_shares > 0 else None,
+            "created_at": window.now,
+        })
+
+    window_filter = and_(
+        HourlyMinerAnalytics.hour_start >= window.start,
+        HourlyMinerAnalytics.hour_start < window.end,
+    )
+    await _replace(db, HourlyMinerAnalytics, window_filter, rows)
+    return len(rows)
+
+
+def _metric(metric_type: str, entity_type: str, entity_id, hour_start: datetime, value: dict, now: datetime):
+    return {
+        "metric_type": metric_type,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "period": "hourly",
+        "timestamp": hour_start,
+        "value_json": value,
+        "computed_at": now,
+    }
+
+
+async def _write_metrics_hourly(db: AsyncSession, window: _Window, hours: List[HourStats]) -> int:
+    from core.database import Metric
+
+    rows = []
+    system_energy: Dict[datetime, List[float]] = defaultdict(lambda: [0.0, 0.0, 0])
+
+    for h in hours:
+        if h.miner_id not in window.enabled_miner_ids:
+            continue
+
+        # Energy cost: price each half-hour slot's samples at that slot's Agile price
+        total_kwh = total_cost_pence = price_sum = 0.0
+        price_count = 0
+        for slot, (power_sum, power_n) in h.slot_power.items():
+            price_pence = window.prices.price_at(slot)
+            if not price_pence:
+                continue
+            energy_kwh = (power_sum / 1000) * METRIC_SAMPLE_HOURS
+            total_kwh += energy_kwh
+            total_cost_pence += energy_kwh * price_pence
+            price_sum += price_pence * power_n
+            price_count += power_n
+        if total_kwh > 0:
+            rows.append(_metric("energy_cost", "miner", h.miner_id, h.hour_start, {
+                "kwh": round(total_kwh, 4),
+                "cost_pence": round(total_cost_pence, 2),
+                "cost_gbp": round(total_cost_pence / 100, 4),
+                "avg_price_pence": round(price_sum / price_count, 2) if price_count > 0 else 0,
+                "records": h.power.n,
+            }, window.now))
+            system = system_energy[h.hour_start]
+            system[0] += round(total_kwh, 4)
+            system[1] += round(total_cost_pence, 2)
+            system[2] += 1
+
+        if h.hashrate.n:
+            rows.append(_metric("hashrate", "miner", h.miner_id, h.hour_start, {
+                "avg": round(h.hashrate.avg, 2),
+                "min": round(h.hashrate.low, 2),
+                "max": round(h.hashrate.high, 2),
+                "unit": h.hashrate_unit,
+                "records": h.hashrate.n,
+            }, window.now))
+
+        if h.temperature.n:
+            rows.append(_metric("temperature", "miner", h.miner_id, h.hour_start, {
+                "avg": round(h.temperature.avg, 1),
+                "min": round(h.temperature.low, 1),
+                "max": round(h.temperature.high, 1),
+                "records": h.temperature.n,
+            }, window.now))
+
+        if h.accepted_sum:
+            total_shares = h.accepted_sum + h.rejected_sum
+            rows.append(_metric("reject_rate", "miner", h.miner_id, h.hour_start, {
+                "reject_rate": round(h.rejected_sum / total_shares * 100, 2) if total_shares > 0 else 0,
+                "shares_accepted": h.accepted_sum,
+                "shares_rejected": h.rejected_sum,
+            }, window.now))
+
+    for hour_start, (total_kwh, total_cost_pence, miner_count) in system_energy.items():
+        rows.append(_metric("energy_cost", "system", None, hour_start, {
+            "total_kwh": round(total_kwh, 4),
+            "total_cost_gbp": round(total_cost_pence / 100, 4),
+            "miner_count": miner_count,
+        }, window.now))
+
+    window_filter = and_(
+        Metric.period == "hourly",
+        Metric.metric_type.in_(TELEMETRY_METRIC_TYPES),
+        Metric.entity_type.in_(("miner", "system")),
+        Metric.timestamp >= window.start,
+        Metric.timestamp < window.end,
+    )
+    await _replace(db, Metric, window_filter, rows)
+    return len(rows)
+
+
+_HOURLY_SINKS = {
+    "telemetry_hourly": _write_telemetry_hourly,
+    "hourly_miner_analytics": _write_miner_analytics_hourly,
+    "metrics_hourly": _write_metrics_hourly,
+}
+
+
+# ---------------------------------------------------------------------------
+# Daily sinks (rolled up from the hourly tables)
+# ---------------------------------------------------------------------------
+
+async def _rollup_telemetry_daily(db: AsyncSession, start: datetime, end: datetime, now: datetime) -> int:
+    from core.database import TelemetryDaily, TelemetryHourly
+
+    result = await db.execute(
+        select(TelemetryHourly)
+        .where(TelemetryHourly.hour_start >= start)
+        .where(TelemetryHourly.hour_start < end)
+        .order_by(TelemetryHourly.hour_start)
+    )
+    days: Dict[Tuple[int, datetime], list] = defaultdict(list)
+    for hour in result.scalars().all():
+        days[(hour.miner_id, _floor_day(hour.hour_start))].append(hour)
+
+    def weighted_avg(hours, attr):
+        pairs = [(getattr(h, attr), h.uptime_minutes) for h in hours if getattr(h, attr) is not None]
+        weight = sum(minutes for _, minutes in pairs)
+        return sum(value * minutes for value, minutes in pairs) / weight if weight else None
+
+    def values(hours, attr):
+        return [getattr(h, attr) for h in hours if getattr(h, attr) is not None]
+
+    rows = []
+    for (miner_id, date), hours in days.items():
+        uptime = sum(h.uptime_minutes for h in hours)
+        uptime_percentage = (uptime / 1440.0) * 100
+        accepted = (values(hours, "shares_accepted") or [None])[-1]
+        rejected = (values(hours, "shares_rejected") or [None])[-1]
+        reject_rate = _reject_rate(accepted, rejected)
+        health_score = uptime_percentage
+        if reject_rate is not None:
+            health_score = max(0, health_score - (reject_rate * 5))
+        kwh = values(hours, "total_kwh")
+        costs = values(hours, "total_energy_cost")
+        rows.append({
+            "miner_id": miner_id,
+            "date": date,
+            "uptime_minutes": uptime,
+            "uptime_percentage": uptime_percentage,
+            "avg_hashrate": weighted_avg(hours, "avg_hashrate"),
+            "min_hashrate": min(values(hours, "min_hashrate"), default=None),
+            "max_hashrate": max(values(hours, "max_hashrate"), default=None),
+            "hashrate_unit": hours[0].hashrate_unit or "GH/s",
+            "avg_temperature": weighted_avg(hours, "avg_temperature"),
+            "peak_temperature": max(values(hours, "peak_temperature"), default=None),
+            "total_kwh": sum(kwh) if kwh else None,
+            "total_energy_cost": sum(costs) if costs else None,
+            "shares_accepted": accepted,
+            "shares_rejected": rejected,
+            "reject_rate_pct": reject_rate,
+            "health_score": health_score,
+            "created_at": now,
+        })
+    await _upsert(db, TelemetryDaily, rows, ["miner_id", "date"])
+    return len(rows)
+
+
+async def _rollup_miner_analytics_daily(db: AsyncSession, start: datetime, end: datetime, now: datetime) -> int:
+    from core.database import DailyMinerAnalytics, HourlyMinerAnalytics
+
+    result = await db.execute(
+        select(HourlyMinerAnalytics)
+        .where(HourlyMinerAnalytics.hour_start >= start)
+        .where(HourlyMinerAnalytics.hour_start < end)
+    )
+    days: Dict[Tuple[int, datetime], list] = defaultdict(list)
+    for hour in result.scalars().all():
+        days[(hour.miner_id, _floor_day(hour.hour_start))].append(hour)
+
+    rows = []
+    for (miner_id, date), hourly_records in days.items():
+        total_hashes_th = sum(h.total_hashes_gh for h in hourly_records) / 1000.0
+        uptime_hours = sum(h.uptime_seconds for h in hourly_records) / 3600.0
+        hashrates = [h.avg_hashrate_gh for h in hourly_records]
+        powers = [h.avg_power_watts for h in hourly_records if h.avg_power_watts is not None]
+        temps = [h.avg_chip_temp_c for h in hourly_records if h.avg_chip_temp_c is not None]
+
+        mode_counts: Dict[str, float] = {}
+        for h in hourly_records:
+            if h.mode:
+                mode_counts[h.mode] = mode_counts.get(h.mode, 0) + (h.uptime_seconds / 3600.0)
+
+        avg_hashrate_gh = sum(hashrates) / len(hashrates)
+        avg_power = sum(powers) / len(powers) if powers else None
+        total_shares = sum(h.shares_accepted for h in hourly_records)
+        total_rejects = sum(h.shares_rejected for h in hourly_records)
+
+        rows.append({
+            "miner_id": miner_id,
+            "coin": hourly_records[0].coin or DEFAULT_COIN,
+            "date": date,
+            "total_hashes_th": total_hashes_th,
+            "avg_hashrate_gh": avg_hashrate_gh,
+            "peak_hashrate_gh": max((h.peak_hashrate_gh for h in hourly_records if h.peak_hashrate_gh), default=None),
+            "uptime_hours": uptime_hours,
+            "total_shares_accepted": total_shares,
+            "total_shares_rejected": total_rejects,
+            "avg_reject_rate_percent": (
+                (total_rejects * 100.0 / (total_shares + total_rejects)) if (total_shares + total_rejects) > 0 else None
+            ),
+            "best_share_difficulty": max(
+                (h.best_share_difficulty for h in hourly_records if h.best_share_difficulty), default=None
+            ),
+            "avg_power_watts": avg_power,
+            "max_power_watts": max(powers) if powers else None,
+            "total_energy_kwh": (avg_power * uptime_hours / 1000.0) if avg_power else None,
+            "avg_temp_c": sum(temps) / len(temps) if temps else None,
+            "max_temp_c": max(temps) if temps else None,
+            "avg_watts_per_gh": avg_power / avg_hashrate_gh if avg_power and avg_hashrate_gh else None,
+            "mode_distribution": mode_counts,
+            "created_at": now,
+        })
+
+    window_filter = and_(DailyMinerAnalytics.date >= start, DailyMinerAnalytics.date < end)
+    await _replace(db, DailyMinerAnalytics, window_filter, rows)
+    return len(rows)
+
+
+_DAILY_SINKS = {
+    "telemetry_daily": _rollup_telemetry_daily,
+    "daily_miner_analytics": _rollup_miner_analytics_daily,
+}
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+async def _existing_high_water(db: AsyncSession, name: str) -> Optional[datetime]:
+    """Start of the period after the newest row already in an output table"""
+    from core.database import (
+        DailyMinerAnalytics, HourlyMinerAnalytics, Metric, TelemetryDaily, TelemetryHourly,
+    )
+
+    if name == "telemetry_hourly":
+        latest, step = select(func.max(TelemetryHourly.hour_start)), timedelta(hours=1)
+    elif name == "hourly_miner_analytics":
+        latest, step = select(func.max(HourlyMinerAnalytics.hour_start)), timedelta(hours=1)
+    elif name == "metrics_hourly":
+        latest = (
+            select(func.max(Metric.timestamp))
+            .where(Metric.period == "hourly")
+            .where(Metric.metric_type.in_(TELEMETRY_METRIC_TYPES))
+        )
+        step = timedelta(hours=1)
+    elif name == "telemetry_daily":
+        latest, step = select(func.max(TelemetryDaily.date)), timedelta(days=1)
+    else:
+        latest, step = select(func.max(DailyMinerAnalytics.date)), timedelta(days=1)
+
+    value = (await db.execute(latest)).scalar()
+    return _as_datetime(value) + step if value is not None else None
+
+
+async def _load_checkpoints(db: AsyncSession, closed_until: datetime) -> Dict[str, datetime]:
+    from core.database import Telemetry, TelemetryRollupState
+
+    result = await db.execute(select(TelemetryRollupState))
+    checkpoints = {state.name: state.watermark for state in result.scalars().all()}
+
+    oldest_raw = None
+    for name in HOURLY_OUTPUTS + tuple(DAILY_OUTPUTS):
+        if name in checkpoints:
+            continue
+        # First run for this output: resume after what it already holds,
+        # otherwise start from the oldest raw telemetry still on disk
+        start = await _existing_high_water(db, name)
+        if start is None:
+            if oldest_raw is None:
+                oldest_raw = _as_datetime((await db.execute(select(func.min(Telemetry.timestamp)))).scalar())
+            start = _floor_hour(oldest_raw) if oldest_raw is not None else closed_until
+        if name in DAILY_OUTPUTS:
+            start = _floor_day(start)
+        checkpoints[name] = start
+    return checkpoints
+
+
+async def _store_checkpoint(db: AsyncSession, name: str, watermark: datetime):
+    from core.database import TelemetryRollupState
+
+    state = await db.get(TelemetryRollupState, name)
+    if state is None:
+        db.add(TelemetryRollupState(name=name, watermark=watermark, updated_at=datetime.utcnow()))
+    else:
+        state.watermark = watermark
+        state.updated_at = datetime.utcnow()
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+async def rollup_telemetry(
+    db: AsyncSession,
+    now: Optional[datetime] = None,
+    settle_seconds: int = 120,
+    chunk_hours: int = 24,
+) -> Dict[str, Any]:
+    """
+    Bring every rollup output up to the last closed hour.
+
+    An hour counts as closed once `settle_seconds` have passed after it ends,
+    giving the telemetry writer time to flush late rows. Raw telemetry is read
+    in windows of at most `chunk_hours`, each committed on its own so catching
+    up after downtime stays bounded.
+    """
+    now = now or datetime.utcnow()
+    closed_until = _floor_hour(now - timedelta(seconds=settle_seconds))
+    written = {name: 0 for name in HOURLY_OUTPUTS + tuple(DAILY_OUTPUTS)}
+    hours_scanned = 0
+
+    async with _rollup_lock:
+        partials_sql = text(build_partials_sql(db.get_bind().dialect.name)).bindparams(
+            bindparam("start", type_=DateTime),
+            bindparam("end", type_=DateTime),
+        )
+        checkpoints = await _load_checkpoints(db, closed_until)
+
+        # ---- Hourly: one raw scan per window, fanned out to every sink ----
+        start = min(checkpoints[name] for name in HOURLY_OUTPUTS)
+        while start < closed_until:
+            end = min(closed_until, start + timedelta(hours=chunk_hours))
+            window = _Window(start, end, now)
+            await window.load(db)
+
+            rows = (await db.execute(partials_sql, {"start": start, "end": end})).all()
+            hours = merge_partials(rows)
+
+            for name, sink in _HOURLY_SINKS.items():
+                checkpoint = checkpoints[name]
+                if checkpoint >= end:
+                    continue
+                window.start = max(start, checkpoint)
+                pending = [h for h in hours.values() if h.hour_start >= window.start]
+                written[name] += await sink(db, window, pending)
+                checkpoints[name] = end
+                await _store_checkpoint(db, name, end)
+
+            await db.commit()
+            hours_scanned += int((end - start).total_seconds() // 3600)
+            start = end
+
+        # ---- Daily: roll closed days from the hourly tables ----
+        for name, source in DAILY_OUTPUTS.items():
+            day_start, day_end = checkpoints[name], _floor_day(checkpoints[source])
+            if day_end <= day_start:
+                continue
+            written[name] += await _DAILY_SINKS[name](db, day_start, day_end, now)
+            checkpoints[name] = day_end
+            await _store_checkpoint(db, name, day_end)
+            await db.commit()
+
+    summary = {
+        "hours_scanned": hours_scanned,
+        "rows_written": written,
+        "watermark": min(checkpoints[name] for name in HOURLY_OUTPUTS),
+    }
+    if hours_scanned or any(written.values()):
+        logger.info(
+            "Telemetry rollup: scanned %s hours of raw telemetry once -> %s (watermark %s)",
+            hours_scanned,
+            ", ".join(f"{name}={count}" for name, count in written.items()),
+            summary["watermark"],
+        )
+    return summary
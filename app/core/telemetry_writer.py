@@ -0,0 +1,295 @@
+"""
+Write-behind telemetry writer
+
+Collectors push prepared telemetry rows onto a bounded asyncio queue and a
+single writer task flushes them in batches - COPY on PostgreSQL, falling
+back to a multi-row INSERT - instead of every miner task committing its
+own one-row transaction.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+
+# Column order used for COPY (id is generated by the database)
+TELEMETRY_COLUMNS = [
+    "miner_id",
+    "timestamp",
+    "hashrate",
+    "hashrate_unit",
+    "temperature",
+    "power_watts",
+    "energy_cost",
+    "shares_accepted",
+    "shares_rejected",
+    "pool_difficulty",
+    "pool_in_use",
+    "mode",
+    "data",
+    "pool_id",
+    "coin",
+]
+
+METRICS_PERSIST_SECONDS = 30.0  # Writer high-water marks are saved at most this often
+
+# SQLSTATEs meaning COPY can never work on this server/role
+COPY_UNSUPPORTED_SQLSTATES = {
+    "0A000",  # feature_not_supported
+    "42501",  # insufficient_privilege
+}
+
+
+def copy_unsupported(error: Exception) -> bool:
+    """True if a COPY failure means COPY is unusable here, not a transient error"""
+    if isinstance(error, (AttributeError, NotImplementedError)):
+        # Driver without copy_records_to_table
+        return True
+    sqlstate = getattr(error, "sqlstate", None) or getattr(getattr(error, "orig", None), "sqlstate", None)
+    return sqlstate in COPY_UNSUPPORTED_SQLSTATES
+
+
+class TelemetryWriter:
+    """
+    Single consumer that batches telemetry rows into the database.
+
+    - submit() blocks when the queue is full (backpressure on collectors)
+    - drain() waits until every submitted row has been written
+    - stop() flushes whatever is queued before shutting down
+    - a failed batch is retried (retry_attempts, linear backoff) before it is dropped
+    - queue/batch/flush high-water marks are kept in memory and saved to the
+      telemetry metrics file every `metrics_interval` seconds, off the event loop
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 5000,
+        batch_size: int = 250,
+        flush_interval: float = 1.0,
+        retry_attempts: int = 3,
+        retry_delay: float = 0.5,
+        metrics_interval: float = METRICS_PERSIST_SECONDS
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_delay = retry_delay
+        self.metrics_interval = metrics_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._use_copy = True
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.batches_written = 0
+        self.last_batch_size = 0
+        self.last_flush_ms: Optional[float] = None
+        self._pending_peaks: Optional[Tuple[int, int, float]] = None
+        self._peaks_saved_at: Optional[float] = None
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, row: Dict[str, Any]):
+        """Queue one telemetry row (dict of Telemetry column values)"""
+        self._ensure_started()
+        await self._queue.put(row)
+
+    async def drain(self):
+        """Wait until all queued rows have been flushed"""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self):
+        """Flush remaining rows and stop the writer task"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Telemetry writer stop timed out with %s rows queued", self.queue_depth)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._save_peaks(force=True)
+        logger.info("Telemetry writer stopped (%s rows written)", self.rows_written)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _collect_batch(self) -> List[Dict[str, Any]]:
+        """Wait for the first row, then gather more until the batch fills or the interval passes"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            depth_at_flush = self.queue_depth + len(batch)
+            started = time.perf_counter()
+            try:
+                await self._write_with_retry(batch)
+                self.rows_written += len(batch)
+                self.batches_written += 1
+            except Exception as e:
+                self.rows_dropped += len(batch)
+                logger.error("Failed to write telemetry batch of %s rows: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            self.last_batch_size = len(batch)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000.0
+            peaks = (depth_at_flush, self.last_batch_size, self.last_flush_ms)
+            if self._pending_peaks is not None:
+                peaks = tuple(max(pending, value) for pending, value in zip(self._pending_peaks, peaks))
+            self._pending_peaks = peaks
+            await self._save_peaks()
+
+    async def _save_peaks(self, force: bool = False):
+        """Persist pending high-water marks once per metrics_interval (in a worker thread)"""
+        if self._pending_peaks is None:
+            return
+        now = time.monotonic()
+        if not force and self._peaks_saved_at is not None and now - self._peaks_saved_at < self.metrics_interval:
+            return
+        peaks, self._pending_peaks = self._pending_peaks, None
+        self._peaks_saved_at = now
+        try:
+            from core.telemetry_metrics import update_writer_metrics
+            await asyncio.to_thread(update_writer_metrics, *peaks)
+        except Exception as e:
+            logger.debug("Failed to record telemetry writer metrics: %s", e)
+
+    async def _write_with_retry(self, batch: List[Dict[str, Any]]):
+        for attempt in range(1, self.retry_attempts + 1):
+            try:
+                await self._write_batch(batch)
+                return
+            except Exception as e:
+                if attempt == self.retry_attempts:
+                    raise
+                logger.warning(
+                    "Telemetry batch write failed (attempt %s/%s), retrying: %s",
+                    attempt, self.retry_attempts, e
+                )
+                await asyncio.sleep(self.retry_delay * attempt)
+
+    async def _write_batch(self, rows: List[Dict[str, Any]]):
+        from core.database import AsyncSessionLocal, Telemetry, engine
+        from core.pool_resolver import annotate_pool_columns
+        from core.pool_shares import record_pool_shares
+        from core.raw_payloads import extract_raw_payloads, store_raw_payloads
+
+        # Raw vendor payloads and per-pool share counters are written in the same transaction
+        rows, payloads = extract_raw_payloads(rows)
+
+        if self._use_copy and engine.dialect.name == "postgresql":
+            try:
+                await self._copy_batch(rows, payloads)
+                return
+            except Exception as e:
+                if copy_unsupported(e):
+                    # Don't keep retrying a path the server rejects
+                    self._use_copy = False
+                    logger.warning("Telemetry COPY unsupported, using multi-row INSERT from now on: %s", e)
+                else:
+                    logger.warning("Telemetry COPY failed, writing this batch with INSERT: %s", e)
+
+        async with AsyncSessionLocal() as db:
+            await annotate_pool_columns(db, rows)
+            await store_raw_payloads(db, payloads)
+            await record_pool_shares(db, rows)
+            await db.execute(insert(Telemetry), rows)
+            await db.commit()
+
+    async def _copy_batch(self, rows: List[Dict[str, Any]], payloads: List[Dict[str, Any]]):
+        from core.database import AsyncSessionLocal
+        from core.pool_resolver import annotate_pool_columns
+        from core.pool_shares import record_pool_shares
+        from core.raw_payloads import store_raw_payloads
+
+        async with AsyncSessionLocal() as db:
+            await annotate_pool_columns(db, rows)
+            records = [
+                tuple(
+                    json.dumps(row.get(column), default=str) if column == "data" and row.get(column) is not None
+                    else row.get(column)
+                    for column in TELEMETRY_COLUMNS
+                )
+                for row in rows
+            ]
+            await store_raw_payloads(db, payloads)
+            await record_pool_shares(db, rows)
+            conn = await db.connection()
+            raw_conn = await conn.get_raw_connection()
+            await raw_conn.driver_connection.copy_records_to_table(
+                "telemetry",
+                records=records,
+                columns=TELEMETRY_COLUMNS,
+            )
+            await db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current writer state for the operations view"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "batch_size_limit": self.batch_size,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 1) if self.last_flush_ms is not None else None,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "batches_written": self.batches_written,
+            "mode": "copy" if self._use_copy else "insert",
+        }
+
+
+# Global instance
+_telemetry_writer: Optional[TelemetryWriter] = None
+
+
+def get_telemetry_writer() -> TelemetryWriter:
+    """Get the global telemetry writer (configured from `telemetry.writer`)"""
+    global _telemetry_writer
+    if _telemetry_writer is None:
+        from core.config import app_config
+
+        cfg = app_config.get("telemetry.writer", {}) or {}
+        _telemetry_writer = TelemetryWriter(
+            max_queue=int(cfg.get("max_queue", 5000)),
+            batch_size=int(cfg.get("batch_size", 250)),
+            flush_interval=float(cfg.get("flush_interval_seconds", 1.0)),
+            retry_attempts=int(cfg.get("retry_attempts", 3)),
+        )
+    return _telemetry_writer
+
+
+async def stop_telemetry_writer():
+    """Flush and stop the global writer if it was started"""
+    if _telemetry_writer is not None:
+        await _telemetry_writer.stop()
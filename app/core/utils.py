@@ -2,9 +2,9 @@
 Utility functions for Home Miner Manager
 """
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Row, select, and_
 from sqlalchemy.sql import func
 
 
@@ -154,11 +154,110 @@ async def get_latest_telemetry(
         query = query.where(Telemetry.timestamp >= cutoff)
     
     query = query.order_by(Telemetry.timestamp.desc()).limit(1)
-    
+
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
+# Numeric telemetry columns used by aggregate views. Deliberately excludes
+# `data`, which carries the full raw vendor payload for every row.
+TELEMETRY_STAT_COLUMNS = (
+    "miner_id",
+    "timestamp",
+    "hashrate",
+    "hashrate_unit",
+    "temperature",
+    "power_watts",
+    "shares_accepted",
+    "shares_rejected",
+)
+
+
+def _telemetry_columns_query(
+    miner_ids: Union[int, Iterable[int]],
+    columns: Sequence[str],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    from core.database import Telemetry
+
+    if isinstance(miner_ids, int):
+        miner_filter = Telemetry.miner_id == miner_ids
+    else:
+        miner_filter = Telemetry.miner_id.in_(list(miner_ids))
+
+    query = select(*(getattr(Telemetry, name) for name in columns)).where(miner_filter)
+    if start is not None:
+        query = query.where(Telemetry.timestamp >= start)
+    if end is not None:
+        query = query.where(Telemetry.timestamp < end)
+
+    return query.order_by(Telemetry.miner_id, Telemetry.timestamp)
+
+
+async def get_telemetry_columns(
+    db: AsyncSession,
+    miner_ids: Union[int, Iterable[int]],
+    columns: Sequence[str] = TELEMETRY_STAT_COLUMNS,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Row]:
+    """
+    Get selected telemetry columns as lightweight rows.
+
+    Unlike select(Telemetry), this never loads the `data` JSON column (unless
+    asked for) and builds no ORM objects, so large windows stay cheap.
+
+    Args:
+        db: Database session
+        miner_ids: A single miner ID or a list of miner IDs
+        columns: Telemetry column names to select
+        start: Only rows at or after this timestamp
+        end: Only rows before this timestamp
+
+    Returns:
+        Rows ordered by miner then timestamp; columns are available by
+        attribute (row.hashrate) or position
+
+    Example:
+        >>> rows = await get_telemetry_columns(db, miner.id, ("timestamp", "power_watts"), start=cutoff)
+        >>> total = sum(r.power_watts or 0 for r in rows)
+    """
+    if not isinstance(miner_ids, int) and not miner_ids:
+        return []
+
+    result = await db.execute(_telemetry_columns_query(miner_ids, columns, start, end))
+    return result.all()
+
+
+async def stream_telemetry_columns(
+    db: AsyncSession,
+    miner_ids: Union[int, Iterable[int]],
+    columns: Sequence[str] = TELEMETRY_STAT_COLUMNS,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 5000,
+) -> AsyncIterator[Row]:
+    """
+    Streaming variant of get_telemetry_columns() for very large windows.
+
+    Rows are fetched from a server-side cursor `batch_size` at a time
+    (yield_per), so memory stays flat regardless of the window length.
+
+    Example:
+        >>> async for row in stream_telemetry_columns(db, miner.id, start=cutoff):
+        ...     writer.writerow(row)
+    """
+    if not isinstance(miner_ids, int) and not miner_ids:
+        return
+
+    query = _telemetry_columns_query(miner_ids, columns, start, end)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        for row in partition:
+            yield row
+
+
 def format_hashrate(hashrate: float, unit: str = "GH/s") -> dict:
     """
     Format hashrate for API responses with consistent structure.
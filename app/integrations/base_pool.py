@@ -194,6 +194,16 @@ class BasePoolIntegration(ABC):
         """Whether this pool requires an API key for statistics"""
         return False
     
+    def http_session(self):
+        """
+        Shared keep-alive HTTP session for pool API calls.
+        
+        Usage: `async with self.http_session() as session:` - the session is
+        pooled process-wide and is not closed when the block exits.
+        """
+        from core.http_client import get_http_client
+        return get_http_client().session()
+    
     @abstractmethod
     def get_pool_templates(self) -> List[PoolTemplate]:
         """
@@ -1,10 +1,18 @@
 """
 Home Assistant REST API Integration
 Supports controlling Home Assistant devices (switches, lights, climate, etc.)
+
+Entity states are mirrored into an in-memory HAStateStore, fed by HA's
+WebSocket state_changed stream (with one bulk /api/states call to resync),
+so strategy and scheduler code can read switch states without polling HA
+once per device.
 """
 import asyncio
+import json
+import time
+import aiohttp
 import httpx
-from typing import List, Optional, Dict, Any
+from typing import Awaitable, Callable, Iterable, List, Optional, Dict, Any, Set
 import logging
 from datetime import datetime
 
@@ -13,6 +21,48 @@ from .base import IntegrationAdapter, DeviceInfo, DeviceState
 logger = logging.getLogger(__name__)
 
 
+# One pooled httpx client shared by every HomeAssistantIntegration instance
+# (instances are created per job run; the connection pool should outlive them)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30.0)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_ha_client():
+    """Stop the state stream and close the shared HA HTTP client"""
+    global _client, _client_loop
+    if _state_store is not None:
+        await _state_store.stop()
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _parse_state(data: Dict[str, Any]) -> DeviceState:
+    """Build a DeviceState from an HA state object"""
+    entity_id = data.get("entity_id", "")
+    attributes = data.get("attributes") or {}
+    return DeviceState(
+        entity_id=entity_id,
+        name=attributes.get("friendly_name", entity_id),
+        state=data.get("state", "unknown"),
+        attributes=attributes,
+        last_updated=datetime.fromisoformat(
+            (data.get("last_updated") or datetime.utcnow().isoformat()).replace("Z", "+00:00")
+        )
+    )
+
+
 class HomeAssistantIntegration(IntegrationAdapter):
     """Home Assistant platform adapter"""
     
@@ -41,15 +91,15 @@ class HomeAssistantIntegration(IntegrationAdapter):
 
         for attempt in range(1, self.retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.request(
-                        method,
-                        url,
-                        headers=self.headers,
-                        json=json
-                    )
-                    response.raise_for_status()
-                    return response
+                response = await _get_client().request(
+                    method,
+                    url,
+                    headers=self.headers,
+                    json=json,
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                return response
             except asyncio.CancelledError:
                 logger.warning(f"HA request cancelled: {method} {url}")
                 return None
@@ -139,18 +189,35 @@ class HomeAssistantIntegration(IntegrationAdapter):
             return None
         try:
             data = response.json()
-            return DeviceState(
-                entity_id=entity_id,
-                name=data.get("attributes", {}).get("friendly_name", entity_id),
-                state=data.get("state", "unknown"),
-                attributes=data.get("attributes", {}),
-                last_updated=datetime.fromisoformat(
-                    data.get("last_updated", datetime.utcnow().isoformat()).replace("Z", "+00:00")
-                )
-            )
+            data.setdefault("entity_id", entity_id)
+            return _parse_state(data)
         except Exception as e:
             logger.error(f"Failed to parse state for {entity_id}: {e}")
             return None
+
+    async def get_states(self) -> Optional[Dict[str, DeviceState]]:
+        """Get the state of every entity in one request (None if HA is unreachable)"""
+        response = await self._request("GET", "/api/states")
+        if not response:
+            return None
+        states = {}
+        try:
+            for data in response.json():
+                if data.get("entity_id"):
+                    states[data["entity_id"]] = _parse_state(data)
+        except Exception as e:
+            logger.error(f"Failed to parse Home Assistant states: {e}")
+            return None
+        return states
+
+    async def get_cached_device_state(self, entity_id: str) -> Optional[DeviceState]:
+        """
+        Current state of an entity from the shared state store.
+
+        Served from memory while the WebSocket stream is live; otherwise the
+        whole state map is refreshed with a single bulk request.
+        """
+        return await get_ha_state_store().get_state(self, entity_id)
     
     async def turn_on(self, entity_id: str) -> bool:
         """Turn device on"""
@@ -187,5 +254,232 @@ class HomeAssistantIntegration(IntegrationAdapter):
         if not response:
             return False
 
+        # Without the live stream the cached map can't see this change coming
+        get_ha_state_store().mark_stale()
         logger.info(f"Called {domain}.{service} on {entity_id}")
         return True
+
+
+StateListener = Callable[[DeviceState], Awaitable[None]]
+
+
+class HAStateStore:
+    """
+    In-memory map of Home Assistant entity states.
+
+    - A background task subscribes to HA's WebSocket `state_changed` events
+      and applies them as they arrive (seconds of latency, no polling)
+    - Every (re)connect resyncs the whole map with one GET /api/states
+    - Without a live stream, reads older than `max_age` trigger a single bulk
+      refresh shared by all concurrent callers
+    - Listeners are awaited for state changes of watched entities (used to
+      persist enrolled device states); the initial sync notifies nobody
+    """
+
+    def __init__(self, max_age: float = 30.0, reconnect_delay: float = 5.0, max_reconnect_delay: float = 300.0):
+        self.max_age = max_age
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.states: Dict[str, DeviceState] = {}
+        self.refreshed_at: Optional[float] = None
+        self.last_event_at: Optional[float] = None
+        self.connected = False
+        self.events_received = 0
+        self.bulk_refreshes = 0
+
+        self._listeners: List[StateListener] = []
+        # Entities listeners care about (None = all)
+        self.watched: Optional[Set[str]] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stream_key: Optional[tuple] = None
+
+    def add_listener(self, listener: StateListener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def watch(self, entity_ids: Iterable[str]):
+        """Only notify listeners about these entities"""
+        self.watched = set(entity_ids)
+
+    def watch_entity(self, entity_id: str, watched: bool = True):
+        """Add or remove one watched entity (e.g. on enroll / un-enroll)"""
+        if self.watched is None:
+            return
+        if watched:
+            self.watched.add(entity_id)
+        else:
+            self.watched.discard(entity_id)
+
+    def is_live(self) -> bool:
+        """True while the WebSocket stream is connected and authenticated"""
+        return self.connected
+
+    def mark_stale(self):
+        """Force the next read to refresh unless the stream is live"""
+        if not self.connected:
+            self.refreshed_at = None
+
+    def _is_fresh(self) -> bool:
+        if self.connected:
+            return True
+        return self.refreshed_at is not None and time.monotonic() - self.refreshed_at < self.max_age
+
+    async def refresh(self, ha: "HomeAssistantIntegration") -> bool:
+        """Replace the map with one bulk /api/states fetch, notifying listeners of changes"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        started = time.monotonic()
+        async with self._refresh_lock:
+            # Another caller refreshed while we waited
+            if self.refreshed_at is not None and self.refreshed_at >= started:
+                return True
+            states = await ha.get_states()
+            if states is None:
+                return False
+            previous, self.states = self.states, states
+            self.refreshed_at = time.monotonic()
+            self.bulk_refreshes += 1
+        if not previous:
+            # First sync: nothing changed from the listeners' point of view
+            return True
+        for entity_id, state in states.items():
+            old = previous.get(entity_id)
+            if old is None or old.state != state.state:
+                await self._notify(state)
+        return True
+
+    async def get_state(self, ha: "HomeAssistantIntegration", entity_id: str) -> Optional[DeviceState]:
+        if not self._is_fresh():
+            if not await self.refresh(ha):
+                # HA unreachable in bulk; fall back to the single-entity call
+                return await ha.get_device_state(entity_id)
+        return self.states.get(entity_id)
+
+    def get(self, entity_id: str) -> Optional[DeviceState]:
+        """Last known state without any network access"""
+        return self.states.get(entity_id)
+
+    async def apply_event(self, event_data: Dict[str, Any]):
+        """Apply a state_changed event payload"""
+        entity_id = event_data.get("entity_id")
+        new_state = event_data.get("new_state")
+        if not entity_id:
+            return
+        self.last_event_at = time.monotonic()
+        self.events_received += 1
+        if new_state is None:
+            # Entity removed
+            self.states.pop(entity_id, None)
+            return
+        new_state.setdefault("entity_id", entity_id)
+        state = _parse_state(new_state)
+        old = self.states.get(entity_id)
+        self.states[entity_id] = state
+        if old is None or old.state != state.state:
+            await self._notify(state)
+
+    async def _notify(self, state: DeviceState):
+        if self.watched is not None and state.entity_id not in self.watched:
+            return
+        for listener in list(self._listeners):
+            try:
+                await listener(state)
+            except Exception as e:
+                logger.warning(f"HA state listener failed for {state.entity_id}: {e}")
+
+    async def ensure_stream(self, base_url: Optional[str], access_token: Optional[str], enabled: bool = True):
+        """Start, restart (config changed) or stop the WebSocket stream to match the HA config"""
+        key = (base_url.rstrip("/"), access_token) if enabled and base_url and access_token else None
+        running = self._task is not None and not self._task.done()
+        if key == self._stream_key and (running or key is None):
+            return
+        await self.stop()
+        self._stream_key = key
+        if key is not None:
+            self._task = asyncio.get_running_loop().create_task(self._run_stream(*key))
+
+    async def stop(self):
+        task, self._task = self._task, None
+        self._stream_key = None
+        self.connected = False
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_stream(self, base_url: str, access_token: str):
+        ws_url = base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/api/websocket"
+        ha = HomeAssistantIntegration(base_url, access_token)
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, connect=10)) as session:
+                    async with session.ws_connect(ws_url, heartbeat=30) as ws:
+                        await self._subscribe(ws, access_token)
+                        # Events may have been missed while disconnected; the
+                        # map only counts as live once it has been resynced
+                        self.refreshed_at = None
+                        if not await self.refresh(ha):
+                            raise RuntimeError("state resync failed")
+                        self.connected = True
+                        delay = self.reconnect_delay
+                        logger.info("📡 Home Assistant state stream connected")
+                        async for message in ws:
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                if message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                                continue
+                            payload = json.loads(message.data)
+                            if payload.get("type") == "event":
+                                await self.apply_event(payload.get("event", {}).get("data", {}))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Home Assistant state stream error: {e}")
+            finally:
+                if self.connected:
+                    logger.warning("Home Assistant state stream disconnected")
+                self.connected = False
+                self.refreshed_at = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    @staticmethod
+    async def _subscribe(ws, access_token: str):
+        message = await ws.receive_json(timeout=10)
+        if message.get("type") == "auth_required":
+            await ws.send_json({"type": "auth", "access_token": access_token})
+            message = await ws.receive_json(timeout=10)
+        if message.get("type") != "auth_ok":
+            raise RuntimeError(f"authentication failed ({message.get('type')})")
+        await ws.send_json({"id": 1, "type": "subscribe_events", "event_type": "state_changed"})
+        message = await ws.receive_json(timeout=10)
+        if not message.get("success"):
+            raise RuntimeError(f"subscribe_events rejected: {message.get('error')}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "live": self.connected,
+            "entities": len(self.states),
+            "events_received": self.events_received,
+            "bulk_refreshes": self.bulk_refreshes,
+            "seconds_since_refresh": round(now - self.refreshed_at, 1) if self.refreshed_at else None,
+            "seconds_since_event": round(now - self.last_event_at, 1) if self.last_event_at else None,
+        }
+
+
+# Global instance
+_state_store: Optional[HAStateStore] = None
+
+
+def get_ha_state_store() -> HAStateStore:
+    """Get the global Home Assistant state store"""
+    global _state_store
+    if _state_store is None:
+        _state_store = HAStateStore()
+    return _state_store
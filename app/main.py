@@ -178,6 +178,15 @@ async def startup_event():
         async with AsyncSessionLocal() as db:
             await initialize_postgres_optimizations(db)
         logger.info("✅ Database optimizations initialized")
+
+        # Warm the in-memory latest telemetry store, best difficulty register and health scorer
+        from core.high_diff_tracker import get_best_difficulty_register
+        from core.latest_telemetry import get_latest_telemetry_store
+        from core.online_health import get_online_health_scorer
+        async with AsyncSessionLocal() as db:
+            await get_latest_telemetry_store().warm_start(db)
+            await get_best_difficulty_register().ensure_seeded(db)
+            await get_online_health_scorer().ensure_loaded(db)
         
         # Ensure default alert types exist
         logger.info("🔔 Syncing default alert types...")
@@ -221,6 +230,8 @@ async def shutdown_event():
     """Application shutdown"""
     logger.info("🛑 Shutting down Home Miner Manager")
     scheduler.shutdown()
+    # Flush queued telemetry and close pooled connections before the loop stops
+    await scheduler.wait_closed()
 
 # Mount static files
 static_dir = Path(__file__).parent / "ui" / "static"
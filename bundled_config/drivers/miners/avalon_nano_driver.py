@@ -1,10 +1,11 @@
 """
 Avalon Nano 3 / 3S adapter using cgminer TCP API
 """
-import socket
 import json
 import asyncio
 import logging
+import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from adapters.base import MinerAdapter, MinerTelemetry
@@ -12,7 +13,148 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.1.3"
+__version__ = "1.3.2"
+
+
+class CgminerClient:
+    """
+    Async cgminer API client shared by every adapter instance for a device.
+
+    - Telemetry reads use one compound request (``summary+estats+devs+pools``)
+      where the firmware supports joined commands, falling back to one
+      request per command otherwise. Support is remembered per device.
+    - All traffic to a device is serialized through a per-device lock, so
+      mode switches, pool changes and telemetry reads never interleave.
+      Operations made of several commands hold the lock for all of them
+      with ``async with client.device_lock()``.
+
+    cgminer closes the socket after every reply, so "one connection" means
+    one connection per request; batching is what removes the round-trips.
+    """
+
+    CONNECT_TIMEOUT = 2.0
+    READ_TIMEOUT = 2.0
+    COMPOUND_READ_TIMEOUT = 4.0
+
+    # Keyed by "ip:port" so state survives adapter replacement
+    _locks: Dict[str, asyncio.Lock] = {}
+    _holders: Dict[str, "asyncio.Task"] = {}
+    _compound_support: Dict[str, bool] = {}
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.key = f"{host}:{port}"
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        lock = self._locks.get(self.key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[self.key] = lock
+        return lock
+
+    @asynccontextmanager
+    async def device_lock(self):
+        """Hold the device across several commands (commands issued inside don't re-lock)"""
+        task = asyncio.current_task()
+        if self._holders.get(self.key) is task:
+            yield
+            return
+        async with self.lock:
+            self._holders[self.key] = task
+            try:
+                yield
+            finally:
+                self._holders.pop(self.key, None)
+
+    async def _exchange(self, payload: bytes, read_timeout: float, tolerate_timeout: bool = False) -> bytes:
+        """Send one request and read until the miner closes the connection"""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            timeout=self.CONNECT_TIMEOUT,
+        )
+        try:
+            writer.write(payload)
+            await writer.drain()
+            try:
+                return await asyncio.wait_for(reader.read(), timeout=read_timeout)
+            except asyncio.TimeoutError:
+                if not tolerate_timeout:
+                    raise
+                return b""
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    @staticmethod
+    def parse_response(response: bytes) -> Optional[Dict]:
+        """Parse the first JSON object from a cgminer reply (null-terminated, may carry junk)"""
+        decoded = response.decode('utf-8', errors='ignore')
+
+        # Remove null bytes and control characters (keep only printable chars and whitespace)
+        decoded = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', decoded).strip()
+        if not decoded:
+            return None
+
+        # Find the end of the first JSON object
+        brace_count = 0
+        for i, char in enumerate(decoded):
+            if char == '{':
+                brace_count += 1
+            elif char == '}':
+                brace_count -= 1
+                if brace_count == 0:
+                    return json.loads(decoded[:i + 1])
+
+        return json.loads(decoded)
+
+    async def _request(self, command: str, parameter: str = "", read_timeout: Optional[float] = None) -> Optional[Dict]:
+        payload = json.dumps({"command": command, "parameter": parameter}).encode()
+        response = await self._exchange(payload, read_timeout or self.READ_TIMEOUT)
+        return self.parse_response(response)
+
+    async def command(self, command: str, parameter: str = "") -> Optional[Dict]:
+        """Run a single JSON command"""
+        async with self.device_lock():
+            return await self._request(command, parameter)
+
+    async def command_raw(self, command: str) -> bytes:
+        """Send a raw (non-JSON) command; an empty reply is normal for reboot"""
+        async with self.device_lock():
+            return await self._exchange(command.encode(), self.READ_TIMEOUT, tolerate_timeout=True)
+
+    async def multi(self, commands: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Run several read-only commands, returning {command: response}.
+
+        Each response has the same shape as a standalone command reply.
+        """
+        async with self.device_lock():
+            if self._compound_support.get(self.key, True):
+                joined = await self._request("+".join(commands), read_timeout=self.COMPOUND_READ_TIMEOUT)
+
+                # Every command gets a list section; an empty one is still a valid answer
+                if joined and all(isinstance(joined.get(cmd), list) for cmd in commands):
+                    self._compound_support[self.key] = True
+                    return {cmd: joined[cmd][0] if joined[cmd] else {} for cmd in commands}
+
+                if joined is not None:
+                    # Firmware answered with an error (e.g. joins not permitted)
+                    logger.info(f"cgminer at {self.key} does not support joined commands - using per-command requests")
+                    self._compound_support[self.key] = False
+
+            results: Dict[str, Optional[Dict]] = {}
+            for cmd in commands:
+                try:
+                    results[cmd] = await self._request(cmd)
+                except Exception as e:
+                    logger.debug(f"cgminer {cmd} failed on {self.key}: {e}")
+                    results[cmd] = None
+            return results
 
 
 class AvalonNanoAdapter(MinerAdapter):
@@ -96,23 +238,21 @@ class AvalonNanoAdapter(MinerAdapter):
         super().__init__(miner_id, miner_name, ip_address, port or self.DEFAULT_PORT, config)
         # Get admin password from config, default to "admin"
         self.admin_password = (config or {}).get("admin_password", self.DEFAULT_ADMIN_PASSWORD)
+        self.cgminer = CgminerClient(ip_address, self.port)
     
     async def get_telemetry(self) -> Optional[MinerTelemetry]:
         """Get telemetry from cgminer API"""
         try:
-            # Get summary
-            summary = await self._cgminer_command("summary")
+            # summary + estats (power/mode) + devs (raw preservation) + pools,
+            # batched into one request where the firmware allows it
+            responses = await self.cgminer.multi(["summary", "estats", "devs", "pools"])
+            summary = responses.get("summary")
             if not summary:
                 return None
             
-            # Get estats for power calculation
-            estats = await self._cgminer_command("estats")
-
-            # Get devs for fallback temperature + raw preservation
-            devs = await self._cgminer_command("devs")
-            
-            # Get pool info
-            pools = await self._cgminer_command("pools")
+            estats = responses.get("estats")
+            devs = responses.get("devs")
+            pools = responses.get("pools")
             
             # Parse telemetry
             summary_data = summary.get("SUMMARY", [{}])[0]
@@ -288,7 +428,6 @@ class AvalonNanoAdapter(MinerAdapter):
             return parsed
 
         try:
-            import re
             for key, value in re.findall(r'([A-Za-z0-9_]+)\[([^\]]*)\]', mm_id):
                 parsed[key] = value
         except Exception:
@@ -450,17 +589,19 @@ class AvalonNanoAdapter(MinerAdapter):
             # Format: setpool|admin,password,slot,pool_url,worker,pool_password
             setpool_cmd = f"setpool|admin,{self.admin_password},0,{full_pool_url},{full_username},{pool_password}"
             
-            # Send setpool command - it doesn't return a JSON response, just sends the command
-            result = await self._cgminer_command_raw(setpool_cmd)
-            if result is None:
-                logger.error(f"❌ Failed to send setpool command to {self.miner_name}")
-                return False
-            
-            logger.info(f"✅ Pool configured for {self.miner_name}, rebooting to activate...")
-            
-            # Reboot to activate the new pool configuration
-            # Format: ascset|0,reboot,0
-            reboot_result = await self._cgminer_command_raw("ascset|0,reboot,0")
+            # No telemetry poll may run between setpool and the reboot
+            async with self.cgminer.device_lock():
+                # Send setpool command - it doesn't return a JSON response, just sends the command
+                result = await self._cgminer_command_raw(setpool_cmd)
+                if result is None:
+                    logger.error(f"❌ Failed to send setpool command to {self.miner_name}")
+                    return False
+                
+                logger.info(f"✅ Pool configured for {self.miner_name}, rebooting to activate...")
+                
+                # Reboot to activate the new pool configuration
+                # Format: ascset|0,reboot,0
+                await self._cgminer_command_raw("ascset|0,reboot,0")
             
             # Note: Miner will disconnect during reboot, so we may not get a response
             # This is expected behavior
@@ -496,15 +637,8 @@ class AvalonNanoAdapter(MinerAdapter):
             return False
     
     async def is_online(self) -> bool:
-        """Check if miner is online via TCP port check (fast ping)"""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)  # Quick timeout for ping
-            sock.connect((self.ip_address, self.port))
-            sock.close()
-            return True
-        except:
-            return False
+        """Check if miner is online (shared ICMP liveness check)"""
+        return await self.ping()
     
     async def _cgminer_command(self, command: str) -> Optional[Dict]:
         """Send command to cgminer API
@@ -513,52 +647,8 @@ class AvalonNanoAdapter(MinerAdapter):
         Only setpool/reboot use raw string format (handled by _cgminer_command_raw)
         """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)  # Reduced from 10s to 2s for faster failure detection
-            sock.connect((self.ip_address, self.port))
-            
-            # Send command in JSON format for standard cgminer commands
-            cmd = {"command": command.split("|")[0], "parameter": command.split("|")[1] if "|" in command else ""}
-            sock.sendall(json.dumps(cmd).encode())
-            
-            # Receive response
-            response = b""
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-            
-            sock.close()
-            
-            # Parse JSON response - cgminer returns multiple JSON objects separated by null bytes
-            # Split on null byte and take the first valid JSON
-            decoded = response.decode('utf-8', errors='ignore')
-            
-            # Remove null bytes and control characters (keep only printable chars and whitespace)
-            import re
-            decoded = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', decoded).strip()
-            
-            # Try to find the first complete JSON object
-            if decoded:
-                # cgminer often returns JSON with trailing null bytes or extra data
-                # Find the end of the first JSON object
-                brace_count = 0
-                json_end = -1
-                for i, char in enumerate(decoded):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            json_end = i + 1
-                            break
-                
-                if json_end > 0:
-                    json_str = decoded[:json_end]
-                    return json.loads(json_str)
-            
-            return json.loads(decoded)
+            name, _, parameter = command.partition("|")
+            return await self.cgminer.command(name, parameter)
         except Exception as e:
             print(f"⚠️ cgminer command failed: {e}")
             return None
@@ -570,25 +660,7 @@ class AvalonNanoAdapter(MinerAdapter):
         Returns True if command was sent successfully and got a response.
         """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            sock.connect((self.ip_address, self.port))
-            
-            # Send raw command
-            sock.sendall(command.encode())
-            
-            # Receive response
-            response = b""
-            try:
-                while True:
-                    chunk = sock.recv(4096)
-                    if not chunk:
-                        break
-                    response += chunk
-            except socket.timeout:
-                pass
-            
-            sock.close()
+            response = await self.cgminer.command_raw(command)
             
             # Check if we got a valid response
             decoded = response.decode('utf-8', errors='ignore')
@@ -1,7 +1,6 @@
 """
 NerdQaxe++ adapter using REST API
 """
-import aiohttp
 import logging
 from typing import Dict, List, Optional
 from adapters.base import MinerAdapter, MinerTelemetry
@@ -9,7 +8,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.1.1"
+__version__ = "1.3.0"
 
 
 class NerdQaxeAdapter(MinerAdapter):
@@ -27,7 +26,7 @@ class NerdQaxeAdapter(MinerAdapter):
     async def get_telemetry(self) -> Optional[MinerTelemetry]:
         """Get telemetry from REST API"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(f"{self.base_url}/api/system/info", timeout=5) as response:
                     if response.status != 200:
                         return None
@@ -140,7 +139,7 @@ class NerdQaxeAdapter(MinerAdapter):
             
             config = mode_config.get(mode)
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.patch(
                     f"{self.base_url}/api/system",
                     json=config,
@@ -165,7 +164,7 @@ class NerdQaxeAdapter(MinerAdapter):
     async def get_current_mode(self) -> Optional[str]:
         """Detect current mode based on frequency"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(f"{self.base_url}/api/system/info", timeout=5) as response:
                     if response.status != 200:
                         return None
@@ -193,7 +192,7 @@ class NerdQaxeAdapter(MinerAdapter):
             full_username = f"{pool_user}.{self.miner_name}"
             
             print(f"🔄 NerdQaxe: Updating pool configuration...")
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.patch(
                     f"{self.base_url}/api/system",
                     json={
@@ -225,7 +224,7 @@ class NerdQaxeAdapter(MinerAdapter):
     async def restart(self) -> bool:
         """Restart miner"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.post(f"{self.base_url}/api/system/restart", timeout=5) as response:
                     return response.status == 200
         except Exception as e:
@@ -233,18 +232,13 @@ class NerdQaxeAdapter(MinerAdapter):
             return False
     
     async def is_online(self) -> bool:
-        """Check if miner is online"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/system/info", timeout=3) as response:
-                    return response.status == 200
-        except:
-            return False
+        """Check if miner is online (shared ICMP liveness check)"""
+        return await self.ping()
     
     async def _apply_custom_settings(self, settings: Dict) -> bool:
         """Apply custom tuning settings (frequency, voltage)"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.patch(
                     f"{self.base_url}/api/system",
                     json=settings,
@@ -11,7 +11,7 @@ Steps:
 6. Restart container to load the new driver
 """
 
-__version__ = "1.0.3"
+__version__ = "1.1.0"
 
 import logging
 import aiohttp
@@ -98,7 +98,7 @@ class TemplateIntegration(BasePoolIntegration):
         try:
             start_time = datetime.utcnow()
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/health",  # Your pool's health endpoint
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -145,7 +145,7 @@ class TemplateIntegration(BasePoolIntegration):
             PoolStats or None on error
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/stats",  # Your pool's stats endpoint
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -200,7 +200,7 @@ class TemplateIntegration(BasePoolIntegration):
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 # Fetch user's worker stats
                 async with session.get(
                     f"{self.BASE_URL}/accounts/{username}",  # Your pool's user endpoint
@@ -277,7 +277,7 @@ class TemplateIntegration(BasePoolIntegration):
             List of PoolBlock objects
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/blocks?limit={limit}",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
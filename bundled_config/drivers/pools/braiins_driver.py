@@ -21,7 +21,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.0.3"
+__version__ = "1.1.0"
 
 
 class BraiinsIntegration(BasePoolIntegration):
@@ -91,7 +91,7 @@ class BraiinsIntegration(BasePoolIntegration):
                 "Accept": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/profile/json/btc/",
                     headers=headers,
@@ -356,7 +356,7 @@ class BraiinsIntegration(BasePoolIntegration):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/workers/json/btc",
                     headers=headers,
@@ -379,7 +379,7 @@ class BraiinsIntegration(BasePoolIntegration):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/profile/json/btc/",
                     headers=headers,
@@ -402,7 +402,7 @@ class BraiinsIntegration(BasePoolIntegration):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{self.BASE_URL}/rewards/json/btc/",
                     headers=headers,
@@ -26,7 +26,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.0.8"
+__version__ = "1.1.0"
 
 
 class CKPoolIntegration(BasePoolIntegration):
@@ -181,7 +181,7 @@ class CKPoolIntegration(BasePoolIntegration):
         """
         try:
             log_url = f"{api_base}/ckpool.log"
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 payload = await self._get_json_text(session, log_url)
                 if not payload:
                     return None
@@ -198,7 +198,7 @@ class CKPoolIntegration(BasePoolIntegration):
     async def _fetch_ckpool_log(self, api_base: str) -> Optional[str]:
         try:
             log_url = f"{api_base}/ckpool.log"
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 return await self._get_json_text(session, log_url)
         except Exception:
             return None
@@ -298,7 +298,7 @@ class CKPoolIntegration(BasePoolIntegration):
 
     async def _fetch_status(self, api_base: str) -> Dict[str, Any]:
         status_url = f"{api_base}/pool/pool.status"
-        async with aiohttp.ClientSession() as session:
+        async with self.http_session() as session:
             payload = await self._get_json_text(session, status_url)
             if payload is None:
                 return {}
@@ -306,7 +306,7 @@ class CKPoolIntegration(BasePoolIntegration):
 
     async def _fetch_user(self, api_base: str, wallet: str) -> Dict[str, Any]:
         user_url = f"{api_base}/users/{wallet}"
-        async with aiohttp.ClientSession() as session:
+        async with self.http_session() as session:
             payload = await self._get_json_text(session, user_url)
             if payload is None:
                 return {}
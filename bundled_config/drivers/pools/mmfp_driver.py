@@ -21,7 +21,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.0.4"
+__version__ = "1.1.0"
 
 
 class MMFPIntegration(BasePoolIntegration):
@@ -86,7 +86,7 @@ class MMFPIntegration(BasePoolIntegration):
         """
         try:
             api_url = self._get_api_url(url)
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/api/v1/health",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -110,7 +110,7 @@ class MMFPIntegration(BasePoolIntegration):
             import time
             start_time = time.time()
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/api/v1/health",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -154,7 +154,7 @@ class MMFPIntegration(BasePoolIntegration):
             
             api_url = self._get_api_url(url)
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/api/v1/{coin.upper()}/metrics/pool",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -175,7 +175,7 @@ class MMFPIntegration(BasePoolIntegration):
         try:
             api_url = self._get_api_url(url)
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/api/v1/{coin.upper()}/metrics/pool",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -235,7 +235,7 @@ class MMFPIntegration(BasePoolIntegration):
         try:
             api_url = self._get_api_url(url)
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/api/v1/{coin.upper()}/metrics/miners",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -296,7 +296,7 @@ class MMFPIntegration(BasePoolIntegration):
         try:
             api_url = self._get_api_url(url)
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 # Measure latency
                 start_time = datetime.utcnow()
                 
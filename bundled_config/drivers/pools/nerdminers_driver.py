@@ -20,7 +20,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.0.7"
+__version__ = "1.1.0"
 
 
 class NerdMinersIntegration(BasePoolIntegration):
@@ -97,7 +97,7 @@ class NerdMinersIntegration(BasePoolIntegration):
             clean_url = url.replace("http://", "").replace("https://", "")
             api_url = f"https://{clean_url}"
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/pool/pool.status",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -118,7 +118,7 @@ class NerdMinersIntegration(BasePoolIntegration):
             
             start_time = datetime.utcnow()
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/pool/pool.status",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -178,7 +178,7 @@ class NerdMinersIntegration(BasePoolIntegration):
             clean_url = url.replace("http://", "").replace("https://", "")
             api_url = f"https://{clean_url}"
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_url}/pool/pool.status",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -226,7 +226,7 @@ class NerdMinersIntegration(BasePoolIntegration):
             clean_url = url.replace("http://", "").replace("https://", "")
             api_url = f"https://{clean_url}"
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 start_time = datetime.utcnow()
                 
                 async with session.get(
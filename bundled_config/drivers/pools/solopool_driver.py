@@ -21,7 +21,7 @@ from core.utils import format_hashrate
 
 logger = logging.getLogger(__name__)
 
-__version__ = "1.0.6"
+__version__ = "1.1.0"
 
 
 class SolopoolIntegration(BasePoolIntegration):
@@ -189,7 +189,7 @@ class SolopoolIntegration(BasePoolIntegration):
         
         try:
             start_time = datetime.utcnow()
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_base}/stats",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -221,7 +221,7 @@ class SolopoolIntegration(BasePoolIntegration):
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_base}/stats",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -249,7 +249,7 @@ class SolopoolIntegration(BasePoolIntegration):
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_base}/stats",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -290,7 +290,7 @@ class SolopoolIntegration(BasePoolIntegration):
             return []
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_base}/blocks",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -346,7 +346,7 @@ class SolopoolIntegration(BasePoolIntegration):
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 async with session.get(
                     f"{api_base}/accounts/{username}",
                     timeout=aiohttp.ClientTimeout(total=self.API_TIMEOUT)
@@ -383,7 +383,7 @@ class SolopoolIntegration(BasePoolIntegration):
         logger.info(f"Solopool get_dashboard_data: coin={coin}, username={username}")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session() as session:
                 # Fetch stats, blocks, and worker stats in parallel
                 start_time = datetime.utcnow()
                 
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+REPO_ROOT = Path(__file__).resolve().parents[1]
+APP_ROOT = REPO_ROOT / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+def _load_driver():
+    path = REPO_ROOT / "bundled_config" / "drivers" / "miners" / "avalon_nano_driver.py"
+    spec = importlib.util.spec_from_file_location("avalon_nano_driver_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+driver = _load_driver()
+
+_REPLIES = {
+    "summary": {"STATUS": [{"STATUS": "S"}], "SUMMARY": [{"MHS 5s": 4000000, "Accepted": 10, "Rejected": 1}]},
+    "estats": {"STATUS": [{"STATUS": "S"}], "STATS": [{"MM ID0": "Ver[25021401] WORKMODE[1] TAvg[70] MPO[80]"}]},
+    "devs": {"STATUS": [{"STATUS": "S"}], "DEVS": [{}]},
+    "pools": {"STATUS": [{"STATUS": "S"}], "POOLS": [{"URL": "stratum+tcp://pool:3333", "Status": "Alive", "Priority": 0}]},
+}
+
+
+async def _start_fake_cgminer(allow_join: bool, requests: list, empty_sections=()):
+    async def handle(reader, writer):
+        raw = await reader.read(4096)
+        request = json.loads(raw.decode())
+        requests.append(request["command"])
+        names = request["command"].split("+")
+        if len(names) > 1 and allow_join:
+            reply = {name: [] if name in empty_sections else [_REPLIES[name]] for name in names}
+        elif len(names) > 1:
+            reply = {"STATUS": [{"STATUS": "E", "Code": 14, "Msg": "Invalid command"}]}
+        else:
+            reply = _REPLIES[names[0]]
+        writer.write(json.dumps(reply).encode() + b"\x00")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _run_telemetry(allow_join: bool, empty_sections=()):
+    requests: list = []
+
+    async def _run():
+        server, port = await _start_fake_cgminer(allow_join, requests, empty_sections)
+        try:
+            adapter = driver.AvalonNanoAdapter(1, "nano", "127.0.0.1", port)
+            first = await adapter.get_telemetry()
+            second = await adapter.get_telemetry()
+            return first, second
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    first, second = asyncio.run(_run())
+    return first, second, requests
+
+
+def test_telemetry_uses_single_joined_request_when_supported() -> None:
+    first, second, requests = _run_telemetry(allow_join=True)
+
+    assert requests == ["summary+estats+devs+pools"] * 2
+    assert first.power_watts == 80.0
+    assert first.extra_data["current_mode"] == "med"
+    assert second.pool_in_use == "stratum+tcp://pool:3333"
+
+
+def test_telemetry_falls_back_and_remembers_missing_join_support() -> None:
+    first, second, requests = _run_telemetry(allow_join=False)
+
+    per_poll = ["summary", "estats", "devs", "pools"]
+    # First poll probes the joined command once, later polls skip it
+    assert requests == ["summary+estats+devs+pools"] + per_poll + per_poll
+    assert first.temperature == 70.0
+    assert second.shares_accepted == 10
+
+
+def test_empty_joined_section_keeps_join_support() -> None:
+    first, second, requests = _run_telemetry(allow_join=True, empty_sections=("pools",))
+
+    assert requests == ["summary+estats+devs+pools"] * 2
+    assert first.shares_accepted == 10
+    assert second.pool_in_use is None
+
+
+def test_parse_response_strips_trailing_garbage() -> None:
+    parsed = driver.CgminerClient.parse_response(b'{"STATUS":[{"STATUS":"S"}]}\x00{"extra": 1}')
+    assert parsed == {"STATUS": [{"STATUS": "S"}]}
+
+
+def test_device_lock_keeps_other_requests_out_of_an_operation() -> None:
+    requests: list = []
+
+    async def _run():
+        server, port = await _start_fake_cgminer(True, requests)
+        try:
+            client = driver.CgminerClient("127.0.0.1", port)
+            async with client.device_lock():
+                await client.command("summary")
+                # A telemetry poll arriving mid-operation waits for the lock
+                poll = asyncio.create_task(client.multi(["summary", "pools"]))
+                await asyncio.sleep(0.05)
+                await client.command("pools")
+            await poll
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(_run())
+    assert requests == ["summary", "pools", "summary+pools"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import statistics
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.anomaly_detection import (
+    _baseline_metric_values,
+    _convert_to_ths,
+    calculate_median_mad,
+    grouped_median_mad,
+)
+
+
+def test_grouped_median_mad_matches_per_list_statistics() -> None:
+    rng = np.random.default_rng(7)
+    groups = rng.integers(0, 6, size=500)
+    values = rng.normal(100.0, 15.0, size=500).round(1)
+    groups[:3] = 9  # tiny odd-sized group
+
+    group_ids, medians, mads, counts = grouped_median_mad(groups, values)
+
+    for group_id, median, mad, count in zip(group_ids, medians, mads, counts):
+        expected = calculate_median_mad(list(values[groups == group_id]))
+        assert (median, mad) == pytest.approx(expected)
+        assert count == np.sum(groups == group_id)
+
+
+def test_grouped_median_mad_empty() -> None:
+    group_ids, medians, mads, counts = grouped_median_mad(np.array([], dtype=np.int64), np.array([]))
+    assert len(group_ids) == len(medians) == len(mads) == len(counts) == 0
+
+
+def test_metric_masks_follow_record_rules() -> None:
+    columns = {
+        "group": np.array([0, 0, 0, 0]),
+        "hashrate": np.array([500.0, 1.2, 480.0, 510.0]),
+        "unit": np.array(["GH/s", "TH/s", "GH/s", "MH/s"], dtype=object),
+        "power": np.array([15.0, 30.0, np.nan, 0.0]),
+        "temp": np.array([55.0, 0.0, np.nan, -2.0]),
+        "accepted": np.array([10.0, 0.0, np.nan, 5.0]),
+        "rejected": np.array([1.0, 0.0, 1.0, 0.0]),
+    }
+    metrics = _baseline_metric_values(columns)
+
+    hashrate_mask, hashrate_ths = metrics["hashrate_mean"]
+    assert hashrate_mask.all()
+    assert hashrate_ths == pytest.approx([_convert_to_ths(h, u) for h, u in zip(columns["hashrate"], columns["unit"])])
+
+    power_mask, _ = metrics["power_mean"]
+    assert list(power_mask) == [True, True, False, False]
+    w_mask, w_per_th = metrics["w_per_th"]
+    assert w_per_th[w_mask] == pytest.approx([15.0 / 0.5, 30.0 / 1.2])
+
+    temp_mask, _ = metrics["temp_mean"]
+    assert list(temp_mask) == [True, False, False, True]
+
+    reject_mask, reject_rate = metrics["reject_rate"]
+    assert list(reject_mask) == [True, False, False, True]
+    assert reject_rate[reject_mask] == pytest.approx([100 / 11, 0.0])
+    assert statistics.median(reject_rate[reject_mask]) == pytest.approx(50 / 11)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+if "core.config" not in sys.modules:
+    config_mod = types.ModuleType("core.config")
+
+    class _Config:
+        @staticmethod
+        def get(_key, default=None):
+            return default
+
+    config_mod.app_config = _Config()
+    sys.modules["core.config"] = config_mod
+
+
+from core.cost_engine import PowerSeries, compute_costs
+from core.price_timeline import PriceTimeline
+
+
+START = datetime(2026, 1, 5, 0, 0)
+SLOT = timedelta(minutes=30)
+
+
+def _prices() -> PriceTimeline:
+    # 00:00-01:30 priced, 01:30-02:00 missing
+    return PriceTimeline([
+        (START, START + SLOT, 10.0),
+        (START + SLOT, START + SLOT * 2, 20.0),
+        (START + SLOT * 2, START + SLOT * 3, 30.0),
+    ])
+
+
+def _reference(rows, prices, manual_power):
+    """The per-reading loop the dashboard used before"""
+    totals = {}
+    by_miner = {}
+    for miner_id, ts, power in sorted(rows, key=lambda r: (r[0], r[1])):
+        by_miner.setdefault(miner_id, []).append((ts, power))
+    for miner_id, readings in by_miner.items():
+        kwh_total = cost_total = 0.0
+        for i, (ts, power) in enumerate(readings):
+            if not power or power <= 0:
+                power = manual_power.get(miner_id)
+                if not power:
+                    continue
+            if i < len(readings) - 1:
+                hours = min((readings[i + 1][0] - ts).total_seconds() / 3600.0, 10.0 / 60.0)
+            else:
+                hours = 30.0 / 3600.0
+            kwh = power / 1000.0 * hours
+            kwh_total += kwh
+            price = prices.price_at(ts)
+            if price is not None:
+                cost_total += kwh * price
+        totals[miner_id] = (kwh_total, cost_total)
+    return totals
+
+
+def test_matches_per_reading_loop() -> None:
+    rows = []
+    for i in range(200):
+        rows.append((1, START + timedelta(seconds=30 * i), 100.0 + i % 7))
+    # Miner 2 reports no power half the time and has an offline gap
+    for i in range(100):
+        ts = START + timedelta(minutes=i) + (timedelta(hours=1) if i >= 50 else timedelta())
+        rows.append((2, ts, None if i % 2 else 60.0))
+    # Miner 3 never reports power and has no manual fallback
+    rows.append((3, START, None))
+    manual_power = {2: 45.0, 3: None}
+
+    result = compute_costs(PowerSeries.from_rows(reversed(rows)), _prices(), manual_power=manual_power)
+    expected = _reference(rows, _prices(), manual_power)
+
+    for miner_id, (kwh, cost) in expected.items():
+        assert result.miner(miner_id).kwh == pytest.approx(kwh)
+        assert result.miner(miner_id).cost_pence == pytest.approx(cost)
+    assert result.miner(3).readings == 0
+    assert result.miner(3).avg_power_watts is None
+    assert result.miner(2).avg_power_watts == pytest.approx((60.0 + 45.0) / 2)
+
+
+def test_unpriced_readings_count_towards_kwh_only() -> None:
+    rows = [(1, START + SLOT * 3 + timedelta(minutes=1), 1000.0)]
+    result = compute_costs(PowerSeries.from_rows(rows), _prices())
+
+    assert result.total_kwh == pytest.approx(1.0 * 30.0 / 3600.0)
+    assert result.total_priced_kwh == 0.0
+    assert result.total_cost_pence == 0.0
+
+
+def test_hourly_buckets() -> None:
+    rows = [
+        (1, START, 1000.0),
+        (1, START + timedelta(minutes=10), 1000.0),
+        (1, START + timedelta(minutes=40), 1000.0),
+        (1, START + timedelta(minutes=50), 1000.0),
+        (1, START + timedelta(minutes=65), 1000.0),
+    ]
+    result = compute_costs(PowerSeries.from_rows(rows), _prices(), bucket="hour")
+
+    assert set(result.buckets) == {START, START + timedelta(hours=1)}
+    first_hour = result.buckets[START]
+    # Four readings of 10 minutes each (the 30 minute gap is capped): two at 10p, two at 20p
+    assert first_hour.kwh == pytest.approx(40.0 / 60.0)
+    assert first_hour.cost_pence == pytest.approx((20 * 10.0 + 20 * 20.0) / 60.0)
+    assert result.buckets[START + timedelta(hours=1)].cost_pence == pytest.approx(30.0 * 30.0 / 3600.0)
+
+
+def test_empty_series() -> None:
+    result = compute_costs(PowerSeries.from_rows(()), _prices(), bucket="day")
+    assert result.miners == {}
+    assert result.buckets == {}
+    assert result.total_cost_pence == 0.0
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.discovery import AdaptiveLimiter, DiscoveryScan, MinerDiscoveryService
+
+
+def _closed_port() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_adaptive_limiter_backs_off_and_grows() -> None:
+    async def run():
+        limiter = AdaptiveLimiter(initial=16, minimum=4, maximum=64)
+        for _ in range(16):
+            await limiter.acquire()
+        blocked = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        limiter.backoff()
+        assert limiter.limit == 8
+        for _ in range(16):
+            limiter.release()
+        await blocked
+        # 16 clean releases at a limit of 8 grow it once
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.limit == 9
+    assert limiter.active == 1
+    assert limiter.peak == 16
+    assert limiter.backoffs == 1
+
+
+def test_only_open_ports_are_identified(monkeypatch) -> None:
+    identified = []
+
+    async def fake_identify(ip, port, timeout, session=None):
+        identified.append((ip, port))
+        return {"ip": ip, "port": port, "type": "bitaxe", "name": f"bitaxe ({ip})", "details": {}}
+
+    monkeypatch.setattr(MinerDiscoveryService, "_identify", staticmethod(fake_identify))
+
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        scan = DiscoveryScan(
+            ["127.0.0.1/32", "127.0.0.1/32"],
+            timeout=1.0,
+            ports=(open_port, _closed_port()),
+            max_concurrency=32,
+        )
+        async with server:
+            miners = [miner async for miner in scan.run()]
+        return open_port, scan, miners
+
+    open_port, scan, miners = asyncio.run(run())
+
+    assert identified == [("127.0.0.1", open_port)]
+    assert [miner["ip"] for miner in miners] == ["127.0.0.1"]
+    assert scan.stats["hosts"] == 1  # Overlapping networks are deduplicated
+    assert scan.stats["probes"] == 2
+    assert scan.stats["open_ports"] == 1
+    assert scan.stats["identified"] == 1
+
+
+def test_discover_miners_collects_streamed_results(monkeypatch) -> None:
+    async def fake_identify(ip, port, timeout, session=None):
+        return {"ip": ip, "port": port, "type": "avalon_nano", "name": ip, "details": {}}
+
+    async def always_open(ip, port, timeout):
+        return True
+
+    import core.discovery as discovery
+
+    monkeypatch.setattr(MinerDiscoveryService, "_identify", staticmethod(fake_identify))
+    monkeypatch.setattr(discovery, "_port_open", always_open)
+
+    miners = asyncio.run(MinerDiscoveryService.discover_miners("10.9.8.0/30", timeout=0.5))
+
+    # One miner per host even though every port answered
+    assert sorted(miner["ip"] for miner in miners) == ["10.9.8.1", "10.9.8.2"]
+
+
+def test_priority_hosts_are_swept_first(monkeypatch) -> None:
+    import core.discovery as discovery
+
+    probed = []
+
+    async def closed(ip, port, timeout):
+        probed.append(ip)
+        return False
+
+    monkeypatch.setattr(discovery, "_port_open", closed)
+
+    scan = DiscoveryScan(
+        "10.9.8.0/29",
+        timeout=0.5,
+        ports=(80,),
+        max_concurrency=256,
+        priority_hosts=["10.9.8.5", "10.9.7.1", "10.9.8.5"],
+        background_concurrency=32,
+    )
+
+    async def run():
+        return [miner async for miner in scan.run()]
+
+    assert asyncio.run(run()) == []
+    assert probed[:2] == ["10.9.8.5", "10.9.7.1"]
+    assert sorted(probed[2:]) == ["10.9.8.1", "10.9.8.2", "10.9.8.3", "10.9.8.4", "10.9.8.6"]
+    assert scan.stats["hosts"] == 7
+    assert scan.limiter.maximum == 32
+    assert scan.covers("10.9.7.1") and scan.covers("10.9.8.3") and not scan.covers("10.9.6.1")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from integrations.homeassistant import HAStateStore, _parse_state
+
+
+def _state(entity_id: str, state: str) -> dict:
+    return {
+        "entity_id": entity_id,
+        "state": state,
+        "attributes": {"friendly_name": entity_id.split(".")[1].title()},
+        "last_updated": "2026-01-05T00:00:00.000000+00:00",
+    }
+
+
+class _FakeHA:
+    def __init__(self, states):
+        self.states = states
+        self.bulk_calls = 0
+        self.single_calls = 0
+
+    async def get_states(self):
+        self.bulk_calls += 1
+        if self.states is None:
+            return None
+        return {s["entity_id"]: _parse_state(s) for s in self.states}
+
+    async def get_device_state(self, entity_id):
+        self.single_calls += 1
+        return None
+
+
+def test_parse_state() -> None:
+    state = _parse_state(_state("switch.miner_1", "on"))
+    assert state.name == "Miner_1"
+    assert state.state == "on"
+    assert state.last_updated.tzinfo is not None
+
+
+def test_reads_share_one_bulk_refresh() -> None:
+    async def run():
+        store = HAStateStore()
+        ha = _FakeHA([_state("switch.a", "on"), _state("switch.b", "off")])
+        results = await asyncio.gather(*(store.get_state(ha, e) for e in ("switch.a", "switch.b", "switch.a")))
+        assert [r.state for r in results] == ["on", "off", "on"]
+        assert ha.bulk_calls == 1
+
+        # Fresh map: no more HA traffic; a service call forces a refresh
+        await store.get_state(ha, "switch.b")
+        assert ha.bulk_calls == 1
+        store.mark_stale()
+        await store.get_state(ha, "switch.b")
+        assert ha.bulk_calls == 2
+
+    asyncio.run(run())
+
+
+def test_falls_back_to_single_entity_when_bulk_fails() -> None:
+    async def run():
+        ha = _FakeHA(None)
+        assert await HAStateStore().get_state(ha, "switch.a") is None
+        assert ha.single_calls == 1
+
+    asyncio.run(run())
+
+
+def test_state_changed_events_update_map_and_notify() -> None:
+    async def run():
+        store = HAStateStore()
+        seen = []
+
+        async def listener(state):
+            seen.append((state.entity_id, state.state))
+
+        store.add_listener(listener)
+        await store.refresh(_FakeHA([_state("switch.a", "on")]))
+        await store.apply_event({"entity_id": "switch.a", "new_state": _state("switch.a", "off")})
+        # Attribute-only update: no listener call
+        await store.apply_event({"entity_id": "switch.a", "new_state": _state("switch.a", "off")})
+        await store.apply_event({"entity_id": "switch.a", "new_state": None})
+
+        # The initial sync is not a change
+        assert seen == [("switch.a", "off")]
+        assert store.get("switch.a") is None
+        assert store.events_received == 3
+
+    asyncio.run(run())
+
+
+def test_only_watched_entities_reach_listeners() -> None:
+    async def run():
+        store = HAStateStore()
+        seen = []
+
+        async def listener(state):
+            seen.append((state.entity_id, state.state))
+
+        store.add_listener(listener)
+        store.watch(["switch.a"])
+        await store.refresh(_FakeHA([_state("switch.a", "on"), _state("light.b", "on")]))
+        await store.apply_event({"entity_id": "light.b", "new_state": _state("light.b", "off")})
+        await store.apply_event({"entity_id": "switch.a", "new_state": _state("switch.a", "off")})
+        assert seen == [("switch.a", "off")]
+
+        # Enrolled later: listeners hear about it from then on
+        store.watch_entity("light.b")
+        store.mark_stale()
+        await store.refresh(_FakeHA([_state("switch.a", "on"), _state("light.b", "on")]))
+        assert seen == [("switch.a", "off"), ("switch.a", "on"), ("light.b", "on")]
+
+        store.watch_entity("switch.a", False)
+        await store.apply_event({"entity_id": "switch.a", "new_state": _state("switch.a", "off")})
+        assert len(seen) == 3
+        # The map itself still tracks every entity
+        assert store.get("switch.a").state == "off"
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import core.latest_telemetry as latest_telemetry
+from core.high_diff_tracker import BestDifficultyRegister, parse_difficulty
+from core.latest_telemetry import LatestTelemetryStore
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (4096, 4096.0),
+        (1.5, 1.5),
+        ("130.46 k", 130_460.0),
+        ("1.2M", 1_200_000.0),
+        ("3.1 G", 3_100_000_000.0),
+        ("2T", 2_000_000_000_000.0),
+        ("4,096", 4096.0),
+        ("  512 ", 512.0),
+        (None, None),
+        ("", None),
+        ("n/a", None),
+        (True, None),
+    ],
+)
+def test_parse_difficulty(value, expected) -> None:
+    if expected is None:
+        assert parse_difficulty(value) is None
+    else:
+        assert parse_difficulty(value) == pytest.approx(expected)
+
+
+def test_register_detects_increases_and_session_resets() -> None:
+    register = BestDifficultyRegister()
+
+    assert register.observe(1, 1_000.0) == (True, None)
+    assert register.observe(1, 1_000.0) == (False, 1_000.0)
+    assert register.observe(1, 5_000.0) == (True, 1_000.0)
+    # Session restart: lower value becomes the new baseline
+    assert register.observe(1, 200.0) == (False, 5_000.0)
+    assert register.observe(1, 300.0) == (True, 200.0)
+    assert register.get(2) is None
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _FakeDB:
+    def __init__(self, high_diff_rows):
+        self.high_diff_rows = high_diff_rows
+
+    async def execute(self, statement):
+        return _Rows(self.high_diff_rows)
+
+
+def test_register_is_seeded_from_latest_telemetry(monkeypatch) -> None:
+    store = LatestTelemetryStore()
+    store.update({"miner_id": 1, "timestamp": datetime(2026, 1, 5), "data": {"best_session_diff": "2.5M"}})
+    store.update({"miner_id": 2, "timestamp": datetime(2026, 1, 5), "data": {"best_share": 900}})
+    store._warm = True
+    monkeypatch.setattr(latest_telemetry, "_latest_telemetry_store", store)
+
+    # Miner 1's share history is older than its current session best; miner 3 has no telemetry
+    db = _FakeDB([(1, 1_000_000.0), (3, 4_000.0)])
+    register = asyncio.run(BestDifficultyRegister().ensure_seeded(db))
+
+    # After a restart, the value already reported is not a new best
+    assert register.observe(1, 2_500_000.0) == (False, 2_500_000.0)
+    assert register.observe(2, 900.0) == (False, 900.0)
+    assert register.observe(3, 4_000.0) == (False, 4_000.0)
+    assert register.observe(1, 3_000_000.0) == (True, 2_500_000.0)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+if "core.config" not in sys.modules:
+    config_mod = types.ModuleType("core.config")
+
+    class _Config:
+        @staticmethod
+        def get(_key, default=None):
+            return default
+
+    config_mod.app_config = _Config()
+    sys.modules["core.config"] = config_mod
+
+
+from core.http_client import HttpClientManager
+
+
+def test_session_is_reused_until_closed() -> None:
+    manager = HttpClientManager(limit=10, limit_per_host=2)
+
+    async def _run():
+        async with manager.session() as first:
+            pass
+        async with manager.session() as second:
+            pass
+
+        assert first is second
+        assert not first.closed
+        assert manager.sessions_created == 1
+
+        stats = manager.get_stats()
+        assert stats["open"] is True
+        assert stats["limit_per_host"] == 2
+
+        await manager.close()
+        assert first.closed
+        assert manager.get_stats()["open"] is False
+
+        reopened = await manager.get_session()
+        assert reopened is not first
+        await manager.close()
+
+    asyncio.run(_run())
+    assert manager.sessions_created == 2
+
+
+def test_new_event_loop_gets_fresh_session() -> None:
+    manager = HttpClientManager()
+
+    async def _get():
+        return await manager.get_session()
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+
+    assert first is not second
+    # The session of the finished loop is closed, not leaked
+    assert first.closed
+    assert not second.closed
+    assert manager.sessions_created == 2
+    asyncio.run(manager.close())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.database import DiscoveredHost, Miner
+from core.discovery import DiscoveryScan, MinerDiscoveryService
+from core.known_hosts import KnownHostCache, host_fingerprint
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+        self.deleted = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+
+def _bitaxe(ip: str, mac: str, hostname: str = "bitaxe") -> dict:
+    return {
+        "ip": ip,
+        "port": 80,
+        "type": "bitaxe",
+        "name": f"{hostname} ({ip})",
+        "details": {"hostname": hostname, "mac": mac},
+    }
+
+
+def test_fingerprint_prefers_mac_then_hostname() -> None:
+    assert host_fingerprint(_bitaxe("10.0.0.2", "AA:BB:CC:00:11:22")) == "mac:aa:bb:cc:00:11:22"
+    assert host_fingerprint({"details": {"hostname": "Nerd-1", "mac": None}}) == "host:nerd-1"
+    assert host_fingerprint({"details": {}}) is None
+
+
+def test_priority_hosts_order_known_recent_then_neighbours() -> None:
+    now = datetime(2026, 1, 10)
+    miners = [Miner(id=1, name="a", miner_type="bitaxe", ip_address="192.168.1.20", port=None)]
+    hosts = [
+        DiscoveredHost(ip_address="192.168.1.50", last_seen=now - timedelta(days=1), miner_id=None),
+        DiscoveredHost(ip_address="192.168.1.60", last_seen=now - timedelta(days=30), miner_id=None),
+    ]
+    cache = KnownHostCache(hosts, miners)
+
+    priority = cache.priority_hosts(["192.168.1.0/24"], now=now)
+
+    assert priority[:2] == ["192.168.1.20", "192.168.1.50"]
+    assert "192.168.1.60" not in priority  # Stale
+    assert set(priority[2:]) == {f"192.168.1.{n}" for n in range(16, 25) if n != 20}
+
+
+def test_miner_followed_to_new_ip_by_fingerprint(monkeypatch) -> None:
+    miner = Miner(id=7, name="Bitaxe 7", miner_type="bitaxe", ip_address="192.168.1.20", port=None)
+    old_host = DiscoveredHost(
+        ip_address="192.168.1.20",
+        port=80,
+        fingerprint="mac:aa:bb",
+        miner_id=7,
+        last_seen=datetime.utcnow() - timedelta(hours=24),
+        missed_scans=0,
+    )
+    cache = KnownHostCache([old_host], [miner])
+    db = FakeSession()
+
+    async def old_ip_silent(ip, port, timeout, session=None):
+        assert ip == "192.168.1.20"
+        return {}
+
+    monkeypatch.setattr(MinerDiscoveryService, "_identify", staticmethod(old_ip_silent))
+
+    moved = asyncio.run(cache.observe(db, _bitaxe("192.168.1.33", "AA:BB")))
+
+    assert moved == (miner, "192.168.1.20")
+    assert miner.ip_address == "192.168.1.33"
+    assert old_host.miner_id is None
+    (new_host,) = db.added
+    assert (new_host.ip_address, new_host.miner_id, new_host.fingerprint) == ("192.168.1.33", 7, "mac:aa:bb")
+
+    # The old address did not answer this scan
+    scan = DiscoveryScan("192.168.1.0/24")
+    asyncio.run(cache.finish(db, scan))
+    assert old_host.missed_scans == 1
+    assert new_host.missed_scans == 0
+
+
+def test_ambiguous_or_still_present_fingerprint_is_not_moved(monkeypatch) -> None:
+    miners = [
+        Miner(id=1, name="a", miner_type="bitaxe", ip_address="10.0.0.2", port=None),
+        Miner(id=2, name="b", miner_type="bitaxe", ip_address="10.0.0.3", port=None),
+    ]
+    hosts = [
+        DiscoveredHost(ip_address="10.0.0.2", port=80, fingerprint="host:bitaxe", miner_id=1),
+        DiscoveredHost(ip_address="10.0.0.3", port=80, fingerprint="host:bitaxe", miner_id=2),
+    ]
+    cache = KnownHostCache(hosts, miners)
+    assert asyncio.run(cache.observe(FakeSession(), _bitaxe("10.0.0.9", None))) is None
+
+    # Same fingerprint still answering at the configured address
+    miner = Miner(id=3, name="c", miner_type="bitaxe", ip_address="10.0.0.4", port=None)
+    host = DiscoveredHost(ip_address="10.0.0.4", port=80, fingerprint="mac:cc", miner_id=3)
+    cache = KnownHostCache([host], [miner])
+
+    async def still_there(ip, port, timeout, session=None):
+        return _bitaxe(ip, "CC")
+
+    monkeypatch.setattr(MinerDiscoveryService, "_identify", staticmethod(still_there))
+    assert asyncio.run(cache.observe(FakeSession(), _bitaxe("10.0.0.10", "cc"))) is None
+    assert miner.ip_address == "10.0.0.4"
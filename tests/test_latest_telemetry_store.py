@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.latest_telemetry import LatestTelemetryStore
+
+
+START = datetime(2026, 1, 5, 0, 0)
+
+
+def _row(miner_id: int, minutes: int, hashrate=500.0, **extra) -> dict:
+    row = {
+        "miner_id": miner_id,
+        "timestamp": START + timedelta(minutes=minutes),
+        "hashrate": hashrate,
+        "power_watts": 15.0,
+        "data": {"best_session_diff": 1000 + minutes, "vendor": {"source": "x", "raw": {"big": "blob"}}},
+    }
+    row.update(extra)
+    return row
+
+
+def test_keeps_newest_reading_per_miner() -> None:
+    store = LatestTelemetryStore()
+    store.update(_row(1, 10))
+    store.update(_row(1, 5))
+    store.update(_row(2, 3))
+
+    assert store.get(1).timestamp == START + timedelta(minutes=10)
+    assert store.get(1).data["best_session_diff"] == 1010
+    # Raw vendor payload is not kept in memory
+    assert store.get(1).data["vendor"] == {"source": "x"}
+    assert store.get(3) is None
+    assert set(store.snapshot()) == {1, 2}
+    assert set(store.snapshot([2, 3])) == {2}
+
+
+def test_recent_history_and_staleness() -> None:
+    store = LatestTelemetryStore(history_size=3)
+    for minute in range(5):
+        store.update(_row(1, minute))
+    store.update(_row(1, 5, hashrate=None))
+
+    assert [r.timestamp.minute for r in store.recent(1)] == [4, 3, 2]
+    assert [r.timestamp.minute for r in store.recent(1, since=START + timedelta(minutes=2))] == [4, 3]
+    assert store.get(1).hashrate is None
+
+    cutoff = START + timedelta(minutes=4)
+    assert store.stale_count([1, 2], cutoff) == 1
+    store.forget(1)
+    assert store.stale_count([1, 2], cutoff) == 2
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import core.liveness as liveness
+from core.liveness import LivenessService, build_echo_request, icmp_checksum, parse_echo_reply, tcp_probe
+
+
+def test_echo_request_checksum_and_reply_parsing() -> None:
+    packet = build_echo_request(0x1234, 7)
+    assert icmp_checksum(packet) == 0
+    assert packet[0] == liveness.ICMP_ECHO_REQUEST
+
+    reply = bytes([liveness.ICMP_ECHO_REPLY]) + packet[1:]
+    ip_header = bytes([0x45]) + bytes(19)
+    assert parse_echo_reply(reply, has_ip_header=False) == (0x1234, 7)
+    assert parse_echo_reply(ip_header + reply, has_ip_header=True) == (0x1234, 7)
+    assert parse_echo_reply(packet, has_ip_header=False) is None
+    assert parse_echo_reply(b"\x00\x00", has_ip_header=False) is None
+
+
+def test_checks_are_cached_and_coalesced(monkeypatch) -> None:
+    service = LivenessService(ttl=60)
+    calls = []
+
+    async def fake_probe(host, timeout, port):
+        calls.append(host)
+        await asyncio.sleep(0.05)
+        return host == "10.0.0.1"
+
+    monkeypatch.setattr(service, "_probe", fake_probe)
+
+    async def run():
+        first = await asyncio.gather(*(service.check("10.0.0.1") for _ in range(5)))
+        many = await service.check_many(["10.0.0.1", "10.0.0.2", "10.0.0.2"])
+        return first, many
+
+    first, many = asyncio.run(run())
+
+    assert first == [True] * 5
+    assert many == {"10.0.0.1": True, "10.0.0.2": False}
+    assert calls == ["10.0.0.1", "10.0.0.2"]
+    assert service.cached("10.0.0.1") is True
+    service.invalidate("10.0.0.1")
+    assert service.cached("10.0.0.1") is None
+
+
+def test_failures_are_not_cached_or_shared_with_longer_probes(monkeypatch) -> None:
+    service = LivenessService(ttl=60)
+    calls = []
+
+    async def fake_probe(host, timeout, port):
+        calls.append(timeout)
+        await asyncio.sleep(0.05)
+        # Host only answers probes that wait long enough
+        return timeout >= 2
+
+    monkeypatch.setattr(service, "_probe", fake_probe)
+
+    async def run():
+        short = asyncio.create_task(service.check("10.0.0.3", timeout=1))
+        await asyncio.sleep(0)
+        longer = await service.check("10.0.0.3", timeout=2)
+        return await short, longer, await service.check("10.0.0.3", timeout=1)
+
+    short, longer, cached = asyncio.run(run())
+
+    assert (short, longer, cached) == (False, True, True)
+    assert calls == [1, 2]
+
+    async def failing_again():
+        return [await service.check("10.0.0.4", timeout=1) for _ in range(2)]
+
+    assert asyncio.run(failing_again()) == [False, False]
+    assert calls == [1, 2, 1, 1]
+    assert service.cached("10.0.0.4") is None
+
+
+def test_tcp_probe_treats_refused_connections_as_alive() -> None:
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        async with server:
+            accepted = await tcp_probe("127.0.0.1", 1.0, (open_port,))
+        # Same port once the server is gone: refused, host still up
+        refused = await tcp_probe("127.0.0.1", 1.0, (open_port,))
+        return accepted, refused
+
+    assert asyncio.run(run()) == (True, True)
+
+
+def test_icmp_probe_of_loopback() -> None:
+    try:
+        loop = asyncio.new_event_loop()
+        prober = liveness.IcmpProber(loop)
+    except OSError:
+        loop.close()
+        pytest.skip("no ICMP socket available")
+    try:
+        assert loop.run_until_complete(prober.probe("127.0.0.1", 1.0)) is True
+    finally:
+        prober.close()
+        loop.close()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from adapters.base import MinerAdapter
+from core.miner_loader import MinerDriverLoader
+
+
+class _FakeAdapter(MinerAdapter):
+    miner_type = "fake"
+
+    async def get_telemetry(self):
+        return None
+
+    async def get_mode(self):
+        return None
+
+    async def set_mode(self, mode: str) -> bool:
+        return True
+
+    async def get_available_modes(self):
+        return []
+
+    async def switch_pool(self, pool_url, pool_port, pool_user, pool_password) -> bool:
+        return True
+
+    async def restart(self) -> bool:
+        return True
+
+    async def is_online(self) -> bool:
+        return True
+
+
+def _loader() -> MinerDriverLoader:
+    loader = MinerDriverLoader("/nonexistent")
+    loader.drivers["fake"] = _FakeAdapter
+    return loader
+
+
+def test_adapter_reused_while_connection_settings_unchanged() -> None:
+    loader = _loader()
+
+    first = loader.create_adapter("fake", 1, "Miner 1", "10.0.0.5", 80, {"a": 1, "b": 2})
+    second = loader.create_adapter("fake", 1, "Renamed", "10.0.0.5", 80, {"b": 2, "a": 1})
+
+    assert first is second
+    assert second.miner_name == "Renamed"
+
+
+def test_adapter_replaced_when_ip_port_or_config_changes() -> None:
+    loader = _loader()
+
+    first = loader.create_adapter("fake", 1, "Miner 1", "10.0.0.5", 80, {})
+    moved = loader.create_adapter("fake", 1, "Miner 1", "10.0.0.6", 80, {})
+    reconfigured = loader.create_adapter("fake", 1, "Miner 1", "10.0.0.6", 80, {"admin_password": "x"})
+
+    assert moved is not first
+    assert reconfigured is not moved
+    assert loader.create_adapter("fake", 1, "Miner 1", "10.0.0.6", 80, {"admin_password": "x"}) is reconfigured
+
+
+def test_invalidate_and_clear() -> None:
+    loader = _loader()
+
+    first = loader.create_adapter("fake", 1, "Miner 1", "10.0.0.5", None, None)
+    loader.create_adapter("fake", 2, "Miner 2", "10.0.0.7", None, None)
+
+    loader.invalidate_adapter(1)
+    assert loader.create_adapter("fake", 1, "Miner 1", "10.0.0.5", None, None) is not first
+    assert 2 in loader.adapters
+
+    loader.clear_adapters()
+    assert loader.adapters == {}
+
+
+def test_unknown_type_and_uncached_adhoc_adapters() -> None:
+    loader = _loader()
+
+    assert loader.create_adapter("missing", 1, "Miner 1", "10.0.0.5") is None
+    adhoc = loader.create_adapter("fake", None, "Probe", "10.0.0.9")
+    assert adhoc is not None
+    assert loader.adapters == {}
+
+
+def test_nmminer_lookups_return_the_listener_instance(monkeypatch) -> None:
+    import adapters
+
+    loader = _loader()
+    loader.drivers["nmminer"] = _FakeAdapter
+    fed = _FakeAdapter(3, "NM", "10.0.0.8", None, {})
+
+    class _Scheduler:
+        nmminer_adapters = {"10.0.0.8": fed}
+
+    monkeypatch.setattr(adapters, "_scheduler_service", _Scheduler())
+
+    # Config edits, renames and loader reloads must not detach from the listener
+    assert loader.create_adapter("nmminer", 3, "NM renamed", "10.0.0.8", None, {"x": 1}) is fed
+    assert fed.miner_name == "NM renamed"
+    loader.clear_adapters()
+    assert loader.create_adapter("nmminer", 3, "NM", "10.0.0.8", None, {}) is fed
+
+    # Not (yet) registered with the listener: a regular cached adapter
+    other = loader.create_adapter("nmminer", 4, "NM 2", "10.0.0.9", None, {})
+    assert other is not fed
+    assert loader.create_adapter("nmminer", 4, "NM 2", "10.0.0.9", None, {}) is other
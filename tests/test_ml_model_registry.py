@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import core.ml_anomaly as ml
+
+pytestmark = pytest.mark.skipif(not ml.SKLEARN_AVAILABLE, reason="scikit-learn not installed")
+
+
+def _model(seed: int = 0):
+    from sklearn.ensemble import IsolationForest
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal([0.5, 15.0, 30.0, 55.0, 0.5], [0.02, 0.5, 1.0, 2.0, 0.1], size=(300, 5))
+    return IsolationForest(n_estimators=20, random_state=seed).fit(X)
+
+
+def _reading(hashrate_ghs: float, temp: float, mode=None):
+    return SimpleNamespace(
+        hashrate=hashrate_ghs,
+        hashrate_unit="GH/s",
+        power_watts=15.0,
+        temperature=temp,
+        shares_accepted=100,
+        shares_rejected=0,
+        mode=mode,
+    )
+
+
+def test_models_are_loaded_once_and_reloaded_when_rewritten(tmp_path) -> None:
+    registry = ml.ModelRegistry(max_size=2)
+    path = tmp_path / "bitaxe.pkl"
+    joblib.dump(_model(0), path)
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+    assert registry.loads == 1
+
+    joblib.dump(_model(1), path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.get(path) is not first
+    assert registry.loads == 2
+    assert len(registry) == 1
+
+    assert registry.get(tmp_path / "missing.pkl") is None
+    registry.invalidate()
+    assert len(registry) == 0
+
+
+def test_batched_scores_match_per_miner_scoring(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(ml, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(ml, "_model_registry", ml.ModelRegistry())
+    type_model = _model(0)
+    miner_model = _model(3)
+    joblib.dump(type_model, tmp_path / "bitaxe.pkl")
+    joblib.dump(miner_model, tmp_path / "miner_2_eco.pkl")
+
+    miners = [SimpleNamespace(id=i, miner_type="bitaxe") for i in (1, 2, 3, 4)]
+    recent = {
+        1: [_reading(500.0, 55.0), _reading(510.0, 56.0)],
+        2: [_reading(480.0, 60.0, mode="eco")],
+        3: [_reading(200.0, 80.0)],
+    }
+
+    scores = asyncio.run(ml.predict_anomaly_scores(miners, recent))
+
+    def expected(model, readings):
+        X = asyncio.run(ml._extract_features(readings)).mean(axis=0).reshape(1, -1)
+        return ml._normalize_score(float(model.decision_function(X)[0]))
+
+    assert scores[1] == pytest.approx(expected(type_model, recent[1]))
+    assert scores[2] == pytest.approx(expected(miner_model, recent[2]))
+    assert scores[3] == pytest.approx(expected(type_model, recent[3]))
+    assert scores[4] is None
+    assert ml.get_model_registry().loads == 2
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pytest
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import core.ml_anomaly as ml
+from core.ml_training import MLTrainingService, TrainingJob
+
+pytestmark = pytest.mark.skipif(not ml.SKLEARN_AVAILABLE, reason="scikit-learn not installed")
+
+
+def test_feature_columns_match_record_features() -> None:
+    records = [
+        SimpleNamespace(hashrate=500.0, hashrate_unit="GH/s", power_watts=15.0, temperature=55.0,
+                        shares_accepted=99, shares_rejected=1),
+        SimpleNamespace(hashrate=1.2, hashrate_unit="TH/s", power_watts=30.0, temperature=60.0,
+                        shares_accepted=None, shares_rejected=None),
+        SimpleNamespace(hashrate=480.0, hashrate_unit="GH/s", power_watts=None, temperature=50.0,
+                        shares_accepted=10, shares_rejected=0),
+        SimpleNamespace(hashrate=750.0, hashrate_unit="MH/s", power_watts=3.0, temperature=0.0,
+                        shares_accepted=10, shares_rejected=0),
+    ]
+    columns = {
+        "group": np.zeros(len(records), dtype=np.int64),
+        "hashrate": np.array([r.hashrate for r in records], dtype=float),
+        "unit": np.array([r.hashrate_unit for r in records], dtype=object),
+        "power": np.array([r.power_watts for r in records], dtype=float),
+        "temp": np.array([r.temperature for r in records], dtype=float),
+        "accepted": np.array([r.shares_accepted for r in records], dtype=float),
+        "rejected": np.array([r.shares_rejected for r in records], dtype=float),
+    }
+
+    mask, X = ml._feature_columns(columns)
+
+    assert list(mask) == [True, True, False, False]
+    assert X.dtype == np.float32
+    assert X == pytest.approx(asyncio.run(ml._extract_features(records)).astype(np.float32))
+
+
+def test_jobs_are_fitted_in_worker_processes(tmp_path) -> None:
+    from sklearn.ensemble import IsolationForest
+
+    rng = np.random.default_rng(1)
+    params = {"n_estimators": 10, "random_state": 0}
+    jobs = [
+        TrainingJob(
+            key=f"type:{name}",
+            model_path=tmp_path / f"{name}.pkl",
+            X=rng.normal(size=(200, 5)).astype(np.float32),
+            metadata={"miner_type": name},
+            params=params,
+        )
+        for name in ("bitaxe", "avalon_nano")
+    ]
+    service = MLTrainingService()
+
+    results = asyncio.run(service.run(jobs, workers=2))
+
+    assert results == {"type:bitaxe": 200, "type:avalon_nano": 200}
+    status = service.status()
+    assert status["state"] == "completed"
+    assert status["completed_jobs"] == 2 and status["failed_jobs"] == 0
+    assert not service.cancel()
+
+    for job in jobs:
+        model = joblib.load(job.model_path)
+        expected = IsolationForest(n_jobs=1, **params).fit(job.X)
+        assert model.decision_function(job.X) == pytest.approx(expected.decision_function(job.X))
+        with open(job.model_path.with_suffix(".meta"), "rb") as f:
+            assert pickle.load(f)["sample_count"] == 200
+
+
+def test_miner_jobs_follow_mode_thresholds(monkeypatch) -> None:
+    from datetime import datetime, timedelta
+
+    monkeypatch.setattr(ml, "MIN_SAMPLES_PER_MINER", 10)
+    miner = SimpleNamespace(id=7, miner_type="bitaxe", created_at=datetime.utcnow() - timedelta(days=30))
+    rows = lambda n: np.ones((n, 5), dtype=np.float32)
+    features = {
+        (7, "eco"): (12, rows(11)),
+        (7, "turbo"): (12, rows(4)),  # too few complete rows
+        (7, None): (40, rows(40)),  # ignored once modes exist
+        (8, "eco"): (50, rows(50)),
+    }
+
+    jobs = ml._miner_training_jobs(miner, features, 30)
+    assert [job.key for job in jobs] == ["miner:7:eco"]
+    assert jobs[0].model_path.name == "miner_7_eco.pkl"
+
+    no_modes = {(7, None): (12, rows(12))}
+    assert [job.key for job in ml._miner_training_jobs(miner, no_modes, 30)] == ["miner:7"]
+
+    miner.created_at = datetime.utcnow()
+    assert ml._miner_training_jobs(miner, features, 30) == []
+
+
+class _MinersResult:
+    def __init__(self, miners):
+        self.miners = miners
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.miners
+
+
+class _MinersDB:
+    async def execute(self, _statement):
+        return _MinersResult([SimpleNamespace(id=1, miner_type="bitaxe")])
+
+
+def test_training_is_running_and_cancellable_while_features_load(monkeypatch) -> None:
+    service = MLTrainingService()
+    monkeypatch.setattr(ml, "get_ml_training_service", lambda: service)
+    loading = asyncio.Event()
+
+    async def slow_features(db, miner_ids, window_days):
+        loading.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(ml, "_load_training_features", slow_features)
+
+    async def run():
+        training = asyncio.create_task(ml.train_all_models(_MinersDB()))
+        await loading.wait()
+        assert service.running
+        assert service.status()["state"] == "preparing"
+        # A second trigger neither starts another load nor fails
+        assert await ml.train_all_models(_MinersDB()) is None
+        with pytest.raises(RuntimeError):
+            await service.run([])
+
+        assert service.cancel()
+        await asyncio.wait_for(training, timeout=1)
+
+    asyncio.run(run())
+    assert not service.running
+    assert service.status()["state"] == "cancelled"
+    assert not service.cancel()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import sqlite
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.anomaly_detection import MIN_SAMPLES_FOR_BASELINE, calculate_median_mad
+import core.online_health as online_health
+from core.online_health import OnlineHealthScorer, RobustStat
+
+
+def _reading(hashrate_ghs: float, temp: float = 55.0, mode=None) -> dict:
+    return {
+        "miner_id": 1,
+        "hashrate": hashrate_ghs,
+        "hashrate_unit": "GH/s",
+        "power_watts": 15.0,
+        "temperature": temp,
+        "shares_accepted": 100,
+        "shares_rejected": 0,
+        "mode": mode,
+    }
+
+
+def test_robust_stat_summarises_warmup_exactly_and_tracks_drift() -> None:
+    rng = random.Random(3)
+    values = [rng.gauss(500.0, 5.0) for _ in range(MIN_SAMPLES_FOR_BASELINE)]
+    stat = RobustStat()
+    for value in values[:-1]:
+        stat.update(value)
+    assert not stat.ready
+
+    stat.update(values[-1])
+    assert stat.ready
+    assert (stat.median, stat.mad) == pytest.approx(calculate_median_mad(values))
+
+    # A single outlier barely moves the estimate; a sustained shift does
+    before = stat.median
+    stat.update(5_000.0)
+    assert stat.median - before < stat.mad
+    for _ in range(2_000):
+        stat.update(rng.gauss(520.0, 5.0))
+    assert stat.median == pytest.approx(520.0, abs=3.0)
+
+
+def test_scorer_reports_insufficient_data_until_baselines_exist() -> None:
+    scorer = OnlineHealthScorer()
+    health = scorer.score(_reading(500.0))
+    assert health["status"] == "warning"
+    assert health["reasons"][0]["actual"] == 1
+    assert health["reasons"][0]["code"] == "INSUFFICIENT_DATA"
+    assert scorer.latest(2) is None
+
+
+def test_scorer_flags_hashrate_drop_against_seeded_baselines() -> None:
+    scorer = OnlineHealthScorer()
+    scorer.load_baselines(
+        {
+            1: {
+                (None, "hashrate_mean"): {"median": 0.5, "mad": 0.005, "samples": 200},
+                (None, "power_mean"): {"median": 15.0, "mad": 0.2, "samples": 200},
+                (None, "w_per_th"): {"median": 30.0, "mad": 0.5, "samples": 200},
+                (None, "temp_mean"): {"median": 55.0, "mad": 1.0, "samples": 200},
+            }
+        }
+    )
+    assert scorer.score(_reading(500.0))["status"] == "healthy"
+
+    for _ in range(5):
+        health = scorer.score(_reading(300.0))
+    assert "HASHRATE_DROP" in {reason["code"] for reason in health["reasons"]}
+    assert health["health_score"] < 100
+    assert scorer.latest(1) == health
+
+
+@pytest.mark.parametrize("drop", [0.1, 0.3, 0.5])
+def test_sustained_hashrate_drop_stays_flagged(drop) -> None:
+    scorer = OnlineHealthScorer()
+    scorer.load_baselines({1: {(None, "hashrate_mean"): {"median": 1.0, "mad": 0.02, "samples": 200}}})
+
+    # Two hours of readings at the 30 s collection interval
+    for _ in range(240):
+        health = scorer.score(_reading(1_000.0 * (1 - drop)))
+        assert "HASHRATE_DROP" in {reason["code"] for reason in health["reasons"]}
+
+    stat = scorer._miners[1].baselines[(None, "hashrate_mean")]
+    assert (stat.median, stat.mad) == (1.0, 0.02)
+
+
+def test_robust_stat_mad_growth_is_capped() -> None:
+    stat = RobustStat(1.0, 0.02, 200)
+    for i in range(5_000):
+        stat.update(1.0 + (0.1 if i % 2 else -0.1))
+    assert stat.mad <= 0.04 + 1e-9
+
+
+class _FakeSession:
+    """Stands in for AsyncSessionLocal(): records upserts, commits them unless told to fail"""
+
+    committed: list = []
+    fail_commits = 0
+
+    def __init__(self):
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    async def execute(self, statement):
+        self.pending.append(statement)
+
+    def add(self, row):
+        self.pending.append(row)
+
+    async def commit(self):
+        if _FakeSession.fail_commits:
+            _FakeSession.fail_commits -= 1
+            raise RuntimeError("commit failed")
+        _FakeSession.committed.extend(self.pending)
+
+
+def _upserted(statement) -> dict:
+    compiled = statement.compile(dialect=sqlite.dialect())
+    assert "ON CONFLICT (miner_id) DO UPDATE" in str(compiled)
+    return compiled.params
+
+
+def test_observe_persists_only_status_and_reason_changes_without_history(monkeypatch) -> None:
+    monkeypatch.setattr(online_health, "AsyncSessionLocal", _FakeSession)
+    _FakeSession.committed = []
+    _FakeSession.fail_commits = 0
+    scorer = OnlineHealthScorer()
+    scorer._loaded = True
+    scorer.load_baselines({1: {(None, "hashrate_mean"): {"median": 1.0, "mad": 0.02, "samples": 200}}})
+
+    async def run():
+        await scorer.observe(None, _reading(1_000.0))
+        # The EWMA moves the score on every degraded reading; only the first one is a change
+        return [(await scorer.observe(None, _reading(700.0)))["health_score"] for _ in range(10)]
+
+    scores = asyncio.run(run())
+    assert len(set(scores)) > 1
+    # Two upserts (healthy, then degraded) and no HealthEvent; the ML score is left alone
+    rows = [_upserted(statement) for statement in _FakeSession.committed]
+    assert [row["status"] for row in rows] == ["healthy", "healthy"]
+    assert [reason["code"] for reason in rows[1]["reasons"]] == ["HASHRATE_DROP"]
+    assert rows[1]["health_score"] == scores[0]
+    assert "anomaly_score" not in rows[1]
+
+
+def test_failed_health_write_is_retried_on_the_next_reading(monkeypatch) -> None:
+    monkeypatch.setattr(online_health, "AsyncSessionLocal", _FakeSession)
+    _FakeSession.committed = []
+    _FakeSession.fail_commits = 1
+    scorer = OnlineHealthScorer()
+    scorer._loaded = True
+    scorer.load_baselines({1: {(None, "hashrate_mean"): {"median": 1.0, "mad": 0.02, "samples": 200}}})
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await scorer.observe(None, _reading(1_000.0))
+        await scorer.observe(None, _reading(1_000.0))
+        await scorer.observe(None, _reading(1_000.0))
+
+    asyncio.run(run())
+    assert [_upserted(statement)["status"] for statement in _FakeSession.committed] == ["healthy"]
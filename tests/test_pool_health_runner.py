@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import core.pool_health as pool_health
+from core.pool_health import PoolHealthService, _HostRateLimiter
+
+
+def test_host_limiter_serializes_same_host_only() -> None:
+    async def run():
+        limiter = _HostRateLimiter(0.05)
+        active = {"a": 0, "b": 0}
+        peak = {"a": 0, "b": 0}
+
+        async def call(host):
+            async with limiter.slot(host):
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+                await asyncio.sleep(0.01)
+                active[host] -= 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(call(h) for h in ("a", "a", "a", "b")))
+        return peak, time.monotonic() - started
+
+    peak, elapsed = asyncio.run(run())
+    assert peak == {"a": 1, "b": 1}
+    # Three calls to host "a" need two spacing intervals
+    assert elapsed >= 0.1
+
+
+class _FakeDB:
+    def add_all(self, records):
+        self.records = records
+
+    async def commit(self):
+        pass
+
+
+def test_shared_host_does_not_block_other_hosts_and_cache_hits_skip_limiter(monkeypatch) -> None:
+    order = []
+
+    async def connectivity(pool, timeout=5.0):
+        order.append(pool.name)
+        return {"is_reachable": True, "response_time_ms": 10.0, "error_message": None}
+
+    async def no_fetch(pool_id, max_age):
+        raise AssertionError("tile cache hit must not fetch")
+
+    async def no_rows(db, pool_ids, *args):
+        return {}
+
+    monkeypatch.setattr(pool_health, "get_pool_share_totals", no_rows)
+    monkeypatch.setattr(PoolHealthService, "_recent_failure_counts", staticmethod(no_rows))
+    monkeypatch.setattr(PoolHealthService, "check_pool_connectivity", staticmethod(connectivity))
+    monkeypatch.setattr(PoolHealthService, "_cached_pool_hashrate", staticmethod(lambda pool_id, max_age: 500.0))
+    monkeypatch.setattr(PoolHealthService, "_get_pool_hashrate", staticmethod(no_fetch))
+
+    pools = [
+        SimpleNamespace(id=1, name="a1", url="a.example", pool_type="solopool", pool_config=None),
+        SimpleNamespace(id=2, name="a2", url="a.example", pool_type="solopool", pool_config=None),
+        SimpleNamespace(id=3, name="b", url="b.example", pool_type="solopool", pool_config=None),
+    ]
+
+    started = time.monotonic()
+    results = asyncio.run(PoolHealthService.monitor_pools(_FakeDB(), pools, concurrency=1, per_host_interval=0.2))
+    elapsed = time.monotonic() - started
+
+    # a2 waits out the host interval without holding up b
+    assert order == ["a1", "b", "a2"]
+    # Only the second call to a.example is spaced; cached hashrate adds no waits
+    assert elapsed < 0.4
+    assert [r["pool_id"] for r in results] == [1, 2, 3]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.pool_resolver import PoolResolver, coin_from_pool_url, normalize_pool_endpoint
+from core.pool_shares import collect_share_counters, reject_stats
+
+
+NOW = datetime(2026, 1, 5, 12, 0)
+
+
+def _resolver() -> PoolResolver:
+    resolver = PoolResolver()
+    resolver.load([
+        (1, "solo.ckpool.org", 3333),
+        (2, "eu.solopool.org", 8004),
+        (3, "eu.solopool.org", 8005),
+        (4, "Pool.Braiins.com", 3333),
+    ])
+    return resolver
+
+
+def test_normalize_pool_endpoint() -> None:
+    assert normalize_pool_endpoint("stratum+tcp://Solo.CKPool.org:3333/") == "solo.ckpool.org:3333"
+    assert normalize_pool_endpoint("solo.ckpool.org", 3333) == "solo.ckpool.org:3333"
+    assert normalize_pool_endpoint(None) == ""
+
+
+def test_resolver_matches_endpoint_then_unique_host() -> None:
+    resolver = _resolver()
+
+    assert resolver.match("stratum+tcp://solo.ckpool.org:3333") == 1
+    assert resolver.match("stratum+ssl://eu.solopool.org:8005") == 3
+    assert resolver.match("pool.braiins.com:3333") == 4
+    # Host only: unique host resolves, shared host is ambiguous
+    assert resolver.match("solo.ckpool.org") == 1
+    assert resolver.match("eu.solopool.org") is None
+    assert resolver.match("stratum+tcp://unknown.pool:3333") is None
+    assert resolver.match(None) is None
+
+
+def test_coin_resolution() -> None:
+    resolver = PoolResolver()
+    resolver.load([
+        (1, "eu1.solopool.org", 8004, "Solopool DGB", {"coin": "dgb"}),
+        (2, "pool.example", 3333, "Solopool BCH", None),
+    ])
+
+    assert resolver.match_with_coin("stratum+tcp://eu1.solopool.org:8004") == (1, "DGB")
+    # Pool name decides when neither config nor URL does
+    assert resolver.match_with_coin("pool.example:3333") == (2, "BCH")
+    # Unknown pools still get a coin from the URL
+    assert resolver.match_with_coin("stratum+tcp://bch.solopool.org:3333") == (None, "BCH")
+    assert coin_from_pool_url("stratum+tcp://unknown:1") is None
+
+
+def test_counters_keep_newest_reading_per_pool_and_miner() -> None:
+    rows = [
+        {"miner_id": 1, "timestamp": NOW, "pool_in_use": "stratum+tcp://solo.ckpool.org:3333",
+         "shares_accepted": 200, "shares_rejected": 5},
+        {"miner_id": 1, "timestamp": NOW - timedelta(minutes=1), "pool_in_use": "solo.ckpool.org:3333",
+         "shares_accepted": 190, "shares_rejected": 5},
+        {"miner_id": 2, "timestamp": NOW, "pool_in_use": "eu.solopool.org:8004",
+         "shares_accepted": None, "shares_rejected": None},
+        {"miner_id": 3, "timestamp": NOW, "pool_in_use": "unknown.pool:1", "shares_accepted": 1},
+        # Already resolved at ingest
+        {"miner_id": 4, "timestamp": NOW, "pool_in_use": "renamed.host:1", "pool_id": 4,
+         "shares_accepted": 7, "shares_rejected": 1},
+    ]
+
+    counters = collect_share_counters(rows, _resolver())
+
+    assert sorted((c["pool_id"], c["miner_id"], c["shares_accepted"], c["shares_rejected"]) for c in counters) == [
+        (1, 1, 200, 5),
+        (2, 2, 0, 0),
+        (4, 4, 7, 1),
+    ]
+
+
+def test_reject_stats() -> None:
+    assert reject_stats({"shares_accepted": 280, "shares_rejected": 20, "miners": 2}) == {
+        "reject_rate": 6.67,
+        "shares_accepted": 280,
+        "shares_rejected": 20,
+    }
+    assert reject_stats(None)["reject_rate"] is None
+    assert reject_stats({"shares_accepted": 0, "shares_rejected": 0, "miners": 1})["reject_rate"] == 0
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import adapters
+import core.price_band_executor as executor_module
+from core.latest_telemetry import LatestReading
+from core.price_band_executor import FleetState, MinerAction, PriceBandExecutor
+
+
+class _FakeDB:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _FakeAdapter:
+    def __init__(self, pool="stratum+tcp://pool.example.com:3333", mode="eco", delay=0.2):
+        self.pool = pool
+        self.mode = mode
+        self.delay = delay
+        self.polls = 0
+        self.modes_set = []
+
+    async def get_telemetry(self):
+        self.polls += 1
+        return SimpleNamespace(pool_in_use=self.pool, extra_data={"current_mode": self.mode})
+
+    async def set_mode(self, mode):
+        await asyncio.sleep(self.delay)
+        self.modes_set.append(mode)
+        return True
+
+    async def switch_pool(self, **_kwargs):
+        return True
+
+
+class _FakeHA:
+    instances = []
+    states = {}
+
+    def __init__(self, *_args, **_kwargs):
+        self.commands = []
+        _FakeHA.instances.append(self)
+
+    async def get_cached_device_state(self, entity_id):
+        return SimpleNamespace(state=self.states[entity_id], last_updated=None)
+
+    async def turn_on(self, entity_id):
+        self.commands.append(("on", entity_id))
+        return True
+
+    async def turn_off(self, entity_id):
+        self.commands.append(("off", entity_id))
+        return True
+
+
+def _miner(miner_id: int, miner_type="bitaxe"):
+    return SimpleNamespace(
+        id=miner_id,
+        name=f"miner-{miner_id}",
+        miner_type=miner_type,
+        current_mode="eco",
+        last_mode_change=None,
+        last_pool_switch=None,
+    )
+
+
+def _reading(miner_id: int, mode="eco", age_seconds=10):
+    return LatestReading(
+        miner_id=miner_id,
+        timestamp=datetime.utcnow() - timedelta(seconds=age_seconds),
+        pool_in_use="stratum+tcp://pool.example.com:3333",
+        data={"current_mode": mode},
+    )
+
+
+def _executor(miners, readings=None, ha_devices=None, ha_config=None):
+    fleet = FleetState(
+        miners={miner.id: miner for miner in miners},
+        ha_devices=ha_devices or {},
+        ha_config=ha_config,
+        telemetry=readings or {},
+    )
+    strategy = SimpleNamespace(current_champion_miner_id=None)
+    target_pool = SimpleNamespace(name="Pool", url="stratum+tcp://pool.example.com", port=3333, user="u", password="x")
+    return PriceBandExecutor(_FakeDB(), fleet, strategy, target_pool=target_pool, target_pool_name="Pool")
+
+
+def test_actions_run_concurrently_from_cached_telemetry(monkeypatch) -> None:
+    miners = [_miner(i) for i in range(1, 21)]
+    fleet_adapters = {miner.id: _FakeAdapter() for miner in miners}
+    monkeypatch.setattr(adapters, "get_adapter", lambda miner: fleet_adapters[miner.id])
+    readings = {miner.id: _reading(miner.id) for miner in miners}
+    readings[1] = _reading(1, age_seconds=3600)  # stale: polled live
+
+    executor = _executor(miners, readings)
+    plan = [MinerAction(miner, target_mode="turbo", configure=True) for miner in miners]
+
+    started = time.monotonic()
+    results = asyncio.run(executor.apply(plan))
+    elapsed = time.monotonic() - started
+
+    # 20 mode changes of 0.2s each, applied in parallel
+    assert elapsed < 1.5
+    assert [result.outcome for result in results] == ["changed"] * 20
+    assert results[0].messages == ["miner-1: mode=turbo"]
+    assert fleet_adapters[1].polls == 1
+    assert sum(adapter.polls for adapter in fleet_adapters.values()) == 1
+    assert all(miner.current_mode == "turbo" for miner in miners)
+    summary = PriceBandExecutor.summary(results, elapsed)
+    assert summary["outcomes"] == {"changed": 20}
+
+
+def test_cached_reading_is_ignored_after_a_mode_change(monkeypatch) -> None:
+    miner = _miner(1)
+    adapter = _FakeAdapter(mode="turbo")
+    monkeypatch.setattr(adapters, "get_adapter", lambda _miner: adapter)
+    miner.last_mode_change = datetime.utcnow() - timedelta(seconds=5)
+
+    executor = _executor([miner], {1: _reading(1, mode="eco", age_seconds=30)})
+    (result,) = asyncio.run(executor.apply([MinerAction(miner, target_mode="turbo", configure=True)]))
+
+    assert adapter.polls == 1
+    assert result.messages == ["miner-1: Already correct (no change)"]
+
+
+def test_shared_ha_switch_is_toggled_once_and_kept_on(monkeypatch) -> None:
+    # The executor imports at call time; other tests may leave their own stub module behind
+    ha_module = ModuleType("integrations.homeassistant")
+    ha_module.HomeAssistantIntegration = _FakeHA
+    monkeypatch.setitem(sys.modules, "integrations.homeassistant", ha_module)
+    monkeypatch.setattr(executor_module, "HA_BOOT_WAIT_SECONDS", 0)
+    monkeypatch.setattr(adapters, "get_adapter", lambda _miner: _FakeAdapter(delay=0))
+    _FakeHA.instances.clear()
+    _FakeHA.states = {"switch.plug": "off", "switch.plug_3": "on"}
+
+    miners = [_miner(1), _miner(2), _miner(3)]
+    shared = SimpleNamespace(id=10, name="Plug", entity_id="switch.plug", current_state="off",
+                             last_state_change=None, last_off_command_timestamp=None)
+    own = SimpleNamespace(id=11, name="Plug 3", entity_id="switch.plug_3", current_state="on",
+                          last_state_change=None, last_off_command_timestamp=None)
+    executor = _executor(
+        miners,
+        ha_devices={1: shared, 2: shared, 3: own},
+        ha_config=SimpleNamespace(enabled=True, base_url="http://ha", access_token="t"),
+    )
+    plan = [
+        MinerAction(miners[0], target_mode="eco", configure=True, ha_turn_on=True),
+        MinerAction(miners[1], ha_turn_on=False, ha_messages=("HA device OFF", "No HA link")),
+        MinerAction(miners[2], ha_turn_on=False, ha_messages=("HA device OFF", "No HA link")),
+    ]
+
+    results = asyncio.run(executor.apply(plan))
+
+    assert sorted(_FakeHA.instances[0].commands) == [("off", "switch.plug_3"), ("on", "switch.plug")]
+    assert shared.current_state == "on" and own.current_state == "off"
+    assert results[1].messages == ["miner-2: HA device kept ON (shared switch)"]
+    assert results[2].messages == ["miner-3: HA device OFF"]
+    assert executor.db.commits == 1
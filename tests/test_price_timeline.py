@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+if "core.config" not in sys.modules:
+    config_mod = types.ModuleType("core.config")
+
+    class _Config:
+        @staticmethod
+        def get(_key, default=None):
+            return default
+
+    config_mod.app_config = _Config()
+    sys.modules["core.config"] = config_mod
+
+
+from core.price_timeline import PriceTimeline
+
+
+START = datetime(2026, 1, 5, 0, 0)
+SLOT = timedelta(minutes=30)
+
+
+def _timeline() -> PriceTimeline:
+    # Four half-hour slots, with a gap where the 01:00 slot is missing; given out of order
+    slots = [
+        (START + SLOT * 3, START + SLOT * 4, 30.0),
+        (START, START + SLOT, 10.0),
+        (START + SLOT, START + SLOT * 2, 20.0),
+        (START + SLOT * 4, START + SLOT * 5, -2.5),
+    ]
+    return PriceTimeline(slots)
+
+
+def test_price_at_uses_half_open_slots() -> None:
+    timeline = _timeline()
+
+    assert len(timeline) == 4
+    assert timeline.price_at(START) == 10.0
+    assert timeline.price_at(START + SLOT - timedelta(microseconds=1)) == 10.0
+    # valid_to is exclusive, so the boundary belongs to the next slot
+    assert timeline.price_at(START + SLOT) == 20.0
+    # Negative Agile prices are real prices, not "missing"
+    assert timeline.price_at(START + SLOT * 4 + timedelta(minutes=5)) == -2.5
+
+
+def test_price_at_returns_none_outside_known_slots() -> None:
+    timeline = _timeline()
+
+    assert timeline.price_at(START - timedelta(seconds=1)) is None
+    assert timeline.price_at(START + SLOT * 2 + timedelta(minutes=10)) is None
+    assert timeline.price_at(START + SLOT * 5) is None
+    assert PriceTimeline(()).price_at(START) is None
+    assert timeline.prices_at([START, START + SLOT * 2, START + SLOT * 3]) == [10.0, None, 30.0]
+
+
+def test_slots_between_includes_both_bounds() -> None:
+    timeline = _timeline()
+
+    prices = [price for _, _, price in timeline.slots_between(START + SLOT, START + SLOT * 4)]
+    assert prices == [20.0, 30.0, -2.5]
+    assert list(timeline.slots_between(START + SLOT * 5, START + SLOT * 6)) == []
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+if "core.config" not in sys.modules:
+    config_mod = types.ModuleType("core.config")
+
+    class _Config:
+        @staticmethod
+        def get(_key, default=None):
+            return default
+
+    config_mod.app_config = _Config()
+    sys.modules["core.config"] = config_mod
+
+
+from core.raw_payloads import RAW_REF_KEY, _decode, extract_raw_payloads, split_raw_payload
+
+
+START = datetime(2026, 1, 5, 0, 0)
+
+
+def _data(uptime: int) -> dict:
+    return {
+        "hashrate_unit": "GH/s",
+        "best_session_diff": 1234,
+        "vendor": {
+            "source": "bitaxe_rest",
+            "raw": {"system_info": {"hashRate": 512.5, "uptimeSeconds": uptime, "ASICModel": "BM1370"}},
+        },
+    }
+
+
+def test_split_keeps_normalized_fields_inline() -> None:
+    data = _data(60)
+    inline, raw = split_raw_payload(data)
+
+    digest, blob = raw
+    assert inline["best_session_diff"] == 1234
+    assert inline["vendor"] == {"source": "bitaxe_rest", RAW_REF_KEY: digest}
+    assert _decode(blob) == data["vendor"]["raw"]
+    # Caller's dict is left alone
+    assert "raw" in data["vendor"]
+
+
+def test_rows_without_raw_payload_pass_through() -> None:
+    assert split_raw_payload(None) == (None, None)
+    plain = {"current_mode": "eco"}
+    assert split_raw_payload(plain) == (plain, None)
+
+
+def test_identical_payloads_are_stored_once() -> None:
+    rows = [
+        {"miner_id": 1, "timestamp": START + timedelta(seconds=30 * i), "data": _data(60)}
+        for i in range(3)
+    ]
+    rows.append({"miner_id": 2, "timestamp": START, "data": _data(90)})
+    rows.append({"miner_id": 3, "timestamp": START, "data": None})
+
+    out_rows, payloads = extract_raw_payloads(rows)
+
+    assert len(out_rows) == 5
+    assert all("raw" not in (row["data"] or {}).get("vendor", {}) for row in out_rows)
+    assert len(payloads) == 2
+    first = next(p for p in payloads if p["miner_id"] == 1)
+    assert first["digest"] == out_rows[0]["data"]["vendor"][RAW_REF_KEY]
+    assert (first["first_seen"], first["last_seen"]) == (START, START + timedelta(seconds=60))
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from sqlalchemy.dialects import sqlite
+
+from core.utils import TELEMETRY_STAT_COLUMNS, _telemetry_columns_query
+
+
+START = datetime(2026, 1, 5, 0, 0)
+
+
+def _run(query):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE telemetry (id INTEGER PRIMARY KEY, miner_id INTEGER, timestamp DATETIME, "
+        "hashrate FLOAT, hashrate_unit VARCHAR(10), temperature FLOAT, power_watts FLOAT, "
+        "shares_accepted INTEGER, shares_rejected INTEGER, pool_in_use VARCHAR(255), data JSON)"
+    )
+    rows = []
+    for miner_id in (1, 2, 3):
+        for minute in (30, 0, 10, 20):
+            ts = (START + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S.%f")
+            rows.append((miner_id, ts, 100.0 + minute, "GH/s", 50.0, 15.0, 1, 0, "pool", '{"raw": "x" }'))
+    conn.executemany(
+        "INSERT INTO telemetry (miner_id, timestamp, hashrate, hashrate_unit, temperature, power_watts, "
+        "shares_accepted, shares_rejected, pool_in_use, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    compiled = query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    cursor = conn.execute(str(compiled))
+    return [col[0] for col in cursor.description], cursor.fetchall()
+
+
+def test_stat_columns_never_select_raw_payload() -> None:
+    columns, rows = _run(_telemetry_columns_query([1, 2], TELEMETRY_STAT_COLUMNS))
+
+    assert "data" not in columns
+    assert columns == list(TELEMETRY_STAT_COLUMNS)
+    assert len(rows) == 8
+
+
+def test_window_filters_and_ordering() -> None:
+    columns, rows = _run(
+        _telemetry_columns_query(
+            2,
+            ("miner_id", "timestamp", "hashrate"),
+            start=START + timedelta(minutes=10),
+            end=START + timedelta(minutes=30),
+        )
+    )
+
+    assert columns == ["miner_id", "timestamp", "hashrate"]
+    # start is inclusive, end exclusive, oldest first
+    assert [(miner_id, hashrate) for miner_id, _, hashrate in rows] == [(2, 110.0), (2, 120.0)]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+import types
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+if "core.config" not in sys.modules:
+    config_mod = types.ModuleType("core.config")
+
+    class _Config:
+        @staticmethod
+        def get(_key, default=None):
+            return default
+
+    config_mod.app_config = _Config()
+    sys.modules["core.config"] = config_mod
+
+
+from sqlalchemy import text
+
+from core.telemetry_rollups import build_partials_sql, merge_partials
+
+
+_SCHEMA = """
+CREATE TABLE telemetry (
+    id INTEGER PRIMARY KEY, miner_id INTEGER, timestamp DATETIME,
+    hashrate FLOAT, hashrate_unit VARCHAR(10), temperature FLOAT, power_watts FLOAT,
+    energy_cost FLOAT, shares_accepted INTEGER, shares_rejected INTEGER,
+    pool_in_use VARCHAR(255), mode VARCHAR(20), pool_id INTEGER, coin VARCHAR(10)
+);
+"""
+
+HOUR = datetime(2026, 1, 5, 1)
+
+
+def _ts(value: datetime) -> str:
+    # Same text format SQLAlchemy uses for DateTime on SQLite
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _partials(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(_SCHEMA)
+    conn.executemany(
+        "INSERT INTO telemetry (miner_id, timestamp, hashrate, hashrate_unit, temperature, power_watts, "
+        "energy_cost, shares_accepted, shares_rejected, pool_in_use, mode) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    cursor = conn.execute(
+        build_partials_sql("sqlite"),
+        {"start": _ts(HOUR), "end": _ts(HOUR + timedelta(hours=2))},
+    )
+    Row = namedtuple("Row", [col[0] for col in cursor.description])
+    return [Row(*row) for row in cursor.fetchall()]
+
+
+def test_single_scan_merges_into_per_hour_stats() -> None:
+    rows = []
+    for minute in range(60):
+        mode = "eco" if minute < 20 or minute >= 40 else "high"
+        rows.append((
+            1, _ts(HOUR + timedelta(minutes=minute)), 100.0 + minute, "GH/s", 50.0 + minute % 3, 600.0, 0.5,
+            minute if minute < 59 else None, 1, "stratum+tcp://pool.example:3333" if minute >= 10 else None, mode,
+        ))
+    # Next hour for the same miner, and a miner with nothing but a heartbeat row
+    rows.append((1, _ts(HOUR + timedelta(hours=1, minutes=5)), 200.0, "TH/s", 70.0, None, None, 5, 0, None, "eco"))
+    rows.append((2, _ts(HOUR + timedelta(minutes=5)), None, None, None, None, None, None, None, None, None))
+
+    partials = _partials(rows)
+    # Grouped per miner, half-hour slot and mode - far fewer rows than raw telemetry
+    assert len(partials) < len(rows) / 5
+
+    hours = merge_partials(partials)
+    assert set(hours) == {(1, HOUR), (1, HOUR + timedelta(hours=1)), (2, HOUR)}
+
+    stats = hours[(1, HOUR)]
+    assert stats.rows == 60
+    assert stats.hashrate.n == 60
+    assert stats.hashrate.avg == sum(100.0 + m for m in range(60)) / 60
+    assert (stats.hashrate.low, stats.hashrate.high) == (100.0, 159.0)
+    assert (stats.temperature.low, stats.temperature.high) == (50.0, 52.0)
+    assert stats.power.total == 600.0 * 60
+    assert stats.energy_cost_sum == 30.0
+    # Last non-null cumulative share counter, and the summed counters
+    assert stats.shares_accepted_last == 58
+    assert stats.shares_rejected_last == 1
+    assert stats.accepted_sum == sum(range(59))
+    assert stats.rejected_sum == 60
+    assert stats.hashrate_unit == "GH/s"
+    assert stats.pool_in_use == "stratum+tcp://pool.example:3333"
+    # Rows written before pool_id/coin were resolved at ingest
+    assert (stats.pool_id, stats.coin) == (None, None)
+    # eco -> high -> eco within the hour
+    assert stats.mode_rows == {"eco": 40, "high": 20}
+    assert stats.dominant_mode == "eco"
+    assert stats.mode_changes == 2
+    # Power is kept per half-hour price slot for energy costing
+    assert {slot: n for slot, (_, n) in stats.slot_power.items()} == {
+        HOUR: 30,
+        HOUR + timedelta(minutes=30): 30,
+    }
+
+    empty = hours[(2, HOUR)]
+    assert empty.rows == 1
+    assert empty.hashrate.avg is None
+    assert empty.dominant_mode is None
+
+
+def test_partials_sql_only_binds_window_parameters() -> None:
+    for dialect in ("postgresql", "sqlite"):
+        statement = text(build_partials_sql(dialect))
+        assert set(statement._bindparams) == {"start", "end"}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+from core.telemetry_writer import TelemetryWriter, copy_unsupported
+
+
+def _writer_with_fake_sink(**kwargs):
+    writer = TelemetryWriter(**kwargs)
+    batches: list = []
+
+    async def _write_batch(rows):
+        batches.append([row["miner_id"] for row in rows])
+
+    writer._write_batch = _write_batch
+    return writer, batches
+
+
+def test_rows_are_flushed_in_bounded_batches() -> None:
+    writer, batches = _writer_with_fake_sink(batch_size=4, flush_interval=0.05)
+
+    async def _run():
+        for miner_id in range(10):
+            await writer.submit({"miner_id": miner_id})
+        await writer.drain()
+        stats = writer.get_stats()
+        await writer.stop()
+        return stats
+
+    stats = asyncio.run(_run())
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [miner_id for batch in batches for miner_id in batch] == list(range(10))
+    assert stats["rows_written"] == 10
+    assert stats["batches_written"] == 3
+    assert stats["queue_depth"] == 0
+
+
+def test_failed_batch_is_counted_and_writer_keeps_running() -> None:
+    writer = TelemetryWriter(batch_size=2, flush_interval=0.01, retry_attempts=3, retry_delay=0)
+    calls = {"count": 0}
+
+    async def _write_batch(rows):
+        calls["count"] += 1
+        if rows[0]["miner_id"] == 0:
+            raise RuntimeError("database unavailable")
+
+    writer._write_batch = _write_batch
+
+    async def _run():
+        for miner_id in range(4):
+            await writer.submit({"miner_id": miner_id})
+        await writer.drain()
+        await writer.stop()
+
+    asyncio.run(_run())
+
+    assert calls["count"] == 4  # Three attempts for the failing batch
+    assert writer.rows_dropped == 2
+    assert writer.rows_written == 2
+    assert writer.get_stats()["running"] is False
+
+
+def test_transient_failure_is_retried() -> None:
+    writer = TelemetryWriter(batch_size=2, flush_interval=0.01, retry_delay=0)
+    calls = {"count": 0}
+
+    async def _write_batch(rows):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise ConnectionResetError("connection lost")
+
+    writer._write_batch = _write_batch
+
+    async def _run():
+        for miner_id in range(2):
+            await writer.submit({"miner_id": miner_id})
+        await writer.drain()
+        await writer.stop()
+
+    asyncio.run(_run())
+
+    assert writer.rows_dropped == 0
+    assert writer.rows_written == 2
+
+
+def test_only_unsupported_copy_errors_disable_copy() -> None:
+    class _PgError(Exception):
+        def __init__(self, sqlstate):
+            self.sqlstate = sqlstate
+
+    assert copy_unsupported(AttributeError("no copy_records_to_table"))
+    assert copy_unsupported(_PgError("0A000"))
+    assert copy_unsupported(_PgError("42501"))
+    assert not copy_unsupported(ConnectionResetError("connection lost"))
+    assert not copy_unsupported(_PgError("08006"))  # connection_failure
+    assert not copy_unsupported(_PgError("23503"))  # foreign_key_violation
+
+
+def test_writer_peaks_are_saved_periodically_off_the_event_loop(monkeypatch) -> None:
+    import core.telemetry_metrics as telemetry_metrics
+
+    saves = []
+
+    def _update(queue_depth, batch_size, flush_ms):
+        saves.append((queue_depth, batch_size, threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(telemetry_metrics, "update_writer_metrics", _update)
+    writer, batches = _writer_with_fake_sink(batch_size=4, flush_interval=0.01, metrics_interval=60)
+
+    async def _run():
+        for miner_id in range(10):
+            await writer.submit({"miner_id": miner_id})
+        await writer.drain()
+        await writer.stop()
+
+    asyncio.run(_run())
+
+    assert len(batches) == 3
+    # First flush is saved straight away, the rest are folded into the save on stop
+    assert len(saves) == 2
+    assert saves[1][1] == 4
+    assert not any(on_main for _, _, on_main in saves)
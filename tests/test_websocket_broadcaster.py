@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+# Ensure app/ is importable when tests run from repo root
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+
+import api.websocket as websocket_api
+from api.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+
+def _manager(monkeypatch, **kwargs) -> ConnectionManager:
+    async def no_listener():
+        return None
+
+    manager = ConnectionManager(**kwargs)
+    monkeypatch.setattr(manager, "_listen_postgres_notifications", no_listener)
+    return manager
+
+
+def test_sweep_notifications_are_coalesced_per_miner(monkeypatch) -> None:
+    manager = _manager(monkeypatch, batch_interval_ms=20, queue_size=16)
+    socket = FakeWebSocket()
+
+    async def run():
+        await manager.connect(socket)
+        for sweep in range(3):
+            for miner_id in (1, 2, 3):
+                manager._handle_telemetry_notification(
+                    None, 0, "telemetry_update", json.dumps({"miner_id": miner_id, "hashrate": sweep})
+                )
+        await asyncio.sleep(0.1)
+        manager.disconnect(socket)
+
+    asyncio.run(run())
+
+    assert len(socket.sent) == 1
+    (message,) = socket.sent
+    assert message["type"] == "telemetry_update"
+    assert [row["miner_id"] for row in message["updates"]] == [1, 2, 3]
+    assert all(row["hashrate"] == 2 for row in message["updates"])
+    assert message["data"] == message["updates"][-1]
+    assert manager.notifications == 9
+
+
+def test_topic_subscriptions_filter_rows(monkeypatch) -> None:
+    manager = _manager(monkeypatch, batch_interval_ms=10, queue_size=16)
+    everything, one_miner, miners_only = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+
+    async def run():
+        await manager.connect(everything)
+        (await manager.connect(one_miner)).subscribe(["miner:2"])
+        (await manager.connect(miners_only)).subscribe(["miners"])
+        for miner_id in (1, 2):
+            manager.queue_notification("telemetry_update", {"miner_id": miner_id})
+        manager.queue_notification("miner_update", {"miner_id": 1, "enabled": False})
+        await asyncio.sleep(0.05)
+        for socket in (everything, one_miner, miners_only):
+            manager.disconnect(socket)
+
+    asyncio.run(run())
+
+    assert sorted(message["type"] for message in everything.sent) == ["miner_update", "telemetry_update"]
+    assert [(m["type"], [r["miner_id"] for r in m["updates"]]) for m in one_miner.sent] == [("telemetry_update", [2])]
+    assert [m["type"] for m in miners_only.sent] == ["miner_update"]
+
+
+def test_slow_client_drops_oldest_without_stalling_others(monkeypatch) -> None:
+    manager = _manager(monkeypatch, batch_interval_ms=1000, queue_size=2)
+    slow, fast = FakeWebSocket(delay=0.2), FakeWebSocket()
+
+    async def run():
+        slow_client = await manager.connect(slow)
+        await manager.connect(fast)
+        for n in range(5):
+            await manager.broadcast({"type": "miner_update", "data": {"miner_id": 1, "n": n}})
+            await asyncio.sleep(0.01)
+        fast_done = [m["data"]["n"] for m in fast.sent]
+        await asyncio.sleep(0.6)
+        manager.disconnect(slow)
+        manager.disconnect(fast)
+        return slow_client.dropped, fast_done
+
+    dropped, fast_done = asyncio.run(run())
+
+    assert fast_done == [0, 1, 2, 3, 4]
+    # First message was in flight; the queue of 2 kept only the newest
+    assert [m["data"]["n"] for m in slow.sent] == [0, 3, 4]
+    assert dropped == 2
+
+
+def test_client_stuck_on_a_send_is_closed(monkeypatch) -> None:
+    monkeypatch.setattr(websocket_api, "SEND_TIMEOUT", 0.05)
+    manager = _manager(monkeypatch, batch_interval_ms=1000, queue_size=4)
+    stuck, healthy = FakeWebSocket(delay=1.0), FakeWebSocket()
+
+    async def run():
+        await manager.connect(stuck)
+        await manager.connect(healthy)
+        await manager.broadcast({"type": "miner_update", "data": {"miner_id": 1}})
+        await asyncio.sleep(0.2)
+        remaining = manager.active_connections
+        manager.disconnect(healthy)
+        return remaining
+
+    remaining = asyncio.run(run())
+
+    assert remaining == {healthy}
+    assert stuck.close_code == 1011
+    assert healthy.close_code is None
+    assert len(healthy.sent) == 1